@@ -0,0 +1,177 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+###########################
+# asyncio interface
+
+# Reading journals, queries and commands take seconds on large journals, so calling them from a coroutine blocks the event loop.
+# Functions of this module run them on a single background thread (so calls to a session are serialized) and can be awaited:
+#   journal = await ledger.aio.read_journal("ledger.dat")
+#   result = await ledger.aio.execute_command("bal ^Expenses", timeout=10)
+#   async for posts in ledger.aio.iter_query("expenses", batch_size=500):
+#       ...
+# A cancelled or timed out call interrupts the running command or parser (the same way as Ctrl-C does in the console application).
+# The journal can be partially read if read_journal is interrupted; it should be closed before reading again.
+
+from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+
+import ledger
+ledger.warmup()     # .Net namespaces are available when the module is loaded
+from NLedger.Utils import CaughtSignalEnum
+
+# Call of a function on the executor thread. It can be interrupted while it is running
+class SessionJob:
+
+    def __init__(self, session: ledger.Session, func, args) -> None:
+        self.session = session
+        self.func = func
+        self.args = args
+        self.lock = threading.Lock()
+        self.is_running = False
+        self.is_cancelled = False
+        self.is_interrupted = False
+
+    def run(self):
+        with self.lock:
+            if self.is_cancelled:
+                raise asyncio.CancelledError()
+            self.is_running = True
+
+        with self.session.enter():
+            try:
+                return self.func(*self.args)
+            finally:
+                with self.lock:
+                    self.is_running = False
+                    if self.is_interrupted:
+                        # An interrupted report leaves calculated data (xdata) in accounts and postings
+                        self.session.get_context().CancellationSignal = CaughtSignalEnum.NONE_CAUGHT
+                        self.session.journal().clear_xdata()
+
+    def cancel(self):
+        with self.lock:
+            self.is_cancelled = True
+            if self.is_running and not self.is_interrupted:
+                self.is_interrupted = True
+                self.session.get_context().CancellationSignal = CaughtSignalEnum.INTERRUPTED
+
+# Executor with one background thread that runs functions in the context of a session.
+# If the session is not specified, functions use the session that is current at the moment of the call (see ledger.current_session).
+class SessionExecutor:
+
+    def __init__(self, session: ledger.Session = None) -> None:
+        assert session is None or isinstance(session, ledger.Session)
+        self.session = session
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger-aio")
+
+    def __enter__(self) -> 'SessionExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def get_session(self) -> ledger.Session:
+        return self.session if not self.session is None else ledger.current_session()
+
+    # Runs a function on the executor thread; timeout is in seconds (asyncio.TimeoutError is raised when it expires)
+    async def run(self, func, *args, timeout: float = None):
+        job = SessionJob(self.get_session(), func, args)
+        future = asyncio.get_running_loop().run_in_executor(self.executor, job.run)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            job.cancel()
+            raise
+
+    async def read_journal(self, path_name: str, timeout: float = None, parallel: bool = False) -> ledger.Journal:
+        return await self.run(self.get_session().read_journal, path_name, parallel, timeout=timeout)
+
+    async def read_journal_from_string(self, data: str, timeout: float = None) -> ledger.Journal:
+        return await self.run(self.get_session().read_journal_from_string, data, timeout=timeout)
+
+    async def query(self, query_text: str, timeout: float = None) -> Iterable:
+        session = self.get_session()
+        return await self.run(lambda: session.journal().query(query_text), timeout=timeout)
+
+    async def execute_command(self, args, readJournalFiles: bool = None, timeout: float = None):
+        return await self.run(self.get_session().execute_command, args, readJournalFiles, timeout=timeout)
+
+    # Executes a query and yields found postings in lists of 'batch_size' items. The executor thread wraps batches one by one
+    # (see NList.chunks) and passes them through a queue of 'max_batches' items, so it waits while the consumer is behind.
+    # The timeout is applied to every batch; closing the iterator early stops the executor job.
+    async def iter_query(self, query_text: str, batch_size: int = 1000, timeout: float = None, max_batches: int = 2):
+        assert batch_size > 0 and max_batches > 0
+        loop = asyncio.get_running_loop()
+        batches = asyncio.Queue(max_batches)
+        is_closed = threading.Event()
+        session = self.get_session()
+
+        def put(item):
+            asyncio.run_coroutine_threadsafe(batches.put(item), loop).result()
+
+        # Errors are passed through the queue; None means the end of results
+        def produce():
+            try:
+                for batch in session.journal().query(query_text).chunks(batch_size):
+                    if is_closed.is_set():
+                        return
+                    put(batch)
+                put(None)
+            except Exception as e:
+                if not is_closed.is_set():
+                    put(e)
+
+        job = SessionJob(session, produce, ())
+        future = loop.run_in_executor(self.executor, job.run)
+        try:
+            while True:
+                batch = await asyncio.wait_for(batches.get(), timeout)
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            is_closed.set()
+            job.cancel()
+            # Releases the executor thread if it waits for a free place in the queue
+            while not batches.empty():
+                batches.get_nowait()
+            await asyncio.wait([future])
+
+    # Waits until the running function is completed and stops the thread
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait)
+
+# Executor that is used by module functions (created on the first call)
+default_executor = None
+
+def get_executor() -> SessionExecutor:
+    global default_executor
+    if default_executor is None:
+        default_executor = SessionExecutor()
+    return default_executor
+
+async def read_journal(path_name: str, timeout: float = None, parallel: bool = False) -> ledger.Journal:
+    return await get_executor().read_journal(path_name, timeout, parallel)
+
+async def read_journal_from_string(data: str, timeout: float = None) -> ledger.Journal:
+    return await get_executor().read_journal_from_string(data, timeout)
+
+async def query(query_text: str, timeout: float = None) -> Iterable:
+    return await get_executor().query(query_text, timeout)
+
+async def execute_command(args, readJournalFiles: bool = None, timeout: float = None):
+    return await get_executor().execute_command(args, readJournalFiles, timeout)
+
+def iter_query(query_text: str, batch_size: int = 1000, timeout: float = None, max_batches: int = 2):
+    return get_executor().iter_query(query_text, batch_size, timeout, max_batches)
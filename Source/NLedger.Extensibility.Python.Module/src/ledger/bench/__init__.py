@@ -0,0 +1,20 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+###########################
+# Benchmark suite
+
+# Measures the module on synthetic journals of production sizes. It can be run as a script:
+#   python -m ledger.bench --xacts 100000 --output results.json [--compare baseline.json]
+# or used from code:
+#   path = JournalGenerator(xacts=100000).write("bench.dat")
+#   results = BenchmarkRunner(path).run()
+
+from ledger.bench.generator import JournalGenerator
+from ledger.bench.runner import BenchmarkRunner, Regression, CASES, compare_results, save_results, load_results
@@ -0,0 +1,65 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Benchmark suite command line
+# Usage: [path_to_python_executable] -m ledger.bench [--journal FILE | --xacts N ...] [--cases CASE ...] [--output FILE] [--compare FILE]
+
+# It generates a synthetic journal (unless --journal is specified), runs benchmark cases and prints results as JSON.
+# With --compare, timings that are slower than the baseline results by more than --threshold are reported and the exit code is 1.
+
+import argparse
+import json
+import os.path
+import sys
+import tempfile
+
+from ledger.bench import JournalGenerator, BenchmarkRunner, CASES, compare_results, save_results, load_results
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m ledger.bench', description='Runs NLedger benchmarks on a synthetic journal')
+    parser.add_argument('--journal', help='Existing journal file (a synthetic journal is generated if it is not specified)')
+    parser.add_argument('--xacts', type=int, default=10000, help='Number of generated transactions')
+    parser.add_argument('--accounts', type=int, default=50, help='Number of generated accounts')
+    parser.add_argument('--depth', type=int, default=3, help='Maximum depth of generated account names')
+    parser.add_argument('--commodities', type=int, default=3, help='Number of generated commodities')
+    parser.add_argument('--prices', type=int, default=100, help='Number of price directives per commodity')
+    parser.add_argument('--tags', type=int, default=5, help='Number of generated tag names')
+    parser.add_argument('--auto-xacts', type=int, default=2, help='Number of automated transactions')
+    parser.add_argument('--periodic-xacts', type=int, default=2, help='Number of periodic transactions')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the generator')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs per case (the best time is reported)')
+    parser.add_argument('--cases', nargs='+', choices=CASES, help='Cases to run (all by default)')
+    parser.add_argument('--output', help='File to save JSON results')
+    parser.add_argument('--compare', help='File with baseline JSON results')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed slowdown comparing to the baseline (0.1 means 10%%)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generator = None
+        journal_path = args.journal
+        if journal_path is None:
+            generator = JournalGenerator(xacts=args.xacts, accounts=args.accounts, depth=args.depth, commodities=args.commodities, prices=args.prices,
+                tags=args.tags, auto_xacts=args.auto_xacts, periodic_xacts=args.periodic_xacts, seed=args.seed)
+            journal_path = generator.write(os.path.join(temp_dir, 'bench.dat'))
+
+        results = BenchmarkRunner(journal_path, repeat=args.repeat).run(args.cases, generator.parameters() if generator else None)
+
+    if args.output:
+        save_results(results, args.output)
+    print(json.dumps(results, indent=2))
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, args.threshold)
+        for regression in regressions:
+            print('Regression: %s %.4f sec -> %.4f sec (x%.2f)' % regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
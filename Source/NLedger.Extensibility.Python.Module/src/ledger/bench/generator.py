@@ -0,0 +1,159 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+###########################
+# Synthetic journal generator
+
+# Generates journals of any size for benchmarks. The output depends only on the parameters (including the seed),
+# so the same journal can be generated again to compare results of different versions:
+#   JournalGenerator(xacts=100000, commodities=5, seed=1).write("bench.dat")
+
+from typing import Iterable, List
+from datetime import date, timedelta
+import os
+import os.path
+import random
+
+TOP_ACCOUNTS = ['Expenses', 'Income', 'Assets', 'Liabilities']
+ACCOUNT_WORDS = ['Food', 'Rent', 'Travel', 'Books', 'Auto', 'Utilities', 'Health', 'Gifts', 'Salary', 'Bonus', 'Checking', 'Savings',
+    'Brokerage', 'Cash', 'Card', 'Loan', 'Power', 'Water', 'Phone', 'Internet', 'Fuel', 'Repair', 'Insurance', 'Taxes', 'Office', 'Home']
+PAYEE_WORDS = ['Acme', 'Global', 'City', 'Green', 'North', 'Star', 'Blue', 'River', 'Market', 'Store', 'Cafe', 'Bank', 'Service', 'Shop']
+
+class JournalGenerator:
+
+    # - xacts: number of transactions (one per day on average, starting from start_date);
+    # - accounts: number of leaf accounts; depth: maximum number of name levels (including the top level like Expenses);
+    # - commodities: number of commodities ('$' and generated symbols); prices: number of price directives per commodity (except '$');
+    # - tags: number of tag names; tag_ratio: share of transactions with a tag (and of postings with a tag value);
+    # - auto_xacts, periodic_xacts: number of automated and periodic transactions;
+    # - seed: seed of the random generator (the same seed gives the same journal).
+    def __init__(self, xacts: int = 10000, accounts: int = 50, depth: int = 3, commodities: int = 3, prices: int = 100,
+        tags: int = 5, tag_ratio: float = 0.3, auto_xacts: int = 2, periodic_xacts: int = 2, start_date: date = date(2000, 1, 1), seed: int = 0) -> None:
+        assert xacts >= 0 and accounts > 0 and depth > 1 and commodities > 0 and prices >= 0 and tags >= 0
+        self.xacts = xacts
+        self.accounts = accounts
+        self.depth = depth
+        self.commodities = commodities
+        self.prices = prices
+        self.tags = tags
+        self.tag_ratio = tag_ratio
+        self.auto_xacts = auto_xacts
+        self.periodic_xacts = periodic_xacts
+        self.start_date = start_date
+        self.seed = seed
+
+    # Generation parameters (they are written to benchmark results)
+    def parameters(self) -> dict:
+        params = dict(vars(self))
+        params['start_date'] = self.start_date.isoformat()
+        return params
+
+    def commodity_symbols(self) -> List[str]:
+        return ['$'] + [chr(ord('A') + index // 26 % 26) + chr(ord('A') + index % 26) + 'X' for index in range(self.commodities - 1)]
+
+    def account_names(self, rnd: random.Random) -> List[str]:
+        names = set()
+        while len(names) < self.accounts:
+            levels = [TOP_ACCOUNTS[len(names) % len(TOP_ACCOUNTS)]]
+            levels += [rnd.choice(ACCOUNT_WORDS) for _ in range(rnd.randint(1, self.depth - 1))]
+            names.add(':'.join(levels))
+        return sorted(names)
+
+    def end_date(self) -> date:
+        return self.start_date + timedelta(days=max(self.xacts, 1))
+
+    # Yields journal lines. If chunks > 1, transactions are split into that many parts separated by None items
+    def lines(self, chunks: int = 1) -> Iterable[str]:
+        rnd = random.Random(self.seed)
+        symbols = self.commodity_symbols()
+        accounts = self.account_names(rnd)
+        expenses = [name for name in accounts if not name.startswith('Assets') and not name.startswith('Liabilities')] or accounts
+        funds = [name for name in accounts if name.startswith('Assets') or name.startswith('Liabilities')] or accounts
+        tags = ['Tag%d' % index for index in range(self.tags)]
+        payees = ['%s %s' % (rnd.choice(PAYEE_WORDS), rnd.choice(PAYEE_WORDS)) for _ in range(max(self.xacts // 20, 10))]
+        days = (self.end_date() - self.start_date).days
+
+        yield '; Synthetic journal: %s' % ', '.join('%s=%s' % item for item in sorted(self.parameters().items()))
+        yield ''
+        yield 'commodity $'
+        yield '    format $1,000.00'
+        for symbol in symbols[1:]:
+            yield 'commodity %s' % symbol
+            yield '    format 1,000.000 %s' % symbol
+        yield ''
+        for name in accounts:
+            yield 'account %s' % name
+        for tag in tags:
+            yield 'tag %s' % tag
+        yield ''
+
+        for symbol in symbols[1:]:
+            price = rnd.uniform(10, 100)
+            for index in range(self.prices):
+                price = max(price * rnd.uniform(0.95, 1.05), 1)
+                yield 'P %s %s $%.2f' % (self.start_date + timedelta(days=index * days // max(self.prices, 1)), symbol, price)
+        yield ''
+
+        for index in range(self.auto_xacts):
+            yield '= ^%s' % expenses[index % len(expenses)]
+            yield '    (Liabilities:Tax)    0.1'
+            yield ''
+
+        for index in range(self.periodic_xacts):
+            yield '~ %s' % ['Monthly', 'Weekly', 'Yearly', 'Quarterly'][index % 4]
+            yield '    %s    $%d.00' % (expenses[index % len(expenses)], rnd.randint(10, 1000))
+            yield '    %s' % funds[index % len(funds)]
+            yield ''
+
+        chunk_size = max(-(-self.xacts // max(chunks, 1)), 1)
+        for index in range(self.xacts):
+            if index and index % chunk_size == 0:
+                yield None
+            xact_date = self.start_date + timedelta(days=index * days // max(self.xacts, 1))
+            state = rnd.choice(['* ', '! ', '', ''])
+            yield '%s %s(%d) %s' % (xact_date.strftime('%Y/%m/%d'), state, index, rnd.choice(payees))
+            if tags and rnd.random() < self.tag_ratio:
+                yield '    ; :%s:' % rnd.choice(tags)
+
+            symbol = rnd.choice(symbols)
+            if symbol == '$':
+                amount = '$%d.%02d' % (rnd.randint(1, 999), rnd.randint(0, 99))
+            else:
+                amount = '%d.%03d %s @ $%d.%02d' % (rnd.randint(1, 99), rnd.randint(0, 999), symbol, rnd.randint(1, 99), rnd.randint(0, 99))
+            note = '  ; %s: %d' % (rnd.choice(tags), rnd.randint(1, 10)) if tags and rnd.random() < self.tag_ratio else ''
+            yield '    %s    %s%s' % (rnd.choice(expenses), amount, note)
+            yield '    %s' % rnd.choice(funds)
+            yield ''
+
+    def to_string(self) -> str:
+        return '\n'.join(line for line in self.lines() if not line is None) + '\n'
+
+    # Writes the journal to a file. If files > 1, transactions are written to included files (<name>-N.dat in the same folder).
+    # Returns the path of the main file.
+    def write(self, path: str, files: int = 1) -> str:
+        (base, ext) = os.path.splitext(path)
+        file_number = 0
+        main_file = open(path, 'w')
+        out = main_file
+        try:
+            for line in self.lines(files):
+                if line is None or (files > 1 and out is main_file and line[:1].isdigit()):
+                    if not out is main_file:
+                        out.close()
+                    file_number += 1
+                    included_path = '%s-%d%s' % (base, file_number, ext or '.dat')
+                    main_file.write('include %s\n' % os.path.basename(included_path))
+                    out = open(included_path, 'w')
+                if not line is None:
+                    out.write(line + '\n')
+        finally:
+            if not out is main_file:
+                out.close()
+            main_file.close()
+        return path
@@ -0,0 +1,231 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+###########################
+# Benchmark runner
+
+# Runs benchmark cases against a journal file and returns results as a JSON-compatible dict:
+#   results = BenchmarkRunner("bench.dat").run()
+# Every case reports 'seconds' (the best time of 'repeat' runs) and all run times; other values depend on the case.
+# Results of different versions can be compared by compare_results.
+# Query and report caches are disabled while cases are measured; 'query_cached' measures repeated queries that are taken from query_cache.
+
+from typing import Iterable, List
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import ledger
+ledger.warmup()     # .Net namespaces are available when the module is loaded
+from NLedger.Utility import VersionInfo
+from System import GC
+
+DEFAULT_QUERIES = ['expenses', 'income', '@Store', '%Tag0']
+DEFAULT_COMMANDS = ['bal', 'reg ^Expenses', 'bal -M ^Expenses', 'print ^Income', 'stats']
+
+CASES = ['parse', 'query', 'query_cached', 'iteration', 'amount_math', 'execute_command', 'memory']
+
+# Enables or disables query and report caches within the block; cached results are dropped before and after it
+@contextmanager
+def caches_enabled(enabled: bool):
+    saved = (ledger.query_cache.enabled, ledger.report_cache.enabled)
+    ledger.query_cache.invalidate()
+    ledger.report_cache.invalidate()
+    ledger.query_cache.enabled = ledger.report_cache.enabled = enabled
+    try:
+        yield
+    finally:
+        (ledger.query_cache.enabled, ledger.report_cache.enabled) = saved
+        ledger.query_cache.invalidate()
+        ledger.report_cache.invalidate()
+
+class BenchmarkRunner:
+
+    def __init__(self, journal_path: str, repeat: int = 3, queries: List[str] = None, commands: List[str] = None) -> None:
+        assert repeat > 0
+        self.journal_path = journal_path
+        self.repeat = repeat
+        self.queries = queries or DEFAULT_QUERIES
+        self.commands = commands or DEFAULT_COMMANDS
+
+    # Calls the function 'repeat' times; returns the result of the last call and the timing dict
+    def measure(self, func, prepare = None):
+        runs = []
+        for _ in range(self.repeat):
+            if not prepare is None:
+                prepare()
+            gc.collect()
+            start = time.perf_counter()
+            result = func()
+            runs.append(time.perf_counter() - start)
+        return (result, {'seconds': min(runs), 'runs': runs})
+
+    def read_journal(self) -> ledger.Journal:
+        ledger.session.close_journal_files()
+        return ledger.read_journal(self.journal_path)
+
+    def bench_parse(self) -> dict:
+        (journal, timing) = self.measure(lambda: ledger.read_journal(self.journal_path), ledger.session.close_journal_files)
+        xacts = len(journal.xacts())
+        return dict(timing, xacts=xacts, xacts_per_second=xacts / timing['seconds'])
+
+    def bench_query(self) -> dict:
+        journal = self.read_journal()
+        results = {}
+        for query in self.queries:
+            (posts, timing) = self.measure(lambda: journal.query(query))
+            results[query] = dict(timing, posts=len(posts))
+        return results
+
+    # The first query of every text is executed before measuring, so measured runs get cached results
+    def bench_query_cached(self) -> dict:
+        journal = self.read_journal()
+        results = {}
+        with caches_enabled(True):
+            for query in self.queries:
+                journal.query(query)
+                ledger.query_cache.reset_stats()
+                (posts, timing) = self.measure(lambda: journal.query(query))
+                results[query] = dict(timing, posts=len(posts), hit_rate=ledger.query_cache.hit_rate)
+        return results
+
+    # Wraps all transactions and postings and reads common attributes
+    def bench_iteration(self) -> dict:
+        journal = self.read_journal()
+
+        def iterate():
+            count = 0
+            for xact in journal:
+                xact.date
+                xact.payee
+                for post in xact:
+                    post.account.fullname()
+                    post.amount
+                    count += 1
+            return count
+
+        (posts, timing) = self.measure(iterate)
+        return dict(timing, posts=posts, posts_per_second=posts / timing['seconds'])
+
+    # Arithmetic on posting amounts: sums by commodity, multiplication, division, rounding and conversion to float
+    def bench_amount_math(self) -> dict:
+        amounts = [post.amount for post in self.read_journal().query('')]
+
+        def calculate():
+            balance = ledger.Balance()
+            for amount in amounts:
+                balance += amount
+                value = (amount * 3 / 2).rounded()
+                value.to_double()
+            return balance
+
+        (_, timing) = self.measure(calculate)
+        return dict(timing, amounts=len(amounts), amounts_per_second=len(amounts) / timing['seconds'])
+
+    def bench_execute_command(self) -> dict:
+        self.read_journal()
+        results = {}
+        for command in self.commands:
+            (cmd_result, timing) = self.measure(lambda: ledger.execute_command(command))
+            results[command] = dict(timing, output_lines=cmd_result.Output.count('\n'), error=cmd_result.Error or None)
+        return results
+
+    # Managed heap taken by the parsed journal (.Net GC) and Python memory taken by wrappers of all postings (tracemalloc)
+    def bench_memory(self) -> dict:
+        ledger.session.close_journal_files()
+        GC.Collect()
+        heap_before = GC.GetTotalMemory(True)
+        journal = ledger.read_journal(self.journal_path)
+        heap_after = GC.GetTotalMemory(True)
+        xacts = len(journal.xacts())
+
+        tracemalloc.start()
+        try:
+            posts = [post for xact in journal for post in xact]
+            (wrappers_size, _) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        results = {
+            'journal_bytes': heap_after - heap_before,
+            'bytes_per_xact': (heap_after - heap_before) / max(xacts, 1),
+            'post_wrapper_bytes': wrappers_size / max(len(posts), 1),
+        }
+
+        try:
+            import resource
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            results['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+        except ImportError:
+            pass
+
+        return results
+
+    # Runs the specified cases (all by default) and returns results with environment info
+    def run(self, cases: Iterable[str] = None, generator: dict = None) -> dict:
+        cases = list(cases or CASES)
+        assert all(case in CASES for case in cases), "Unknown benchmark case"
+
+        results = {
+            'nledger_version': VersionInfo.NLedgerVersion,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'journal': os.path.abspath(self.journal_path),
+            'repeat': self.repeat,
+            'generator': generator,
+            'cases': {},
+        }
+        for case in cases:
+            with caches_enabled(False):
+                results['cases'][case] = getattr(self, 'bench_' + case)()
+
+        ledger.session.close_journal_files()
+        return results
+
+###########################
+# Comparing results
+
+Regression = namedtuple('Regression', ['name', 'baseline', 'current', 'ratio'])
+
+# Flattens timings of results to a dict of 'case[/name]' => seconds
+def result_timings(results: dict) -> dict:
+    timings = {}
+    for (case, values) in results['cases'].items():
+        if 'seconds' in values:
+            timings[case] = values['seconds']
+        else:
+            timings.update(('%s/%s' % (case, name), value['seconds']) for (name, value) in values.items() if isinstance(value, dict) and 'seconds' in value)
+    return timings
+
+# Returns timings that are slower than the baseline by more than 'threshold' (0.1 means 10%)
+def compare_results(baseline: dict, current: dict, threshold: float = 0.1) -> List[Regression]:
+    baseline_timings = result_timings(baseline)
+    regressions = []
+    for (name, seconds) in result_timings(current).items():
+        base = baseline_timings.get(name)
+        if base and seconds / base > 1 + threshold:
+            regressions.append(Regression(name, base, seconds, seconds / base))
+    return regressions
+
+def save_results(results: dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def load_results(path: str) -> dict:
+    with open(path, 'r') as f:
+        return json.load(f)
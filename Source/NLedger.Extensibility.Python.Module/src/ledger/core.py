@@ -0,0 +1,4078 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+# 
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+###########################
+# NLedger Python interface module
+#
+# The module code is executed in the namespace of the ledger package when the package is used for the first time (see __init__.py),
+# so it should not be imported directly
+
+if __name__ != 'ledger':
+    raise ImportError("ledger.core is loaded by the ledger package; use 'import ledger' instead")
+
+from typing import Iterable, List, Tuple, Dict
+import ctypes
+import enum
+import inspect
+import os
+import sys
+import threading
+
+# Helper functions
+
+def getenv(name: str) -> str:
+    return os.environ[name] if name in os.environ else None
+
+def getpath(relative_path: str) -> str:
+    return os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), relative_path))
+
+# Static property attribute
+
+class classproperty(property):
+    def __get__(self, cls, owner):
+        return classmethod(self.fget).__get__(None, owner)()
+
+# Metaclass that routes assignments to class properties (e.g. JournalItem.use_aux_date = True) to their setters
+
+class classproperty_meta(type):
+    def __setattr__(cls, name, value):
+        for klass in cls.__mro__:
+            if name in klass.__dict__:
+                attr = klass.__dict__[name]
+                if isinstance(attr, classproperty) and not attr.fset is None:
+                    return attr.fset(cls, value)
+                break
+        super().__setattr__(name, value)
+
+############################
+# CLR Runtime initialization
+
+# In case of using PythonNet 3, CLR Runtime initialization can be optionally regulated by means of "nledger_python_clr_runtime" environment variable.
+# Possible values are: "netfx", "mono", "core". In case of "core", you should also specify a path to runtime config file ("nledger_python_clr_runtime_config" variable)
+# For older versions of PythonNet (e.g. 2.5.1), the variable "nledger_python_clr_runtime" should be empty.
+
+clr_runtime = getenv("nledger_python_clr_runtime")
+if bool(clr_runtime):
+    from pythonnet import set_runtime
+
+    if clr_runtime == "netfx":
+        from clr_loader import get_netfx
+        set_runtime(get_netfx())
+    elif clr_runtime == "mono":
+        from clr_loader import get_mono
+        set_runtime(get_mono())
+    elif clr_runtime == "core":
+        from clr_loader import get_coreclr
+        runtime_config = getenv("nledger_python_clr_runtime_config")
+        assert not bool(runtime_config)
+        set_runtime(get_coreclr(runtime_config))
+    else:
+        raise Exception("Unsupported CLR Runtime selector (environment variable 'nledger_python_clr_runtime_config'): " + clr_runtime)
+
+import clr
+
+is_pythonnet_2 = clr.__version__ and clr.__version__.startswith("2.")
+
+############################
+# Load NLedger library
+
+# Check whether the module is running under NLedger host (the indicator is that the current app domain already contains type PythonSession)
+from System import Type
+is_nledger_host = not (Type.GetType("NLedger.Extensibility.Python.PythonSession,NLedger.Extensibility.Python") is None)
+
+# Load NLedger library if it is not NLedger host
+if not is_nledger_host:
+
+    # The module looks for NLedger.dll in the local runtime folder until environment variable "nledger_extensibility_python_dll_path" is populated
+
+    nledger_extensibility_python_dll_path = getenv("nledger_extensibility_python_dll_path")
+    if not bool(nledger_extensibility_python_dll_path):
+        nledger_extensibility_python_dll_path = getpath('./runtime/NLedger.Extensibility.Python.dll')
+    assert os.path.isfile(nledger_extensibility_python_dll_path), "Cannot find NLedger binary file: " + nledger_extensibility_python_dll_path
+
+    # Adding path to runtime dll to PATH and sending only name fixes a problem in pythonnet:
+    # it tries to use Assembly.Load for loading an assembly specified by path and name
+
+    dllFolder = os.path.dirname(nledger_extensibility_python_dll_path)
+    dllName = os.path.splitext(os.path.basename(nledger_extensibility_python_dll_path))[0]
+
+    if not(dllFolder in sys.path):
+        sys.path.append(dllFolder)
+
+    # Load NLedger.Extensibility.Python.dll (and NLedger.dll respectively)
+
+    clr.AddReference(dllName)
+
+else:
+
+    nledger_extensibility_python_dll_path = "[Embedded]"
+
+
+############################
+# Import NLedger library
+
+# Module initialization
+
+from NLedger.Extensibility.Python import PythonSession
+PythonSession.PythonModuleInitialization()
+
+# Import origin NLedger classes and globals
+
+from NLedger import Balance as OriginBalance
+from NLedger import Mask as OriginMask
+from NLedger import Post as OriginPost
+from NLedger import PostXData as OriginPostXData
+from NLedger import SupportsFlagsEnum as OriginSupportsFlagsEnum
+from NLedger.Accounts import Account as OriginAccount
+from NLedger.Accounts import AccountXDataDetails as OriginAccountXDataDetails
+from NLedger.Accounts import AccountXData as OriginAccountXData
+from NLedger.Amounts import Amount as OriginAmount
+from NLedger.Amounts import AmountParseFlagsEnum as OriginAmountParseFlagsEnum
+from NLedger.Annotate import AnnotatedCommodity as OriginAnnotatedCommodity
+from NLedger.Annotate import Annotation as OriginAnnotation
+from NLedger.Annotate import AnnotationKeepDetails as OriginAnnotationKeepDetails
+from NLedger.Commodities import CommodityPool as OriginCommodityPool
+from NLedger.Commodities import Commodity as OriginCommodity
+from NLedger.Commodities import PricePoint as OriginPricePoint
+from NLedger.Commodities import CommodityFlagsEnum
+from NLedger.Expressions import Expr as OriginExpr
+from NLedger.Journals import Journal as OriginJournal
+from NLedger.Journals import JournalFileInfo as OriginJournalFileInfo
+from NLedger.Journals import JournalExtensions as OriginJournalExtensions
+from NLedger.Journals import JournalSnapshot as OriginJournalSnapshot
+from NLedger.Journals import JournalQuery as OriginJournalQuery
+from NLedger.Journals import TagIndex as OriginTagIndex
+from NLedger.Items import Item as OriginItem
+from NLedger.Items import ItemStateEnum as OriginItemStateEnum
+from NLedger.Items import ItemPosition as OriginItemPosition
+from NLedger.Scopus import Scope as OriginScope
+from NLedger.Scopus import Session as OriginSession
+from NLedger.Values import ValueTypeEnum as OriginValueTypeEnum
+from NLedger.Values import Value as OriginValue
+from NLedger.Xacts import XactBase as OriginXactBase
+from NLedger.Xacts import Xact as OriginXact
+from NLedger.Xacts import PeriodXact as OriginPeriodXact
+from NLedger.Xacts import AutoXact as OriginAutoXact
+
+# Import unwrapped NLedger classes
+
+from NLedger import Predicate
+from NLedger import MainApplicationContext
+from NLedger.Extensibility import ExtendedSession
+from NLedger.Extensibility import SessionExtensions
+from NLedger.Extensibility import IsolatedSession as OriginIsolatedSession
+from NLedger.Extensibility.Export import FlagsAdapter
+from NLedger.Extensibility.Export import ListAdapter as NetListAdapter
+from NLedger.Extensibility.Export import ExportedConsts
+from NLedger.Extensibility.Export import ChunkTextWriter
+from NLedger.Extensibility.Export import AccountTreeColumns
+from NLedger.Scopus import SymbolKindEnum as SymbolKind
+from NLedger.Times import TimesCommon
+from NLedger.Times import DateInterval
+from NLedger.Utility import Date
+from NLedger.Utility import CommandLine
+
+# Import .Net classes
+
+from System import DateTime
+from System import Boolean
+from System import Tuple as NetTuple
+from System import Enum as NetEnum
+from System import String as NetString
+from System import Action as NetAction
+from System.Collections.Generic import List as NetList
+from System.Globalization import DateTimeStyles
+
+###########################
+# Date/time conversions
+
+# .Net dates are converted by reading Ticks (a single interop call) instead of reading date parts one by one.
+# Converted dates are memoized by ordinal (journals contain a small set of distinct dates); .Net dates are immutable structures,
+# so the same converted value can be shared by callers. Bulk conversions (to_pdates, to_datetime64) read all dates of a posting
+# or transaction list in a single call.
+
+from datetime import datetime
+from datetime import date
+from datetime import timedelta
+from functools import lru_cache
+
+TICKS_PER_DAY = 864000000000
+TICKS_PER_MILLISECOND = 10000
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DATE_CACHE_SIZE = 4096
+
+# Python date by the ordinal (memoized)
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def pdate_from_ordinal(ordinal: int) -> date:
+    return date.fromordinal(ordinal)
+
+# .Net Ledger Date by the ordinal (memoized)
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def ndate_from_ordinal(ordinal: int) -> Date:
+    value = date.fromordinal(ordinal)
+    return Date(value.year, value.month, value.day)
+
+# Ticks of .Net DateTime and Date start at 0001-01-01 that has ordinal 1 in Python
+def ticks_to_ordinal(ticks: int) -> int:
+    return ticks // TICKS_PER_DAY + 1
+
+# Converts to Python date
+def to_pdate(value) -> date:
+    value_type = type(value)
+    if value_type is Date or value_type is DateTime:
+        return pdate_from_ordinal(ticks_to_ordinal(value.Ticks))
+    elif value is None:
+        return None
+    elif isinstance(value, (DateTime, Date)):
+        return pdate_from_ordinal(ticks_to_ordinal(value.Ticks))
+    elif isinstance(value, datetime):
+        return value.date()
+    elif isinstance(value, date):
+        return value
+    else:
+        raise Exception("Date value is expected")
+
+# Converts to Python datetime
+def to_pdatetime(value) -> datetime:
+    if value is None:
+        return None
+    elif isinstance(value, (DateTime, Date)):
+        ticks = value.Ticks
+        return datetime.fromordinal(ticks_to_ordinal(ticks)) + timedelta(milliseconds=ticks % TICKS_PER_DAY // TICKS_PER_MILLISECOND)
+    elif isinstance(value, datetime):
+        return value
+    elif isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    else:
+        raise Exception("Date value is expected")
+
+# Converts to .Net Ledger Date
+def to_ndate(value) -> Date:
+    value_type = type(value)
+    if value_type is date or value_type is datetime:
+        return ndate_from_ordinal(value.toordinal())
+    elif value is None:
+        return None
+    elif isinstance(value, Date):
+        return value
+    elif isinstance(value, DateTime):
+        return ndate_from_ordinal(ticks_to_ordinal(value.Ticks))
+    elif isinstance(value, date):
+        return ndate_from_ordinal(value.toordinal())
+    else:
+        raise Exception("Date value is expected")
+
+# Converts to .Net DateTime
+def to_ndatetime(value) -> DateTime:
+    if value is None:
+        return None
+    elif isinstance(value, DateTime):
+        return value
+    elif isinstance(value, Date):
+        return DateTime(value.Ticks)
+    elif isinstance(value, datetime):
+        return DateTime(value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond // 1000)
+    elif isinstance(value, date):
+        return DateTime(value.year, value.month, value.day)
+    else:
+        raise Exception("Date value is expected")
+
+# Converts dates of a posting or transaction list (PostingList, TransactionList) or a sequence of date values to a list of Python dates
+def to_pdates(values) -> List[date]:
+    epoch_days = get_epoch_days(values)
+    if epoch_days is None:
+        return [to_pdate(value) for value in values]
+    return [pdate_from_ordinal(days + EPOCH_ORDINAL) for days in to_int64_array(epoch_days)]
+
+# Converts dates of a posting or transaction list or a sequence of date values to NumPy datetime64[D] array (None values are NaT)
+def to_datetime64(values):
+    import numpy
+    epoch_days = get_epoch_days(values)
+    if epoch_days is None:
+        return numpy.array([to_pdate(value) for value in values], dtype='datetime64[D]')
+    return to_numpy_array(epoch_days, numpy.int64).view('datetime64[D]')
+
+# Returns .Net array of dates (days since 1970-01-01) for posting and transaction lists or None for other sequences
+def get_epoch_days(values):
+    if isinstance(values, (PostingList, TransactionList)):
+        return NetListAdapter.GetItemDates(values.origin)
+    return None
+
+###########################
+# NLedger lists for Python
+
+from collections.abc import MutableSequence
+
+# .Net List wrapper
+
+class NList(MutableSequence):
+
+    origin = None
+    nclass = None
+
+    def __init__(self, origin = None) -> None:
+        super(NList, self).__init__()
+
+        self.nclass = self.get_nclass()
+        assert isinstance(self.nclass, type)
+
+        if origin is None:
+            self.origin = self.nclass()
+        elif isinstance(origin,Iterable) and not isinstance (origin, self.nclass):
+            self.origin = self.nclass()
+            for item in origin:
+                self.append(item)
+        else:
+            assert isinstance (origin, self.nclass)
+            self.origin = origin
+
+    def get_nclass(self) -> type:
+        raise Exception("This method should return .Net class for expected origin")
+
+    def to_nitem(self, item):
+        raise Exception("This method should convert a Python item to .Net item")
+
+    def to_pitem(self, item):
+        raise Exception("This method should convert a .Net item to Python item")
+
+    def __repr__(self):
+        return "<{0} {1}>".format(self.__class__.__name__, self.origin)
+
+    def __len__(self) -> int:
+        return self.origin.Count
+
+    # Items are wrapped one at a time, so breaking the loop does not pay for the rest of the list
+    def __iter__(self):
+        origin = self.origin
+        for index in range(origin.Count):
+            yield self.to_pitem(origin[index])
+
+    # Yields lists of wrapped items; every chunk is fetched from .Net list by a single call
+    def chunks(self, chunk_size: int = 1000):
+        assert isinstance(chunk_size, int) and chunk_size > 0
+        origin = self.origin
+        index = 0
+        while index < origin.Count:
+            chunk = origin.GetRange(index, chunk_size)
+            yield [self.to_pitem(item) for item in chunk]
+            index += len(chunk)
+
+    # Streaming iterator that fetches .Net items by chunks
+    def iter_chunked(self, chunk_size: int = 1000):
+        for chunk in self.chunks(chunk_size):
+            yield from chunk
+
+    def __getitem__(self, row):
+        item = self.origin[row] if row < self.origin.Count else None
+        return self.to_pitem(item) if not item is None else None
+
+    def __delitem__(self, row):
+        self.origin.RemoveAt(row)
+
+    def __setitem__(self, row, item):
+        item = self.to_nitem(item) if not item is None else None
+        self.origin[row] = item
+
+    def __str__(self):
+        return str(self.origin)
+
+    def insert(self, row, item):
+        item = self.to_nitem(item) if not item is None else None
+        self.origin.Insert(row, item)
+
+    def append(self, item):
+        item = self.to_nitem(item) if not item is None else None
+        self.origin.Add(item)
+
+# Lists
+
+class ValueList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginValue]
+
+    def to_nitem(self, item):
+        return Value.to_value(item).origin
+
+    def to_pitem(self, item):
+        return Value.to_value(item)
+
+class SortValueList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[NetTuple[OriginValue,bool]]
+
+    def to_nitem(self, item):
+        (value, inverted) = item
+        return NetTuple[OriginValue,bool](Value.to_value(value).origin,inverted)
+
+    def to_pitem(self, item):
+        return (Value.to_value(item.Item1), item.Item2)
+
+class PostingList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginPost]
+
+    def to_nitem(self, item):
+        return item.origin if not item is None else None
+
+    def to_pitem(self, item):
+        return Posting.from_origin(item)
+
+    def to_columns(self) -> Dict:
+        return to_columns(NetListAdapter.GetPostColumns(self.origin))
+
+    # Sums posting amounts on .Net side in a single call. Returns Balance if 'by' is not specified;
+    # otherwise, returns a dict of balances keyed by account name, commodity symbol, payee or month ('account', 'commodity', 'payee', 'month').
+    # Month keys are dates of the first day of the month
+    def sum_amounts(self, by: str = None):
+        assert by is None or isinstance(by, str)
+        totals = NetListAdapter.GetPostTotals(self.origin, by)
+        if by is None:
+            return Balance.from_origin(totals.Total)
+        return {(key if isinstance(key, str) else to_pdate(key)): Balance.from_origin(total) for key, total in zip(totals.Keys, totals.Totals)}
+
+class AccountList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginAccount]
+
+    def to_nitem(self, item):
+        return item.origin if not item is None else None
+
+    def to_pitem(self, item):
+        return Account.from_origin(item)
+
+class AmountList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginAmount]
+
+    def to_nitem(self, item):
+        return item.origin if not item is None else None
+
+    def to_pitem(self, item):
+        return Amount.from_origin(item)
+
+class TransactionList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginXact]
+
+    def to_nitem(self, item):
+        return item.origin if not item is None else None
+
+    def to_pitem(self, item):
+        return Transaction.from_origin(item)
+
+class AutomatedTransactionList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginAutoXact]
+
+    def to_nitem(self, item):
+        return item.origin if not item is None else None
+
+    def to_pitem(self, item):
+        return AutomatedTransaction.from_origin(item)
+
+class PeriodicTransactionList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginPeriodXact]
+
+    def to_nitem(self, item):
+        return item.origin if not item is None else None
+
+    def to_pitem(self, item):
+        return PeriodicTransaction.from_origin(item)
+
+class FileInfoList(NList):
+    def __init__(self, origin = None) -> None:
+        super().__init__(origin=origin)
+
+    def get_nclass(self) -> type:
+        return NetListAdapter[OriginJournalFileInfo]
+
+    def to_nitem(self, item):
+        return item.origin if not item is None else None
+
+    def to_pitem(self, item):
+        return FileInfo.from_origin(item)
+
+###########################
+# Columnar export (requires NumPy)
+
+from array import array
+from System.Runtime.InteropServices import GCHandle, GCHandleType
+
+# Copies content of .Net array of primitive values to the memory address by means of a single memory copy
+def copy_net_array(net_array, address: int, nbytes: int):
+    if nbytes > 0:
+        handle = GCHandle.Alloc(net_array, GCHandleType.Pinned)
+        try:
+            ctypes.memmove(address, handle.AddrOfPinnedObject().ToInt64(), nbytes)
+        finally:
+            handle.Free()
+
+# Copies .Net array of primitive values to a new NumPy array
+def to_numpy_array(net_array, dtype):
+    import numpy
+    result = numpy.empty(net_array.Length, dtype=dtype)
+    copy_net_array(net_array, result.ctypes.data, result.nbytes)
+    return result
+
+# Copies .Net array of long values to a new Python array (it does not require NumPy)
+def to_int64_array(net_array) -> array:
+    result = array('q', [0]) * net_array.Length
+    copy_net_array(net_array, result.buffer_info()[0], len(result) * result.itemsize)
+    return result
+
+# Converts .Net PostColumns to a dict of NumPy arrays (one item per posting) and side tables.
+# Commodity, account and payee columns contain indexes in 'commodities', 'accounts' and 'payees' lists;
+# 'quantity_scaled' is a quantity multiplied by 10^precision (precisions are in 'commodity_precisions'); it is None
+# if some scaled quantities do not fit into int64 ('quantity' is available then)
+def to_columns(post_columns) -> Dict:
+    import numpy
+    return {
+        'date': to_numpy_array(post_columns.Dates, numpy.int64).view('datetime64[D]'),
+        'quantity': to_numpy_array(post_columns.Quantities, numpy.float64),
+        'quantity_scaled': to_numpy_array(post_columns.ScaledQuantities, numpy.int64) if not post_columns.ScaledQuantities is None else None,
+        'commodity': to_numpy_array(post_columns.CommodityIds, numpy.int32),
+        'account': to_numpy_array(post_columns.AccountIds, numpy.int32),
+        'payee': to_numpy_array(post_columns.PayeeIds, numpy.int32),
+        'state': to_numpy_array(post_columns.States, numpy.int32),
+        'xact': to_numpy_array(post_columns.XactSeqs, numpy.int64),
+        'commodities': list(post_columns.Commodities),
+        'commodity_precisions': list(post_columns.CommodityPrecisions),
+        'accounts': list(post_columns.Accounts),
+        'payees': list(post_columns.Payees),
+    }
+
+###########################
+# Base wrapper class (origin keeper)
+# Wrappers keep the origin in a slot, so wrapper instances have no __dict__ and reading the origin is a plain attribute access.
+# Derived classes should declare __slots__ too (an empty tuple unless they keep additional attributes).
+
+class OriginKeeper(metaclass=classproperty_meta):
+
+    __slots__ = ('origin', '__weakref__')
+
+# Base wrapper class for objects that refer to a current context object (e.g. the current session)
+# unless the origin is specified explicitly
+
+class ContextOriginKeeper(OriginKeeper):
+
+    __slots__ = ('_origin',)
+
+    @property
+    def origin(self):
+        return self._origin if not self._origin is None else self.get_origin()
+
+    @origin.setter
+    def origin(self, value):
+        self._origin = value
+
+    def get_origin(self):
+        raise Exception("Method 'get_origin' should be defined in derived class if 'origin' value is not specified explicitly.")
+
+# Identity map of wrappers (postings, transactions, accounts and commodities). It is disabled by default;
+# when enabled, the same origin object is always represented by the same wrapper while the wrapper is alive.
+# Wrappers are kept by weak references, so the cache does not extend their lifetime.
+
+from weakref import WeakValueDictionary
+
+class WrapperCache:
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self.wrappers = WeakValueDictionary()
+
+    # Returns a cached wrapper for the origin or creates a new one by calling factory(origin)
+    def get(self, origin, factory):
+        if not self.enabled:
+            return factory(origin)
+
+        wrapper = self.wrappers.get(origin)
+        if wrapper is None:
+            self.misses += 1
+            wrapper = factory(origin)
+            self.wrappers[origin] = wrapper
+        else:
+            self.hits += 1
+        return wrapper
+
+    def clear(self):
+        self.wrappers.clear()
+
+    # Removes wrappers of objects that belong to the session: postings, transactions and accounts of its journal
+    # and commodities of its commodity pool. Wrappers of other sessions are kept
+    def invalidate(self, session: 'Session'):
+        with session.enter():
+            journal = session.origin.Journal
+            pool = OriginCommodityPool.Current
+            for origin in [origin for origin in list(self.wrappers.keys()) if WrapperCache.belongs(origin, journal, pool)]:
+                self.wrappers.pop(origin, None)
+
+    @staticmethod
+    def belongs(origin, journal, pool) -> bool:
+        if isinstance(origin, OriginPost):
+            return not origin.Xact is None and origin.Xact.Journal == journal
+        if isinstance(origin, OriginXactBase):
+            return origin.Journal == journal
+        if isinstance(origin, OriginAccount):
+            while not origin.Parent is None:
+                origin = origin.Parent
+            return origin == journal.Master
+        if isinstance(origin, OriginCommodity):
+            return origin.Parent == pool
+        return False
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.wrappers)
+
+wrapper_cache = WrapperCache()
+
+###########################
+# Ported extras
+
+# Converts command arguments (a command line or an iterable of strings) to a .Net argument of SessionExtensions methods
+def to_net_args(args):
+    if isinstance(args, str):
+        return args
+
+    if isinstance(args, Iterable):
+        args_list = NetList[NetString]()
+        for arg in args:
+            assert isinstance(arg, str)
+            args_list.Add(NetString(arg))
+        return args_list
+
+    raise Exception("Unexpected argument type")
+
+# Creates a .Net text writer that passes command output in chunks to a file-like object (write), a generator (send) or a callable.
+# Chunks are passed synchronously, so a slow consumer suspends the command and memory use does not depend on the output size
+def to_output_writer(output, chunk_size: int = None):
+    if hasattr(output, 'write'):
+        on_chunk = output.write
+    elif inspect.isgenerator(output):
+        if inspect.getgeneratorstate(output) == inspect.GEN_CREATED:
+            next(output)
+        on_chunk = output.send
+    elif callable(output):
+        on_chunk = output
+    else:
+        raise Exception("Output should be a file-like object, a generator or a callable")
+
+    return ChunkTextWriter(NetAction[NetString](on_chunk), chunk_size if not chunk_size is None else ChunkTextWriter.DefaultChunkSize)
+
+# Executes a command and returns its result. If 'output' is specified, the command output is streamed to it (see to_output_writer)
+# and the result contains error messages only. Results of other commands are taken from report_cache when it is enabled
+def execute_command(args, readJournalFiles: bool = None, output = None, chunk_size: int = None) -> str:
+    return current_session().execute_command(args, readJournalFiles, output, chunk_size)
+
+# Executes a command and streams its output to a file-like object ('output'; sys.stdout by default)
+def print_command(args, readJournalFiles: bool = None, output = None, chunk_size: int = None) -> str:
+    if output is None:
+        output = sys.stdout
+
+    cmd_result = execute_command(args, readJournalFiles, output, chunk_size)
+
+    if (cmd_result.Error):
+        raise Exception(cmd_result.Error)
+
+    output.write('\n')
+
+from collections import namedtuple
+import queue
+
+from NLedger.Extensibility.Export import ReportRow as OriginReportRow
+from NLedger.Utils import CaughtSignalEnum
+from System.Collections.Generic import IList as NetIList
+
+# Row of a structured report. Amount and total are display_amount and display_total values; balance rows have no date and payee
+ReportRow = namedtuple('ReportRow', ['date', 'payee', 'account', 'amount', 'total'])
+
+REPORT_CHUNK_SIZE = SessionExtensions.DefaultReportRowChunkSize
+REPORT_QUEUE_SIZE = 2
+
+# Converts report arguments (a command and its arguments as a string or an iterable of strings) to a .Net list of strings
+def to_report_args(command: str, args = None):
+    assert isinstance(command, str)
+
+    if args is None or isinstance(args, str):
+        return CommandLine.PreprocessSingleQuotes(command if args is None else command + " " + args)
+
+    if isinstance(args, Iterable):
+        net_args = NetList[NetString]()
+        net_args.Add(NetString(command))
+        for arg in args:
+            assert isinstance(arg, str)
+            net_args.Add(NetString(arg))
+        return net_args
+
+    raise Exception("Unexpected argument type")
+
+def to_report_row(row) -> ReportRow:
+    return ReportRow(to_pdate(row.Date), row.Payee, row.Account, Value.to_value(row.Amount), Value.to_value(row.Total))
+
+# Runs a register or balance report and yields its rows (without text formatting) as the report produces them.
+# The report runs on a producer thread in a copy of the session context, so the global scope of the caller is not changed;
+# rows are passed in chunks through a queue of REPORT_QUEUE_SIZE chunks (the report waits while the consumer is behind).
+# The report keeps calculated data in journal items, so other commands should not run in the session until the iterator
+# is exhausted or closed; closing the iterator interrupts the report. Data file options (-f) are allowed only if readJournalFiles is set
+def iter_report(command: str, args = None, readJournalFiles: bool = False, chunk_size: int = REPORT_CHUNK_SIZE) -> Iterable:
+    net_args = to_report_args(command, args)
+
+    ssn = current_session()
+    with ssn.enter():
+        origin = ssn.origin
+    context = ssn.get_context().Clone()
+    chunks = queue.Queue(REPORT_QUEUE_SIZE)
+    is_closed = threading.Event()
+
+    def on_chunk(chunk):
+        if is_closed.is_set():
+            raise Exception("Report iterator is closed")
+        chunks.put(list(chunk))
+
+    # Errors are passed through the queue; None means the end of rows
+    def produce():
+        switcher = context.EnterCurrentThread()
+        try:
+            SessionExtensions.GetReportRows(origin, net_args, NetAction[NetIList[OriginReportRow]](on_chunk), chunk_size, readJournalFiles)
+            chunks.put(None)
+        except Exception as e:
+            # An interrupted or failed report leaves calculated data (xdata) in accounts and postings
+            origin.Journal.ClearXData()
+            if not is_closed.is_set():
+                chunks.put(e)
+        finally:
+            switcher.Dispose()
+
+    producer = threading.Thread(target=produce, name="ledger-report", daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            for row in chunk:
+                yield to_report_row(row)
+    finally:
+        is_closed.set()
+        context.CancellationSignal = CaughtSignalEnum.INTERRUPTED
+        # Releases the producer if it waits for a free place in the queue
+        while not chunks.empty():
+            chunks.get_nowait()
+        producer.join()
+
+# Runs a register or balance report and returns the list of its rows (see iter_report). Rows are collected on the calling thread
+# while the report scope is active
+def report(command: str, args = None, readJournalFiles: bool = False) -> List[ReportRow]:
+    net_args = to_report_args(command, args)
+    ssn = current_session()
+    with ssn.enter():
+        rows = SessionExtensions.GetReportRows(ssn.origin, net_args, readJournalFiles)
+    return [to_report_row(row) for row in rows]
+
+ANNOTATION_PRICE_CALCULATED = ExportedConsts.ANNOTATION_PRICE_CALCULATED
+ANNOTATION_PRICE_FIXATED = ExportedConsts.ANNOTATION_PRICE_FIXATED
+ANNOTATION_PRICE_NOT_PER_UNIT = ExportedConsts.ANNOTATION_PRICE_NOT_PER_UNIT
+ANNOTATION_DATE_CALCULATED = ExportedConsts.ANNOTATION_DATE_CALCULATED
+ANNOTATION_TAG_CALCULATED = ExportedConsts.ANNOTATION_TAG_CALCULATED
+ANNOTATION_VALUE_EXPR_CALCULATED = ExportedConsts.ANNOTATION_VALUE_EXPR_CALCULATED
+
+class Mask(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, val = None) -> None:
+        if val is None:
+            self.origin = OriginMask()
+        elif isinstance(val, OriginMask):
+            self.origin = val
+        else:
+            self.origin = OriginMask(val)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return Mask(origin) if not origin is None else None
+
+    def match(self, text: str) -> bool:
+        return self.origin.Match(text)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.origin.IsEmpty
+
+    def str(self) -> str:
+        return self.origin.Str()
+
+    __str__ = str
+
+class Config:
+
+    @property
+    def is_atty(self) -> bool:
+        return MainApplicationContext.Current.IsAtty
+
+    @is_atty.setter
+    def is_atty(self, val: bool):
+        MainApplicationContext.Current.IsAtty = val
+
+    def get_env(self, name: str) -> str:
+        return MainApplicationContext.Current.EnvironmentVariables[name] if MainApplicationContext.Current.EnvironmentVariables.ContainsKey(name) else None
+
+    def set_env(self, name: str, val: str):
+        MainApplicationContext.Current.EnvironmentVariables[name] = val
+
+config = Config()
+
+###########################
+# Ported from py_times.cc
+
+def parse_datetime(str: str) -> datetime:
+    return to_pdatetime(TimesCommon.Current.ParseDateTime(str))
+
+def parse_date(str: str) -> date:
+    return to_pdate(TimesCommon.Current.ParseDate(str))
+
+def times_initialize():
+    TimesCommon.Current.TimesInitialize()
+
+def times_shutdown():
+    TimesCommon.Current.TimesShutdown()
+
+###########################
+# Ported from py_expr.cc
+
+class Expr(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, val = None) -> None:
+        if val is None:
+            self.origin = OriginExpr()
+        elif isinstance(val, str):
+            self.origin = OriginExpr(val)
+        elif isinstance(val, OriginExpr):
+            self.origin = val
+        else:
+            raise Exception("Unexpected parameter type")
+
+    @classmethod
+    def from_origin(cls, origin) -> 'Expr':
+        return Expr(origin) if not origin is None else None
+
+    def __bool__(self) -> bool:
+        return not self.origin.IsEmpty
+
+    __nonzero__ = __bool__
+
+    def text(self) -> str:
+        return self.origin.Text
+
+    def set_text(self, val: str):
+        self.origin.Text = val
+
+    def __call__(self, scope: 'Scope' = None) -> 'Value':
+        if scope is None:
+            return Value.to_value(self.origin.Calc())
+        else:
+            assert isinstance(scope, Scope)
+            return Value.to_value(self.origin.Calc(scope.origin))
+
+    @property
+    def context(self) -> 'Scope':
+        return Scope.from_origin(self.origin.Context)
+
+    @context.setter
+    def context(self, scope: 'Scope'):
+        self.origin.Context = scope.origin if not scope is None else None
+
+    def compile(self, scope: 'Scope'):
+        assert isinstance(scope, Scope)
+        self.origin.Compile(scope.origin)
+
+    def is_constant(self) -> bool:
+        return self.origin.IsConstant
+
+###########################
+# Ported from py_amount.cc
+
+class ParseFlags(enum.IntFlag):     # ParseFlags enum
+    Default = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_DEFAULT)
+    Partial = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_PARTIAL)
+    Single = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_SINGLE)
+    NoMigrate = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_NO_MIGRATE)
+    NoReduce = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_NO_REDUCE)
+    NoAssign = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_NO_ASSIGN)
+    OpContext = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_OP_CONTEXT)
+    SoftFail = FlagsAdapter.EnumToInt(OriginAmountParseFlagsEnum.PARSE_SOFT_FAIL)
+
+class Amount(OriginKeeper):
+
+    __slots__ = ('owned',)
+
+    def __init__(self,value = None, origin = None) -> None:
+        self.owned = origin is None
+        if not (origin is None):
+            assert isinstance(origin, OriginAmount)
+            self.origin = origin
+        else:
+            if value is None:
+                self.origin = OriginAmount()
+            else:
+                self.origin = OriginAmount(value)
+
+    @classmethod
+    def from_origin(cls, origin) -> 'Amount':        
+        return Amount(None, origin) if not origin is None else None
+
+    @classmethod
+    def to_amount(cls, value) -> 'Amount':
+        if isinstance(value, Amount):
+            return value
+        if isinstance(value, Value):
+            return value.to_amount()
+        return Amount(value)
+
+    @classmethod
+    def exact(cls, value) -> 'Amount':
+        return Amount.from_origin(OriginAmount.Exact(value))
+
+    def __eq__(self, o: object) -> bool:
+        return OriginAmount.op_Equality(self.origin, Amount.to_amount(o).origin if not o is None else None)
+
+    def __ne__(self, o: object) -> bool:
+        return OriginAmount.op_Inequality(self.origin, Amount.to_amount(o).origin if not o is None else None)
+
+    def __lt__(self, o: object) -> bool:
+        return OriginAmount.op_LessThan(self.origin, Amount.to_amount(o).origin if not o is None else None)
+
+    def __le__(self, o: object) -> bool:
+        return OriginAmount.op_LessThanOrEqual(self.origin, Amount.to_amount(o).origin if not o is None else None)
+
+    def __gt__(self, o: object) -> bool:
+        return OriginAmount.op_GreaterThan(self.origin, Amount.to_amount(o).origin if not o is None else None)
+
+    def __ge__(self, o: object) -> bool:
+        return OriginAmount.op_GreaterThanOrEqual(self.origin, Amount.to_amount(o).origin if not o is None else None)
+
+    def __neg__(self) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_UnaryNegation(self.origin))
+
+    def __bool__(self) -> bool:
+        return self.origin.IsNonZero
+
+    def __add__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Addition(self.origin, Amount.to_amount(o).origin))
+
+    def __radd__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Addition(Amount.to_amount(o).origin, self.origin))
+
+    def __sub__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Subtraction(self.origin, Amount.to_amount(o).origin))
+
+    def __rsub__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Subtraction(Amount.to_amount(o).origin, self.origin))
+
+    def __mul__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Multiply(self.origin, Amount.to_amount(o).origin))
+
+    def __rmul__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Multiply(Amount.to_amount(o).origin, self.origin))
+
+    def __truediv__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Division(self.origin, Amount.to_amount(o).origin))
+
+    def __rtruediv__(self, o: object) -> 'Amount':
+        return Amount.from_origin(OriginAmount.op_Division(Amount.to_amount(o).origin, self.origin))
+
+    # In-place operators change this amount if the wrapper owns its origin (it was created by the constructor or copy()).
+    # Wrappers of existing objects (e.g. Posting.amount) are copied first, so that += does not change the journal
+
+    def __iadd__(self, o: object) -> 'Amount':
+        target = self if self.owned else self.copy()
+        target.origin.InPlaceAdd(Amount.to_amount(o).origin)
+        return target
+
+    def __isub__(self, o: object) -> 'Amount':
+        target = self if self.owned else self.copy()
+        target.origin.InPlaceSubtract(Amount.to_amount(o).origin)
+        return target
+
+    def __imul__(self, o: object) -> 'Amount':
+        target = self if self.owned else self.copy()
+        target.origin.Multiply(Amount.to_amount(o).origin)
+        return target
+
+    def __itruediv__(self, o: object) -> 'Amount':
+        target = self if self.owned else self.copy()
+        target.origin.InPlaceDivide(Amount.to_amount(o).origin)
+        return target
+
+    def copy(self) -> 'Amount':
+        amount = Amount.from_origin(OriginAmount(self.origin))
+        amount.owned = True
+        return amount
+
+    __copy__ = copy
+
+    @property
+    def precision(self) -> int:
+        return self.origin.Precision
+
+    @property
+    def display_precision(self) -> int:
+        return self.origin.DisplayPrecision
+
+    @property
+    def keep_precision(self) -> bool:
+        return self.origin.KeepPrecision
+
+    @keep_precision.setter
+    def keep_precision(self, value: bool):
+        return self.origin.SetKeepPrecision(value)
+
+    def negated(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Negated())
+
+    def in_place_negate(self) -> 'Amount':
+        self.origin.InPlaceNegate()
+        return self
+
+    def abs(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Abs())
+
+    __abs__ = abs
+
+    def inverted(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Inverted())
+
+    def rounded(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Rounded())
+
+    def in_place_round(self) -> 'Amount':
+        self.origin.InPlaceRound()
+        return self
+
+    def truncated(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Truncated())
+
+    def in_place_truncate(self) -> 'Amount':
+        self.origin.InPlaceTruncate()
+        return self
+
+    def floored(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Floored())
+
+    def in_place_floor(self) -> 'Amount':
+        self.origin.InPlaceFloor()
+        return self
+
+    def unrounded(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Unrounded())
+
+    def in_place_unround(self) -> 'Amount':
+        self.origin.InPlaceUnround()
+        return self
+
+    def reduced(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Reduced())
+
+    def in_place_reduce(self) -> 'Amount':
+        self.origin.InPlaceReduce()
+        return self
+
+    def unreduced(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Unreduced())
+
+    def in_place_unreduce(self) -> 'Amount':
+        self.origin.InPlaceUnreduce()
+        return self
+
+    def value(self, in_terms_of: 'Commodity' = None, moment = None) -> 'Amount':
+        if in_terms_of is None:
+            assert moment is None
+            return Amount.from_origin(self.origin.Value(TimesCommon.Current.CurrentTime))
+        else:
+            assert isinstance(in_terms_of, Commodity)
+            if moment is None:
+                return Amount.from_origin(self.origin.Value(TimesCommon.Current.CurrentTime, in_terms_of.origin))
+            elif isinstance(moment, datetime):
+                return Amount.from_origin(self.origin.Value(to_ndatetime(moment), in_terms_of.origin))
+            elif isinstance(moment, date):
+                return Amount.from_origin(self.origin.Value(to_ndatetime(moment), in_terms_of.origin))
+            else:
+                raise Exception("Unexpected argument type: moment")
+
+    def price(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Price)
+
+    def sign(self) -> int:
+        return self.origin.Sign
+
+    def is_nonzero(self) -> bool:
+        return self.origin.IsNonZero
+
+    __nonzero__ = is_nonzero
+
+    def is_zero(self) -> bool:
+        return self.origin.IsZero
+
+    def is_realzero(self) -> bool:
+        return self.origin.IsRealZero
+
+    def is_null(self) -> bool:
+        return OriginAmount.IsNullOrEmpty(self.origin)
+
+    def to_double(self) -> float:
+        return self.origin.ToDouble()
+
+    __float__ = to_double
+
+    def to_long(self) -> int:
+        return self.origin.ToLong()
+
+    __int__ = to_long
+
+    def fits_in_long(self) -> bool:
+        return self.origin.FitsInLong
+
+    def to_string(self) -> str:
+        return self.origin.ToString()
+
+    __str__ =  to_string
+
+    def to_fullstring(self) -> str:
+        return self.origin.ToFullString()
+
+    __repr__ = to_fullstring
+
+    def quantity_string(self) -> str:
+        return self.origin.QuantityString()
+
+    @property
+    def commodity(self) -> 'Commodity':
+        return Commodity.from_origin(self.origin.Commodity)
+
+    @commodity.setter
+    def commodity(self, value: 'Commodity'):
+        self.origin.Commodity = value.origin if not value is None else None
+
+    def has_commodity(self) -> bool:
+        return self.origin.HasCommodity
+
+    def with_commodity(self, comm: 'Commodity') -> 'Amount':
+        return Amount.from_origin(self.origin.WithCommodity(comm.origin)) if not comm is None else Amount.from_origin(self.origin.WithCommodity(None))
+
+    def clear_commodity(self):
+        return self.origin.ClearCommodity()
+
+    def number(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Number())
+
+    def annotate(self, details: 'Annotation'):
+        assert isinstance(details, Annotation)
+        self.origin.Annotate(details.origin)
+
+    def has_annotation(self) -> bool:
+        return self.origin.HasAnnotation
+
+    @property
+    def annotation(self) -> 'Annotation':
+        return Annotation.from_origin(self.origin.Annotation)
+
+    def strip_annotations(self, what_to_keep: 'KeepDetails' = None) -> 'Amount':
+        if what_to_keep is None:
+            return Amount.from_origin(self.origin.StripAnnotations(OriginAnnotationKeepDetails()))
+        else:
+            assert isinstance(what_to_keep, KeepDetails)
+            return Amount.from_origin(self.origin.StripAnnotations(what_to_keep.origin))
+
+    def parse(self, s: str, flags: 'ParseFlags' = None):
+        if flags is None:
+            self.origin.ParseString(s)
+        else:
+            assert isinstance(flags, ParseFlags)
+            self.origin.ParseString(s, NetEnum.ToObject(OriginAmountParseFlagsEnum, flags.value))
+
+    @classmethod
+    def parse_conversion(cls, larger_str: str, smaller_str: str):
+        return OriginAmount.ParseConversion(larger_str, smaller_str)
+
+    def valid(self) -> bool:
+        return self.origin.Valid()
+
+###########################
+# Ported from py_balance.cc
+
+class Balance(OriginKeeper):
+
+    __slots__ = ('owned',)
+
+    def __init__(self, val = None) -> None:
+        self.owned = not isinstance(val, OriginBalance)
+        if val is None:
+            self.origin = OriginBalance()
+        elif isinstance(val, OriginBalance):
+            self.origin = val
+        elif isinstance(val, Amount) or isinstance(val, Balance):
+            self.origin = OriginBalance(val.origin)
+        elif isinstance(val, str) or isinstance(val, int) or isinstance(val, float):
+            self.origin = OriginBalance(val)
+        else:
+            raise Exception("Unexpected argument type")
+
+    @classmethod
+    def from_origin(cls, origin) -> 'Balance':
+        return Balance(origin) if not origin is None else None
+
+    def __add__(self, o: object) -> 'Balance':
+        if isinstance(o, Amount) or isinstance(o, Balance):
+            return Balance.from_origin(OriginBalance.op_Addition(OriginBalance(self.origin), o.origin))
+        elif isinstance(o, int) or isinstance(o, float):
+            return Balance.from_origin(OriginBalance.op_Addition(OriginBalance(self.origin), Amount.to_amount(o).origin))
+        else:
+            raise Exception("Unexpected argument type")
+
+    def __sub__(self, o: object) -> 'Balance':    
+        if isinstance(o, Amount) or isinstance(o, Balance):
+            return Balance.from_origin(OriginBalance.op_Subtraction(OriginBalance(self.origin), o.origin))
+        elif isinstance(o, int) or isinstance(o, float):
+            return Balance.from_origin(OriginBalance.op_Subtraction(OriginBalance(self.origin), Amount.to_amount(o).origin))
+        else:
+            raise Exception("Unexpected argument type")
+
+    def __mul__(self, o: object) -> 'Balance':
+        if isinstance(o, Amount):
+            return Balance.from_origin(OriginBalance.op_Multiply(OriginBalance(self.origin), o.origin))
+        elif isinstance(o, int) or isinstance(o, float):
+            return Balance.from_origin(OriginBalance.op_Multiply(OriginBalance(self.origin), Amount.to_amount(o).origin))
+        else:
+            raise Exception("Unexpected argument type")
+
+    def __truediv__ (self, o: object) -> 'Balance':
+        if isinstance(o, Amount):
+            return Balance.from_origin(OriginBalance.op_Division(OriginBalance(self.origin), o.origin))
+        elif isinstance(o, int) or isinstance(o, float):
+            return Balance.from_origin(OriginBalance.op_Division(OriginBalance(self.origin), Amount.to_amount(o).origin))
+        else:
+            raise Exception("Unexpected argument type")
+
+    # In-place operators change this balance if the wrapper owns its origin (it was created by the constructor or copy()).
+    # Wrappers of existing objects (e.g. PostingXData.total) are copied first, so that += does not change the journal
+
+    def __iadd__(self, o: object) -> 'Balance':
+        target = self if self.owned else self.copy()
+        if isinstance(o, Amount) or isinstance(o, Balance):
+            target.origin.Add(o.origin if not o is target else OriginBalance(o.origin))
+        elif isinstance(o, int) or isinstance(o, float):
+            target.origin.Add(Amount.to_amount(o).origin)
+        else:
+            raise Exception("Unexpected argument type")
+        return target
+
+    def __isub__(self, o: object) -> 'Balance':
+        target = self if self.owned else self.copy()
+        if isinstance(o, Amount) or isinstance(o, Balance):
+            target.origin.Subtract(o.origin if not o is target else OriginBalance(o.origin))
+        elif isinstance(o, int) or isinstance(o, float):
+            target.origin.Subtract(Amount.to_amount(o).origin)
+        else:
+            raise Exception("Unexpected argument type")
+        return target
+
+    def __imul__(self, o: object) -> 'Balance':
+        target = self if self.owned else self.copy()
+        if isinstance(o, Amount):
+            target.origin.Multiply(o.origin)
+        elif isinstance(o, int) or isinstance(o, float):
+            target.origin.Multiply(Amount.to_amount(o).origin)
+        else:
+            raise Exception("Unexpected argument type")
+        return target
+
+    def __itruediv__(self, o: object) -> 'Balance':
+        target = self if self.owned else self.copy()
+        if isinstance(o, Amount):
+            target.origin.Divide(o.origin)
+        elif isinstance(o, int) or isinstance(o, float):
+            target.origin.Divide(Amount.to_amount(o).origin)
+        else:
+            raise Exception("Unexpected argument type")
+        return target
+
+    def copy(self) -> 'Balance':
+        return Balance(self)
+
+    __copy__ = copy
+
+    def __neg__(self) -> 'Balance':
+        return Balance.from_origin(OriginBalance.op_UnaryNegation(self.origin))
+
+    def __eq__(self, o: object) -> bool:
+        if isinstance(o, Value):
+            return o.__eq__(self)
+        if isinstance(o, Amount) or isinstance(o, Balance):
+            return OriginBalance.op_Equality(self.origin, o.origin)
+        elif isinstance(o, int) or isinstance(o, float):
+            return OriginBalance.op_Equality(self.origin, Amount.to_amount(o).origin)
+        else:
+            raise Exception("Unexpected argument type")
+
+    def __ne__(self, o: object) -> bool:
+        if isinstance(o, Value):
+            return o.__ne__(self)
+        if isinstance(o, Amount) or isinstance(o, Balance):
+            return OriginBalance.op_Inequality(self.origin, o.origin)
+        elif isinstance(o, int) or isinstance(o, float):
+            return OriginBalance.op_Inequality(self.origin, Amount.to_amount(o).origin)
+        else:
+            raise Exception("Unexpected argument type")
+
+    def __bool__(self) -> bool:
+        return OriginBalance.op_Explicit(self.origin)
+
+    def to_string(self) -> str:
+        return self.origin.Print()
+
+    __str__ = to_string
+
+    def negated(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Negated())
+
+    def abs(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Abs())
+
+    __abs__ = abs
+
+    def __len__(self) -> int:
+        return NetListAdapter.GetAmounts(self.origin).Count
+
+    def __getitem__(self, row: int) -> 'Amount':
+        return Amount.from_origin(NetListAdapter.GetAmounts(self.origin)[row])
+
+    def __iter__(self):
+        return iter(AmountList(NetListAdapter.GetAmounts(self.origin)))
+
+    def in_place_negate(self):
+        self.origin.InPlaceNegate()
+
+    def rounded(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Rounded())
+
+    def in_place_round(self):
+        self.origin.InPlaceRound()
+
+    def truncated(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Truncated())
+
+    def in_place_truncate(self):
+        self.origin.InPlaceTruncate()
+
+    def floored(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Floored())
+
+    def in_place_floor(self):
+        self.origin.InPlaceFloor()
+
+    def unrounded(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Unrounded())
+
+    def in_place_unround(self):
+        self.origin.InPlaceUnround()
+
+    def reduced(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Reduced())
+
+    def in_place_reduce(self):
+        self.origin.InPlaceReduce()
+
+    def unreduced(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Unreduced())
+
+    def in_place_unreduce(self):
+        self.origin.InPlaceUnreduce()
+
+    def value(self, in_terms_of: 'Commodity' = None, moment = None) -> 'Balance':
+        if moment is None and in_terms_of is None:
+            return Balance.from_origin(self.origin.Value(TimesCommon.Current.CurrentTime))
+        elif moment is None:
+            assert isinstance(in_terms_of, Commodity)
+            return Balance.from_origin(self.origin.Value(TimesCommon.Current.CurrentTime, in_terms_of.origin))
+        elif isinstance(moment, date) or isinstance(moment, datetime):
+            assert isinstance(in_terms_of, Commodity)
+            return Balance.from_origin(self.origin.Value(to_ndatetime(moment), in_terms_of.origin))
+        else:
+            raise Exception("Unexpected argument type")
+
+    def is_nonzero(self) -> bool:
+        return self.origin.IsNonZero
+
+    __nonzero__ = is_nonzero
+
+    def is_zero(self) -> bool:
+        return self.origin.IsZero
+
+    def is_realzero(self) -> bool:
+        return self.origin.IsRealZero
+
+    def is_empty(self) -> bool:
+        return self.origin.IsEmpty
+
+    def single_amount(self) -> 'Amount':
+        return Amount.from_origin(self.origin.SingleAmount)
+
+    def to_amount(self) -> 'Amount':
+        return Amount.from_origin(self.origin.ToAmount())
+
+    def commodity_count(self) -> int:
+        return self.origin.CommodityCount
+
+    def commodity_amount(self, commodity: 'Commodity' = None) -> 'Amount':
+        if commodity is None:
+            return Amount.from_origin(self.origin.CommodityAmount())
+        else:
+            assert isinstance(commodity, Commodity)
+            return Amount.from_origin(self.origin.CommodityAmount(commodity.origin))
+
+    def number(self) -> 'Balance':
+        return Balance.from_origin(self.origin.Number())
+
+    def strip_annotations(self, keep: 'KeepDetails' = None) -> 'Balance':
+        if keep is None:
+            return Balance.from_origin(self.origin.StripAnnotations(OriginAnnotationKeepDetails()))
+        else:
+            assert isinstance(keep, KeepDetails)
+            return Balance.from_origin(self.origin.StripAnnotations(keep.origin))
+
+    def valid(self) -> bool:
+        return self.origin.Valid()
+
+###########################
+# Ported from py_commodity.cc
+
+class CommodityPool(ContextOriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if not origin is None:
+            assert isinstance(origin, OriginCommodityPool)
+        self.origin = origin
+
+    def get_origin(self):
+        return OriginCommodityPool.Current
+
+    @property
+    def null_commodity(self):
+        return Commodity.from_origin(self.origin.NullCommodity)
+
+    @property
+    def default_commodity(self):
+        return Commodity.from_origin(self.origin.DefaultCommodity)
+
+    @default_commodity.setter
+    def set_default_commodity(self, value):
+        self.origin.DefaultCommodity = value
+
+    @property
+    def keep_base(self):
+        return self.origin.KeepBase
+
+    @keep_base.setter
+    def keep_base(self, value):
+        self.origin.KeepBase = value
+
+    @property
+    def price_db(self):
+        return self.origin.PriceDb
+
+    @price_db.setter
+    def price_db(self, value):
+        self.origin.PriceDb = value
+
+    @property
+    def quote_leeway(self):
+        return self.origin.QuoteLeeway
+
+    @quote_leeway.setter
+    def quote_leeway(self, value):
+        self.origin.QuoteLeeway = value
+
+    @property
+    def get_quotes(self):
+        return self.origin.GetQuotes
+
+    @get_quotes.setter
+    def get_quotes(self, value):
+        self.origin.GetQuotes = value
+
+    def create(self, symbol: str, details: 'Annotation' = None):
+        assert details is None or isinstance(details, Annotation)
+        return Commodity.from_origin(self.origin.Create(symbol) if details is None else self.origin.Create(symbol, details.origin))
+
+    def find_or_create(self, symbol: str, details = None):
+        assert details is None or isinstance(details, Annotation)
+        return Commodity.from_origin(self.origin.FindOrCreate(symbol) if details is None else self.origin.FindOrCreate(symbol, details.origin))
+
+    def find(self, symbol: str, details = None):
+        assert details is None or isinstance(details, Annotation)
+        return Commodity.from_origin(self.origin.Find(symbol) if details is None else self.origin.Find(symbol, details.origin))
+
+    # Allowed arguments for 'exchange' method: 
+    # exchange(commodity: Commodity, per_unit_cost: Amount)
+    # exchange(commodity: Commodity, per_unit_cost: Amount, moment: datetime)
+    # exchange(amount: Amount, cost: Amount, is_per_unit: bool, add_prices: bool, moment: datetime = None, tag: str = None)
+    def exchange(self,*args):
+        if len(args) == 2:
+            assert isinstance(args[0], Commodity)
+            assert isinstance(args[1], Amount)
+            self.origin.Exchange(args[0].origin, args[1].origin, TimesCommon.Current.CurrentTime)
+        elif len(args) == 3:
+            assert isinstance(args[0], Commodity)
+            assert isinstance(args[1], Amount)
+            assert isinstance(args[2], datetime) or isinstance(args[2], date)
+            self.origin.Exchange(args[0].origin, args[1].origin, to_ndatetime(args[2]))
+        elif len(args) >= 4 and len(args) <= 6:
+            assert isinstance(args[0], Amount)
+            assert isinstance(args[1], Amount)
+            assert isinstance(args[2], bool)
+            assert isinstance(args[3], bool)
+            assert len(args) < 5 or (isinstance(args[4], datetime) or isinstance(args[4], date))
+            assert len(args) < 6 or isinstance(args[5], str)
+            self.origin.Exchange(args[0].origin, args[1].origin, args[2], args[3], to_ndatetime(args[4]) if len(args) >= 5 else None, args[5] if len(args) == 6 else None)
+        else:
+            raise Exception("Unexpected number of 'exchange' arguments (allowed from 2 to 6")
+
+    def parse_price_directive(self, line: str, do_not_add_price: bool = False, no_date: bool = False):
+        pair = self.origin.ParsePriceDirective(line, do_not_add_price, no_date)
+        return (Commodity.from_origin(pair.Item1), PricePoint.from_origin(pair.Item2)) if not pair is None else None
+
+    def parse_price_expression(self, line: str, add_price: bool = True, moment: datetime = None):
+        return Commodity.from_origin(self.origin.ParsePriceExpression(line, add_price, to_ndatetime(moment)))
+
+    def __getitem__(self, symbol):
+        comm = Commodity.from_origin(self.origin.Find(symbol))
+        if comm is None:
+            raise ValueError("Could not find commodity " + str(symbol))
+        return comm
+
+    def keys(self):
+        return list(self.origin.Commodities.Keys)
+
+    def has_key(self, symbol:str) -> bool:
+        return not self.origin.Find(symbol) is None
+
+    __contains__ = has_key
+
+    def values(self):
+        return [Commodity.from_origin(comm) for comm in self.origin.Commodities.Values]
+
+    def items(self):
+        return [(kv.Key, Commodity.from_origin(kv.Value)) for kv in self.origin.Commodities]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+commodities = CommodityPool()
+
+COMMODITY_STYLE_DEFAULTS = ExportedConsts.COMMODITY_STYLE_DEFAULTS
+COMMODITY_STYLE_SUFFIXED = ExportedConsts.COMMODITY_STYLE_SUFFIXED
+COMMODITY_STYLE_SEPARATED = ExportedConsts.COMMODITY_STYLE_SEPARATED
+COMMODITY_STYLE_DECIMAL_COMMA = ExportedConsts.COMMODITY_STYLE_DECIMAL_COMMA
+COMMODITY_STYLE_TIME_COLON = ExportedConsts.COMMODITY_STYLE_TIME_COLON
+COMMODITY_STYLE_THOUSANDS = ExportedConsts.COMMODITY_STYLE_THOUSANDS
+COMMODITY_NOMARKET = ExportedConsts.COMMODITY_NOMARKET
+COMMODITY_BUILTIN = ExportedConsts.COMMODITY_BUILTIN
+COMMODITY_WALKED = ExportedConsts.COMMODITY_WALKED
+COMMODITY_KNOWN = ExportedConsts.COMMODITY_KNOWN
+COMMODITY_PRIMARY = ExportedConsts.COMMODITY_PRIMARY
+
+class Commodity(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self,origin) -> None:
+        assert isinstance(origin, OriginCommodity)
+        self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin) -> 'Commodity':
+        if origin is None:
+            return None
+
+        if isinstance(origin, OriginAnnotatedCommodity):
+            return wrapper_cache.get(origin, AnnotatedCommodity)
+
+        return wrapper_cache.get(origin, Commodity)
+
+    @classproperty
+    def decimal_comma_by_default(cls) -> bool:
+        return OriginCommodity.Defaults.DecimalCommaByDefault
+
+    @decimal_comma_by_default.setter
+    def decimal_comma_by_default(cls, value: bool):
+        OriginCommodity.Defaults.DecimalCommaByDefault = value
+
+    def __eq__(self, o: object) -> bool:
+        return self.origin.Equals(o.origin if isinstance(o, Commodity) else o)
+
+    def __ne__(self, o: object) -> bool:
+        return not self.origin.Equals(o.origin if isinstance(o, Commodity) else o)
+
+    @property
+    def flags(self) -> int:
+        return FlagsAdapter.EnumToInt(self.origin.Flags)
+
+    @flags.setter
+    def flags(self, value:int):
+        self.origin.Flags = CommodityFlagsEnum(value) if not is_pythonnet_2 else value
+
+    def has_flags(self, value:int) -> bool:
+        return (self.flags & value) == value
+
+    def clear_flags(self):
+        self.flags = 0
+
+    def add_flags(self, value:int):
+        self.flags |= value
+
+    def drop_flags(self, value:int):
+        self.flags &= ~value
+
+    def __str__(self) -> str:
+        return self.origin.Symbol
+
+    def __bool__(self) -> bool:
+        return not self.origin.Equals(OriginCommodityPool.Current.NullCommodity)
+
+    __nonzero__ = __bool__
+
+    @staticmethod
+    def symbol_needs_quotes(symbol: str) -> bool:
+        return OriginCommodity.SymbolNeedsQuotes(symbol)
+
+    @property
+    def referent(self) -> 'Commodity':
+        return Commodity.from_origin(self.origin.Referent)
+
+    def has_annotation(self) -> bool:
+        return self.origin.IsAnnotated
+
+    def strip_annotations(self, keep: 'KeepDetails' = None) -> 'Commodity':
+        return Commodity.from_origin(self.origin.StripAnnotations(keep.origin if not keep is None else KeepDetails().origin))
+
+    def write_annotations(self) -> str:
+        return self.origin.WriteAnnotations()
+
+    def pool(self) -> CommodityPool:
+        return CommodityPool(self.origin.Pool)
+
+    @property
+    def base_symbol(self) -> str:
+        return self.origin.BaseSymbol
+
+    @property
+    def symbol(self) -> str:
+        return self.origin.Symbol
+
+    @property
+    def name(self) -> str:
+        return self.origin.Name
+
+    @name.setter
+    def name(self, value: str):
+        self.origin.SetName(value)
+
+    @property
+    def note(self) -> str:
+        return self.origin.Note
+
+    @note.setter
+    def note(self, value: str):
+        self.origin.SetNote(value)
+
+    @property
+    def precision(self) -> int:
+        return self.origin.Precision
+
+    @precision.setter
+    def precision(self, value: int):
+        self.origin.Precision = value
+
+    @property
+    def smaller(self) -> Amount:
+        return Amount.from_origin(self.origin.Smaller)
+
+    @smaller.setter
+    def smaller(self, value: Amount):
+        self.origin.Smaller = value.origin if not value is None else None
+
+    @property
+    def larger(self) -> Amount:
+        return Amount.from_origin(self.origin.Larger)
+
+    @larger.setter
+    def larger(self, value: Amount):
+        self.origin.Larger = value.origin if not value is None else None
+
+    def add_price(self, date, price: Amount, reflexive: bool = None):
+        if (reflexive is None):
+            self.origin.AddPrice(to_ndatetime(date), price.origin)
+        else:
+            self.origin.AddPrice(to_ndatetime(date), price.origin, reflexive)
+
+    def remove_price(self, date, commodity: 'Commodity'):
+        self.origin.RemovePrice(to_ndatetime(date), commodity.origin)
+
+    def find_price(self, commodity: 'Commodity' = None, moment = None, oldest = None) -> 'PricePoint':
+        PricePoint.from_origin(self.origin.FindPrice(commodity.origin if not commodity is None else None, to_ndatetime(moment) if not moment is None else DateTime.MinValue, to_ndatetime(oldest) if not oldest is None else DateTime.MinValue))
+
+    def check_for_updated_price(self, point: 'PricePoint' = None, moment = None, inTermsOf: 'Commodity' = None) -> 'PricePoint':
+        PricePoint.from_origin(self.origin.CheckForUpdatedPrice(point.origin if not point is None else None, to_ndatetime(moment) if not moment is None else DateTime.MinValue, inTermsOf.origin if not inTermsOf is None else None))
+
+    def valid(self):
+        self.origin.Valid()
+
+class Annotation(OriginKeeper):
+
+    __slots__ = ()
+
+    flags_adapter = FlagsAdapter.AnnotationFlagsAdapter()
+
+    def __init__(self,origin=None) -> None:
+        if origin is None:
+            self.origin = OriginAnnotation()
+        else:
+            assert isinstance(origin, OriginAnnotation)
+            self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin) -> 'Annotation':
+        return Annotation(origin=origin) if not origin is None else None
+
+    def __eq__(self, o: object) -> bool:
+        return self.origin.Equals(o.origin)
+
+    def __ne__(self, o: object) -> bool:
+        return not self.origin.Equals(o.origin)
+
+    def __bool__(self) -> bool:
+        return not OriginAnnotation.IsNullOrEmpty(self.origin)
+
+    __nonzero__ = __bool__
+
+    @property
+    def flags(self):
+        return self.flags_adapter.GetFlags(self.origin)
+
+    @flags.setter
+    def flags(self,value):
+        return self.flags_adapter.SetFlags(self.origin, value)
+
+    def has_flags(self,flag):
+        return self.flags_adapter.HasFlags(self.origin, flag)
+
+    def clear_flags(self):
+        return self.flags_adapter.ClearFlags(self.origin)
+
+    def add_flags(self,flag):
+        return self.flags_adapter.AddFlags(self.origin,flag)
+
+    def drop_flags(self,flag):
+        return self.flags_adapter.DropFlags(self.origin,flag)
+
+    @property
+    def price(self) -> Amount:
+        return Amount.from_origin(self.origin.Price)
+
+    @price.setter
+    def price(self, value: Amount):
+        self.origin.Price = value.origin if not value is None else None
+
+    @property
+    def date(self):
+        return to_pdate(self.origin.Date)
+
+    @date.setter
+    def date(self,value):
+        self.origin.Date = to_ndate(value)
+
+    @property
+    def tag(self):
+        return self.origin.Tag
+
+    @tag.setter
+    def tag(self,value):
+        self.origin.Tag = value
+
+    def valid(self) -> bool:
+        return True # valid() is not implemented in NLedger's annotation
+
+class KeepDetails(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, keepPrice = False, keepDate = False, keepTag = False, onlyActuals = False, origin = None) -> None:
+
+        if not(origin is None):
+            assert isinstance(origin, OriginAnnotationKeepDetails)
+            self.origin = origin
+        else:
+            self.origin = OriginAnnotationKeepDetails(keepPrice, keepDate, keepTag, onlyActuals)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return KeepDetails(origin=origin) if not origin is None else None
+
+    @property
+    def keep_price(self) -> bool:
+        return self.origin.KeepPrice
+
+    @keep_price.setter
+    def keep_price(self,value):
+        self.origin.KeepPrice = value
+
+    @property
+    def keep_date(self) -> bool:
+        return self.origin.KeepDate
+
+    @keep_date.setter
+    def keep_date(self,value):
+        self.origin.KeepDate = value
+
+    @property
+    def keep_tag(self) -> bool:
+        return self.origin.KeepTag
+
+    @keep_tag.setter
+    def keep_tag(self,value):
+        self.origin.KeepTag = value
+
+    @property
+    def only_actuals(self) -> bool:
+        return self.origin.OnlyActuals
+
+    @only_actuals.setter
+    def only_actuals(self,value):
+        self.origin.OnlyActuals = value
+
+    def keep_all(self, comm = None):
+        return self.origin.KeepAll() if comm is None else self.origin.KeepAll(comm.origin)
+
+    def keep_any(self, comm = None):
+        return self.origin.KeepAny() if comm is None else self.origin.KeepAny(comm.origin)
+
+class PricePoint(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, when, price, origin = None) -> None:
+
+        if not(origin is None):
+            assert isinstance(origin, OriginPricePoint)
+            self.origin = origin
+        else:
+            assert price is None or isinstance(price, Amount)
+            self.origin = OriginPricePoint(to_ndatetime(when), price.origin if not price is None else None)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return PricePoint(None, None, origin) if not origin is None else None
+
+    def __eq__(self, o: object) -> bool:
+        return self.origin.Equals(o.origin if isinstance(o, PricePoint) else o)
+
+    def __ne__(self, o: object) -> bool:
+        return not self.origin.Equals(o.origin if isinstance(o, PricePoint) else o)
+
+    @property
+    def when(self) -> datetime:
+        return to_pdatetime(self.origin.When)
+
+    @when.setter
+    def when(self,value):
+        self.origin.When = to_ndatetime(value)
+
+    @property
+    def price(self) -> Amount:
+        return Amount.from_origin(self.origin.Price)
+
+    @price.setter
+    def price(self, value: Amount):
+        assert value is None or isinstance(value, Amount)
+        self.origin.Price = value.origin if not value is None else None
+
+class AnnotatedCommodity(Commodity):
+
+    __slots__ = ()
+
+    def __init__(self,origin) -> None:
+        assert isinstance(origin, OriginAnnotatedCommodity)
+        self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin) -> 'AnnotatedCommodity':
+        return wrapper_cache.get(origin, AnnotatedCommodity) if not origin is None else None
+
+    @property
+    def details(self) -> Annotation:
+        return Annotation.from_origin(self.origin.Details)
+
+    @details.setter
+    def details(self, value: Annotation) -> Annotation:
+        return self.origin.SetDetails(value.origin)
+
+###########################
+# Ported from py_account.cc
+
+ACCOUNT_EXT_SORT_CALC = ExportedConsts.ACCOUNT_EXT_SORT_CALC
+ACCOUNT_EXT_HAS_NON_VIRTUALS = ExportedConsts.ACCOUNT_EXT_HAS_NON_VIRTUALS
+ACCOUNT_EXT_HAS_UNB_VIRTUALS = ExportedConsts.ACCOUNT_EXT_HAS_UNB_VIRTUALS
+ACCOUNT_EXT_AUTO_VIRTUALIZE = ExportedConsts.ACCOUNT_EXT_AUTO_VIRTUALIZE
+ACCOUNT_EXT_VISITED = ExportedConsts.ACCOUNT_EXT_VISITED
+ACCOUNT_EXT_MATCHING = ExportedConsts.ACCOUNT_EXT_MATCHING
+ACCOUNT_EXT_TO_DISPLAY = ExportedConsts.ACCOUNT_EXT_TO_DISPLAY
+ACCOUNT_EXT_DISPLAYED = ExportedConsts.ACCOUNT_EXT_DISPLAYED
+
+class AccountXDataDetails(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if not(origin is None):
+            assert isinstance(origin, OriginAccountXDataDetails)
+            self.origin = origin
+        else:
+            self.origin = OriginAccountXDataDetails()
+
+    @classmethod
+    def from_origin(cls, origin):
+        return AccountXDataDetails(origin=origin) if not origin is None else None
+
+    @property
+    def total(self) -> 'Value':
+        return Value.to_value(self.origin.Total)
+
+    @property
+    def real_total(self) -> 'Value':
+        return Value.to_value(self.origin.RealTotal)
+
+    @property
+    def calculated(self) -> bool:
+        return self.origin.Calculated
+
+    @property
+    def gathered(self) -> bool:
+        return self.origin.Gathered
+
+    @property
+    def posts_count(self) -> int:
+        return self.origin.PostsCount
+
+    @property
+    def posts_virtuals_count(self) -> int:
+        return self.origin.PostsVirtualsCount
+
+    @property
+    def posts_cleared_count(self) -> int:
+        return self.origin.PostsClearedCount
+
+    @property
+    def posts_last_7_count(self) -> int:
+        return self.origin.PostsLast7Count
+
+    @property
+    def posts_last_30_count(self) -> int:
+        return self.origin.PostsLast30Count
+
+    @property
+    def posts_this_month_count(self) -> int:
+        return self.origin.PostsThisMountCount
+
+    @property
+    def earliest_post(self) -> date:
+        return to_pdate(self.origin.EarliestPost)
+
+    @property
+    def earliest_cleared_post(self) -> date:
+        return to_pdate(self.origin.EarliestClearedPost)
+
+    @property
+    def latest_post(self) -> date:
+        return to_pdate(self.origin.LatestPost)
+
+    @property
+    def latest_cleared_post(self) -> date:
+        return to_pdate(self.origin.LatestClearedPost)
+
+    @property
+    def filenames(self) -> Iterable:
+        return list(self.origin.Filenames)
+
+    @property
+    def accounts_referenced(self) -> Iterable:
+        return list(self.origin.AccountsReferenced)
+
+    @property
+    def payees_referenced(self) -> Iterable:
+        return list(self.origin.PayeesReferenced)
+
+    def __iadd__(self, o: object) -> 'Value':
+        assert isinstance(o, AccountXDataDetails)
+        self.origin.Add(o.origin)
+        return self
+
+    def update(self, post: 'Posting', gather_all: bool = None):
+        if gather_all is None:
+            self.origin.Update(post.origin)
+        else:
+            self.origin.Update(post.origin, gather_all)
+
+class AccountXData(OriginKeeper):
+
+    __slots__ = ()
+
+    flags_adapter = FlagsAdapter.AccountXDataFlagsAdapter()
+
+    def __init__(self, origin = None) -> None:
+        if not(origin is None):
+            assert isinstance(origin, OriginAccountXData)
+            self.origin = origin
+        else:
+            self.origin = OriginAccountXData()
+
+    @classmethod
+    def from_origin(cls, origin):
+        return AccountXData(origin=origin) if not origin is None else None
+
+    @property
+    def flags(self):
+        return self.flags_adapter.GetFlags(self.origin)
+
+    @flags.setter
+    def flags(self,value):
+        return self.flags_adapter.SetFlags(self.origin, value)
+
+    def has_flags(self,flag):
+        return self.flags_adapter.HasFlags(self.origin, flag)
+
+    def clear_flags(self):
+        return self.flags_adapter.ClearFlags(self.origin)
+
+    def add_flags(self,flag):
+        return self.flags_adapter.AddFlags(self.origin,flag)
+
+    def drop_flags(self,flag):
+        return self.flags_adapter.DropFlags(self.origin,flag)
+
+    @property
+    def self_details(self) -> AccountXDataDetails:
+        return AccountXDataDetails.from_origin(self.origin.SelfDetails)
+
+    @property
+    def family_details(self) -> AccountXDataDetails:
+        return AccountXDataDetails.from_origin(self.origin.FamilyDetails)
+
+    @property
+    def reported_posts(self) -> Iterable:
+        return PostingList(NetListAdapter.GetPosts(self.origin))
+
+    @property
+    def sort_values(self) -> Iterable:
+        return SortValueList(NetListAdapter.GetAccountXDataSortValues(self.origin))
+
+ACCOUNT_NORMAL = ExportedConsts.ACCOUNT_NORMAL
+ACCOUNT_KNOWN = ExportedConsts.ACCOUNT_KNOWN
+ACCOUNT_TEMP = ExportedConsts.ACCOUNT_TEMP
+ACCOUNT_GENERATED = ExportedConsts.ACCOUNT_GENERATED
+
+class Account(OriginKeeper):
+
+    __slots__ = ()
+
+    flags_adapter = FlagsAdapter.AccountFlagsAdapter()
+
+    def __init__(self, parent: 'Account' = None, name: str = None, note: str = None, origin = None) -> None:
+
+        if not(origin is None):
+            assert isinstance(origin, OriginAccount)
+            self.origin = origin
+        else:
+            self.origin = OriginAccount(parent.origin if not parent is None else None, name, note)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return wrapper_cache.get(origin, lambda origin: Account(origin=origin)) if not origin is None else None
+
+    @property
+    def flags(self):
+        return self.flags_adapter.GetFlags(self.origin)
+
+    @flags.setter
+    def flags(self,value):
+        return self.flags_adapter.SetFlags(self.origin, value)
+
+    def has_flags(self,flag):
+        return self.flags_adapter.HasFlags(self.origin, flag)
+
+    def clear_flags(self):
+        return self.flags_adapter.ClearFlags(self.origin)
+
+    def add_flags(self,flag):
+        return self.flags_adapter.AddFlags(self.origin,flag)
+
+    def drop_flags(self,flag):
+        return self.flags_adapter.DropFlags(self.origin,flag)
+
+    @property
+    def parent(self) -> 'Account':
+        return Account.from_origin(self.origin.Parent)
+
+    @property
+    def name(self) -> str:
+        return self.origin.Name
+
+    @property
+    def note(self) -> str:
+        return self.origin.Note
+
+    @property
+    def depth(self) -> int:
+        return self.origin.Depth
+
+    def __str__(self) -> str:
+        return self.origin.ToString()
+
+    def fullname(self) -> str:
+        return self.origin.FullName
+
+    def partial_name(self, flat: bool = None) -> str:
+        return self.origin.PartialName(flat) if flat else self.origin.PartialName()
+
+    def add_account(self, account: 'Account'):
+        self.origin.AddAccount(account.origin)
+
+    def remove_account(self, account: 'Account'):
+        self.origin.RemoveAccount(account.origin)
+
+    def find_account(self, acctname: str, auto_create: bool = None) -> 'Account':
+        return Account.from_origin(self.origin.FindAccount(acctname, auto_create) if not auto_create is None else self.origin.FindAccount(acctname))
+
+    def find_account_re(self, regexp: str) -> 'Account':
+        return Account.from_origin(self.origin.FindAccountRe(regexp))
+
+    def add_post(self, post: 'Posting'):
+        assert isinstance(post, Posting)
+        self.origin.AddPost(post.origin)
+
+    def remove_post(self, post: 'Posting'):
+        assert isinstance(post, Posting)
+        self.origin.RemovePost(post.origin)
+
+    def valid(self) -> bool:
+        return self.origin.Valid()
+
+    def __len__(self) -> int:
+        return NetListAdapter.GetAccounts(self.origin).Count
+
+    def __getitem__(self, row: int) -> 'Account':
+        return Account.from_origin(NetListAdapter.GetAccounts(self.origin)[row])
+
+    def __iter__(self):
+        return iter(self.accounts())
+
+    def accounts(self) -> Iterable:
+        return AccountList(NetListAdapter.GetAccounts(self.origin))
+
+    def posts(self) -> Iterable:
+        return PostingList(NetListAdapter.GetPosts(self.origin))
+
+    def has_xdata(self) -> bool:
+        return self.origin.HasXData
+
+    def clear_xdata(self):
+        return self.origin.ClearXData()
+
+    def xdata(self) -> AccountXData:
+        return AccountXData.from_origin(self.origin.XData)
+
+    def amount(self, expr: Expr = None) -> 'Value':
+        if expr is None:
+            return Value.to_value(self.origin.Amount())
+        else:
+            assert isinstance(expr, Expr)
+            return Value.to_value(self.origin.Amount(False, expr.origin))
+
+    def total(self, expr: Expr = None) -> 'Value':
+        if expr is None:
+            return Value.to_value(self.origin.Total())
+        else:
+            assert isinstance(expr, Expr)
+            return Value.to_value(self.origin.Total(expr.origin))
+
+    def self_details(self, gather_all: bool = None) -> AccountXDataDetails:
+        if gather_all is None:
+            return AccountXDataDetails.from_origin(self.origin.SelfDetails())
+        else:
+            return AccountXDataDetails.from_origin(self.origin.SelfDetails(gather_all))
+
+    def family_details(self, gather_all: bool = None) -> AccountXDataDetails:
+        if gather_all is None:
+            return AccountXDataDetails.from_origin(self.origin.FamilyDetails())
+        else:
+            return AccountXDataDetails.from_origin(self.origin.FamilyDetails(gather_all))
+
+    def has_xflags(self, flags: int) -> bool:
+        return FlagsAdapter.AccountHasXFlags(self.origin, flags)
+
+    def children_with_flags(self, to_display: bool, visited: bool) -> int:
+        return self.origin.ChildrenWithFlags(to_display, visited)
+
+###########################
+# Ported from py_item.cc
+
+class Scope(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self,origin) -> None:
+        assert isinstance(origin, OriginScope)
+        self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin):
+        if origin is None:
+            return None
+        if isinstance(origin, OriginSession):
+            return Session.from_origin(origin)
+        if isinstance(origin, OriginPost):
+            return Posting.from_origin(origin)
+        if isinstance(origin, OriginXactBase):
+            return TransactionBase.from_origin(origin)
+        raise Exception("Unexpected origin type")
+
+    @property
+    def description(self) -> str:
+        return self.origin.Description
+
+    @property
+    def type_context(self) -> 'ValueType':
+        return ValueType(FlagsAdapter.EnumToInt(self.origin.TypeContext))
+
+    @property
+    def type_required(self) -> bool:
+        return self.origin.TypeRequired
+
+class Position(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if origin is None:
+            self.origin = OriginItemPosition()
+        else:
+            assert isinstance(origin, OriginItemPosition)
+            self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin) -> 'Position':
+        if origin is None:
+            return None
+
+        return Position(origin)
+
+    @property
+    def pathname(self) -> str:
+        return self.origin.PathName
+
+    @pathname.setter
+    def pathname(self, val: str):
+        self.origin.PathName = val
+
+    @property
+    def beg_pos(self) -> int:
+        return self.origin.BegPos
+
+    @beg_pos.setter
+    def beg_pos(self, val: int):
+        self.origin.BegPos = val
+
+    @property
+    def beg_line(self) -> int:
+        return self.origin.BegLine
+
+    @beg_line.setter
+    def beg_line(self, val: int):
+        self.origin.BegLine = val
+
+    @property
+    def end_pos(self) -> int:
+        return self.origin.EndPos
+
+    @end_pos.setter
+    def end_pos(self, val: int):
+        self.origin.EndPos = val
+
+    @property
+    def end_line(self) -> int:
+        return self.origin.EndLine
+
+    @end_line.setter
+    def end_line(self, val: int):
+        self.origin.EndLine = val
+
+ITEM_NORMAL = ExportedConsts.ITEM_NORMAL
+ITEM_GENERATED = ExportedConsts.ITEM_GENERATED
+ITEM_TEMP = ExportedConsts.ITEM_TEMP
+
+class State(enum.Enum):  # State enum
+    Uncleared = FlagsAdapter.EnumToInt(OriginItemStateEnum.Uncleared)
+    Cleared = FlagsAdapter.EnumToInt(OriginItemStateEnum.Cleared)
+    Pending = FlagsAdapter.EnumToInt(OriginItemStateEnum.Pending)
+
+class JournalItem(Scope):
+
+    __slots__ = ()
+
+    def __init__(self, origin) -> None:
+        assert isinstance(origin, OriginItem)
+        super().__init__(origin)
+
+    @property
+    def flags(self) -> int:
+        return FlagsAdapter.EnumToInt(self.origin.Flags)
+
+    @flags.setter
+    def flags(self, value:int):
+        self.origin.Flags = OriginSupportsFlagsEnum(value) if not is_pythonnet_2 else value
+
+    def has_flags(self, value:int) -> bool:
+        return (self.flags & value) == value
+
+    def clear_flags(self):
+        self.flags = 0
+
+    def add_flags(self, value:int):
+        self.flags |= value
+
+    def drop_flags(self, value:int):
+        self.flags &= ~value
+
+    @property
+    def note(self) -> str:
+        return self.origin.Note
+
+    @note.setter
+    def note(self, val: str):
+        self.origin.Note = val
+
+    @property
+    def pos(self) -> Position:
+        return Position(self.origin.Pos)
+
+    @pos.setter
+    def pos(self, val: Position):
+        self.origin.Pos = val.origin if not val is None else None
+
+    @property
+    def metadata(self) -> Dict[str, Tuple]:
+        result = {}
+        data = self.origin.GetMetadata()
+        if not data is None:
+            for key_value in data:
+                result[key_value.Key] = (Value.to_value(key_value.Value.Value), bool(key_value.Value.IsParsed)) if not key_value.Value is None else None
+        return result
+
+    def copy_details(self, item: 'JournalItem'):
+        assert isinstance(item, JournalItem)
+        self.origin.CopyDetails(item.origin)
+
+    def __eq__(self, o: object) -> bool:
+        if o is None:
+            return False
+        assert isinstance(o, JournalItem)
+        return self.origin == o.origin
+
+    def __ne__(self, o: object) -> bool:
+        if o is None:
+            return False
+        assert isinstance(o, JournalItem)
+        return self.origin != o.origin
+
+    def has_tag(self, tag, val = None) -> bool:
+        if isinstance(tag, str) and val is None:
+            return self.origin.HasTag(tag)
+        assert isinstance(tag, Mask)
+        if val is None:
+            return self.origin.HasTag(tag.origin)
+        assert isinstance(val, Mask)
+        return self.origin.HasTag(tag.origin, val.origin)
+
+    def get_tag(self, tag, val = None) -> 'Value':
+        if isinstance(tag, str) and val is None:
+            return Value.to_value(self.origin.GetTag(tag))
+        assert isinstance(tag, Mask)
+        if val is None:
+            return Value.to_value(self.origin.GetTag(tag.origin))
+        assert isinstance(val, Mask)
+        return Value.to_value(self.origin.GetTag(tag.origin, val.origin))
+
+    tag = get_tag
+
+    def set_tag(self, tag: str, val: 'Value' = None, overwrite_existing: bool = None):
+        if not overwrite_existing is None:
+            self.origin.SetTag(tag, Value.to_value(val).origin, overwrite_existing)
+        elif not val is None:
+            self.origin.SetTag(tag, Value.to_value(val).origin)
+        else:
+            self.origin.SetTag(tag)
+
+    def parse_tags(self, note: str, scope: Scope, overwrite_existing: bool = None):
+        assert isinstance(note, str)
+        assert isinstance(scope, Scope)
+        if overwrite_existing is None:
+            self.origin.ParseTags(note, scope.origin)
+        else:
+            assert isinstance(overwrite_existing, bool)
+            return self.origin.ParseTags(note, scope.origin, overwrite_existing)
+
+    def append_note(self, note: str, scope: Scope, overwrite_existing: bool = None):
+        assert isinstance(note, str)
+        assert isinstance(scope, Scope)
+        if overwrite_existing is None:
+            return self.origin.AppendNote(note, scope.origin)
+        else:
+            assert isinstance(overwrite_existing, bool)
+            return self.origin.AppendNote(note, scope.origin, overwrite_existing)
+
+    @classproperty
+    def use_aux_date(cls) -> bool:
+        return OriginItem.UseAuxDate
+
+    @use_aux_date.setter
+    def use_aux_date(cls, value: bool):
+        OriginItem.UseAuxDate = value
+
+    @property
+    def date(self) -> date:
+        return to_pdate(self.origin.GetDate())
+
+    @date.setter
+    def date(self, val: date):
+        self.origin.Date = to_ndate(val)
+
+    @property
+    def aux_date(self) -> date:
+        return to_pdate(self.origin.DateAux)
+
+    @aux_date.setter
+    def aux_date(self, val: date):
+        self.origin.DateAux = to_ndate(val)
+
+    @property
+    def state(self) -> date:
+        return State(FlagsAdapter.EnumToInt(self.origin.State))
+
+    @state.setter
+    def state(self, val: State):
+        self.origin.State = NetEnum.ToObject(OriginItemStateEnum, val.value)
+
+    def lookup(self, kind: SymbolKind, name: str):
+        return self.origin.Lookup(kind, name)
+
+    def valid(self):
+        return self.origin.Valid()
+
+###########################
+# Ported from py_post.cc
+
+POST_EXT_RECEIVED = ExportedConsts.POST_EXT_RECEIVED
+POST_EXT_HANDLED = ExportedConsts.POST_EXT_HANDLED
+POST_EXT_DISPLAYED = ExportedConsts.POST_EXT_DISPLAYED
+POST_EXT_DIRECT_AMT = ExportedConsts.POST_EXT_DIRECT_AMT
+POST_EXT_SORT_CALC = ExportedConsts.POST_EXT_SORT_CALC
+POST_EXT_COMPOUND = ExportedConsts.POST_EXT_COMPOUND
+POST_EXT_VISITED = ExportedConsts.POST_EXT_VISITED
+POST_EXT_MATCHES = ExportedConsts.POST_EXT_MATCHES
+POST_EXT_CONSIDERED = ExportedConsts.POST_EXT_CONSIDERED
+
+class PostingXData(OriginKeeper):
+
+    __slots__ = ()
+
+    flags_adapter = FlagsAdapter.PostXDataFlagsAdapter()
+
+    def __init__(self, origin = None) -> None:
+        if origin is None:
+            self.origin = OriginPostXData()
+        else:
+            assert isinstance(origin, OriginPostXData)
+            self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin):
+        return PostingXData(origin=origin) if not origin is None else None
+
+    @property
+    def flags(self):
+        return self.flags_adapter.GetFlags(self.origin)
+
+    @flags.setter
+    def flags(self,value):
+        return self.flags_adapter.SetFlags(self.origin, value)
+
+    def has_flags(self,flag):
+        return self.flags_adapter.HasFlags(self.origin, flag)
+
+    def clear_flags(self):
+        return self.flags_adapter.ClearFlags(self.origin)
+
+    def add_flags(self,flag):
+        return self.flags_adapter.AddFlags(self.origin,flag)
+
+    def drop_flags(self,flag):
+        return self.flags_adapter.DropFlags(self.origin,flag)
+
+    @property
+    def visited_value(self) -> 'Value':
+        return Value.to_value(self.origin.VisitedValue)
+
+    @visited_value.setter
+    def visited_value(self, value: 'Value'):
+        self.origin.VisitedValue = value.origin if not value is None else None 
+
+    @property
+    def compound_value(self) -> 'Value':
+        return Value.to_value(self.origin.CompoundValue)
+
+    @compound_value.setter
+    def compound_value(self, value: 'Value'):
+        self.origin.CompoundValue = value.origin if not value is None else None 
+
+    @property
+    def total(self) -> 'Value':
+        return Value.to_value(self.origin.Total)
+
+    @total.setter
+    def total(self, value: 'Value'):
+        self.origin.Total = value.origin if not value is None else None 
+
+    @property
+    def count(self) -> 'int':
+        return self.origin.Count
+
+    @count.setter
+    def count(self, value: 'int'):
+        self.origin.Count = value
+
+    @property
+    def date(self) -> date:
+        return to_pdate(self.origin.Date)
+
+    @date.setter
+    def date(self, value: date):
+        self.origin.Date = to_ndate(value)
+
+    @property
+    def datetime(self) -> datetime:
+        return to_pdatetime(self.origin.Datetime)
+
+    @datetime.setter
+    def datetime(self, value: datetime):
+        self.origin.Datetime = to_ndatetime(value)
+
+    @property
+    def account(self) -> 'Account':
+        return Account.from_origin(self.origin.Account)
+
+    @account.setter
+    def account(self, value: 'Account'):
+        self.origin.Account = value.origin if not value is None else None 
+
+    @property
+    def sort_values(self) -> Iterable:
+        return SortValueList(NetListAdapter.GetPostXDataSortValues(self.origin))
+
+POST_VIRTUAL = ExportedConsts.POST_VIRTUAL
+POST_MUST_BALANCE = ExportedConsts.POST_MUST_BALANCE
+POST_CALCULATED = ExportedConsts.POST_CALCULATED
+POST_COST_CALCULATED = ExportedConsts.POST_COST_CALCULATED
+
+class Posting(JournalItem):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if not origin is None:
+            assert isinstance(origin, OriginPost)
+        else:
+            origin = OriginPost()
+
+        super().__init__(origin)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return wrapper_cache.get(origin, Posting) if not origin is None else None
+
+    def id(self) -> str:
+        return self.origin.Id
+
+    def seq(self) -> int:
+        return self.origin.Seq
+
+    @property
+    def xact(self) -> 'Transaction':
+        return Transaction.from_origin(self.origin.Xact)
+
+    @xact.setter
+    def xact(self, trx: 'Transaction'):
+        self.origin.Xact = trx.origin if not trx is None else None
+
+    @property
+    def account(self) -> 'Account':
+        return Account.from_origin(self.origin.Account)
+
+    @account.setter
+    def account(self, acc: 'Account'):
+        self.origin.Account = acc.origin if not acc is None else None
+
+    @property
+    def amount(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Amount)
+
+    @amount.setter
+    def amount(self, amt: 'Amount'):
+        self.origin.Amount = amt.origin if not amt is None else None
+
+    @property
+    def cost(self) -> 'Amount':
+        return Amount.from_origin(self.origin.Cost)
+
+    @cost.setter
+    def cost(self, amt: 'Amount'):
+        self.origin.Cost = amt.origin if not amt is None else None
+
+    @property
+    def given_cost(self) -> 'Amount':
+        return Amount.from_origin(self.origin.GivenCost)
+
+    @given_cost.setter
+    def given_cost(self, amt: 'Amount'):
+        self.origin.GivenCost = amt.origin if not amt is None else None
+
+    @property
+    def assigned_amount(self) -> 'Amount':
+        return Amount.from_origin(self.origin.AssignedAmount)
+
+    @assigned_amount.setter
+    def assigned_amount(self, amt: 'Amount'):
+        self.origin.AssignedAmount = amt.origin if not amt is None else None
+
+    def must_balance(self) -> bool:
+        return self.origin.MustBalance
+
+    def has_xdata(self) -> bool:
+        return self.origin.HasXData
+
+    def clear_xdata(self):
+        self.origin.ClearXData()
+
+    def xdata(self) -> PostingXData:
+        return PostingXData.from_origin(self.origin.XData)
+
+    def reported_account(self) -> Account:
+        return Account.from_origin(self.origin.ReportedAccount)
+
+    def set_reported_account(self, acc: Account):
+        self.origin.ReportedAccount = acc.origin if not acc is None else None
+
+###########################
+# Ported from py_xact.cc
+
+class TransactionBase(JournalItem):
+
+    __slots__ = ()
+
+    def __init__(self, origin) -> None:
+        assert isinstance(origin, OriginXactBase)
+        super().__init__(origin)
+
+    @classmethod
+    def from_origin(cls, origin):
+        if origin is None:
+            return None
+        if isinstance(origin, OriginXact):
+            return wrapper_cache.get(origin, Transaction)
+        if isinstance(origin, OriginPeriodXact):
+            return wrapper_cache.get(origin, PeriodicTransaction)
+        if isinstance(origin, OriginAutoXact):
+            return wrapper_cache.get(origin, AutomatedTransaction)
+        raise Exception("Incorrect origin for transaction base")
+
+    @property
+    def journal(self) -> 'Journal':
+        return Journal.from_origin(self.origin.Journal)
+
+    @journal.setter
+    def journal(self, value: 'Journal'):
+        self.origin.Journal = value.origin if not value is None else None
+
+    def __len__(self) -> int:
+        return NetListAdapter.GetPosts(self.origin).Count
+
+    def __getitem__(self, row):
+        return Posting.from_origin(NetListAdapter.GetPosts(self.origin)[row])
+
+    def add_post(self, post: Posting):
+        assert isinstance(post, Posting)
+        self.origin.AddPost(post.origin)
+
+    def remove_post(self, post: Posting) -> bool:
+        assert isinstance(post, Posting)
+        return self.origin.RemovePost(post.origin)
+
+    def finalize(self) -> bool:
+        return self.origin.FinalizeXact()
+
+    def posts(self) -> Iterable:
+        return PostingList(NetListAdapter.GetPosts(self.origin))
+
+    def __iter__(self):
+        return iter(self.posts())
+
+class Transaction(TransactionBase):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if not origin is None:
+            assert isinstance(origin, OriginXact)
+        else:
+            origin = OriginXact()
+        super().__init__(origin)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return wrapper_cache.get(origin, Transaction) if not origin is None else None
+
+    def id(self) -> str:
+        return self.origin.Id
+
+    def seq(self) -> int:
+        return self.origin.Seq
+
+    @property
+    def code(self) -> str:
+        return self.origin.Code
+
+    @code.setter
+    def code(self, value: str):
+        self.origin.Code = value
+
+    @property
+    def payee(self) -> str:
+        return self.origin.Payee
+
+    @payee.setter
+    def payee(self, value: str):
+        self.origin.Payee = value
+
+    def magnitude(self) -> 'Value':
+        return Value.to_value(self.origin.Magnitude())
+
+    def has_xdata(self) -> bool:
+        return self.origin.HasXData
+
+    def clear_xdata(self):
+        self.origin.ClearXData()
+
+    def __str__(self) -> str:
+        return ""  # See py_xact.cc, py_xact_to_string, jww (2012-03-01)
+
+class PeriodicTransaction(TransactionBase):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if not origin is None:
+            assert isinstance(origin, OriginPeriodXact)
+        else:
+            origin = OriginPeriodXact()
+        super().__init__(origin)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return wrapper_cache.get(origin, PeriodicTransaction) if not origin is None else None
+
+    @property
+    def period(self) -> DateInterval:
+        return self.origin.Period
+
+    @property
+    def period_string(self) -> DateInterval:
+        return self.origin.PeriodSting
+
+class AutomatedTransaction(TransactionBase):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if not origin is None:
+            assert isinstance(origin, OriginAutoXact)
+        else:
+            origin = OriginAutoXact()
+        super().__init__(origin)
+
+    @classmethod
+    def from_origin(cls, origin):
+        return wrapper_cache.get(origin, AutomatedTransaction) if not origin is None else None
+
+    @property
+    def predicate(self) -> Predicate:
+        return self.origin.Predicate
+
+    def extend_xact(self, xact_base: TransactionBase):
+        self.origin.ExtendXact(xact_base.origin, None)
+
+###########################
+# Ported from py_journal.cc
+
+class FileInfo(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, val = None) -> None:
+        if val is None:
+            self.origin = OriginJournalFileInfo()
+        elif isinstance(val, OriginJournalFileInfo):
+            self.origin = val
+        elif isinstance(val, str):
+            self.origin = OriginJournalFileInfo(val)
+        else:
+            raise Exception("Unexpected argument type")
+
+    @classmethod
+    def from_origin(cls, origin):
+        return FileInfo(origin) if not origin is None else None
+
+    @property
+    def filename(self) -> str:
+        return self.origin.FileName
+
+    @property
+    def size(self) -> int:
+        return self.origin.Size
+
+    @property
+    def modtime(self) -> datetime:
+        return to_pdatetime(self.origin.ModTime)
+
+    @property
+    def from_stream(self) -> bool:
+        return self.origin.FromStream
+
+class Journal(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if origin is None:
+            self.origin = OriginJournal()
+        else:
+            assert isinstance(origin, OriginJournal)
+            self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin):
+        return Journal(origin) if not origin is None else None
+
+    @property
+    def master(self) -> Account:
+        return Account.from_origin(self.origin.Master)
+
+    @master.setter
+    def master(self, val: Account):
+        self.origin.Master = val.origin if not val is None else None
+
+    @property
+    def bucket(self) -> Account:
+        return Account.from_origin(self.origin.Bucket)
+
+    @bucket.setter
+    def bucket(self, val: Account):
+        self.origin.Bucket = val.origin if not val is None else None
+
+    def add_account(self, acct: Account):
+        assert isinstance(acct, Account)
+        self.origin.AddAccount(acct.origin)
+
+    def remove_account(self, acct: Account) -> bool:
+        assert isinstance(acct, Account)
+        return self.origin.RemoveAccount(acct.origin)
+
+    def find_account(self, name: str, auto_create: bool = None) -> Account:
+        assert isinstance(name, str)
+        if auto_create is None:
+            return Account.from_origin(self.origin.FindAccount(name))
+        else:
+            return Account.from_origin(self.origin.FindAccount(name, auto_create))
+
+    def find_account_re(self, regexp: str) -> Account:
+        assert isinstance(regexp, str)
+        return Account.from_origin(self.origin.FindAccountRe(regexp))
+
+    def register_account(self, name: str, post: Posting) -> Account:
+        assert isinstance(name, str) or name is None
+        assert isinstance(post, Posting) or post is None
+        master = self.master
+        return Account.from_origin(self.origin.RegisterAccount(name, (post.origin if not post is None else None), (master.origin if not master is None else None)))
+
+    def expand_aliases(self, name: str) -> Account:
+        assert isinstance(name, str)
+        return Account.from_origin(self.origin.ExpandAliases(name))
+
+    def add_xact(self, xact: Transaction) -> bool:
+        assert isinstance(xact, Transaction)
+        query_cache.invalidate(self)
+        report_cache.invalidate(self)
+        return self.origin.AddXact(xact.origin)
+
+    def remove_xact(self, xact: Transaction) -> bool:
+        assert isinstance(xact, Transaction)
+        query_cache.invalidate(self)
+        report_cache.invalidate(self)
+        return self.origin.RemoveXact(xact.origin)
+
+    # Content generation counter; it is changed every time transactions are added, removed or read
+    @property
+    def generation(self) -> int:
+        return self.origin.Generation
+
+    def __len__(self) -> int:
+        return NetListAdapter.GetXacts(self.origin).Count
+
+    def __getitem__(self, row: int) -> 'Transaction':
+        return Transaction.from_origin(NetListAdapter.GetXacts(self.origin)[row])
+
+    def __iter__(self):
+        return iter(self.xacts())
+
+    def xacts(self) -> Iterable:
+        return TransactionList(NetListAdapter.GetXacts(self.origin))
+
+    def auto_xacts(self) -> Iterable:
+        return AutomatedTransactionList(NetListAdapter.GetAutoXacts(self.origin))
+
+    def period_xacts(self) -> Iterable:
+        return PeriodicTransactionList(NetListAdapter.GetPeriodXacts(self.origin))
+
+    def sources(self) -> Iterable:
+        return FileInfoList(NetListAdapter.GetFileInfos(self.origin))
+
+    # Files that were read by 'include' directives
+    def included_sources(self) -> Iterable:
+        return FileInfoList(NetListAdapter.GetIncludedFileInfos(self.origin))
+
+    def has_xdata(self) -> bool:
+        return self.origin.HasXData()
+
+    def clear_xdata(self):
+        self.origin.ClearXData()
+
+    def query(self, query_text:str) -> Iterable:
+        if query_cache.enabled:
+            return query_cache.query(self, query_text)
+        return PostingList(NetListAdapter.GetQuery(self.origin, query_text))
+
+    # Report options (e.g. --real or --effective) are taken when the query is prepared; queries should be prepared again
+    # after the options are changed (see PreparedQuery.report_options)
+    def prepare_query(self, query_text:str) -> 'PreparedQuery':
+        return PreparedQuery(self, query_text)
+
+    def to_columns(self) -> Dict:
+        return to_columns(NetListAdapter.GetPostColumns(self.origin))
+
+    # Transactions with dates in the range [start, end) in date order; None means an open range.
+    # The range is found by binary search in the journal date index (it is rebuilt after the journal is changed);
+    # the result is a read-only view, so items are wrapped only when they are accessed
+    def xacts_between(self, start: date = None, end: date = None) -> TransactionList:
+        return TransactionList(NetListAdapter.GetXactsBetween(self.origin, to_ndate(start), to_ndate(end)))
+
+    # Postings with dates (posting dates if they are specified) in the range [start, end) in date order
+    def posts_between(self, start: date = None, end: date = None) -> PostingList:
+        return PostingList(NetListAdapter.GetPostsBetween(self.origin, to_ndate(start), to_ndate(end)))
+
+    # Index of transaction and posting tags. It is built on first call and updated by add_xact and remove_xact;
+    # rebuild=True is needed if tags of items that are already in the journal were changed
+    def tag_index(self, rebuild: bool = False) -> 'TagIndex':
+        index = TagIndex(self.origin.GetTagIndex())
+        if rebuild:
+            index.rebuild()
+        return index
+
+    # Cached view of the account tree for fast lookups, prefix and regex searches and tree walks (see AccountTree).
+    # The view is built again after accounts were added or removed
+    def account_tree(self) -> 'AccountTree':
+        return account_tree_cache.get(self.master)
+
+    # Saves the journal content (with commodities and prices) to a binary file that can be loaded by load_snapshot
+    def save_snapshot(self, path_name: str):
+        assert isinstance(path_name, str)
+        OriginJournalSnapshot.Save(self.origin, path_name)
+
+    # Reads again changed journal files (only changed included files if possible); returns the number of read files
+    def refresh(self) -> int:
+        return OriginJournalExtensions.Refresh(self.origin)
+
+    def valid(self) -> bool:
+        return self.origin.Valid()
+
+###########################
+# Tag index
+
+# Maps tag names to tag values and to transactions and postings that have them. Tag names are case-insensitive;
+# value masks (Mask or regex string) are matched against text representation of tag values
+class TagIndex(OriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, origin) -> None:
+        assert isinstance(origin, OriginTagIndex)
+        self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin):
+        return TagIndex(origin) if not origin is None else None
+
+    @property
+    def journal(self) -> Journal:
+        return Journal.from_origin(self.origin.Journal)
+
+    def tags(self) -> List[str]:
+        return list(self.origin.Tags)
+
+    def has_tag(self, tag: str) -> bool:
+        assert isinstance(tag, str)
+        return self.origin.HasTag(tag)
+
+    __contains__ = has_tag
+
+    # Distinct values of the tag (an empty string stands for tags without values)
+    def values(self, tag: str) -> List[str]:
+        assert isinstance(tag, str)
+        return list(self.origin.GetValues(tag))
+
+    # Postings that have the tag; postings of tagged transactions are included if inherit is True
+    def posts(self, tag: str, value_mask = None, inherit: bool = True) -> PostingList:
+        assert isinstance(tag, str)
+        return PostingList(NetListAdapter.GetTaggedPosts(self.origin, tag, TagIndex.to_nmask(value_mask), inherit))
+
+    def xacts(self, tag: str, value_mask = None) -> TransactionList:
+        assert isinstance(tag, str)
+        return TransactionList(NetListAdapter.GetTaggedXacts(self.origin, tag, TagIndex.to_nmask(value_mask)))
+
+    def rebuild(self):
+        self.origin.Rebuild()
+
+    @staticmethod
+    def to_nmask(value_mask):
+        if value_mask is None:
+            return None
+        if isinstance(value_mask, Mask):
+            return value_mask.origin
+        assert isinstance(value_mask, str)
+        return OriginMask(value_mask)
+
+###########################
+# Prepared queries and query result cache
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Query with parsed arguments. It keeps the result of the last execution and re-collects posts only if the journal was changed.
+# Report options are copied when the query is prepared, so later option changes do not affect its results
+class PreparedQuery(OriginKeeper):
+
+    __slots__ = ('result', 'generation')
+
+    def __init__(self, journal: Journal, query_text: str) -> None:
+        assert isinstance(journal, Journal)
+        assert isinstance(query_text, str)
+        self.origin = NetListAdapter.PrepareQuery(journal.origin, query_text)
+        self.result = None
+        self.generation = None
+
+    @property
+    def journal(self) -> Journal:
+        return Journal.from_origin(self.origin.Journal)
+
+    @property
+    def query_text(self) -> str:
+        return self.origin.QueryText
+
+    # Handled report options when the query was prepared
+    @property
+    def report_options(self) -> str:
+        return self.origin.ReportOptions
+
+    def is_actual(self) -> bool:
+        return not self.result is None and self.generation == self.origin.Journal.Generation
+
+    def execute(self) -> Iterable:
+        if not self.is_actual():
+            self.generation = self.origin.Journal.Generation
+            self.result = NetListAdapter.GetQuery(self.origin)
+        return PostingList(self.result.Copy())
+
+    __call__ = execute
+
+# LRU cache of query results keyed by journal, journal generation, query text and handled report options. It is disabled by default;
+# when enabled, Journal.query takes results from the cache until the journal or report options are changed.
+class QueryCache:
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.enabled = False
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.queries = OrderedDict()
+
+    def query(self, journal: Journal, query_text: str) -> Iterable:
+        key = (journal.origin, query_text, OriginJournalQuery.CurrentReportOptions())
+        prepared = self.queries.get(key)
+        if prepared is None:
+            prepared = PreparedQuery(journal, query_text)
+            self.queries[key] = prepared
+            while len(self.queries) > self.max_size:
+                self.queries.popitem(last=False)
+        else:
+            self.queries.move_to_end(key)
+
+        if prepared.is_actual():
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return prepared.execute()
+
+    # Removes cached results for the journal (or all cached results if journal is not specified)
+    def invalidate(self, journal: Journal = None):
+        if journal is None:
+            self.queries.clear()
+        else:
+            for key in [key for key in self.queries if key[0] == journal.origin]:
+                del self.queries[key]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+query_cache = QueryCache()
+
+# LRU cache of command results keyed by the session, normalized command arguments, handled session and report options and the current date.
+# Every result keeps the journal and its generation, so it is recalculated after the journal is changed or read again.
+# It is disabled by default; when enabled, execute_command returns cached results of successful commands
+# (except streamed commands and commands that read journal files).
+class ReportCache:
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.enabled = False
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.results = OrderedDict()
+
+    def get_key(self, session: 'Session', args) -> tuple:
+        args_list = CommandLine.PreprocessSingleQuotes(args) if isinstance(args, str) else args
+        return (session.get_context(), tuple(str(arg) for arg in args_list), SessionExtensions.GetOptionsReport(session.origin), date.today())
+
+    # Should be called while the session is entered (see Session.enter)
+    def execute_command(self, session: 'Session', args):
+        assert isinstance(session, Session)
+
+        key = self.get_key(session, args)
+        journal = session.origin.Journal
+        entry = self.results.get(key)
+        if not entry is None and entry[0] == journal and entry[1] == journal.Generation:
+            self.results.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        generation = journal.Generation
+        cmd_result = SessionExtensions.ExecuteCommand(session.origin, to_net_args(args))
+        if not cmd_result.Error:
+            self.results[key] = (journal, generation, cmd_result)
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+
+        return cmd_result
+
+    # Removes cached results calculated for the journal (or all cached results if journal is not specified)
+    def invalidate(self, journal: Journal = None):
+        if journal is None:
+            self.results.clear()
+        else:
+            for key in [key for (key, entry) in self.results.items() if entry[0] == journal.origin]:
+                del self.results[key]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+report_cache = ReportCache()
+
+###########################
+# Account tree
+
+import re
+from bisect import bisect_left
+
+# Cached view of an account tree. Names, depths and parents of all accounts are collected in a single call (see AccountTreeColumns),
+# so lookups by full name, prefix and regex searches and tree walks do not cross the interop boundary; account wrappers
+# are created only when AccountNode.account is read. The view is a snapshot: is_actual() tells whether accounts were added
+# or removed after it was built (Journal.account_tree() builds a new view then).
+class AccountTree:
+
+    def __init__(self, root: Account) -> None:
+        assert isinstance(root, Account)
+        self.columns = AccountTreeColumns(root.origin)
+        self.generation = self.columns.TreeGeneration
+        self.fullnames = list(self.columns.FullNames)
+        self.names = list(self.columns.Names)
+        self.depths = list(self.columns.Depths)
+        self.parents = list(self.columns.Parents)
+        self.children = [[] for _ in self.parents]
+        for (index, parent) in enumerate(self.parents):
+            if parent >= 0:
+                self.children[parent].append(index)
+        self.indexes = {fullname: index for (index, fullname) in enumerate(self.fullnames)}
+        # Full names in case-insensitive order; a name prefix selects a continuous range that is found by binary search
+        self.sorted = sorted((fullname.lower(), index) for (index, fullname) in enumerate(self.fullnames))
+        self.sorted_keys = [key for (key, _) in self.sorted]
+
+    @property
+    def root(self) -> 'AccountNode':
+        return AccountNode(self, 0)
+
+    def is_actual(self) -> bool:
+        return self.columns.Root.TreeGeneration == self.generation
+
+    def find(self, fullname: str) -> 'AccountNode':
+        index = self.indexes.get(fullname)
+        return AccountNode(self, index) if not index is None else None
+
+    def __getitem__(self, fullname: str) -> 'AccountNode':
+        node = self.find(fullname)
+        if node is None:
+            raise KeyError(fullname)
+        return node
+
+    def __contains__(self, fullname: str) -> bool:
+        return fullname in self.indexes
+
+    def __len__(self) -> int:
+        return len(self.fullnames)
+
+    def __iter__(self):
+        return self.dfs()
+
+    # Accounts with full names that start with the prefix (case-insensitive) in name order
+    def startswith(self, prefix: str) -> List['AccountNode']:
+        assert isinstance(prefix, str)
+        return [AccountNode(self, index) for index in self.prefix_range(prefix.lower())]
+
+    # Accounts with full names that match the regular expression (case-insensitive search like account masks) in name order.
+    # If the pattern starts with ^ followed by literal text, only names with this prefix are checked
+    def find_re(self, pattern: str) -> List['AccountNode']:
+        assert isinstance(pattern, str)
+        regex = re.compile(pattern, re.IGNORECASE)
+        prefix = AccountTree.literal_prefix(pattern)
+        indexes = self.prefix_range(prefix) if prefix else (index for (_, index) in self.sorted)
+        return [AccountNode(self, index) for index in indexes if regex.search(self.fullnames[index])]
+
+    # Walks the tree (or the subtree of 'start') in depth-first order; children are visited in name order
+    def dfs(self, start: 'AccountNode' = None):
+        stack = [self.node_index(start)]
+        while stack:
+            index = stack.pop()
+            yield AccountNode(self, index)
+            stack.extend(reversed(self.children[index]))
+
+    # Walks the tree (or the subtree of 'start') in breadth-first order
+    def bfs(self, start: 'AccountNode' = None):
+        queue = [self.node_index(start)]
+        for index in queue:
+            yield AccountNode(self, index)
+            queue.extend(self.children[index])
+
+    def node_index(self, node: 'AccountNode') -> int:
+        if node is None:
+            return 0
+        assert isinstance(node, AccountNode) and node.tree is self
+        return node.index
+
+    def prefix_range(self, prefix: str):
+        position = bisect_left(self.sorted_keys, prefix)
+        while position < len(self.sorted):
+            (key, index) = self.sorted[position]
+            if not key.startswith(prefix):
+                break
+            yield index
+            position += 1
+
+    # Lower-cased literal text after a leading ^ (empty if the pattern has alternatives or does not start with ^)
+    @staticmethod
+    def literal_prefix(pattern: str) -> str:
+        match = re.match(r'\^([^\\.^$*+?{}\[\]|()]*)(.?)', pattern)
+        if match is None or '|' in pattern:
+            return ''
+        (prefix, next_char) = match.groups()
+        # The last literal character is optional if it is followed by a quantifier (e.g. ^Assets?)
+        if next_char in ('*', '?', '{'):
+            prefix = prefix[:-1]
+        return prefix.lower()
+
+# Account in a cached account tree
+class AccountNode:
+
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree: AccountTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    @property
+    def fullname(self) -> str:
+        return self.tree.fullnames[self.index]
+
+    @property
+    def name(self) -> str:
+        return self.tree.names[self.index]
+
+    @property
+    def depth(self) -> int:
+        return self.tree.depths[self.index]
+
+    @property
+    def parent(self) -> 'AccountNode':
+        parent = self.tree.parents[self.index]
+        return AccountNode(self.tree, parent) if parent >= 0 else None
+
+    @property
+    def children(self) -> List['AccountNode']:
+        return [AccountNode(self.tree, index) for index in self.tree.children[self.index]]
+
+    @property
+    def account(self) -> Account:
+        return Account.from_origin(self.tree.columns.Accounts[self.index])
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, AccountNode) and self.tree is other.tree and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return 'AccountNode(%r)' % self.fullname
+
+# LRU cache of account trees keyed by root accounts. A tree is built again when accounts were added to or removed from the root
+class AccountTreeCache:
+
+    def __init__(self, max_size: int = 8) -> None:
+        self.max_size = max_size
+        self.trees = OrderedDict()
+
+    def get(self, root: Account) -> AccountTree:
+        key = root.origin
+        tree = self.trees.get(key)
+        if tree is None or not tree.is_actual():
+            tree = AccountTree(root)
+            self.trees[key] = tree
+        self.trees.move_to_end(key)
+        while len(self.trees) > self.max_size:
+            self.trees.popitem(last=False)
+        return tree
+
+    def invalidate(self):
+        self.trees.clear()
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+account_tree_cache = AccountTreeCache()
+
+###########################
+# Ported from py_session.cc
+
+class Session(Scope, ContextOriginKeeper):
+
+    __slots__ = ()
+
+    def __init__(self, origin = None) -> None:
+        if not origin is None:
+            assert isinstance(origin, OriginSession)
+        self.origin = origin
+
+    @classmethod
+    def from_origin(cls, origin):
+        return Session(origin=origin) if not origin is None else None
+
+    # Creates a session with its own journal, commodity pool and options. Its methods can be called explicitly;
+    # module-level functions (read_journal, execute_command etc) use it inside 'with' statement:
+    #   with ledger.Session.create() as forecast:
+    #       ledger.read_journal("forecast.dat")
+    # Objects that belong to the session (journals, posts, amounts) should be used while the session is entered.
+    @classmethod
+    def create(cls) -> 'Session':
+        return Session(OriginIsolatedSession.Create(MainApplicationContext.Current))
+
+    def get_origin(self):
+        return ExtendedSession.Current
+
+    # Application context of the session (the context of the module session if the session is not created by Session.create)
+    def get_context(self):
+        return self._origin.Context if isinstance(self._origin, OriginIsolatedSession) else default_context
+
+    # Makes the session context current for the calling thread inside 'with' statement
+    @contextmanager
+    def enter(self):
+        switcher = self.get_context().EnterCurrentThread()
+        try:
+            yield self
+        finally:
+            switcher.Dispose()
+
+    # Makes the session current for module-level functions (see current_session) and its context current for the calling thread
+    def __enter__(self) -> 'Session':
+        switcher = self.get_context().EnterCurrentThread()
+        get_session_stack().append((self, switcher))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stack = get_session_stack()
+        if not stack or not stack[-1][0] is self:
+            raise Exception("Session is not the innermost session entered on this thread")
+        (ssn, switcher) = stack.pop()
+        switcher.Dispose()
+
+    # Removes cached query and command results of the session journal (and wrappers of session objects if 'wrappers' is set);
+    # caches of other sessions are kept
+    def invalidate_caches(self, wrappers: bool = False):
+        journal = self.journal()
+        if not journal is None:
+            query_cache.invalidate(journal)
+            report_cache.invalidate(journal)
+        if wrappers:
+            wrapper_cache.invalidate(self)
+
+    # If parallel is set, independent included files (transactions, prices and comments only) are parsed on worker threads
+    def read_journal(self, path_name: str, parallel: bool = False) -> Journal:
+        if parallel:
+            return self.read_journals([path_name], parallel)
+        self.invalidate_caches()
+        with self.enter():
+            return Journal.from_origin(self.origin.ReadJournal(path_name))
+
+    # Reads several journal files (like several --file options); with parallel, independent files are parsed concurrently
+    # and merged in the order they are listed
+    def read_journals(self, path_names: Iterable[str], parallel: bool = False) -> Journal:
+        assert not isinstance(path_names, str)
+        self.invalidate_caches()
+        with self.enter():
+            return Journal.from_origin(SessionExtensions.ReadJournals(self.origin, to_net_args(path_names), parallel))
+
+    def read_journal_from_string(self, data: str) -> Journal:
+        self.invalidate_caches()
+        with self.enter():
+            return Journal.from_origin(self.origin.ReadJournalFromString(data))
+
+    def read_journal_files(self) -> Journal:
+        self.invalidate_caches()
+        with self.enter():
+            return Journal.from_origin(self.origin.ReadJournalFiles())
+
+    # Populates the journal from a snapshot file; source files are read again if they were changed after the snapshot was saved.
+    # The session journal should be empty (see close_journal_files)
+    def load_snapshot(self, path_name: str) -> Journal:
+        assert isinstance(path_name, str)
+        self.invalidate_caches()
+        with self.enter():
+            return Journal.from_origin(SessionExtensions.LoadJournalSnapshot(self.origin, path_name))
+
+    def close_journal_files(self):
+        self.invalidate_caches(wrappers=True)
+        with self.enter():
+            self.origin.CloseJournalFiles()
+
+    def journal(self) -> Journal:
+        with self.enter():
+            return Journal.from_origin(self.origin.Journal)
+
+    # Executes a command in this session (see module-level execute_command)
+    def execute_command(self, args, readJournalFiles: bool = None, output = None, chunk_size: int = None):
+        with self.enter():
+            if output is None and not readJournalFiles and report_cache.enabled:
+                return report_cache.execute_command(self, args)
+
+            net_args = to_net_args(args)
+            if output is None:
+                return SessionExtensions.ExecuteCommand(self.origin, net_args) if readJournalFiles is None else SessionExtensions.ExecuteCommand(self.origin, net_args, readJournalFiles)
+
+            writer = to_output_writer(output, chunk_size)
+            return SessionExtensions.ExecuteCommand(self.origin, net_args, writer) if readJournalFiles is None else SessionExtensions.ExecuteCommand(self.origin, net_args, writer, readJournalFiles)
+
+default_context = MainApplicationContext.Current
+session_threads = threading.local()
+session = Session()
+
+# Sessions entered by 'with' statements on the calling thread; every thread has its own stack
+def get_session_stack() -> List:
+    stack = getattr(session_threads, 'stack', None)
+    if stack is None:
+        stack = session_threads.stack = []
+    return stack
+
+# Returns the session that module-level functions use on the calling thread: the innermost session entered by 'with' statement
+# on this thread or the module session (ledger.session)
+def current_session() -> Session:
+    stack = get_session_stack()
+    return stack[-1][0] if stack else session
+
+def read_journal(path_name: str, parallel: bool = False) -> Journal:
+    return current_session().read_journal(path_name, parallel)
+
+def read_journals(path_names: Iterable[str], parallel: bool = False) -> Journal:
+    return current_session().read_journals(path_names, parallel)
+
+def read_journal_from_string(data: str) -> Journal:
+    return current_session().read_journal_from_string(data)
+
+def load_snapshot(path_name: str) -> Journal:
+    return current_session().load_snapshot(path_name)
+
+###########################
+# Ported from py_value.cc
+
+class ValueType(enum.Enum):  # ValueType enum
+    Void = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Void)
+    Boolean = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Boolean)
+    DateTime = FlagsAdapter.EnumToInt(OriginValueTypeEnum.DateTime)
+    Date = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Date)
+    Integer = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Integer)
+    Amount = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Amount)
+    Balance = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Balance)
+    String = FlagsAdapter.EnumToInt(OriginValueTypeEnum.String)
+    Mask = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Mask)
+    Sequence = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Sequence)
+    Scope = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Scope)
+    Any = FlagsAdapter.EnumToInt(OriginValueTypeEnum.Any)
+
+class Value(OriginKeeper):
+
+    __slots__ = ('owned',)
+
+    def __init__(self,val) -> None:
+        # Values of Amount, Balance or Value objects share them, so only values of plain Python objects own their origin
+        self.owned = not isinstance(val, (OriginValue, Value, Amount, Balance, Mask))
+        if isinstance(val, datetime):
+            val = to_ndatetime(val)
+        if isinstance(val, date):
+            val = to_ndate(val)
+        if isinstance(val, bool):
+            val = Boolean(val)
+        if isinstance(val, Amount) or isinstance(val, Balance) or isinstance(val, Mask) or isinstance(val, Value):
+            val = val.origin
+
+        if isinstance(val, ValueList):
+            self.origin = NetListAdapter.CreateValue(val.origin)
+        elif isinstance(val, OriginValue):
+            self.origin = val
+        else:
+            self.origin = OriginValue(val)
+
+    @classmethod
+    def to_value(cls, val) -> 'Value':
+        if val is None:
+            return None
+        if isinstance(val, Value):
+            return val
+        if isinstance(val, Amount) or isinstance(val, Balance):
+            return Value(OriginValue.Get(val.origin))    # Faster than resolving OriginValue constructor overloads
+        return Value(val)
+
+    def is_equal_to(self, val) -> bool:
+        return self.origin.IsEqualTo(val.origin)
+
+    def is_less_than(self, val) -> bool:
+        return self.origin.IsLessThan(val.origin)
+
+    def is_greater_than(self, val) -> bool:
+        return self.origin.IsGreaterThan(val.origin)
+
+    def __eq__(self, o: object) -> bool:
+        return OriginValue.op_Equality(self.origin, Value.to_value(o).origin if not o is None else None)
+
+    def __ne__(self, o: object) -> bool:
+        return OriginValue.op_Inequality(self.origin, Value.to_value(o).origin if not o is None else None)
+
+    def __bool__(self) -> bool:
+        return self.origin.Bool
+
+    def __lt__(self, o: object) -> bool:
+        return OriginValue.op_LessThan(self.origin, Value.to_value(o).origin if not o is None else None)
+
+    def __le__(self, o: object) -> bool:
+        return OriginValue.op_LessThanOrEqual(self.origin, Value.to_value(o).origin if not o is None else None)
+
+    def __gt__(self, o: object) -> bool:
+        return OriginValue.op_GreaterThan(self.origin, Value.to_value(o).origin if not o is None else None)
+
+    def __ge__(self, o: object) -> bool:
+        return OriginValue.op_GreaterThanOrEqual(self.origin, Value.to_value(o).origin if not o is None else None)
+
+    def __add__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Addition(self.origin, Value.to_value(o).origin))
+
+    def __radd__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Addition(Value.to_value(o).origin, self.origin))
+
+    def __sub__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Subtraction(self.origin, Value.to_value(o).origin))
+
+    def __rsub__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Subtraction(Value.to_value(o).origin, self.origin))
+
+    def __mul__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Multiply(self.origin, Value.to_value(o).origin))
+
+    def __rmul__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Multiply(Value.to_value(o).origin, self.origin))
+
+    def __truediv__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Division(self.origin, Value.to_value(o).origin))
+
+    def __rtruediv__(self, o: object) -> 'Value':
+        return Value.to_value(OriginValue.op_Division(Value.to_value(o).origin, self.origin))
+
+    # In-place operators change this value if the wrapper owns its origin (it was created from a Python object or by copy()).
+    # Other wrappers are copied first, so that += does not change shared journal objects.
+    # An empty value takes a copy of the operand, so that further changes do not affect the operand
+
+    def __iadd__(self, o: object) -> 'Value':
+        target = self if self.owned else self.copy()
+        val = Value.to_value(o).origin
+        target.origin.InPlaceAdd(val if not OriginValue.IsNullOrEmpty(target.origin) else OriginValue.Clone(val))
+        return target
+
+    def __isub__(self, o: object) -> 'Value':
+        target = self if self.owned else self.copy()
+        val = Value.to_value(o).origin
+        target.origin.InPlaceSubtract(val if not OriginValue.IsNullOrEmpty(target.origin) else OriginValue.Clone(val))
+        return target
+
+    def __imul__(self, o: object) -> 'Value':
+        target = self if self.owned else self.copy()
+        target.origin.InPlaceMultiply(Value.to_value(o).origin)
+        return target
+
+    def __itruediv__(self, o: object) -> 'Value':
+        target = self if self.owned else self.copy()
+        target.origin.InPlaceDivide(Value.to_value(o).origin)
+        return target
+
+    def copy(self) -> 'Value':
+        value = Value.to_value(OriginValue.Clone(self.origin))
+        value.owned = True
+        return value
+
+    __copy__ = copy
+
+    def negated(self) -> 'Value':
+        return Value.to_value(self.origin.Negated())
+
+    def in_place_negate(self):
+        self.origin.InPlaceNegate()
+
+    def in_place_not(self):
+        self.origin.InPlaceNot()
+
+    def __neg__(self) -> 'Value':
+        return Value.to_value(OriginValue.op_UnaryNegation(self.origin))
+
+    def abs(self) -> 'Value':
+        return Value.to_value(self.origin.Abs())
+
+    __abs__ = abs
+
+    def rounded(self) -> 'Value':
+        return Value.to_value(self.origin.Rounded())
+
+    def in_place_round(self):
+        self.origin.InPlaceRound()
+
+    def truncated(self) -> 'Value':
+        return Value.to_value(self.origin.Truncated())
+
+    def in_place_truncate(self):
+        self.origin.InPlaceTruncate()
+
+    def floored(self) -> 'Value':
+        return Value.to_value(self.origin.Floored())
+
+    def in_place_floor(self):
+        self.origin.InPlaceFloor()
+
+    def unrounded(self) -> 'Value':
+        return Value.to_value(self.origin.Unrounded())
+
+    def in_place_unround(self):
+        self.origin.InPlaceUnround()
+
+    def reduced(self) -> 'Value':
+        return Value.to_value(self.origin.Reduced())
+
+    def in_place_reduce(self):
+        self.origin.InPlaceReduce()
+
+    def unreduced(self) -> 'Value':
+        return Value.to_value(self.origin.Unreduced())
+
+    def in_place_unreduce(self):
+        self.origin.InPlaceUnreduce()
+
+    def value(self, in_terms_of : Commodity = None, moment = None) -> 'Value':
+
+        if in_terms_of is None:
+            return Value.to_value(self.origin.ValueOf(TimesCommon.Current.CurrentTime))
+
+        assert(isinstance(in_terms_of, Commodity))
+
+        if moment is None:
+            return Value.to_value(self.origin.ValueOf(TimesCommon.Current.CurrentTime, in_terms_of.origin))
+
+        return Value.to_value(self.origin.ValueOf(to_ndatetime(moment), in_terms_of.origin))
+
+    def exchange_commodities(self, commodities: str, addPrices: bool = None, moment = None) -> 'Value':
+
+        assert(not (commodities is None) and isinstance(commodities, str))
+        if addPrices is None:
+            return Value.to_value(self.origin.ExchangeCommodities(commodities, False, DateTime())) # default(DateTime) caused PythonNet issued, so arguments are populated explicitly
+
+        assert(isinstance(addPrices, bool))
+        if moment is None:
+            return Value.to_value(self.origin.ExchangeCommodities(commodities, addPrices, DateTime()))
+
+        return Value.to_value(self.origin.ExchangeCommodities(commodities, addPrices, to_ndatetime(moment)))
+
+    def is_nonzero(self) -> bool:
+        return self.origin.IsNonZero
+
+    __nonzero__ = is_nonzero
+
+    def is_realzero(self) -> bool:
+        return self.origin.IsRealZero
+
+    def is_zero(self) -> bool:
+        return self.origin.IsZero
+
+    def is_null(self) -> bool:
+        return OriginValue.IsNullOrEmpty(self.origin)
+
+    def type(self) -> ValueType:
+        return ValueType(FlagsAdapter.EnumToInt(self.origin.Type))
+
+    def is_type(self, type_enum: ValueType) -> bool:
+        return self.type() == type_enum
+
+    def is_boolean(self) -> bool:
+        return self.type() == ValueType.Boolean
+
+    def set_boolean(self, val: bool):
+        self.origin.SetBoolean(val)
+
+    def is_datetime(self) -> bool:
+        return self.type() == ValueType.DateTime
+
+    def set_datetime(self, val: datetime):
+        self.origin.SetDateTime(to_ndatetime(val))
+
+    def is_date(self) -> bool:
+        return self.type() == ValueType.Date
+
+    def set_date(self, val: date):
+        self.origin.SetDate(to_ndate(val))
+
+    def is_long(self) -> bool:
+        return self.type() == ValueType.Integer
+
+    def set_long(self, val: int):
+        self.origin.SetLong(val)
+
+    def is_amount(self) -> bool:
+        return self.type() == ValueType.Amount
+
+    def set_amount(self, val: Amount):
+        self.origin.SetAmount(val.origin)
+
+    def is_balance(self) -> bool:
+        return self.type() == ValueType.Balance
+
+    def set_balance(self, val: Balance):
+        self.origin.SetBalance(val.origin)
+
+    def is_string(self) -> bool:
+        return self.type() == ValueType.String
+
+    def set_string(self, val: str):
+        self.origin.SetString(val)
+
+    def is_mask(self) -> bool:
+        return self.type() == ValueType.Mask
+
+    def set_mask(self, val: 'Mask'):
+        self.origin.SetMask(val.origin)
+
+    def is_sequence(self) -> bool:
+        return self.type() == ValueType.Sequence
+
+    def set_sequence(self, val: Iterable):
+        NetListAdapter.SetValueSequence(self.origin, ValueList(val).origin)
+
+    def to_boolean(self) -> bool:
+        return self.origin.AsBoolean
+
+    def to_long(self) -> int:
+        return self.origin.AsLong
+
+    __int__ = to_long
+
+    def to_datetime(self) -> datetime:
+        return to_pdatetime(self.origin.AsDateTime)
+
+    def to_date(self) -> date:
+        return to_pdate(self.origin.AsDate)
+
+    def to_amount(self) -> Amount:
+        return Amount.from_origin(self.origin.AsAmount)
+
+    def to_balance(self) -> Balance:
+        return Balance.from_origin(self.origin.AsBalance)
+
+    def to_string(self) -> str:
+        return self.origin.AsString
+
+    __str__ = to_string
+
+    def to_mask(self) -> 'Mask':
+        return Mask.from_origin(self.origin.AsMask)
+
+    def to_sequence(self) -> Iterable:
+        return ValueList(NetListAdapter.GetValueSequence(self.origin))
+
+    def __repr__(self) -> str:
+        return self.origin.Dump()
+
+    def casted(self, type: ValueType) -> 'Value':
+        ntype = NetEnum.ToObject(OriginValueTypeEnum, type.value)
+        return Value.to_value(self.origin.Casted(ntype))
+
+    def in_place_cast(self, type: ValueType):
+        ntype = NetEnum.ToObject(OriginValueTypeEnum, type.value)
+        self.origin.InPlaceCast(ntype)
+
+    def simplified(self) -> 'Value':
+        return Value.to_value(self.origin.Simplified())
+
+    def in_place_simplify(self):
+        self.origin.InPlaceSimplify()
+
+    def number(self) -> 'Value':
+        return Value.to_value(self.origin.Number())
+
+    def annotate(self, details: Annotation):
+        self.origin.Annotate(details.origin)
+
+    def has_annotation(self) -> bool:
+        return self.origin.HasAnnotation
+
+    @property
+    def annotation(self) -> Annotation:
+        return Annotation.from_origin(self.origin.Annotation)
+
+    def strip_annotations(self, keep_details: KeepDetails = None) -> 'Value':
+        if keep_details is None:
+            return Value.to_value(self.origin.StripAnnotations(OriginAnnotationKeepDetails()))
+        return Value.to_value(self.origin.StripAnnotations(keep_details.origin))
+
+    def push_back(self,val):
+        self.origin.PushBack(Value.to_value(val).origin)
+
+    def pop_back(self):
+        self.origin.PopBack()
+
+    def size(self) -> int:
+        return self.origin.Size
+
+    def label(self) -> str:
+        return self.origin.Label()
+
+    def valid(self) -> bool:
+        return self.origin.IsValid
+
+    def basetype(self):
+        if self.is_boolean():
+            return type(bool)
+        if self.is_long():
+            return type(int)
+        if self.is_string():
+            return type(str)
+
+        return self.origin.BaseType()
+
+NULL_VALUE = Value(OriginValue.Empty)
+
+def string_value(s: str) -> Value:
+    return Value.to_value(OriginValue.StringValue(s))
+
+def mask_value(s: str) -> Value:
+    return Value.to_value(OriginValue.MaskValue(s))
+
+def value_context(val: Value) -> str:
+    return OriginValue.ValueContext(val.origin)
+
+###########################
+# Routine to acquire and release Python output streams
+
+from io import TextIOBase
+
+# Python output is collected in a buffer and passed to NLedger console by chunks, so every print does not cross the interop boundary.
+# With line buffering (default), the buffer is flushed when a line is completed or the buffer is full; otherwise, only when it is full.
+# Size-based buffering is faster for hooks that print a lot, but NLedger output can be written before buffered Python output until flush() is called.
+# Buffering can be changed by sys.stdout.reconfigure(buffer_size=65536, line_buffering=False).
+OUTPUT_BUFFER_SIZE = 8192
+
+class RedirectWrapperIO(TextIOBase):
+
+    is_error = False
+
+    def __init__(self, is_error, buffer_size: int = OUTPUT_BUFFER_SIZE, line_buffering: bool = True):
+        super().__init__()
+        assert buffer_size > 0
+        self.is_error = is_error
+        self.buffer_size = buffer_size
+        self.line_buffering = line_buffering
+        self.chunks = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self,s):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if s:
+            self.chunks.append(s)
+            self.size += len(s)
+            if self.size >= self.buffer_size or (self.line_buffering and '\n' in s):
+                self.flush()
+        return len(s)
+
+    def flush(self):
+        if self.chunks:
+            (chunks, self.chunks, self.size) = (self.chunks, [], 0)
+            self.write_through(''.join(chunks))
+
+    def write_through(self, s: str):
+        PythonSession.ConsoleWrite(s, self.is_error)
+
+    def reconfigure(self, *, buffer_size: int = None, line_buffering: bool = None):
+        self.flush()
+        if not buffer_size is None:
+            assert buffer_size > 0
+            self.buffer_size = buffer_size
+        if not line_buffering is None:
+            self.line_buffering = line_buffering
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+        super().close()
+
+_stdout = sys.stdout
+_stderr = sys.stderr
+
+def acquire_output_streams(buffer_size: int = OUTPUT_BUFFER_SIZE, line_buffering: bool = True):
+    if sys.stdout == _stdout:
+        sys.stdout = RedirectWrapperIO(False, buffer_size, line_buffering)
+
+    if sys.stderr == _stderr:
+        sys.stderr = RedirectWrapperIO(True, buffer_size, True)
+
+# Buffered output is always flushed before the original streams are restored
+def release_output_streams():
+    try:
+        for stream in (sys.stdout, sys.stderr):
+            if isinstance(stream, RedirectWrapperIO):
+                stream.flush()
+    finally:
+        sys.stdout = _stdout
+        sys.stderr = _stderr
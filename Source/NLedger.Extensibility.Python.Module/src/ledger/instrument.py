@@ -0,0 +1,242 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+###########################
+# Wrapper layer instrumentation
+
+# Counts and times calls of wrapper methods and properties (Posting.amount, Amount.__add__, NList.__getitem__, Posting.from_origin,
+# Value.to_value etc) and module functions, so it is possible to see whether time is spent in NLedger or in crossing the interop layer:
+#   ledger.instrument.enable()
+#   ledger.read_journal("ledger.dat").query("expenses")
+#   print(ledger.instrument.report(top=20))
+#   ledger.instrument.dump_stats("wrappers.prof")     # cProfile format: python -m pstats wrappers.prof, snakeviz etc
+#   ledger.instrument.dump_folded("wrappers.folded")  # folded stacks: flamegraph.pl wrappers.folded > wrappers.svg
+#   ledger.instrument.disable()
+# Own time of a wrapper is its total time without nested wrapper calls, i.e. time of the Python code, pythonnet calls and NLedger code it runs.
+# Methods are counted by the class that defines them (e.g. PostingList.__getitem__ is counted as NList.__getitem__).
+# Instrumentation slows down wrapper calls, so it should be enabled for diagnostics only.
+
+from typing import List
+from collections import namedtuple
+import functools
+import inspect
+import marshal
+import threading
+import time
+
+import ledger
+
+# Special methods that are not instrumented (they are called by the interpreter itself or would break patching)
+SKIPPED_NAMES = {'__new__', '__init_subclass__', '__class_getitem__', '__getattr__', '__getattribute__', '__setattr__', '__delattr__', '__del__', '__subclasshook__'}
+
+# Statistics of one wrapper: number of calls, primitive (not recursive) calls, total (inclusive) and own time in seconds
+CallStats = namedtuple('CallStats', ['name', 'calls', 'primitive_calls', 'total_time', 'own_time'])
+
+# Wrapper classes are classes of the module that keep .Net objects (origins)
+def is_wrapper_class(attr) -> bool:
+    return inspect.isclass(attr) and attr.__module__ == ledger.__name__ and issubclass(attr, (ledger.OriginKeeper, ledger.NList))
+
+# Class attributes are set directly, because classproperty_meta would pass a class property to its setter
+def set_attribute(owner, name: str, value):
+    if inspect.isclass(owner):
+        type.__setattr__(owner, name, value)
+    else:
+        setattr(owner, name, value)
+
+class WrapperStats:
+
+    def __init__(self, name: str, code) -> None:
+        self.name = name
+        self.code = code
+        self.calls = 0
+        self.primitive_calls = 0
+        self.total_time = 0.0
+        self.own_time = 0.0
+        self.callers = {}   # caller name => [primitive calls, calls, own time, total time]
+
+class Profiler:
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {}
+        self.folded = {}    # 'outer;inner' => own time
+        self.patches = []   # (owner, name, original attribute)
+
+    def is_enabled(self) -> bool:
+        return bool(self.patches)
+
+    def get_stats(self, name: str, func) -> WrapperStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            code = getattr(func, '__code__', None)
+            stats = self.stats.setdefault(name, WrapperStats(name, (code.co_filename, code.co_firstlineno, name) if code else ('~', 0, name)))
+        return stats
+
+    def get_stack(self) -> list:
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def leave(self, stack: list, stats: WrapperStats, start: float, count: bool):
+        elapsed = time.perf_counter() - start
+        frame = stack.pop()
+        own_time = elapsed - frame[1]
+        is_recursive = any(outer[0] is stats for outer in stack)
+        caller = stack[-1][0].name if stack else None
+        if stack:
+            stack[-1][1] += elapsed
+        path = ';'.join([outer[0].name for outer in stack] + [stats.name])
+
+        with self.lock:
+            stats.own_time += own_time
+            if count:
+                stats.calls += 1
+                if not is_recursive:
+                    stats.primitive_calls += 1
+            if not is_recursive:
+                stats.total_time += elapsed
+            if not caller is None:
+                caller_stats = stats.callers.setdefault(caller, [0, 0, 0.0, 0.0])
+                if count:
+                    caller_stats[1] += 1
+                    if not is_recursive:
+                        caller_stats[0] += 1
+                caller_stats[2] += own_time
+                if not is_recursive:
+                    caller_stats[3] += elapsed
+            self.folded[path] = self.folded.get(path, 0.0) + own_time
+
+    def wrap(self, name: str, func):
+        stats = self.get_stats(name, func)
+
+        if inspect.isgeneratorfunction(func):
+            # Time of a generator is collected when it is resumed; the call is counted once
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                gen = func(*args, **kwargs)
+                count = True
+                while True:
+                    stack = self.get_stack()
+                    stack.append([stats, 0.0])
+                    start = time.perf_counter()
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        return
+                    finally:
+                        self.leave(stack, stats, start, count)
+                        count = False
+                    yield item
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self.get_stack()
+            stack.append([stats, 0.0])
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.leave(stack, stats, start, True)
+        return wrapper
+
+    def instrument_attribute(self, owner_name: str, name: str, attr):
+        full_name = '%s.%s' % (owner_name, name) if owner_name else name
+        if isinstance(attr, property):
+            return type(attr)(self.wrap(full_name, attr.fget) if attr.fget else None,
+                self.wrap(full_name + '.setter', attr.fset) if attr.fset else None, attr.fdel, attr.__doc__)
+        if isinstance(attr, classmethod):
+            return classmethod(self.wrap(full_name, attr.__func__))
+        if isinstance(attr, staticmethod):
+            return staticmethod(self.wrap(full_name, attr.__func__))
+        if inspect.isfunction(attr):
+            return self.wrap(full_name, attr)
+        return None
+
+    def patch(self, owner, owner_name: str, name: str, attr):
+        if name in SKIPPED_NAMES:
+            return
+        instrumented = self.instrument_attribute(owner_name, name, attr)
+        if not instrumented is None:
+            self.patches.append((owner, name, attr))
+            set_attribute(owner, name, instrumented)
+
+    def enable(self):
+        if self.is_enabled():
+            return
+
+        # Wrapper classes appear in the module namespace when the module code is executed (see the lazy loader)
+        ledger.warmup()
+        for (name, attr) in list(vars(ledger).items()):
+            if is_wrapper_class(attr):
+                for (attr_name, class_attr) in list(vars(attr).items()):
+                    self.patch(attr, attr.__name__, attr_name, class_attr)
+            elif inspect.isfunction(attr) and attr.__module__ == ledger.__name__:
+                self.patch(ledger, None, name, attr)
+
+    def disable(self):
+        for (owner, name, attr) in reversed(self.patches):
+            set_attribute(owner, name, attr)
+        self.patches.clear()
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+            self.folded.clear()
+
+profiler = Profiler()
+
+# Instruments wrapper classes and functions of the module. Statistics are collected until disable() is called
+def enable():
+    profiler.enable()
+
+# Restores original methods; collected statistics are kept until reset() is called
+def disable():
+    profiler.disable()
+
+def is_enabled() -> bool:
+    return profiler.is_enabled()
+
+def reset():
+    profiler.reset()
+
+# Statistics of called wrappers sorted by 'own_time', 'total_time' or 'calls'
+def get_stats(sort: str = 'own_time') -> List[CallStats]:
+    assert sort in CallStats._fields
+    with profiler.lock:
+        items = [CallStats(s.name, s.calls, s.primitive_calls, s.total_time, s.own_time) for s in profiler.stats.values() if s.calls]
+    return sorted(items, key=lambda item: getattr(item, sort), reverse=sort != 'name')
+
+# Text table of the top hot paths
+def report(top: int = 20, sort: str = 'own_time') -> str:
+    lines = ['%-45s %10s %12s %12s %10s' % ('Wrapper', 'Calls', 'Own, sec', 'Total, sec', 'Own, us')]
+    for item in get_stats(sort)[:top]:
+        lines.append('%-45s %10d %12.4f %12.4f %10.2f' % (item.name, item.calls, item.own_time, item.total_time, item.own_time * 1e6 / item.calls))
+    return '\n'.join(lines)
+
+# Writes statistics in cProfile (marshal) format that can be loaded by pstats.Stats
+def dump_stats(path: str):
+    with profiler.lock:
+        stats = {}
+        for s in profiler.stats.values():
+            if not s.calls:
+                continue
+            callers = dict((profiler.stats[caller].code, tuple(values)) for (caller, values) in s.callers.items())
+            stats[s.code] = (s.primitive_calls, s.calls, s.own_time, s.total_time, callers)
+    with open(path, 'wb') as f:
+        marshal.dump(stats, f)
+
+# Writes folded stacks ('outer;inner own_time_in_microseconds' per line) for flamegraph.pl, speedscope and similar tools
+def dump_folded(path: str):
+    with profiler.lock:
+        lines = ['%s %d' % (path_name, round(own_time * 1e6)) for (path_name, own_time) in sorted(profiler.folded.items())]
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
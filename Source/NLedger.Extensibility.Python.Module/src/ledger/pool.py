@@ -0,0 +1,323 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+###########################
+# Process pool of pre-warmed NLedger sessions
+
+# The module has the only global session and commands hold the GIL, so reports in one process are executed one by one.
+# ReportPool starts worker processes; every worker imports the module (CLR Runtime starts once per worker), reads journal files once
+# and then executes jobs against the parsed journal:
+#   with ledger.pool.ReportPool(["ledger.dat"], workers=4) as pool:
+#       results = pool.map_commands(["bal", "reg food", "bal -M"])
+# Results are passed between processes, so they contain Python values only: commands return CommandResult,
+# queries and reports return ReportRow items (see below) with amounts and totals formatted as strings.
+
+from typing import Iterable, List
+from collections import namedtuple
+from concurrent.futures import Future
+import multiprocessing
+import os
+import queue
+import threading
+
+import ledger
+
+# Result of a command executed by a worker (field names repeat the result of ledger.execute_command)
+CommandResult = namedtuple('CommandResult', ['Output', 'Error'])
+
+# Row of query and report results (fields repeat ledger.ReportRow). It is a type of this module rather than ledger.ReportRow,
+# so unpickling results in the parent process does not load the module core and start CLR Runtime
+ReportRow = namedtuple('ReportRow', ['date', 'payee', 'account', 'amount', 'total'])
+
+###########################
+# Worker process
+
+def read_journal_paths(journal_paths: List[str]):
+    if len(journal_paths) == 1:
+        return ledger.read_journal(journal_paths[0])
+    return ledger.read_journals(journal_paths)
+
+def format_value(value) -> str:
+    return str(value) if not value is None else None
+
+def run_job(kind: str, args):
+    if kind == 'ping':
+        return os.getpid()
+
+    if kind == 'execute_command':
+        cmd_result = ledger.execute_command(args)
+        return CommandResult(cmd_result.Output, cmd_result.Error)
+
+    if kind == 'query':
+        return [ReportRow(post.date, post.xact.payee, post.account.fullname() if not post.account is None else None, format_value(post.amount), None)
+            for post in ledger.session.journal().query(args)]
+
+    if kind == 'report':
+        (command, command_args) = args
+        return [ReportRow(row.date, row.payee, row.account, format_value(row.amount), format_value(row.total)) for row in ledger.iter_report(command, command_args)]
+
+    raise Exception("Unknown job: " + kind)
+
+# Entry point of a worker process. It reads the journal, reports readiness and executes jobs until it gets None
+def worker_main(conn, journal_paths: List[str]):
+    try:
+        read_journal_paths(journal_paths)
+    except Exception as e:
+        conn.send((False, str(e)))
+        conn.close()
+        return
+
+    conn.send((True, os.getpid()))
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+
+        (kind, args) = job
+        try:
+            result = (True, run_job(kind, args))
+        except Exception as e:
+            result = (False, str(e))
+        conn.send(result)
+
+    conn.close()
+
+###########################
+# Pool
+
+# Forking a process with running CLR Runtime is not safe, so workers are always spawned
+mp_context = multiprocessing.get_context('spawn')
+
+# Error that means the worker process is not usable anymore (it is restarted before the next job)
+class WorkerError(Exception):
+    pass
+
+# Parent side of a worker process. Its dispatcher thread takes jobs from the pool queue and passes them to the process one by one
+class PoolWorker:
+
+    def __init__(self, pool: 'ReportPool', index: int) -> None:
+        self.pool = pool
+        self.index = index
+        self.lock = threading.Lock()
+        self.process = None
+        self.conn = None
+        self.pid = None
+        self.jobs = 0
+        self.thread = threading.Thread(target=self.dispatch, name="ReportPool worker %d" % index, daemon=True)
+
+    def launch(self):
+        (parent_conn, child_conn) = mp_context.Pipe()
+        self.process = mp_context.Process(target=worker_main, args=(child_conn, self.pool.journal_paths), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.pid = None
+        self.jobs = 0
+
+    def wait_ready(self):
+        (is_ready, value) = self.receive(self.pool.start_timeout)
+        if not is_ready:
+            self.stop()
+            raise Exception("Worker process cannot read journal files: " + value)
+        self.pid = value
+
+    def start(self):
+        self.launch()
+        self.wait_ready()
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(self.pool.stop_timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+        self.pid = None
+
+    def restart(self):
+        self.stop()
+        self.pool.restarts += 1
+        self.start()
+
+    def is_alive(self) -> bool:
+        return not self.process is None and self.process.is_alive()
+
+    def receive(self, timeout: float = None):
+        try:
+            if not self.conn.poll(timeout):
+                raise WorkerError("Worker process did not respond in %s seconds" % timeout)
+            return self.conn.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerError("Worker process terminated unexpectedly") from e
+
+    # Sends a job to the process and returns its result; the caller holds the lock
+    def call(self, kind: str, args, timeout: float = None):
+        if not self.is_alive():
+            self.restart()
+        try:
+            self.conn.send((kind, args))
+        except (OSError, ValueError) as e:
+            raise WorkerError("Worker process terminated unexpectedly") from e
+
+        (is_success, value) = self.receive(timeout)
+        if not is_success:
+            raise Exception(value)
+        return value
+
+    def dispatch(self):
+        while True:
+            item = self.pool.jobs.get()
+            if item is None:
+                break
+
+            (future, kind, args) = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            with self.lock:
+                try:
+                    result = self.call(kind, args, self.pool.job_timeout)
+                except WorkerError as e:
+                    future.set_exception(e)
+                    self.restart_silently()
+                    continue
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+
+                self.jobs += 1
+                if self.pool.max_jobs and self.jobs >= self.pool.max_jobs:
+                    self.restart_silently()
+
+    # Restarts the process from the dispatcher thread; if it cannot start, the next job tries again
+    def restart_silently(self):
+        try:
+            self.restart()
+        except Exception:
+            self.stop()
+
+# Pool of worker processes with parsed journals.
+# - workers: number of processes (the number of CPUs by default);
+# - max_jobs: a worker process is recycled (restarted with a fresh journal) after executing this number of jobs (never by default);
+# - job_timeout: a worker that does not complete a job in time is restarted and the job fails with WorkerError;
+# - start_timeout: time to wait until a worker process imports the module and reads journal files.
+class ReportPool:
+
+    def __init__(self, journal_paths, workers: int = None, max_jobs: int = None, job_timeout: float = None, start_timeout: float = 300.0, stop_timeout: float = 10.0) -> None:
+        if isinstance(journal_paths, str):
+            journal_paths = [journal_paths]
+        self.journal_paths = [os.path.abspath(path) for path in journal_paths]
+        assert self.journal_paths, "Journal paths are not specified"
+
+        self.max_jobs = max_jobs
+        self.job_timeout = job_timeout
+        self.start_timeout = start_timeout
+        self.stop_timeout = stop_timeout
+        self.restarts = 0
+        self.closed = False
+        self.jobs = queue.Queue()
+        self.workers = [PoolWorker(self, index) for index in range(workers or os.cpu_count() or 1)]
+
+        # Processes are launched together, so they import the module and read journals in parallel
+        try:
+            for worker in self.workers:
+                worker.launch()
+            for worker in self.workers:
+                worker.wait_ready()
+        except:
+            for worker in self.workers:
+                worker.stop()
+            raise
+
+        for worker in self.workers:
+            worker.thread.start()
+
+    def __enter__(self) -> 'ReportPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.workers)
+
+    def submit(self, kind: str, args = None) -> Future:
+        if self.closed:
+            raise Exception("Report pool is closed")
+        future = Future()
+        self.jobs.put((future, kind, args))
+        return future
+
+    # Executes a command in a worker process and returns CommandResult (see ledger.execute_command)
+    def submit_command(self, args) -> Future:
+        return self.submit('execute_command', args)
+
+    def execute_command(self, args) -> CommandResult:
+        return self.submit_command(args).result()
+
+    # Executes a query in a worker process and returns the list of ReportRow items (one per found posting; totals are empty)
+    def query(self, query_text: str) -> List:
+        return self.submit('query', query_text).result()
+
+    # Runs a register or balance report in a worker process and returns its rows (see ledger.report)
+    def report(self, command: str, args = None) -> List:
+        return self.submit('report', (command, args)).result()
+
+    # Executes commands in parallel and returns their results in the same order
+    def map_commands(self, commands: Iterable) -> List[CommandResult]:
+        futures = [self.submit_command(args) for args in commands]
+        return [future.result() for future in futures]
+
+    # Pings every worker process (waiting until it completes its current job). Workers that do not respond are restarted.
+    # Returns the list of health flags (True if the worker responded).
+    def health_check(self, timeout: float = 10.0) -> List[bool]:
+        health = []
+        for worker in self.workers:
+            with worker.lock:
+                try:
+                    is_healthy = worker.is_alive() and worker.call('ping', None, timeout) == worker.pid
+                except Exception:
+                    is_healthy = False
+                if not is_healthy and not self.closed:
+                    worker.restart_silently()
+            health.append(is_healthy)
+        return health
+
+    # Process identifiers of the workers (changed when workers are recycled or restarted)
+    def pids(self) -> List[int]:
+        return [worker.pid for worker in self.workers]
+
+    # Stops dispatching; jobs that are not started yet are cancelled
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+
+        while True:
+            try:
+                item = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if not item is None:
+                item[0].cancel()
+
+        for worker in self.workers:
+            self.jobs.put(None)
+        for worker in self.workers:
+            worker.thread.join()
+            worker.stop()
@@ -0,0 +1,60 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Account tree benchmark
+# Usage: [path_to_python_executable] account_tree_benchmark.py [--accounts N] [--depth N] [--lookups N]
+
+# It compares account operations on wrappers (every call crosses the interop boundary) with the cached account tree view:
+# - lookups of accounts by full names (Journal.find_account vs Journal.account_tree().find);
+# - full names of all accounts in depth-first order (Account.fullname() vs AccountNode.fullname);
+# - selecting accounts by a regular expression (a Python loop over account wrappers vs AccountTree.find_re).
+
+import argparse
+import re
+import time
+from datetime import date
+
+import ledger
+from ledger.bench import JournalGenerator
+
+def walk(account):
+    yield account
+    for child in account.accounts():
+        yield from walk(child)
+
+def measure(name, func):
+    start = time.perf_counter()
+    result = func()
+    print('%-32s %8.3f sec %10d items' % (name, time.perf_counter() - start, result))
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures account lookups and walks with and without the cached account tree')
+    parser.add_argument('--accounts', type=int, default=500, help='Number of generated accounts')
+    parser.add_argument('--depth', type=int, default=4, help='Maximum depth of generated accounts')
+    parser.add_argument('--lookups', type=int, default=100000, help='Number of lookups by full names')
+    args = parser.parse_args()
+
+    generator = JournalGenerator(xacts=args.accounts * 2, accounts=args.accounts, depth=args.depth, start_date=date(2020, 1, 1))
+    journal = ledger.read_journal_from_string(generator.to_string())
+    names = [account.fullname() for account in walk(journal.master)][1:]
+    lookups = [names[i % len(names)] for i in range(args.lookups)]
+    pattern = '^expenses:.*:food'
+    regex = re.compile(pattern, re.IGNORECASE)
+
+    measure('account_tree() (build)', lambda: len(journal.account_tree()))
+    tree = journal.account_tree()
+    measure('find_account', lambda: sum(1 for name in lookups if not journal.find_account(name, False) is None))
+    measure('AccountTree.find', lambda: sum(1 for name in lookups if not tree.find(name) is None))
+    measure('Account.fullname() walk', lambda: len([account.fullname() for account in walk(journal.master)]))
+    measure('AccountTree walk', lambda: len([node.fullname for node in tree]))
+    measure('regex over wrappers', lambda: len([a for a in walk(journal.master) if regex.search(a.fullname())]))
+    measure('AccountTree.find_re', lambda: len(tree.find_re(pattern)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Accumulation benchmark
+# Usage: [path_to_python_executable] accumulation_benchmark.py [--count N]
+
+# It compares running totals calculated by binary operators (total = total + amount; every step creates a new object)
+# and by in-place operators (total += amount; the total is changed in place) for Balance, Amount and Value.
+
+import argparse
+import time
+
+import ledger
+
+def measure(name, count, step):
+    amounts = [ledger.Amount("%d.%02d EUR" % (i % 100, i % 7)) for i in range(100)]
+    start = time.perf_counter()
+    total = step(count, amounts)
+    elapsed = time.perf_counter() - start
+    print('%-24s %10.0f accumulations per second (total: %s)' % (name, count / elapsed, str(total).strip()))
+
+def balance_binary(count, amounts):
+    total = ledger.Balance()
+    for i in range(count):
+        total = total + amounts[i % 100]
+    return total
+
+def balance_in_place(count, amounts):
+    total = ledger.Balance()
+    for i in range(count):
+        total += amounts[i % 100]
+    return total
+
+def amount_binary(count, amounts):
+    total = ledger.Amount("0 EUR")
+    for i in range(count):
+        total = total + amounts[i % 100]
+    return total
+
+def amount_in_place(count, amounts):
+    total = ledger.Amount("0 EUR")
+    for i in range(count):
+        total += amounts[i % 100]
+    return total
+
+def value_binary(count, amounts):
+    total = ledger.Value(ledger.Amount("0 EUR"))
+    for i in range(count):
+        total = total + amounts[i % 100]
+    return total
+
+def value_in_place(count, amounts):
+    total = ledger.Value(ledger.Amount("0 EUR"))
+    for i in range(count):
+        total += amounts[i % 100]
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares binary and in-place accumulation of amounts')
+    parser.add_argument('--count', type=int, default=10000000, help='Number of accumulations per test')
+    args = parser.parse_args()
+
+    measure('Balance: total + amount', args.count, balance_binary)
+    measure('Balance: total += amount', args.count, balance_in_place)
+    measure('Amount: total + amount', args.count, amount_binary)
+    measure('Amount: total += amount', args.count, amount_in_place)
+    measure('Value: total + amount', args.count, value_binary)
+    measure('Value: total += amount', args.count, value_in_place)
+
+if __name__ == '__main__':
+    main()
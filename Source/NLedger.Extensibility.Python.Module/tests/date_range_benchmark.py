@@ -0,0 +1,57 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Date range selection benchmark
+# Usage: [path_to_python_executable] date_range_benchmark.py [--xacts N] [--months N]
+
+# It selects postings of every month of a synthetic journal (a month-end dashboard) in three ways:
+# - a Python loop over all transactions and postings that checks posting dates;
+# - Journal.query with --begin and --end options;
+# - Journal.posts_between that finds the range in the journal date index by binary search.
+
+import argparse
+import time
+from datetime import date
+
+import ledger
+from ledger.bench import JournalGenerator
+
+def month_ranges(start: date, months: int):
+    for i in range(months):
+        (year, month) = divmod(start.month - 1 + i, 12)
+        begin = date(start.year + year, month + 1, 1)
+        (year, month) = divmod(start.month + i, 12)
+        yield (begin, date(start.year + year, month + 1, 1))
+
+def select_by_loop(journal, begin, end):
+    return [post for xact in journal for post in xact if begin <= post.date < end]
+
+def select_by_query(journal, begin, end):
+    return journal.query('--begin %s --end %s' % (begin.isoformat(), end.isoformat()))
+
+def select_by_index(journal, begin, end):
+    return journal.posts_between(begin, end)
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures selecting postings by date ranges')
+    parser.add_argument('--xacts', type=int, default=5000, help='Number of generated transactions')
+    parser.add_argument('--months', type=int, default=12, help='Number of selected months')
+    args = parser.parse_args()
+
+    generator = JournalGenerator(xacts=args.xacts, start_date=date(2020, 1, 1))
+    journal = ledger.read_journal_from_string(generator.to_string())
+    ranges = list(month_ranges(date(2020, 1, 1), args.months))
+
+    for (name, select) in [('python loop', select_by_loop), ('query --begin --end', select_by_query), ('posts_between', select_by_index)]:
+        start = time.perf_counter()
+        posts = sum(len(select(journal, begin, end)) for (begin, end) in ranges)
+        print('%-22s %8.3f sec %10d posts' % (name, time.perf_counter() - start, posts))
+
+if __name__ == '__main__':
+    main()
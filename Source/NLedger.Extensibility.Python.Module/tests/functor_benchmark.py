@@ -0,0 +1,86 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Python functor benchmark
+# Usage: [path_to_python_executable] functor_benchmark.py [--nledger path_to_nledger_cli] [--scale N] [--repeat N]
+
+# It measures how many calls per second NLedger makes to a Python function that is imported by '--import'
+# and used in a '--display' expression. Every call converts a posting to a Python object and the result back.
+# The input journal is drewr3.dat with transactions repeated N times (10000 by default).
+# NLedger command-line utility should have Python extension enabled (see 'python enable' in nledger-tools).
+
+import argparse
+import os
+import os.path
+import subprocess
+import sys
+import tempfile
+import time
+
+FUNCTOR_MODULE = '''
+def bench_display(post):
+    return post.amount is not None
+'''
+
+# Creates a journal with drewr3.dat transactions repeated 'scale' times.
+# The heading automated transaction and comments are written only once.
+def create_scaled_journal(file_name, scale):
+    source_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'drewr3.dat')
+    with open(source_file, 'r') as f:
+        lines = f.read().splitlines()
+
+    first_xact = next(i for i, line in enumerate(lines) if line[:1].isdigit())
+    header = '\n'.join(lines[:first_xact])
+    body = '\n'.join(lines[first_xact:])
+
+    with open(file_name, 'w') as f:
+        f.write(header + '\n')
+        for _ in range(scale):
+            f.write(body + '\n\n')
+
+def run_nledger(nledger, args):
+    start = time.perf_counter()
+    result = subprocess.run([nledger] + args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise Exception('NLedger failed (%s): %s' % (result.returncode, result.stderr))
+    return elapsed, result.stdout
+
+def best_of(repeat, nledger, args):
+    runs = [run_nledger(nledger, args) for _ in range(repeat)]
+    return min(elapsed for elapsed, _ in runs), runs[0][1]
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures Python functor calls per second in NLedger reports')
+    parser.add_argument('--nledger', default='NLedger-cli', help='Path to NLedger command-line utility')
+    parser.add_argument('--scale', type=int, default=10000, help='How many times drewr3.dat transactions are repeated')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs; the best time is taken')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal_file = os.path.join(temp_dir, 'journal.dat')
+        module_file = os.path.join(temp_dir, 'functor_bench.py')
+        create_scaled_journal(journal_file, args.scale)
+        with open(module_file, 'w') as f:
+            f.write(FUNCTOR_MODULE)
+
+        report = ['-f', journal_file, 'reg', '--format', '.\n']
+        baseline_time, output = best_of(args.repeat, args.nledger, report + ['--display', 'true'])
+        functor_time, _ = best_of(args.repeat, args.nledger, report + ['--import', module_file, '--display', 'bench_display(post)'])
+
+    calls = output.count('\n')
+    functor_overhead = max(functor_time - baseline_time, sys.float_info.epsilon)
+
+    print('Journal: drewr3.dat x %d (%d postings)' % (args.scale, calls))
+    print('Baseline (--display true): %.3f sec' % baseline_time)
+    print('Python functor (--display bench_display(post)): %.3f sec' % functor_time)
+    print('Functor calls per second: %.0f' % (calls / functor_overhead))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Module import time benchmark
+# Usage: [path_to_python_executable] import_benchmark.py [--repeat N]
+
+# It measures start-up time of the module in fresh Python processes:
+# - "import ledger" (the runtime is not started until the module is used);
+# - "import ledger" followed by ledger.warmup() (CLR Runtime start, NLedger assemblies loading and module initialization);
+# - the first call of a function that needs the runtime (ledger.parse_date).
+# Times are measured inside the child process, so Python interpreter start-up is not included.
+
+import argparse
+import subprocess
+import sys
+
+SCENARIOS = [
+    ('import ledger', 'import ledger'),
+    ('import + warmup()', 'import ledger; ledger.warmup()'),
+    ('import + parse_date()', 'import ledger; ledger.parse_date("2023/01/01")'),
+]
+
+MEASURE_CODE = '''
+import time
+start = time.perf_counter()
+%s
+print(time.perf_counter() - start)
+'''
+
+def measure(code, repeat):
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', MEASURE_CODE % code], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        if result.returncode != 0:
+            raise Exception('Python process failed (%s): %s' % (result.returncode, result.stderr))
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures import time of the ledger module')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs; the best time is taken')
+    args = parser.parse_args()
+
+    for (name, code) in SCENARIOS:
+        print('%-25s %8.3f sec' % (name, measure(code, args.repeat)))
+
+if __name__ == '__main__':
+    main()
@@ -21,6 +21,8 @@ import os.path
 import sys
 import re
 import collections
+import copy
+import asyncio
 
 # Find path to the latest NLedger.Extensibility.Python.dll on development environment. 
 # It returns path to either debug or release binaries depending what was built later.
@@ -70,6 +72,12 @@ from datetime import date
 from System import DateTime
 from NLedger.Utility import Date
 
+try:
+    import numpy
+    is_numpy_available = True
+except ImportError:
+    is_numpy_available = False
+
 # Test classes
 
 class LedgerModuleTests(unittest.TestCase):
@@ -140,6 +148,14 @@ class LedgerModuleTests(unittest.TestCase):
     def test_session_attribute(self):
         self.assertIsInstance(ledger.session, ledger.Session)
 
+    def test_wrappers_have_slots(self):
+        for cls in [cls for cls in vars(ledger).values() if isinstance(cls, type) and issubclass(cls, ledger.OriginKeeper)]:
+            self.assertIn('__slots__', cls.__dict__, cls.__name__)
+
+        self.assertFalse(hasattr(ledger.Posting(), '__dict__'))
+        self.assertFalse(hasattr(ledger.Amount(10), '__dict__'))
+        self.assertFalse(hasattr(ledger.Account(), '__dict__'))
+
     def test_times_parse_datetime(self):
         self.assertEqual(datetime(2021, 5, 22, 18, 55, 59), ledger.parse_datetime("2021/5/22 18:55:59"))
 
@@ -186,6 +202,97 @@ class LedgerModuleTests(unittest.TestCase):
         self.assertTrue(cmd_output)     # contains some text
         self.assertFalse(cmd_error)     # empty string
 
+    def test_execute_command_streams_output(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+        expected_output = ledger.execute_command("reg").Output
+
+        import io
+        output = io.StringIO()
+        cmd_result = ledger.execute_command("reg", output=output, chunk_size=100)
+        self.assertEqual("", cmd_result.Output)
+        self.assertFalse(cmd_result.Error)
+        self.assertEqual(expected_output, output.getvalue())
+
+        chunks = []
+        def consumer():
+            while True:
+                chunks.append((yield))
+        ledger.execute_command(["reg"], output=consumer(), chunk_size=100)
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(expected_output, "".join(chunks))
+
+        def failing_consumer(chunk):
+            raise IOError("consumer failure")
+        self.assertIn("consumer failure", ledger.execute_command("reg", output=failing_consumer).Error)
+
+    def test_print_command_streams_output(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        import io
+        output = io.StringIO()
+        ledger.print_command("bal ^Expenses", output=output)
+        self.assertEqual(ledger.execute_command("bal ^Expenses").Output + "\n", output.getvalue())
+
+        with self.assertRaises(Exception):
+            ledger.print_command("unknown-command", output=output)
+
+    def test_report_returns_register_rows(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        rows = ledger.report('register', '^Expenses:Auto')
+        self.assertEqual(1, len(rows))
+        self.assertIsInstance(rows[0], ledger.ReportRow)
+        self.assertEqual(date(2011, 1, 25), rows[0].date)
+        self.assertEqual("Tom's Used Cars", rows[0].payee)
+        self.assertEqual("Expenses:Auto", rows[0].account)
+        self.assertIsInstance(rows[0].amount, ledger.Value)
+        self.assertEqual(ledger.Amount("$5,500.00"), rows[0].amount.to_amount())
+
+        totals = [row.total.to_amount() for row in ledger.report('reg', ['^Expenses:Food'])]
+        self.assertEqual(8, len(totals))
+        self.assertEqual(ledger.Amount("$334.00"), totals[-1])
+
+    def test_report_returns_balance_rows(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        rows = ledger.report('bal', '--flat ^Assets')
+        self.assertEqual(['Assets:Checking', 'Assets:Checking:Business', 'Assets:Savings'], [row.account for row in rows])
+        self.assertIsNone(rows[0].date)
+        self.assertEqual(ledger.Amount("$-5,200.00"), rows[2].total.to_amount())
+
+    def test_iter_report_yields_rows(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        default_scope = ledger.MainApplicationContext.Current.DefaultScope
+        rows = ledger.iter_report('reg', chunk_size=1)
+        self.assertEqual(date(2010, 12, 1), next(rows).date)
+        self.assertTrue(ledger.session.journal().has_xdata())     # the report is suspended until the consumer takes rows
+        self.assertEqual(default_scope, ledger.MainApplicationContext.Current.DefaultScope)
+
+        rows.close()
+        self.assertFalse(ledger.session.journal().has_xdata())
+        self.assertTrue(ledger.execute_command('bal').Output)
+        self.assertEqual(len(ledger.report('reg')), len(list(ledger.iter_report('reg', chunk_size=3))))
+
+        with self.assertRaises(Exception):
+            next(ledger.iter_report('print'))
+
+    def test_report_rejects_data_file_options(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        with self.assertRaises(Exception):
+            ledger.report('bal', ['-f', get_drewr3_dat_filename()])
+
+        ledger.session.close_journal_files()
+        rows = ledger.report('bal', ['--flat', '-f', get_drewr3_dat_filename(), '^Assets'], readJournalFiles=True)
+        self.assertEqual(['Assets:Checking', 'Assets:Checking:Business', 'Assets:Savings'], [row.account for row in rows])
+
     def test_session_read_journal(self):
         ledger.session.close_journal_files()
         filename = get_drewr3_dat_filename()
@@ -267,6 +374,41 @@ class LedgerModuleTests(unittest.TestCase):
         ndate = Date(2021, 5, 22)
         self.assertEqual(DateTime(2021, 5, 22), ledger.to_ndatetime(ndate))
 
+    def test_date_conversions_are_memoized(self):
+
+        ledger.pdate_from_ordinal.cache_clear()
+        self.assertIs(ledger.to_pdate(Date(2021, 5, 22)), ledger.to_pdate(DateTime(2021, 5, 22, 23, 55, 50, 99)))
+        self.assertEqual(1, ledger.pdate_from_ordinal.cache_info().hits)
+
+        self.assertEqual(Date(1, 1, 1), ledger.to_ndate(date.min))
+        self.assertEqual(Date(9999, 12, 31), ledger.to_ndate(date.max))
+        self.assertEqual(date(1969, 12, 31), ledger.to_pdate(Date(1969, 12, 31)))
+
+    def test_to_pdates(self):
+
+        ledger.session.close_journal_files()
+        jrn = ledger.read_journal_from_string("2021/05/22 A\n  a  1\n  b\n\n2021/05/23 B\n  a  1  ; [2021/06/01]\n  b\n")
+        self.assertEqual([date(2021, 5, 22), date(2021, 5, 23)], ledger.to_pdates(jrn.xacts()))
+        self.assertEqual([date(2021, 5, 22), date(2021, 5, 22), date(2021, 6, 1), date(2021, 5, 23)], ledger.to_pdates(jrn.query("")))
+        self.assertEqual([post.date for post in jrn.query("")], ledger.to_pdates(jrn.query("")))
+        self.assertEqual([], ledger.to_pdates(jrn.query("unknown")))
+
+        self.assertEqual([date(2021, 5, 22), None, date(2021, 5, 23)], ledger.to_pdates([Date(2021, 5, 22), None, datetime(2021, 5, 23, 10, 0, 0)]))
+
+    @unittest.skipIf(not is_numpy_available, "NumPy is not installed")
+    def test_to_datetime64(self):
+        import numpy
+
+        ledger.session.close_journal_files()
+        jrn = ledger.read_journal_from_string("2021/05/22 A\n  a  1\n  b\n\n2021/05/23 B\n  a  1\n  b\n")
+        dates = ledger.to_datetime64(jrn.xacts())
+        self.assertEqual(numpy.dtype('datetime64[D]'), dates.dtype)
+        self.assertEqual([numpy.datetime64('2021-05-22'), numpy.datetime64('2021-05-23')], list(dates))
+
+        dates = ledger.to_datetime64([Date(2021, 5, 22), None])
+        self.assertEqual(numpy.datetime64('2021-05-22'), dates[0])
+        self.assertTrue(numpy.isnat(dates[1]))
+
 class ConfigTests(unittest.TestCase):
 
     def test_config_is_atty(self):
@@ -386,6 +528,30 @@ class ValueListTests(unittest.TestCase):
         self.assertEqual(20, vlist[1].to_long())
         self.assertEqual(30, vlist[2].to_long())
 
+    def test_valuelist_iter_is_lazy(self):
+        vlist = ledger.ValueList((ledger.Value(10), ledger.Value(20), ledger.Value(30)))
+        it = iter(vlist)
+        self.assertEqual(10, next(it).to_long())
+        vlist[1] = ledger.Value(40)     # items are wrapped on demand, so the change is visible
+        self.assertEqual(40, next(it).to_long())
+        self.assertEqual(30, next(it).to_long())
+        with self.assertRaises(StopIteration):
+            next(it)
+
+    def test_valuelist_chunks(self):
+        vlist = ledger.ValueList([ledger.Value(i) for i in range(5)])
+        chunks = list(vlist.chunks(2))
+        self.assertEqual(3, len(chunks))
+        self.assertEqual([0, 1], [v.to_long() for v in chunks[0]])
+        self.assertEqual([2, 3], [v.to_long() for v in chunks[1]])
+        self.assertEqual([4], [v.to_long() for v in chunks[2]])
+        self.assertEqual([], list(ledger.ValueList().chunks(2)))
+
+    def test_valuelist_iter_chunked(self):
+        vlist = ledger.ValueList([ledger.Value(i) for i in range(5)])
+        self.assertEqual([0, 1, 2, 3, 4], [v.to_long() for v in vlist.iter_chunked(2)])
+        self.assertEqual([0, 1, 2, 3, 4], [v.to_long() for v in vlist.iter_chunked(10)])
+
 # Expressions
 
 class ExprTests(unittest.TestCase):
@@ -2464,6 +2630,39 @@ class ValueTests(unittest.TestCase):
         val -= ledger.Balance(3)
         self.assertEqual(2, val)
 
+    def test_value_in_place_operators_change_origin(self):
+        val = ledger.Value(10)
+        origin = val.origin
+        total = val
+
+        val += ledger.Amount(20)
+        val -= 5
+        val *= 2
+        val /= ledger.Value(5)
+        self.assertIs(total, val)
+        self.assertTrue(ledger.OriginValue.ReferenceEquals(origin, val.origin))
+        self.assertEqual(10, val)
+
+    def test_value_copy(self):
+        val = ledger.Value(10)
+        val_copy = val.copy()
+        val_copy += 10
+        self.assertEqual(10, val)
+        self.assertEqual(20, val_copy)
+        self.assertEqual(10, copy.copy(val))
+
+    def test_value_in_place_operators_do_not_change_shared_amounts(self):
+        amt = ledger.Amount(10)
+        val = ledger.Value(amt)
+        val += 5
+        self.assertEqual(ledger.Amount(10), amt)
+        self.assertEqual(15, val)
+
+        val = ledger.Value.to_value(amt)
+        val -= 5
+        self.assertEqual(ledger.Amount(10), amt)
+        self.assertEqual(5, val)
+
     def test_value_mul(self):
         self.assertEqual(6, ledger.Value(2) * ledger.Value(3))
         self.assertEqual(6, ledger.Value(2) * 3)
@@ -3384,6 +3583,39 @@ class AmountTests(unittest.TestCase):
         self.assertEqual("<class 'ledger.Amount'>", str(type(a1 + a2)))
         self.assertEqual("<class 'ledger.Amount'>", str(type(10 + a2)))
 
+    def test_amount_in_place_operators_change_origin(self):
+        amt = ledger.Amount(10)
+        origin = amt.origin
+        total = amt
+
+        amt += ledger.Amount(20)
+        amt -= 5
+        amt *= 2
+        amt /= ledger.Amount(5)
+        self.assertIs(total, amt)
+        self.assertTrue(ledger.OriginAmount.ReferenceEquals(origin, amt.origin))
+        self.assertEqual(ledger.Amount(10), amt)
+
+    def test_amount_copy(self):
+        amt = ledger.Amount(10)
+        amt_copy = amt.copy()
+        amt_copy += 10
+        self.assertEqual(ledger.Amount(10), amt)
+        self.assertEqual(ledger.Amount(20), amt_copy)
+        self.assertEqual(ledger.Amount(10), copy.copy(amt))
+
+    def test_amount_in_place_operators_do_not_change_journal_amounts(self):
+        ledger.session.close_journal_files()
+        post = ledger.read_journal_from_string("2021/01/01 Payee\n    Expenses:Food    $10\n    Assets:Cash\n")[0][0]
+
+        total = post.amount
+        total += 1
+        total *= 2
+        self.assertEqual(ledger.Amount("$10"), post.amount)
+        self.assertEqual(ledger.Amount("$22"), total)
+        self.assertFalse(ledger.OriginAmount.ReferenceEquals(post.origin.Amount, total.origin))
+        ledger.session.close_journal_files()
+
     def test_amount_minus(self):
 
         a1 = ledger.Amount(30)
@@ -3992,6 +4224,45 @@ class BalanceTests(unittest.TestCase):
         bal /= 10.0
         self.assertIsInstance(bal, ledger.Balance)
 
+    def test_balance_binary_operators_keep_operands(self):
+        bal = ledger.Balance(10)
+        self.assertEqual(ledger.Balance(15), bal + 5)
+        self.assertEqual(ledger.Balance(5), bal - 5)
+        self.assertEqual(ledger.Balance(20), bal * 2)
+        self.assertEqual(ledger.Balance(5), bal / 2)
+        self.assertEqual(ledger.Balance(10), bal)
+
+    def test_balance_in_place_operators_change_origin(self):
+        bal = ledger.Balance(10)
+        origin = bal.origin
+        total = bal
+
+        bal += ledger.Amount(20)
+        bal -= 5
+        bal *= 2
+        bal /= ledger.Amount(5)
+        self.assertIs(total, bal)
+        self.assertTrue(ledger.OriginBalance.ReferenceEquals(origin, bal.origin))
+        self.assertEqual(ledger.Balance(10), bal)
+
+        bal += bal
+        self.assertEqual(ledger.Balance(20), bal)
+
+    def test_balance_copy(self):
+        bal = ledger.Balance(10)
+        bal_copy = bal.copy()
+        bal_copy += 10
+        self.assertEqual(ledger.Balance(10), bal)
+        self.assertEqual(ledger.Balance(20), bal_copy)
+        self.assertEqual(ledger.Balance(10), copy.copy(bal))
+
+    def test_balance_in_place_operators_do_not_change_wrapped_origin(self):
+        bal = ledger.Balance(10)
+        shared = ledger.Balance.from_origin(bal.origin)
+        shared += 5
+        self.assertEqual(ledger.Balance(10), bal)
+        self.assertEqual(ledger.Balance(15), shared)
+
     def test_balance_neg(self):
         bal = ledger.Balance(10)
 
@@ -4516,6 +4787,10 @@ class JournalItemTests(unittest.TestCase):
 
         item.use_aux_date = True
         self.assertTrue(item.use_aux_date)
+        self.assertTrue(ledger.OriginItem.UseAuxDate)
+
+        ledger.JournalItem.use_aux_date = False
+        self.assertFalse(ledger.OriginItem.UseAuxDate)
 
         ledger.JournalItem.use_aux_date = orig_value
 
@@ -4573,6 +4848,11 @@ class SessionTests(unittest.TestCase):
         ssn = ledger.Session.from_origin(None)
         self.assertIsNone(ssn)
 
+    def test_session_origin_is_current_session(self):
+        ssn = ledger.Session()
+        self.assertTrue(ledger.ExtendedSession.Current.Equals(ssn.origin))
+        self.assertFalse(hasattr(ssn, '__dict__'))
+
     def test_session_read_journal(self):
         ledger.session.close_journal_files()
         filename = get_drewr3_dat_filename()
@@ -4597,6 +4877,42 @@ class SessionTests(unittest.TestCase):
         jrn = ledger.session.read_journal_files()
         self.assertIsInstance(jrn, ledger.Journal)
 
+    def test_session_read_journals(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, 'y%d.dat' % year) for year in (2020, 2021)]
+            for year, path in zip((2020, 2021), paths):
+                with open(path, 'w') as f:
+                    f.write("%d/01/01 Payee %d\n    A    $10\n    B\n" % (year, year))
+
+            ledger.session.close_journal_files()
+            jrn = ledger.read_journals(paths, parallel=True)
+            self.assertEqual(["Payee 2020", "Payee 2021"], [xact.payee for xact in jrn])
+            self.assertEqual(paths, [source.filename for source in jrn.sources()])
+
+    def test_session_read_journal_parallel(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = os.path.join(temp_dir, 'journal.dat')
+            with open(journal_path, 'w') as f:
+                f.write("account Expenses:Food\n    alias food\n\ncommodity $\n    format $1,000.00\n\n")
+                for year in range(2015, 2021):
+                    f.write("include y%d.dat\n" % year)
+                    with open(os.path.join(temp_dir, 'y%d.dat' % year), 'w') as year_file:
+                        year_file.write("P %d/01/01 EUR $1.%d\n\n%d/01/02 Shop\n    food    %d EUR\n    Assets:Cash\n" % (year, year % 10, year, year))
+                        if year == 2017:
+                            # Balance assertions depend on preceding files, so this file is parsed sequentially
+                            year_file.write("\n%d/02/01 Rent\n    Expenses:Rent    $500\n    Assets:Cash    $-500 = $-500\n" % year)
+
+            results = []
+            for parallel in (False, True):
+                ledger.session.close_journal_files()
+                ledger.read_journal(journal_path, parallel=parallel)
+                results.append([ledger.execute_command(command).Output for command in ('bal', 'reg', 'prices')])
+
+            self.assertEqual(results[0], results[1])
+            self.assertIn("12105 EUR    Food", results[1][0])
+
     def test_session_close_journal_files(self):
         filename = get_drewr3_dat_filename()
         ledger.session.close_journal_files()
@@ -4614,6 +4930,87 @@ class SessionTests(unittest.TestCase):
         jrn = ledger.session.journal()
         self.assertIsInstance(jrn, ledger.Journal)
 
+    def test_session_create_makes_isolated_session(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        ssn = ledger.Session.create()
+        self.assertIsInstance(ssn, ledger.Session)
+        self.assertIsNot(ssn, ledger.session)
+        self.assertEqual(0, len(ssn.journal().xacts()))
+
+        ssn.read_journal_from_string("2021/01/01 Forecast\n    A    10 EUR\n    B\n")
+        self.assertEqual(1, len(ssn.journal().xacts()))
+        self.assertEqual(11, len(ledger.session.journal().xacts()))
+
+        self.assertIn("EUR", ssn.execute_command("bal").Output)
+        self.assertNotIn("EUR", ledger.execute_command("bal").Output)
+
+        with ssn.enter():
+            self.assertTrue(ledger.commodities.has_key("EUR"))
+        self.assertFalse(ledger.commodities.has_key("EUR"))
+
+    def test_session_with_statement_switches_module_session(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+        default_session = ledger.session
+
+        with ledger.Session.create() as ssn:
+            self.assertIs(ssn, ledger.current_session())
+            self.assertIs(default_session, ledger.session)
+            ledger.read_journal_from_string("2021/01/01 Forecast\n    A    10 EUR\n    B\n")
+            self.assertEqual(["Forecast"], [xact.payee for xact in ledger.current_session().journal()])
+            self.assertIn("Forecast", ledger.execute_command("reg").Output)
+            self.assertEqual(["A", "B"], [row.account for row in ledger.report("reg")])
+
+        self.assertIs(default_session, ledger.current_session())
+        self.assertNotIn("Forecast", ledger.execute_command("reg").Output)
+        self.assertEqual(1, len(ssn.journal().xacts()))
+
+    def test_session_exit_checks_the_innermost_session(self):
+        first = ledger.Session.create()
+        second = ledger.Session.create()
+        first.__enter__()
+        second.__enter__()
+        try:
+            with self.assertRaises(Exception):
+                first.__exit__(None, None, None)
+            self.assertIs(second, ledger.current_session())
+        finally:
+            second.__exit__(None, None, None)
+            first.__exit__(None, None, None)
+        self.assertIs(ledger.session, ledger.current_session())
+
+    def test_session_with_statement_is_thread_local(self):
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        import threading
+        entered = threading.Event()
+        checked = threading.Event()
+        outputs = []
+
+        def worker():
+            with ledger.Session.create() as ssn:
+                ledger.read_journal_from_string("2021/01/01 Forecast\n    A    10 EUR\n    B\n")
+                entered.set()
+                checked.wait(10)
+                outputs.append((ledger.current_session() is ssn, ledger.execute_command("reg").Output))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        try:
+            self.assertTrue(entered.wait(10))
+            self.assertIs(ledger.session, ledger.current_session())
+            self.assertNotIn("Forecast", ledger.execute_command("reg").Output)
+        finally:
+            checked.set()
+            thread.join()
+
+        self.assertEqual(1, len(outputs))
+        self.assertTrue(outputs[0][0])
+        self.assertIn("Forecast", outputs[0][1])
+
 # Journals
 
 class FileInfoTests(unittest.TestCase):
@@ -4875,6 +5272,906 @@ class JournalTests(unittest.TestCase):
         jrn = ledger.session.read_journal(get_drewr3_dat_filename())
         self.assertTrue(jrn.valid())
 
+    def test_journal_generation(self):
+        jrn = ledger.Journal()
+        self.assertEqual(0, jrn.generation)
+
+        xact = ledger.Transaction()
+        post = ledger.Posting()
+        post.amount = ledger.Amount("22 JAX")
+        post.account = jrn.find_account("source")
+        xact.add_post(post)
+        post = ledger.Posting()
+        post.amount = ledger.Amount("-22 JAX")
+        post.account = jrn.find_account("destination")
+        xact.add_post(post)
+
+        jrn.add_xact(xact)
+        self.assertEqual(1, jrn.generation)
+        jrn.remove_xact(xact)
+        self.assertEqual(2, jrn.generation)
+
+    def test_journal_tag_index(self):
+        ledger.session.close_journal_files()
+        jrn = ledger.read_journal_from_string("""
+2021/01/01 First
+    ; :Receipt:
+    ; Project: Alpha
+    Expenses:Food    $10
+    Assets:Cash
+
+2021/01/02 Second
+    Expenses:Food    $20  ; Project: Beta
+    Assets:Cash
+""")
+        index = jrn.tag_index()
+        self.assertEqual(['Project', 'Receipt'], index.tags())
+        self.assertTrue('receipt' in index)
+        self.assertFalse(index.has_tag('Unknown'))
+        self.assertEqual(['Alpha', 'Beta'], index.values('Project'))
+
+        self.assertEqual(['First'], [xact.payee for xact in index.xacts('Receipt')])
+        self.assertEqual(2, len(index.posts('Receipt')))
+        self.assertEqual(0, len(index.posts('Receipt', inherit=False)))
+        self.assertEqual(['Expenses:Food'], [post.account.fullname() for post in index.posts('Project', 'Beta')])
+        self.assertEqual(['First'], [xact.payee for xact in index.xacts('Project', ledger.Mask('^al'))])
+
+        second = jrn[1]
+        self.assertTrue(jrn.remove_xact(second))
+        self.assertEqual(['Alpha'], index.values('Project'))
+
+        second.set_tag('Reviewed')
+        self.assertTrue(jrn.add_xact(second))
+        self.assertEqual(['Alpha', 'Beta'], index.values('Project'))
+        self.assertEqual(['Second'], [xact.payee for xact in jrn.tag_index().xacts('Reviewed')])
+
+        jrn[0].set_tag('Reviewed')
+        self.assertEqual(1, len(jrn.tag_index().xacts('Reviewed')))
+        self.assertEqual(2, len(jrn.tag_index(rebuild=True).xacts('Reviewed')))
+        ledger.session.close_journal_files()
+
+    def test_journal_xacts_and_posts_between(self):
+        ledger.session.close_journal_files()
+        jrn = ledger.read_journal_from_string("""
+2021/02/01 February
+    Expenses:Food    $10
+    Assets:Cash
+
+2021/01/15 January
+    Expenses:Food    $20  ; [2021/03/01]
+    Assets:Cash
+""")
+        self.assertEqual(['January', 'February'], [xact.payee for xact in jrn.xacts_between()])
+        self.assertEqual(['February'], [xact.payee for xact in jrn.xacts_between(date(2021, 2, 1))])
+        self.assertEqual(['January'], [xact.payee for xact in jrn.xacts_between(end=date(2021, 2, 1))])
+        self.assertEqual(0, len(jrn.xacts_between(date(2021, 1, 16), datetime(2021, 2, 1, 10, 0, 0))))
+
+        posts = jrn.posts_between(date(2021, 2, 1), date(2021, 3, 2))
+        self.assertIsInstance(posts, ledger.PostingList)
+        self.assertEqual([date(2021, 2, 1), date(2021, 2, 1), date(2021, 3, 1)], [post.date for post in posts])
+        self.assertEqual(['Assets:Cash'], [post.account.fullname() for post in jrn.posts_between(end=date(2021, 2, 1))])
+
+        xacts = jrn.xacts_between()
+        self.assertTrue(jrn.remove_xact(xacts[0]))
+        self.assertEqual(['February'], [xact.payee for xact in jrn.xacts_between()])
+        self.assertEqual(2, len(xacts))
+        ledger.session.close_journal_files()
+
+    def test_journal_account_tree(self):
+        ledger.session.close_journal_files()
+        jrn = ledger.read_journal_from_string("""
+2021/01/01 First
+    Expenses:Food:Groceries    $10
+    Expenses:Auto    $20
+    Assets:Cash
+""")
+        tree = jrn.account_tree()
+        self.assertIsInstance(tree, ledger.AccountTree)
+        self.assertIs(tree, jrn.account_tree())
+        self.assertTrue(tree.is_actual())
+        self.assertEqual(7, len(tree))
+        self.assertEqual(['', 'Assets', 'Assets:Cash', 'Expenses', 'Expenses:Auto', 'Expenses:Food', 'Expenses:Food:Groceries'], [node.fullname for node in tree])
+        self.assertEqual(['', 'Assets', 'Expenses', 'Assets:Cash', 'Expenses:Auto', 'Expenses:Food', 'Expenses:Food:Groceries'], [node.fullname for node in tree.bfs()])
+
+        food = tree['Expenses:Food']
+        self.assertEqual('Food', food.name)
+        self.assertEqual(2, food.depth)
+        self.assertEqual('Expenses', food.parent.fullname)
+        self.assertEqual(['Groceries'], [node.name for node in food.children])
+        self.assertEqual(['Expenses:Food', 'Expenses:Food:Groceries'], [node.fullname for node in tree.dfs(food)])
+        self.assertEqual('Expenses:Food', food.account.fullname())
+        self.assertIsNone(tree.root.parent)
+        self.assertIsNone(tree.find('Expenses:Unknown'))
+        self.assertFalse('Expenses:Unknown' in tree)
+
+        self.assertEqual(['Expenses', 'Expenses:Auto', 'Expenses:Food', 'Expenses:Food:Groceries'], [node.fullname for node in tree.startswith('expenses')])
+        self.assertEqual(['Expenses:Auto', 'Expenses:Food'], [node.fullname for node in tree.find_re('^exp.*:(auto|food)$')])
+        self.assertEqual(['Expenses:Food:Groceries'], [node.fullname for node in tree.find_re('^Expenses:Foods?:gro')])
+        self.assertEqual(['Assets:Cash'], [node.fullname for node in tree.find_re('cash')])
+
+        jrn.find_account('Expenses:Travel')
+        self.assertFalse(tree.is_actual())
+        self.assertFalse('Expenses:Travel' in tree)
+        self.assertTrue('Expenses:Travel' in jrn.account_tree())
+        ledger.session.close_journal_files()
+
+    def test_journal_prepare_query(self):
+        ledger.session.close_journal_files()
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        query = jrn.prepare_query("^expenses:")
+        self.assertIsInstance(query, ledger.PreparedQuery)
+        self.assertEqual("^expenses:", query.query_text)
+        self.assertFalse(query.is_actual())
+
+        posts = query.execute()
+        self.assertIsInstance(posts, ledger.PostingList)
+        self.assertEqual(12, len(posts))
+        self.assertTrue(query.is_actual())
+        self.assertEqual(12, len(query()))
+
+        xact = jrn[0]
+        jrn.remove_xact(xact)
+        self.assertFalse(query.is_actual())
+        self.assertEqual(12, len(query()))
+
+    @unittest.skipIf(not is_numpy_available, "NumPy is not installed")
+    def test_journal_to_columns(self):
+        import numpy
+        ledger.session.close_journal_files()
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        posts = [post for xact in jrn for post in xact]
+        cols = jrn.to_columns()
+
+        self.assertEqual(len(posts), len(cols['date']))
+        self.assertEqual(numpy.dtype('datetime64[D]'), cols['date'].dtype)
+        self.assertEqual(numpy.datetime64('2010-12-01'), cols['date'][0])
+        self.assertEqual(1000.0, cols['quantity'][0])
+        self.assertEqual(-1000.0, cols['quantity'][1])
+        self.assertEqual(100000, cols['quantity_scaled'][0])
+        self.assertEqual("$", cols['commodities'][cols['commodity'][0]])
+        self.assertEqual(2, cols['commodity_precisions'][cols['commodity'][0]])
+        self.assertEqual("Assets:Checking", cols['accounts'][cols['account'][0]])
+        self.assertEqual("Equity:Opening Balances", cols['accounts'][cols['account'][1]])
+        self.assertEqual("Checking balance", cols['payees'][cols['payee'][0]])
+        self.assertEqual(ledger.State.Cleared.value, cols['state'][0])
+        self.assertEqual(posts[0].xact.seq(), cols['xact'][0])
+
+        for post, quantity, account in zip(posts, cols['quantity'], cols['account']):
+            self.assertEqual(post.amount.to_double(), quantity)
+            self.assertEqual(post.account.fullname(), cols['accounts'][account])
+
+    @unittest.skipIf(not is_numpy_available, "NumPy is not installed")
+    def test_journal_query_to_columns(self):
+        ledger.session.close_journal_files()
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        cols = jrn.query("^expenses:").to_columns()
+        self.assertEqual(12, len(cols['quantity']))
+        self.assertEqual(6654.0, cols['quantity'].sum())
+        self.assertTrue(all(name.startswith("Expenses:") for name in cols['accounts']))
+
+    def test_journal_query_sum_amounts(self):
+        ledger.session.close_journal_files()
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        posts = jrn.query("^expenses:")
+
+        total = posts.sum_amounts()
+        self.assertIsInstance(total, ledger.Balance)
+        self.assertEqual("$ 6,654.00", str(total).strip())
+
+        by_account = posts.sum_amounts('account')
+        self.assertEqual(5, len(by_account))
+        self.assertEqual("$ 334.00", str(by_account["Expenses:Food:Groceries"]).strip())
+
+        by_commodity = posts.sum_amounts('commodity')
+        self.assertEqual(["$"], list(by_commodity.keys()))
+
+        by_payee = posts.sum_amounts('payee')
+        self.assertEqual("$ 5,500.00", str(by_payee["Tom's Used Cars"]).strip())
+
+        by_month = posts.sum_amounts('month')
+        self.assertEqual([date(2010, 12, 1), date(2011, 1, 1)], list(by_month.keys()))
+        self.assertEqual("$ 1,025.00", str(by_month[date(2010, 12, 1)]).strip())
+
+        self.assertTrue(ledger.PostingList().sum_amounts().is_empty())
+        self.assertEqual({}, ledger.PostingList().sum_amounts('account'))
+
+    def test_journal_included_sources(self):
+        ledger.session.close_journal_files()
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        self.assertEqual(0, len(jrn.included_sources()))
+
+    def test_journal_save_and_load_snapshot(self):
+        import tempfile
+        ledger.session.close_journal_files()
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        expected_posts = [(str(post.date), post.account.fullname(), str(post.amount)) for xact in jrn for post in xact]
+        expected_balance = ledger.execute_command('bal').Output
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot_path = os.path.join(temp_dir, 'drewr3.snapshot')
+            jrn.save_snapshot(snapshot_path)
+            self.assertTrue(os.path.isfile(snapshot_path))
+
+            ledger.session.close_journal_files()
+            jrn = ledger.load_snapshot(snapshot_path)
+
+        self.assertIsInstance(jrn, ledger.Journal)
+        self.assertEqual(expected_posts, [(str(post.date), post.account.fullname(), str(post.amount)) for xact in jrn for post in xact])
+        self.assertEqual(expected_balance, ledger.execute_command('bal').Output)
+        self.assertEqual(get_drewr3_dat_filename(), jrn.sources()[0].filename)
+
+    def test_journal_load_snapshot_reads_changed_sources(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = os.path.join(temp_dir, 'journal.dat')
+            snapshot_path = os.path.join(temp_dir, 'journal.snapshot')
+            with open(journal_path, 'w') as f:
+                f.write("2021/01/01 Payee\n    A    $10\n    B\n")
+
+            ledger.session.close_journal_files()
+            ledger.read_journal(journal_path).save_snapshot(snapshot_path)
+
+            with open(journal_path, 'a') as f:
+                f.write("\n2021/01/02 Another Payee\n    A    $20\n    B\n")
+
+            ledger.session.close_journal_files()
+            jrn = ledger.load_snapshot(snapshot_path)
+            self.assertEqual(["Payee", "Another Payee"], [xact.payee for xact in jrn])
+
+    def test_journal_refresh_reads_changed_included_file(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = os.path.join(temp_dir, 'journal.dat')
+            included_path = os.path.join(temp_dir, 'month.dat')
+            with open(included_path, 'w') as f:
+                f.write("2021/02/01 Included\n    A    $5\n    B\n")
+            with open(journal_path, 'w') as f:
+                f.write("2021/01/01 First\n    A    $10\n    B\n\ninclude month.dat\n\n2021/03/01 Last\n    A    $1\n    B\n")
+
+            ledger.session.close_journal_files()
+            jrn = ledger.read_journal(journal_path)
+            self.assertEqual(0, jrn.refresh())
+
+            with open(included_path, 'a') as f:
+                f.write("\n2021/02/02 Appended\n    A    $20\n    B\n")
+
+            self.assertEqual(1, jrn.refresh())
+            self.assertEqual(["First", "Included", "Appended", "Last"], [xact.payee for xact in jrn])
+            self.assertEqual(4, len(jrn.find_account("A").posts()))
+            self.assertEqual(0, jrn.refresh())
+
+    def test_journal_refresh_reads_changed_top_level_file(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = os.path.join(temp_dir, 'journal.dat')
+            with open(journal_path, 'w') as f:
+                f.write("2021/01/01 Payee\n    A    $10\n    B\n")
+
+            ledger.session.close_journal_files()
+            jrn = ledger.read_journal(journal_path)
+            master = jrn.master
+            self.assertTrue('A' in jrn.account_tree())
+
+            with open(journal_path, 'w') as f:
+                f.write("2021/01/02 Another Payee\n    C    $20\n    B\n")
+
+            self.assertEqual(1, jrn.refresh())
+            self.assertEqual(["Another Payee"], [xact.payee for xact in jrn])
+            self.assertIsNone(jrn.find_account("A", False))
+            self.assertTrue(ledger.OriginAccount.ReferenceEquals(master.origin, jrn.master.origin))
+            self.assertEqual(['', 'B', 'C'], [node.fullname for node in jrn.account_tree()])
+
+
+class QueryCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        ledger.session.close_journal_files()
+        ledger.query_cache.reset_stats()
+
+    def tearDown(self):
+        ledger.query_cache.enabled = False
+        ledger.query_cache.invalidate()
+
+    def test_query_cache_is_disabled_by_default(self):
+        self.assertFalse(ledger.query_cache.enabled)
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        jrn.query("^expenses:")
+        self.assertEqual(0, len(ledger.query_cache))
+
+    def test_query_cache_returns_cached_results(self):
+        ledger.query_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+
+        self.assertEqual(12, len(jrn.query("^expenses:")))
+        self.assertEqual(12, len(jrn.query("^expenses:")))
+        self.assertEqual(2, len(jrn.query("^income:")))
+        self.assertEqual(1, ledger.query_cache.hits)
+        self.assertEqual(2, ledger.query_cache.misses)
+        self.assertEqual(2, len(ledger.query_cache))
+        self.assertAlmostEqual(1/3, ledger.query_cache.hit_rate)
+
+    def test_query_cache_results_are_isolated(self):
+        ledger.query_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        posts = jrn.query("^expenses:")
+        del posts[0]
+        self.assertEqual(12, len(jrn.query("^expenses:")))
+
+    def test_query_cache_evicts_least_recently_used(self):
+        ledger.query_cache.enabled = True
+        ledger.query_cache.max_size = 2
+        try:
+            jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+            jrn.query("^expenses:")
+            jrn.query("^income:")
+            jrn.query("^expenses:")
+            jrn.query("^assets:")
+            self.assertEqual(2, len(ledger.query_cache))
+            self.assertEqual([key[1] for key in ledger.query_cache.queries], ["^expenses:", "^assets:"])
+        finally:
+            ledger.query_cache.max_size = 64
+
+    def test_query_cache_keeps_results_of_other_sessions(self):
+        ledger.query_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        jrn.query("^expenses:")
+
+        ssn = ledger.Session.create()
+        ssn.read_journal_from_string("2021/01/01 Forecast\n    Expenses:A    10 EUR\n    B\n")
+        with ssn.enter():
+            self.assertEqual(1, len(ssn.journal().query("^expenses:")))
+            self.assertEqual(2, len(ledger.query_cache))
+        ssn.close_journal_files()
+
+        self.assertEqual(1, len(ledger.query_cache))
+        self.assertEqual(12, len(jrn.query("^expenses:")))
+        self.assertEqual(1, ledger.query_cache.hits)
+
+    def test_query_cache_is_invalidated_by_journal_changes(self):
+        ledger.query_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        self.assertEqual(12, len(jrn.query("^expenses:")))
+
+        jrn.remove_xact(jrn[1])     # Organic Co-op, 6 expense posts
+        self.assertEqual(0, len(ledger.query_cache))
+        self.assertEqual(6, len(jrn.query("^expenses:")))
+
+        ledger.session.close_journal_files()
+        self.assertEqual(0, len(ledger.query_cache))
+
+    def test_query_cache_detects_generation_change(self):
+        ledger.query_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        self.assertEqual(12, len(jrn.query("^expenses:")))
+        jrn.origin.RemoveXact(jrn[1].origin)   # bypasses explicit invalidation
+        self.assertEqual(6, len(jrn.query("^expenses:")))
+        self.assertEqual(2, ledger.query_cache.misses)
+
+    def test_query_cache_detects_report_option_change(self):
+        ledger.query_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        jrn.query("^expenses:")
+
+        from NLedger.Scopus import Scope
+        report = Scope.DefaultScope
+        report.RealHandler.On("test")
+        try:
+            prepared = jrn.prepare_query("^expenses:")
+            jrn.query("^expenses:")
+            self.assertEqual(2, ledger.query_cache.misses)
+            self.assertEqual(2, len(ledger.query_cache))
+            self.assertIn("real", prepared.report_options)
+        finally:
+            report.RealHandler.Off()
+            report.LimitHandler.Off()
+
+class ReportCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        ledger.session.close_journal_files()
+        ledger.report_cache.reset_stats()
+
+    def tearDown(self):
+        ledger.report_cache.enabled = False
+        ledger.report_cache.invalidate()
+
+    def test_report_cache_is_disabled_by_default(self):
+        self.assertFalse(ledger.report_cache.enabled)
+        ledger.read_journal(get_drewr3_dat_filename())
+        ledger.execute_command("bal ^Assets")
+        self.assertEqual(0, len(ledger.report_cache))
+
+    def test_report_cache_returns_cached_results(self):
+        ledger.report_cache.enabled = True
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        expected_output = ledger.execute_command("bal ^Assets").Output
+        self.assertEqual(expected_output, ledger.execute_command(["bal", "^Assets"]).Output)   # normalized args share the key
+        self.assertNotEqual(expected_output, ledger.execute_command("bal ^Income").Output)
+        self.assertEqual(1, ledger.report_cache.hits)
+        self.assertEqual(2, ledger.report_cache.misses)
+        self.assertEqual(2, len(ledger.report_cache))
+        self.assertAlmostEqual(1/3, ledger.report_cache.hit_rate)
+
+    def test_report_cache_skips_failed_and_streamed_commands(self):
+        ledger.report_cache.enabled = True
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        self.assertTrue(ledger.execute_command("unknown-command").Error)
+        import io
+        ledger.execute_command("bal", output=io.StringIO())
+        self.assertEqual(0, len(ledger.report_cache))
+
+    def test_report_cache_evicts_least_recently_used(self):
+        ledger.report_cache.enabled = True
+        ledger.report_cache.max_size = 2
+        try:
+            ledger.read_journal(get_drewr3_dat_filename())
+            ledger.execute_command("bal ^Expenses")
+            ledger.execute_command("bal ^Income")
+            ledger.execute_command("bal ^Expenses")
+            ledger.execute_command("bal ^Assets")
+            self.assertEqual(2, len(ledger.report_cache))
+            self.assertEqual([key[1] for key in ledger.report_cache.results], [("bal", "^Expenses"), ("bal", "^Assets")])
+        finally:
+            ledger.report_cache.max_size = 64
+
+    def test_report_cache_is_invalidated_by_journal_changes(self):
+        ledger.report_cache.enabled = True
+        jrn = ledger.read_journal(get_drewr3_dat_filename())
+        output = ledger.execute_command("reg ^Expenses").Output
+
+        jrn.remove_xact(jrn[1])     # Organic Co-op
+        self.assertEqual(0, len(ledger.report_cache))
+        self.assertNotEqual(output, ledger.execute_command("reg ^Expenses").Output)
+
+        ledger.session.close_journal_files()
+        self.assertEqual(0, len(ledger.report_cache))
+
+    def test_report_cache_keeps_results_of_other_sessions(self):
+        ledger.report_cache.enabled = True
+        ledger.read_journal(get_drewr3_dat_filename())
+        output = ledger.execute_command("bal").Output
+
+        ssn = ledger.Session.create()
+        ssn.read_journal_from_string("2021/01/01 Forecast\n    A    10 EUR\n    B\n")
+        self.assertIn("EUR", ssn.execute_command("bal").Output)    # the same arguments in another session
+        self.assertEqual(2, len(ledger.report_cache))
+
+        ssn.close_journal_files()
+        self.assertEqual(1, len(ledger.report_cache))
+        self.assertEqual(output, ledger.execute_command("bal").Output)
+        self.assertEqual(1, ledger.report_cache.hits)
+
+    def test_report_cache_detects_generation_change(self):
+        ledger.report_cache.enabled = True
+        jrn = ledger.read_journal(get_drewr3_dat_filename())
+        output = ledger.execute_command("reg ^Expenses").Output
+        jrn.origin.RemoveXact(jrn[1].origin)   # bypasses explicit invalidation
+        self.assertNotEqual(output, ledger.execute_command("reg ^Expenses").Output)
+        self.assertEqual(2, ledger.report_cache.misses)
+
+class WrapperCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        ledger.session.close_journal_files()
+        ledger.wrapper_cache.reset_stats()
+
+    def tearDown(self):
+        ledger.wrapper_cache.enabled = False
+        ledger.wrapper_cache.clear()
+
+    def test_wrapper_cache_is_disabled_by_default(self):
+        self.assertFalse(ledger.wrapper_cache.enabled)
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        post = jrn.query("^expenses:")[0]
+        self.assertFalse(post.account is post.account)
+        self.assertEqual(0, len(ledger.wrapper_cache))
+
+    def test_wrapper_cache_preserves_identity(self):
+        ledger.wrapper_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        posts = jrn.query("^expenses:food:")
+
+        self.assertTrue(posts[0] is posts[0])
+        self.assertTrue(posts[0].account is posts[1].account)
+        self.assertTrue(posts[0].xact is posts[1].xact)
+        self.assertTrue(posts[0].xact is jrn[1])
+        self.assertTrue(posts[0].amount.commodity is posts[1].amount.commodity)
+        self.assertTrue(posts[0].account is jrn.find_account("Expenses:Food:Groceries"))
+
+    def test_wrapper_cache_counts_hits(self):
+        ledger.wrapper_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        post = jrn.query("^expenses:food:")[0]
+        ledger.wrapper_cache.reset_stats()
+
+        accounts = [post.account for _ in range(4)]
+        self.assertEqual(3, ledger.wrapper_cache.hits)
+        self.assertEqual(1, ledger.wrapper_cache.misses)
+        self.assertAlmostEqual(0.75, ledger.wrapper_cache.hit_rate)
+
+    def test_wrapper_cache_keeps_weak_references(self):
+        ledger.wrapper_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        account = jrn.find_account("Expenses:Food:Groceries")
+        self.assertEqual(1, len(ledger.wrapper_cache))
+
+        del account
+        self.assertEqual(0, len(ledger.wrapper_cache))
+
+    def test_wrapper_cache_is_cleared_by_close_journal_files(self):
+        ledger.wrapper_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        account = jrn.find_account("Expenses:Food:Groceries")
+        self.assertEqual(1, len(ledger.wrapper_cache))
+
+        ledger.session.close_journal_files()
+        self.assertEqual(0, len(ledger.wrapper_cache))
+
+    def test_wrapper_cache_keeps_wrappers_of_other_sessions(self):
+        ledger.wrapper_cache.enabled = True
+        jrn = ledger.session.read_journal(get_drewr3_dat_filename())
+        account = jrn.find_account("Expenses:Food:Groceries")
+
+        ssn = ledger.Session.create()
+        ssn.read_journal_from_string("2021/01/01 Forecast\n    A    10 EUR\n    B\n")
+        with ssn.enter():
+            xact = ssn.journal()[0]
+            commodity = ledger.commodities.find("EUR")
+            forecast_account = ssn.journal().find_account("A")
+        self.assertEqual(4, len(ledger.wrapper_cache))
+
+        ssn.close_journal_files()
+        self.assertEqual(1, len(ledger.wrapper_cache))
+        self.assertIs(account, jrn.find_account("Expenses:Food:Groceries"))
+
+# Process pool
+
+class ReportPoolTests(unittest.TestCase):
+
+    def test_report_pool_executes_jobs_in_workers(self):
+        import ledger.pool
+        with ledger.pool.ReportPool(get_drewr3_dat_filename(), workers=2) as pool:
+            self.assertEqual(2, len(pool))
+            self.assertNotIn(os.getpid(), pool.pids())
+
+            cmd_result = pool.execute_command("bal ^Expenses")
+            self.assertIn("$ 6,654.00", cmd_result.Output)
+            self.assertFalse(cmd_result.Error)
+            self.assertIn("unknowncmd", pool.execute_command("unknowncmd").Error)
+
+            results = pool.map_commands(["bal", "reg", "bal ^Assets"])
+            self.assertEqual(3, len(results))
+            self.assertIn("Checking", results[2].Output)
+
+            rows = pool.query("groceries")
+            self.assertTrue(rows)
+            self.assertIsInstance(rows[0], ledger.pool.ReportRow)
+            self.assertNotIsInstance(rows[0], ledger.ReportRow)
+            self.assertEqual("Expenses:Food:Groceries", rows[0].account)
+            self.assertEqual("$ 37.50", rows[0].amount)
+
+            rows = pool.report("bal", "^Expenses")
+            self.assertIsInstance(rows[0], ledger.pool.ReportRow)
+            self.assertEqual("Expenses", rows[0].account)
+            self.assertEqual("$ 6,654.00", rows[0].total)
+
+    def test_report_pool_recycles_and_restarts_workers(self):
+        import ledger.pool
+        import signal
+        with ledger.pool.ReportPool(get_drewr3_dat_filename(), workers=1, max_jobs=2) as pool:
+            pid = pool.pids()[0]
+            pool.execute_command("bal")
+            self.assertEqual([pid], pool.pids())
+            pool.execute_command("bal")
+            self.assertEqual([True], pool.health_check())   # waits until the worker is recycled
+            self.assertNotEqual([pid], pool.pids())
+            self.assertEqual(1, pool.restarts)
+
+            os.kill(pool.pids()[0], signal.SIGKILL)
+            pool.workers[0].process.join()
+            self.assertEqual([False], pool.health_check())
+            self.assertEqual(2, pool.restarts)
+            self.assertIn("$ 6,654.00", pool.execute_command("bal ^Expenses").Output)
+
+# asyncio interface
+
+class AioTests(unittest.TestCase):
+
+    def setUp(self):
+        ledger.session.close_journal_files()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_aio_functions_are_awaitable(self):
+        import ledger.aio
+        jrn = self.loop.run_until_complete(ledger.aio.read_journal(get_drewr3_dat_filename()))
+        self.assertIsInstance(jrn, ledger.Journal)
+        self.assertEqual(11, len(ledger.session.journal().xacts()))
+
+        posts = self.loop.run_until_complete(ledger.aio.query("expenses"))
+        self.assertEqual(12, len(posts))
+        self.assertIsInstance(posts[0], ledger.Posting)
+
+        cmd_result = self.loop.run_until_complete(ledger.aio.execute_command("bal ^Expenses"))
+        self.assertIn("$ 6,654.00", cmd_result.Output)
+        self.assertFalse(cmd_result.Error)
+
+    def test_aio_iter_query_yields_batches(self):
+        import ledger.aio
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        async def collect():
+            return [batch async for batch in ledger.aio.iter_query("expenses", batch_size=5)]
+
+        batches = self.loop.run_until_complete(collect())
+        self.assertEqual([5, 5, 2], [len(batch) for batch in batches])
+        self.assertEqual("Expenses:Food:Groceries", batches[0][0].account.fullname())
+
+    def test_aio_iter_query_stops_producer_when_closed(self):
+        import ledger.aio
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        async def take_first():
+            batches = ledger.aio.iter_query("expenses", batch_size=1, max_batches=1)
+            first = await batches.__anext__()
+            await batches.aclose()
+            return (first, await ledger.aio.query("income", timeout=10))
+
+        (first, posts) = self.loop.run_until_complete(take_first())
+        self.assertEqual(1, len(first))
+        self.assertTrue(posts)
+
+    def test_aio_iter_query_raises_query_errors(self):
+        import ledger.aio
+        ledger.read_journal(get_drewr3_dat_filename())
+
+        async def collect():
+            return [batch async for batch in ledger.aio.iter_query("expenses and (", batch_size=5)]
+
+        with self.assertRaises(Exception):
+            self.loop.run_until_complete(collect())
+
+    def test_aio_timeout_interrupts_running_job(self):
+        import ledger.aio
+        import time
+        from NLedger.Utils import CaughtSignalEnum
+
+        def wait_for_signal():
+            for _ in range(500):
+                if ledger.MainApplicationContext.Current.CancellationSignal == CaughtSignalEnum.INTERRUPTED:
+                    return True
+                time.sleep(0.01)
+            return False
+
+        with ledger.aio.SessionExecutor() as executor:
+            with self.assertRaises(asyncio.TimeoutError):
+                self.loop.run_until_complete(executor.run(wait_for_signal, timeout=0.1))
+
+            # The signal is discarded when the interrupted job is completed
+            signal = self.loop.run_until_complete(executor.run(lambda: ledger.MainApplicationContext.Current.CancellationSignal))
+            self.assertEqual(CaughtSignalEnum.NONE_CAUGHT, signal)
+
+# Lazy module loading
+
+class LazyLoadingTests(unittest.TestCase):
+
+    def run_python(self, code: str) -> str:
+        import subprocess
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.dirname(ledger.__file__))] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+        result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, env=env)
+        self.assertEqual(0, result.returncode, result.stderr)
+        return result.stdout
+
+    def test_import_does_not_start_runtime(self):
+        output = self.run_python("import sys, ledger; print(ledger.is_loaded, 'clr' in sys.modules); ledger.warmup(); print(ledger.is_loaded, 'clr' in sys.modules)")
+        self.assertEqual(["False False", "True True"], output.splitlines())
+
+    def test_instrument_enable_loads_module(self):
+        output = self.run_python("import ledger, ledger.instrument; print(ledger.is_loaded); ledger.instrument.enable(); " +
+            "print(ledger.is_loaded, ledger.Amount('$ 10') + ledger.Amount('$ 5')); ledger.instrument.disable(); " +
+            "print('Amount.__add__' in [item.name for item in ledger.instrument.get_stats()])")
+        self.assertEqual(["False", "True $ 15", "True"], output.splitlines())
+
+    def test_first_attribute_access_loads_module(self):
+        output = self.run_python("import ledger; print(ledger.Amount('$ 10') * 2); print(ledger.is_loaded)")
+        self.assertEqual(["$ 20", "True"], output.splitlines())
+
+    def test_loaded_module_has_single_namespace(self):
+        import importlib
+        self.assertTrue(ledger.is_loaded)
+        self.assertIs(ledger.Session, ledger.__dict__['Session'])
+        self.assertEqual('ledger', ledger.Session.__module__)
+        self.assertIn('read_journal', dir(ledger))
+        with self.assertRaises(AttributeError):
+            ledger.missing_attribute
+        with self.assertRaises(ImportError):
+            importlib.import_module('ledger.core')
+
+# Wrapper layer instrumentation
+
+class InstrumentTests(unittest.TestCase):
+
+    def setUp(self):
+        import ledger.instrument
+        ledger.session.close_journal_files()
+        ledger.read_journal(get_drewr3_dat_filename())
+        ledger.instrument.reset()
+
+    def tearDown(self):
+        import ledger.instrument
+        ledger.instrument.disable()
+        ledger.instrument.reset()
+
+    def test_instrument_counts_wrapper_calls(self):
+        import ledger.instrument
+        original_amount = ledger.Posting.__dict__['amount']
+        original_getitem = ledger.NList.__dict__['__getitem__']
+
+        ledger.instrument.enable()
+        self.assertTrue(ledger.instrument.is_enabled())
+        posts = ledger.session.journal().query("expenses")
+        total = posts[0].amount + posts[1].amount
+        self.assertEqual(ledger.Amount("$ 75.00"), total)
+        self.assertEqual(5, ledger.Value.to_value(5).to_long())
+        ledger.instrument.disable()
+
+        self.assertIs(original_amount, ledger.Posting.__dict__['amount'])
+        self.assertIs(original_getitem, ledger.NList.__dict__['__getitem__'])
+
+        stats = dict((item.name, item) for item in ledger.instrument.get_stats())
+        self.assertEqual(2, stats['Posting.amount'].calls)
+        self.assertEqual(2, stats['NList.__getitem__'].calls)
+        self.assertEqual(2, stats['Posting.from_origin'].calls)
+        self.assertEqual(1, stats['Amount.__add__'].calls)
+        self.assertEqual(1, stats['Value.to_value'].calls)
+        self.assertGreaterEqual(stats['NList.__getitem__'].total_time, stats['NList.__getitem__'].own_time)
+        self.assertIn('Posting.amount', ledger.instrument.report(top=100))
+
+        # Statistics are kept after disabling and are not collected anymore
+        ledger.session.journal().query("expenses")[0].amount
+        self.assertEqual(2, dict((item.name, item) for item in ledger.instrument.get_stats())['Posting.amount'].calls)
+
+    def test_instrument_writes_profile_dumps(self):
+        import ledger.instrument
+        import pstats
+        import tempfile
+
+        ledger.instrument.enable()
+        for post in ledger.session.journal().query("expenses"):
+            post.amount
+        ledger.instrument.disable()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prof_path = os.path.join(temp_dir, 'wrappers.prof')
+            ledger.instrument.dump_stats(prof_path)
+            stats = pstats.Stats(prof_path)
+            functions = dict((func[2], values) for (func, values) in stats.stats.items())
+            self.assertEqual(12, functions['Posting.amount'][1])
+            self.assertIn("PostingList.to_pitem", [caller[2] for caller in functions["Posting.from_origin"][4]])
+
+            folded_path = os.path.join(temp_dir, 'wrappers.folded')
+            ledger.instrument.dump_folded(folded_path)
+            with open(folded_path) as f:
+                lines = f.read().splitlines()
+            self.assertIn('NList.__iter__;PostingList.to_pitem;Posting.from_origin', [line.rsplit(' ', 1)[0] for line in lines])
+
+# Benchmark suite
+
+class BenchTests(unittest.TestCase):
+
+    def test_bench_generator_is_deterministic(self):
+        from ledger.bench import JournalGenerator
+        ledger.session.close_journal_files()
+        generator = JournalGenerator(xacts=100, seed=5)
+        self.assertEqual(generator.to_string(), JournalGenerator(xacts=100, seed=5).to_string())
+        self.assertNotEqual(generator.to_string(), JournalGenerator(xacts=100, seed=6).to_string())
+
+        jrn = ledger.read_journal_from_string(generator.to_string())
+        self.assertEqual(100, len(jrn.xacts()))
+        self.assertEqual(2, len(jrn.auto_xacts()))
+        self.assertEqual(2, len(jrn.period_xacts()))
+
+    def test_bench_generator_writes_included_files(self):
+        import tempfile
+        from ledger.bench import JournalGenerator
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = JournalGenerator(xacts=100).write(os.path.join(temp_dir, 'bench.dat'), files=4)
+            self.assertEqual(['bench-1.dat', 'bench-2.dat', 'bench-3.dat', 'bench-4.dat', 'bench.dat'], sorted(os.listdir(temp_dir)))
+
+            ledger.session.close_journal_files()
+            self.assertEqual(100, len(ledger.read_journal(path).xacts()))
+            ledger.session.close_journal_files()
+
+    def test_bench_runner_returns_json_results(self):
+        import json
+        import tempfile
+        from ledger.bench import JournalGenerator, BenchmarkRunner, compare_results
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = JournalGenerator(xacts=50).write(os.path.join(temp_dir, 'bench.dat'))
+            ledger.query_cache.enabled = True
+            try:
+                results = BenchmarkRunner(path, repeat=2, commands=['bal']).run(['parse', 'query', 'query_cached', 'execute_command', 'memory'])
+            finally:
+                self.assertTrue(ledger.query_cache.enabled)
+                ledger.query_cache.enabled = False
+            self.assertEqual(0, len(ledger.query_cache))
+
+        results = json.loads(json.dumps(results))
+        self.assertEqual(50, results['cases']['parse']['xacts'])
+        self.assertEqual(['expenses', 'income', '@Store', '%Tag0'], list(results['cases']['query'].keys()))
+        self.assertEqual(['expenses', 'income', '@Store', '%Tag0'], list(results['cases']['query_cached'].keys()))
+        self.assertEqual(1.0, results['cases']['query_cached']['expenses']['hit_rate'])
+        self.assertEqual(results['cases']['query']['expenses']['posts'], results['cases']['query_cached']['expenses']['posts'])
+        self.assertGreater(results['cases']['execute_command']['bal']['output_lines'], 0)
+        self.assertGreater(results['cases']['memory']['journal_bytes'], 0)
+
+        self.assertEqual([], compare_results(results, results))
+        slower = copy.deepcopy(results)
+        slower['cases']['query']['income']['seconds'] *= 2
+        self.assertEqual(['query/income'], [regression.name for regression in compare_results(results, slower)])
+
+class RedirectWrapperIOTests(unittest.TestCase):
+
+    class CollectingIO(ledger.RedirectWrapperIO):
+
+        def __init__(self, buffer_size: int = ledger.OUTPUT_BUFFER_SIZE, line_buffering: bool = True):
+            super().__init__(False, buffer_size, line_buffering)
+            self.written = []
+
+        def write_through(self, s: str):
+            self.written.append(s)
+
+    def test_redirect_wrapper_io_flushes_lines(self):
+        stream = RedirectWrapperIOTests.CollectingIO()
+        print('abc', end='', file=stream)
+        self.assertEqual([], stream.written)
+        print('def', file=stream)
+        print('ghi', file=stream)
+        self.assertEqual(['abcdef\n', 'ghi\n'], stream.written)
+
+    def test_redirect_wrapper_io_flushes_full_buffer(self):
+        stream = RedirectWrapperIOTests.CollectingIO(buffer_size=10, line_buffering=False)
+        for i in range(5):
+            print(i, file=stream)
+        self.assertEqual(['0\n1\n2\n3\n4\n'], stream.written)
+        print('x', end='', file=stream)
+        self.assertEqual(1, len(stream.written))
+        stream.flush()
+        self.assertEqual(['0\n1\n2\n3\n4\n', 'x'], stream.written)
+        stream.flush()
+        self.assertEqual(2, len(stream.written))
+
+    def test_redirect_wrapper_io_reconfigure_flushes(self):
+        stream = RedirectWrapperIOTests.CollectingIO(line_buffering=False)
+        self.assertEqual(4, stream.write('abc\n'))
+        self.assertEqual([], stream.written)
+        stream.reconfigure(line_buffering=True)
+        self.assertEqual(['abc\n'], stream.written)
+        stream.write('def\n')
+        self.assertEqual(['abc\n', 'def\n'], stream.written)
+
+        stream.write('ghi')
+        stream.close()
+        self.assertEqual(['abc\n', 'def\n', 'ghi'], stream.written)
+        self.assertRaises(ValueError, stream.write, 'jkl')
+
+    def test_release_output_streams_flushes_buffers(self):
+        (stdout, stderr) = (sys.stdout, sys.stderr)
+        stream = RedirectWrapperIOTests.CollectingIO(line_buffering=False)
+        try:
+            sys.stdout = stream
+            print('abc')
+            ledger.release_output_streams()
+            self.assertEqual(['abc\n'], stream.written)
+            self.assertEqual(ledger._stdout, sys.stdout)
+            self.assertEqual(ledger._stderr, sys.stderr)
+        finally:
+            (sys.stdout, sys.stderr) = (stdout, stderr)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,49 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Redirected output benchmark
+# Usage: [path_to_python_executable] output_benchmark.py [--prints N] > /dev/null
+
+# It prints small lines to RedirectWrapperIO (the stream that replaces sys.stdout when NLedger hosts Python) with different buffering settings.
+# Every flush calls PythonSession.ConsoleWrite, so printed text goes to the process standard output; results are written to standard error.
+# The unbuffered case (buffer_size=1) makes one interop call per write as the stream did before buffering was added.
+
+import argparse
+import sys
+import time
+
+import ledger
+
+SCENARIOS = [
+    ('unbuffered', dict(buffer_size=1)),
+    ('line buffering', dict(line_buffering=True)),
+    ('buffer 8192', dict(buffer_size=8192, line_buffering=False)),
+    ('buffer 65536', dict(buffer_size=65536, line_buffering=False)),
+]
+
+def measure(prints, settings):
+    stream = ledger.RedirectWrapperIO(False, **settings)
+    start = time.perf_counter()
+    for i in range(prints):
+        print('post', i, file=stream)
+    stream.flush()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures print performance of redirected output streams')
+    parser.add_argument('--prints', type=int, default=1000000, help='Number of printed lines')
+    args = parser.parse_args()
+
+    ledger.warmup()
+    for (name, settings) in SCENARIOS:
+        elapsed = measure(args.prints, settings)
+        print('%-20s %8.3f sec %12.0f prints/sec' % (name, elapsed, args.prints / elapsed), file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Parallel parsing benchmark
+# Usage: [path_to_python_executable] parallel_parse_benchmark.py [--files N] [--xacts N] [--runs N] [--processors N]
+
+# It generates a synthetic journal: the main file declares commodities, accounts and aliases and includes N yearly files (20 by default);
+# every included file contains transactions and price directives only, so it can be parsed independently.
+# The journal is read sequentially and with ledger.read_journal(path, parallel=True); the benchmark reports the best time of several runs
+# and checks that both ways produce the same balance report. Parallel parsing is skipped on single-processor hosts;
+# --processors overrides the detected number of processors, so the cost of the parallel mode can be measured there too.
+
+import argparse
+import os
+import os.path
+import random
+import tempfile
+import time
+
+import ledger
+
+ACCOUNTS = ['food', 'rent', 'travel', 'Expenses:Utilities:Power', 'Expenses:Utilities:Water', 'Expenses:Books']
+
+def create_journal(temp_dir, files, xacts):
+    rnd = random.Random(20)
+    main_file = os.path.join(temp_dir, 'main.dat')
+    with open(main_file, 'w') as f:
+        f.write("commodity $\n    format $1,000.00\n\ncommodity EUR\n    format 1,000.00 EUR\n\n")
+        f.write("account Expenses:Food\n    alias food\n\naccount Expenses:Rent\n    alias rent\n\n")
+        f.write("alias travel=Expenses:Travel\nalias cash=Assets:Cash\n\n")
+        for index in range(files):
+            year = 2000 + index
+            file_name = 'y%d.dat' % year
+            f.write("include %s\n" % file_name)
+            with open(os.path.join(temp_dir, file_name), 'w') as year_file:
+                for month in range(1, 13):
+                    year_file.write("P %d/%02d/01 EUR $%.2f\n" % (year, month, 1 + rnd.random() / 2))
+                year_file.write("\n")
+                for number in range(xacts):
+                    year_file.write("%d/%02d/%02d * (%d) Payee %d\n" % (year, number % 12 + 1, number % 28 + 1, number, rnd.randrange(100)))
+                    year_file.write("    %s    %s\n" % (rnd.choice(ACCOUNTS), rnd.choice(["$%d.%02d" % (rnd.randrange(1000), rnd.randrange(100)), "%d EUR" % rnd.randrange(1000)])))
+                    year_file.write("    cash\n\n")
+    return main_file
+
+def measure(main_file, parallel, runs):
+    best = None
+    for _ in range(runs):
+        ledger.session.close_journal_files()
+        start = time.perf_counter()
+        ledger.read_journal(main_file, parallel=parallel)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return (best, ledger.execute_command('bal').Output)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares sequential and parallel parsing of a multi-file journal')
+    parser.add_argument('--files', type=int, default=20, help='Number of included files')
+    parser.add_argument('--xacts', type=int, default=5000, help='Number of transactions in every included file')
+    parser.add_argument('--runs', type=int, default=3, help='Number of runs (the best time is reported)')
+    parser.add_argument('--processors', type=int, default=None, help='Number of processors that parallel parsing assumes (detected by default)')
+    args = parser.parse_args()
+
+    ledger.warmup()     # .Net namespaces are available when the module is loaded
+    from NLedger.Textual import ParallelParser
+    if not args.processors is None:
+        ParallelParser.ProcessorCount = args.processors
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        main_file = create_journal(temp_dir, args.files, args.xacts)
+        measure(main_file, False, 1)   # warms up JIT
+
+        (sequential_time, sequential_balance) = measure(main_file, False, args.runs)
+        (parallel_time, parallel_balance) = measure(main_file, True, args.runs)
+
+    print('Journal: %d files x %d transactions; %d CPUs, parallel parsing assumes %d' % (args.files, args.xacts, os.cpu_count() or 1, ParallelParser.ProcessorCount))
+    print('Sequential: %8.3f sec' % sequential_time)
+    print('Parallel:   %8.3f sec, speedup %5.2f' % (parallel_time, sequential_time / parallel_time))
+    if sequential_balance != parallel_balance:
+        print('Error: balance reports are different')
+
+if __name__ == '__main__':
+    main()
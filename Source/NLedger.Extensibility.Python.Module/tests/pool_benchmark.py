@@ -0,0 +1,75 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Report pool benchmark
+# Usage: [path_to_python_executable] pool_benchmark.py [--workers N] [--scale N] [--jobs N]
+
+# It measures report throughput (commands per second) of ledger.pool.ReportPool with 1, 2, 4 ... N workers
+# and compares it with executing the same commands one by one in the current process.
+# The input journal is drewr3.dat with transactions repeated N times (1000 by default).
+# Worker start time (module import and journal parsing) is reported separately and is not included into throughput.
+
+import argparse
+import os
+import os.path
+import tempfile
+import time
+
+import ledger
+import ledger.pool
+
+from functor_benchmark import create_scaled_journal
+
+COMMANDS = ['bal', 'bal ^Expenses', 'reg ^Assets:Checking', 'bal -M ^Expenses', 'reg --monthly ^Income']
+
+def worker_counts(max_workers):
+    count = 1
+    while count < max_workers:
+        yield count
+        count *= 2
+    yield max_workers
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures report throughput of ledger.pool.ReportPool')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Maximum number of worker processes')
+    parser.add_argument('--scale', type=int, default=1000, help='How many times drewr3.dat transactions are repeated')
+    parser.add_argument('--jobs', type=int, default=40, help='Number of commands executed in every run')
+    args = parser.parse_args()
+
+    commands = [COMMANDS[i % len(COMMANDS)] for i in range(args.jobs)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal_file = os.path.join(temp_dir, 'journal.dat')
+        create_scaled_journal(journal_file, args.scale)
+
+        ledger.read_journal(journal_file)
+        start = time.perf_counter()
+        for command in commands:
+            ledger.execute_command(command)
+        sequential_time = time.perf_counter() - start
+
+        print('Journal: drewr3.dat x %d; %d commands; %d CPUs' % (args.scale, args.jobs, os.cpu_count() or 1))
+        print('In-process:  %8.2f commands per second' % (args.jobs / sequential_time))
+
+        single_rate = None
+        for workers in worker_counts(args.workers):
+            start = time.perf_counter()
+            with ledger.pool.ReportPool(journal_file, workers=workers) as pool:
+                start_time = time.perf_counter() - start
+                pool.map_commands(commands[:workers])   # every worker runs one command to warm up JIT
+                start = time.perf_counter()
+                pool.map_commands(commands)
+                elapsed = time.perf_counter() - start
+
+            rate = args.jobs / elapsed
+            single_rate = single_rate or rate
+            print('%2d workers: %8.2f commands per second, speedup %5.2f (start %.2f sec)' % (workers, rate, rate / single_rate, start_time))
+
+if __name__ == '__main__':
+    main()
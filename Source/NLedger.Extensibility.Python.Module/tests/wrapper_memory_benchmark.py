@@ -0,0 +1,54 @@
+####################################################################################
+# Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+# Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+#
+# This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+# Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+# See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+####################################################################################
+
+# Wrapper memory benchmark
+# Usage: [path_to_python_executable] wrapper_memory_benchmark.py [--count N]
+
+# It measures how many bytes of Python memory are allocated per wrapped posting (and per other common wrappers).
+# Only Python allocations are counted (tracemalloc); .Net objects are shared and not included.
+
+import argparse
+import os.path
+import time
+import tracemalloc
+
+import ledger
+
+def measure(name, origins, factory):
+    wrappers = None
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        wrappers = [factory(origin) for origin in origins]
+        elapsed = time.perf_counter() - start
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The list itself takes one pointer per item; it is not a part of the wrapper size
+    per_item = (size - len(wrappers) * 8) / len(wrappers)
+    print('%-10s %8.1f bytes per wrapper, %8.0f wrappers per second' % (name, per_item, len(wrappers) / elapsed))
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures Python memory per wrapped object')
+    parser.add_argument('--count', type=int, default=100000, help='Number of wrappers to create')
+    args = parser.parse_args()
+
+    journal = ledger.read_journal(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'drewr3.dat'))
+    posts = [post.origin for post in journal.query('')]
+    post_origins = [posts[i % len(posts)] for i in range(args.count)]
+    amount_origins = [post.Amount for post in post_origins]
+    account_origins = [post.Account for post in post_origins]
+
+    measure('Posting', post_origins, ledger.Posting.from_origin)
+    measure('Amount', amount_origins, ledger.Amount.from_origin)
+    measure('Account', account_origins, ledger.Account.from_origin)
+
+if __name__ == '__main__':
+    main()
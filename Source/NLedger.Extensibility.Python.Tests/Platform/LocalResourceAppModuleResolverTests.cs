@@ -23,19 +23,19 @@ namespace NLedger.Extensibility.Python.Tests.Platform
         {
             AppModulePath = Path.GetTempPath();
             AppModuleFile = Path.GetFullPath($"{AppModulePath}/ledger/__init__.py");
+            AppModuleCoreFile = Path.GetFullPath($"{AppModulePath}/ledger/core.py");
 
-            if (File.Exists(AppModuleFile))
-                File.Delete(AppModuleFile);
+            DeleteModuleFiles();
         }
 
         public void Dispose()
         {
-            if (File.Exists(AppModuleFile))
-                File.Delete(AppModuleFile);
+            DeleteModuleFiles();
         }
 
         public string AppModulePath { get; }
         public string AppModuleFile { get; }
+        public string AppModuleCoreFile { get; }
 
         [Fact]
         public void LocalResourceAppModuleResolver_Constructor_PopulatesProperties()
@@ -79,6 +79,24 @@ namespace NLedger.Extensibility.Python.Tests.Platform
             }
         }
 
+        [Fact]
+        public void LocalResourceAppModuleResolver_GetAppModulePath_CreatesCoreFile()
+        {
+            Assert.False(File.Exists(AppModuleCoreFile));
+            new LocalResourceAppModuleResolver(AppModulePath).GetAppModulePath();
+            Assert.True(File.Exists(AppModuleCoreFile));
+
+            var content = File.ReadAllText(AppModuleCoreFile);
+            using (var resource = typeof(LocalResourceAppModuleResolver).Assembly.GetManifestResourceStream("NLedger.Extensibility.Python.core.py"))
+            {
+                using (var reader = new StreamReader(resource))
+                {
+                    string result = reader.ReadToEnd();
+                    Assert.Equal(result, content);
+                }
+            }
+        }
+
         [Fact]
         public void LocalResourceAppModuleResolver_GetAppModulePath_CreatesFileOnce()
         {
@@ -136,5 +154,14 @@ namespace NLedger.Extensibility.Python.Tests.Platform
             Assert.False(created);
 
         }
+
+        private void DeleteModuleFiles()
+        {
+            foreach (var fileName in new string[] { AppModuleFile, AppModuleCoreFile })
+            {
+                if (File.Exists(fileName))
+                    File.Delete(fileName);
+            }
+        }
     }
 }
@@ -158,6 +158,69 @@ namespace NLedger.Extensibility.Python.Tests
             }
         }
 
+        [PythonFact]
+        public void PythonValueConverter_GetObject_RepeatedConversions()
+        {
+            PythonSession.PythonModuleInitialization();
+            try
+            {
+                PythonSession.Current.Initialize();
+                using (PythonSession.Current.GIL())
+                {
+                    var converter = new PythonValueConverter(PythonSession.Current);
+
+                    for (int i = 0; i < 100; i++)
+                    {
+                        var py = converter.GetObject(Value.Get(new Amount(i)));
+                        Assert.Equal("Amount", py.GetPythonTypeName());
+                        Assert.Equal(i.ToString(), py.ToString());
+
+                        py = converter.GetObject(Value.Get(new Date(2021, 10, 1 + i % 28)));
+                        Assert.Equal("date", py.GetPythonTypeName());
+                        Assert.Equal($"2021-10-{1 + i % 28:00}", py.ToString());
+
+                        py = converter.GetObject(Value.Get(i % 2 == 0));
+                        Assert.Equal("bool", py.GetPythonTypeName());
+                        Assert.Equal(i % 2 == 0 ? "True" : "False", py.ToString());
+                    }
+                }
+            }
+            finally
+            {
+                PythonSession.PythonModuleShutdown();
+            }
+        }
+
+        [PythonFact]
+        public void PythonValueConverter_GetObject_UsesReloadedModule()
+        {
+            PythonSession.PythonModuleInitialization();
+            try
+            {
+                PythonSession.Current.Initialize();
+                using (PythonSession.Current.GIL())
+                {
+                    var converter = new PythonValueConverter(PythonSession.Current);
+                    var ledgerModule = PythonSession.Current.LedgerModule;
+
+                    var amountClass = ledgerModule.GetAttr("Amount");
+                    Assert.Equal(amountClass.Handle, converter.GetObject(Value.Get(new Amount(1))).GetPythonType().Handle);
+
+                    ledgerModule.Exec("import importlib\nimportlib.reload(sys.modules['ledger']).warmup()");
+                    var reloadedAmountClass = ledgerModule.GetAttr("Amount");
+                    Assert.NotEqual(amountClass.Handle, reloadedAmountClass.Handle);
+                    Assert.Equal(reloadedAmountClass.Handle, converter.GetObject(Value.Get(new Amount(1))).GetPythonType().Handle);
+
+                    converter.Reset();
+                    Assert.Equal("1", converter.GetObject(Value.Get(new Amount(1))).ToString());
+                }
+            }
+            finally
+            {
+                PythonSession.PythonModuleShutdown();
+            }
+        }
+
         [PythonFact]
         public void PythonValueConverter_GetValue_Conversions()
         {
@@ -19,6 +19,11 @@ namespace NLedger.Extensibility.Python.Platform
     /// </summary>
     public class LocalResourceAppModuleResolver : IAppModuleResolver
     {
+        /// <summary>
+        /// Files of Ledger module: the lazy loader (__init__.py) and the module code (core.py) that it loads on first use.
+        /// </summary>
+        public static readonly string[] ModuleFiles = new string[] { "__init__.py", "core.py" };
+
         public LocalResourceAppModuleResolver(string appModulePath = null)
         {
             AppModulePath = appModulePath ?? BuildAppModulePath();
@@ -31,21 +36,25 @@ namespace NLedger.Extensibility.Python.Platform
         {
             if (!IsPathValidated)
             {
-                var targetFileName = Path.GetFullPath($"{AppModulePath}/ledger/__init__.py");
                 var assemblyDate = File.GetLastWriteTime(Assembly.GetExecutingAssembly().Location);
 
-                if (!File.Exists(targetFileName) || assemblyDate != File.GetLastWriteTime(targetFileName))
+                foreach (var moduleFile in ModuleFiles)
                 {
-                    Directory.CreateDirectory(Path.GetDirectoryName(targetFileName));
+                    var targetFileName = Path.GetFullPath($"{AppModulePath}/ledger/{moduleFile}");
 
-                    using (var resource = Assembly.GetExecutingAssembly().GetManifestResourceStream("NLedger.Extensibility.Python.__init__.py"))
+                    if (!File.Exists(targetFileName) || assemblyDate != File.GetLastWriteTime(targetFileName))
                     {
-                        using (var file = new FileStream(targetFileName, FileMode.Create, FileAccess.Write))
-                            resource.CopyTo(file);
-                    }
+                        Directory.CreateDirectory(Path.GetDirectoryName(targetFileName));
 
-                    File.SetLastWriteTime(targetFileName, assemblyDate);
-                    OnFileCreated?.Invoke();
+                        using (var resource = Assembly.GetExecutingAssembly().GetManifestResourceStream($"NLedger.Extensibility.Python.{moduleFile}"))
+                        {
+                            using (var file = new FileStream(targetFileName, FileMode.Create, FileAccess.Write))
+                                resource.CopyTo(file);
+                        }
+
+                        File.SetLastWriteTime(targetFileName, assemblyDate);
+                        OnFileCreated?.Invoke();
+                    }
                 }
 
                 IsPathValidated = true;
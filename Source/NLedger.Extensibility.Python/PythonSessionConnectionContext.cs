@@ -47,6 +47,9 @@ namespace NLedger.Extensibility.Python
                 if (!PythonSession.IsPythonHost && isPlatformDisposing)
                     LedgerModule?.Exec("release_output_streams()");
 
+                // Cached conversion functions refer to the released ledger module
+                PythonSession.PythonValueConverter.Reset();
+
                 MainModule.ModuleObject.Dispose();
             }
         }
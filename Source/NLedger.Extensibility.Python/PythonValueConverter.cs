@@ -22,6 +22,7 @@ namespace NLedger.Extensibility.Python
     {
         PyObject GetObject(Value val);
         Value GetValue(PyObject obj);
+        void Reset();
     }
 
     public class PythonValueConverter : IPythonValueConverter
@@ -147,32 +148,89 @@ namespace NLedger.Extensibility.Python
             }
         }
 
-        public PyObject GetPyDate(Date date) => GetPyObject("to_pdate(value)", date);
-        public PyObject GetPyDateTime(DateTime dateTime) => GetPyObject("to_pdatetime(value)", dateTime);
-        public PyObject GetPyBool(bool val) => GetPyObject("bool(str(value)=='True')", val);
-        public PyObject GetPyInt(long val) => GetPyObject("int(str(value))", val);
+        public PyObject GetPyDate(Date date) => GetPyObject("to_pdate", date);
+        public PyObject GetPyDateTime(DateTime dateTime) => GetPyObject("to_pdatetime", dateTime);
+        public PyObject GetPyBool(bool val)
+        {
+            using (PythonSession.GIL())
+                return val.ToPython();
+        }
+
+        public PyObject GetPyInt(long val)
+        {
+            using (PythonSession.GIL())
+                return new PyInt(val);
+        }
 
-        public PyObject GetPyAmount(Amounts.Amount amount) => GetPyObject("Amount.from_origin(value)", amount);
-        public PyObject GetPyBalance(Balance balance) => GetPyObject("Balance.from_origin(value)", balance);
-        public PyObject GetPyPost(Post post) => GetPyObject("Posting.from_origin(value)", post);
-        public PyObject GetPyXact(Xact xact) => GetPyObject("Transaction.from_origin(value)", xact);
-        public PyObject GetPyPeriodXact(PeriodXact periodXact) => GetPyObject("PeriodicTransaction.from_origin(value)", periodXact);
-        public PyObject GetPyAutoXact(AutoXact autoXact) => GetPyObject("AutomatedTransaction.from_origin(value)", autoXact);
-        public PyObject GetPyAccount(Account account) => GetPyObject("Account.from_origin(value)", account);
-        public PyObject GetPyValue(Value val) => GetPyObject("Value.to_value(value)", val);
+        public PyObject GetPyAmount(Amounts.Amount amount) => GetPyObject("Amount.from_origin", amount);
+        public PyObject GetPyBalance(Balance balance) => GetPyObject("Balance.from_origin", balance);
+        public PyObject GetPyPost(Post post) => GetPyObject("Posting.from_origin", post);
+        public PyObject GetPyXact(Xact xact) => GetPyObject("Transaction.from_origin", xact);
+        public PyObject GetPyPeriodXact(PeriodXact periodXact) => GetPyObject("PeriodicTransaction.from_origin", periodXact);
+        public PyObject GetPyAutoXact(AutoXact autoXact) => GetPyObject("AutomatedTransaction.from_origin", autoXact);
+        public PyObject GetPyAccount(Account account) => GetPyObject("Account.from_origin", account);
+        public PyObject GetPyValue(Value val) => GetPyObject("Value.to_value", val);
+
+        public Date GetDate(PyObject val) => GetPyObject("to_ndate", val).As<Date>();
+        public DateTime GetDateTime(PyObject val) => GetPyObject("to_ndatetime", val).As<DateTime>();
+
+        /// <summary>
+        /// Releases cached conversion functions. It is called when the ledger module is released (e.g. before the Python engine is shut down)
+        /// and should be called while the engine is initialized.
+        /// </summary>
+        public void Reset()
+        {
+            using (PythonSession.GIL())
+            {
+                foreach (var function in Functions.Values)
+                    function.Dispose();
+                Functions.Clear();
 
-        public Date GetDate(PyObject val) => GetPyObject("to_ndate(value)", val).As<Date>();
-        public DateTime GetDateTime(PyObject val) => GetPyObject("to_ndatetime(value)", val).As<DateTime>();
+                FunctionsToken?.Dispose();
+                FunctionsToken = null;
+                FunctionsModule = null;
+            }
+        }
 
-        private PyObject GetPyObject(string init_method, object val)
+        /// <summary>
+        /// Calls a conversion function from the ledger module. Functions are resolved once and cached
+        /// until the ledger module is changed or reloaded, so that conversions do not compile and evaluate Python code.
+        /// </summary>
+        private PyObject GetPyObject(string functionName, object val)
         {
             using (PythonSession.GIL())
+                return GetFunction(functionName).Invoke((val as PyObject) ?? PyObject.FromManagedObject(val));
+        }
+
+        private PyObject GetFunction(string functionName)
+        {
+            var ledgerModule = PythonSession.LedgerModule;
+
+            // importlib.reload keeps the module object but executes the module code again, so the module gets new classes
+            var token = ledgerModule.GetAttr("Value");
+            if (!ReferenceEquals(ledgerModule, FunctionsModule) || FunctionsToken == null || token.Handle != FunctionsToken.Handle)
+            {
+                Reset();
+                FunctionsModule = ledgerModule;
+                FunctionsToken = token;
+            }
+            else
             {
-                var dict = new PyDict();
-                dict["value"] = (val as PyObject) ?? PyObject.FromManagedObject(val);
-                return PythonSession.LedgerModule.Eval(init_method, dict);
+                token.Dispose();
             }
+
+            PyObject function;
+            if (!Functions.TryGetValue(functionName, out function))
+            {
+                function = ledgerModule.Eval(functionName);
+                Functions.Add(functionName, function);
+            }
+            return function;
         }
 
+        private readonly IDictionary<string, PyObject> Functions = new Dictionary<string, PyObject>();
+        private PyModule FunctionsModule;
+        private PyObject FunctionsToken;
+
     }
 }
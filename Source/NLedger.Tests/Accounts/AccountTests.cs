@@ -526,5 +526,30 @@ namespace NLedger.Tests.Accounts
             Assert.False(childAcc.Valid());
         }
 
+        [Fact]
+        public void Account_TreeGeneration_IsIncrementedForParentsWhenAccountsAreAddedOrRemoved()
+        {
+            Account root = new Account();
+            Account assets = root.FindAccount("Assets");
+            Assert.Equal(1, root.TreeGeneration);
+            Assert.Equal(0, assets.TreeGeneration);
+
+            Account cash = root.FindAccount("Assets:Cash");
+            Assert.Equal(2, root.TreeGeneration);
+            Assert.Equal(1, assets.TreeGeneration);
+
+            root.FindAccount("Assets:Cash");
+            Assert.Equal(2, root.TreeGeneration);
+
+            Assert.True(assets.RemoveAccount(cash));
+            Assert.Equal(3, root.TreeGeneration);
+            Assert.False(assets.RemoveAccount(cash));
+            Assert.Equal(3, root.TreeGeneration);
+
+            assets.AddAccount(cash);
+            Assert.Equal(4, root.TreeGeneration);
+            Assert.Equal(3, assets.TreeGeneration);
+        }
+
     }
 }
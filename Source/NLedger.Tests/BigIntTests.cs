@@ -478,5 +478,17 @@ namespace NLedger.Tests
             Assert.Equal("1,000", BigInt.FromLong(1000).Print(0, 2, comm));
         }
 
+        [Fact]
+        public void BigInt_ToExactString_CanBeRestoredByParseExact()
+        {
+            BigInt third = BigInt.FromInt(1) / BigInt.FromInt(3);
+            BigInt restored = BigInt.ParseExact(third.ToExactString(), 4, true);
+
+            Assert.Equal(third, restored);
+            Assert.Equal(4, restored.Precision);
+            Assert.True(restored.KeepPrecision);
+            Assert.Equal(BigInt.Parse("-12.345"), BigInt.ParseExact(BigInt.Parse("-12.345").ToExactString()));
+        }
+
     }
 }
@@ -0,0 +1,49 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Accounts;
+using NLedger.Extensibility.Export;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Extensibility.Export
+{
+    public class AccountTreeColumnsTests
+    {
+        [Fact]
+        public void AccountTreeColumns_Constructor_RequiresRoot()
+        {
+            Assert.Throws<ArgumentNullException>(() => new AccountTreeColumns(null));
+        }
+
+        [Fact]
+        public void AccountTreeColumns_Constructor_CollectsTreeInDepthFirstOrder()
+        {
+            var root = new Account();
+            root.FindAccount("Expenses:Food");
+            root.FindAccount("Assets:Cash");
+            root.FindAccount("Assets:Bank:Checking");
+
+            var columns = new AccountTreeColumns(root);
+
+            Assert.Same(root, columns.Root);
+            Assert.Equal(root.TreeGeneration, columns.TreeGeneration);
+            Assert.Equal(7, columns.Count);
+            Assert.Same(root, columns.Accounts[0]);
+            Assert.Equal(new string[] { "", "Assets", "Assets:Bank", "Assets:Bank:Checking", "Assets:Cash", "Expenses", "Expenses:Food" }, columns.FullNames);
+            Assert.Equal(new string[] { "", "Assets", "Bank", "Checking", "Cash", "Expenses", "Food" }, columns.Names);
+            Assert.Equal(new int[] { 0, 1, 2, 3, 2, 1, 2 }, columns.Depths);
+            Assert.Equal(new int[] { -1, 0, 1, 2, 1, 0, 5 }, columns.Parents);
+            Assert.Same(root.FindAccount("Assets:Bank:Checking", false), columns.Accounts[3]);
+        }
+    }
+}
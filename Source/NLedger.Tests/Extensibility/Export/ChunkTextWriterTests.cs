@@ -0,0 +1,59 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Extensibility.Export;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Extensibility.Export
+{
+    public class ChunkTextWriterTests
+    {
+        [Fact]
+        public void ChunkTextWriter_Constructor_ValidatesArguments()
+        {
+            Assert.Throws<ArgumentNullException>(() => new ChunkTextWriter(null));
+            Assert.Throws<ArgumentOutOfRangeException>(() => new ChunkTextWriter(s => { }, 0));
+        }
+
+        [Fact]
+        public void ChunkTextWriter_Write_SendsCompleteChunks()
+        {
+            var chunks = new List<string>();
+            var writer = new ChunkTextWriter(chunks.Add, 4);
+
+            writer.Write("ab");
+            Assert.Empty(chunks);
+
+            writer.Write('c');
+            writer.Write("de".ToCharArray(), 0, 2);
+            Assert.Equal(new string[] { "abcde" }, chunks);
+
+            writer.Write("f");
+            writer.Flush();
+            Assert.Equal(new string[] { "abcde", "f" }, chunks);
+
+            writer.Flush();
+            Assert.Equal(2, chunks.Count);
+        }
+
+        [Fact]
+        public void ChunkTextWriter_Dispose_SendsRemainder()
+        {
+            var chunks = new List<string>();
+            using (var writer = new ChunkTextWriter(chunks.Add))
+                writer.WriteLine("text");
+
+            Assert.Equal("text" + Environment.NewLine, chunks.Single());
+        }
+    }
+}
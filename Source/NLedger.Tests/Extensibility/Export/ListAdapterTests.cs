@@ -87,6 +87,18 @@ namespace NLedger.Tests.Extensibility.Export
             Assert.Equal(3, origin.Count);
         }
 
+        [Fact]
+        public void ListAdapter_GetRange_ReturnsRequestedItems()
+        {
+            var origin = new List<int>() { 10, 20, 30, 40, 50 };
+            var adapter = new ListAdapter<int>(origin);
+            Assert.Equal(new int[] { 20, 30 }, adapter.GetRange(1, 2));
+            Assert.Equal(new int[] { 40, 50 }, adapter.GetRange(3, 10));
+            Assert.Empty(adapter.GetRange(5, 2));
+            Assert.Throws<ArgumentOutOfRangeException>(() => adapter.GetRange(-1, 2));
+            Assert.Throws<ArgumentOutOfRangeException>(() => adapter.GetRange(0, -1));
+        }
+
         [Fact]
         public void ListAdapter_ToString_ForwardsToOrigin()
         {
@@ -231,5 +243,76 @@ namespace NLedger.Tests.Extensibility.Export
             }
         }
 
+        [Fact]
+        public void ListAdapter_GetQuery_ReturnsAdapterForPreparedQuery()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString("2010/01/01 Payee\n    A    10\n    B\n");
+                var query = ListAdapter.PrepareQuery(session.Journal, "A");
+                Assert.Equal("A", query.QueryText);
+                Assert.Single(ListAdapter.GetQuery(query).Origin);
+                Assert.Single(ListAdapter.GetQuery(query).Origin);
+            }
+        }
+
+        [Fact]
+        public void ListAdapter_PrepareQuery_KeepsReportOptionsOfPreparation()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString("2010/01/01 Payee\n    A    10\n    B\n");
+                var query = ListAdapter.PrepareQuery(session.Journal, "A");
+                Assert.Equal(JournalQuery.CurrentReportOptions(), query.ReportOptions);
+
+                ((NLedger.Scopus.Report)NLedger.Scopus.Scope.DefaultScope).RealHandler.On("test");
+                Assert.NotEqual(JournalQuery.CurrentReportOptions(), query.ReportOptions);
+            }
+        }
+
+        [Fact]
+        public void ListAdapter_Copy_CreatesShallowCopy()
+        {
+            var origin = new List<int>() { 10, 20 };
+            var copy = new ListAdapter<int>(origin).Copy();
+            copy.Add(30);
+            Assert.Equal(2, origin.Count);
+            Assert.Equal(new List<int>() { 10, 20, 30 }, copy.Origin);
+        }
+
+        [Fact]
+        public void ListAdapter_GetPostColumns_ReturnsColumnsForJournal()
+        {
+            var data = new Journal();
+            var columns = ListAdapter.GetPostColumns(data);
+            Assert.Equal(0, columns.Count);
+        }
+
+        [Fact]
+        public void ListAdapter_GetPostColumns_ReturnsColumnsForPosts()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                var xact = new Xact() { Date = new NLedger.Utility.Date(2010, 10, 10) };
+                var adapter = new ListAdapter<Post>(new List<Post>() { new Post() { Xact = xact, Amount = new NLedger.Amounts.Amount(10) } });
+                var columns = ListAdapter.GetPostColumns(adapter);
+                Assert.Equal(1, columns.Count);
+                Assert.Equal(10, columns.Quantities[0]);
+            }
+        }
+
+        [Fact]
+        public void ListAdapter_GetItemDates_ReturnsDatesForPostsAndXacts()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                var xact = new Xact() { Date = new NLedger.Utility.Date(1970, 1, 11) };
+                var posts = new ListAdapter<Post>(new List<Post>() { new Post() { Xact = xact } });
+                var xacts = new ListAdapter<Xact>(new List<Xact>() { xact });
+                Assert.Equal(new long[] { 10 }, ListAdapter.GetItemDates(posts));
+                Assert.Equal(new long[] { 10 }, ListAdapter.GetItemDates(xacts));
+            }
+        }
+
     }
 }
@@ -0,0 +1,123 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Amounts;
+using NLedger.Extensibility.Export;
+using NLedger.Extensibility.Net;
+using NLedger.Items;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Extensibility.Export
+{
+    public class PostColumnsTests
+    {
+        [Fact]
+        public void PostColumns_Constructor_RequiresPosts()
+        {
+            Assert.Throws<ArgumentNullException>(() => new PostColumns(null));
+        }
+
+        [Fact]
+        public void PostColumns_Constructor_HandlesEmptySequence()
+        {
+            var columns = new PostColumns(Enumerable.Empty<Post>());
+            Assert.Equal(0, columns.Count);
+            Assert.Empty(columns.Dates);
+            Assert.Empty(columns.Quantities);
+            Assert.Empty(columns.Commodities);
+            Assert.Empty(columns.Accounts);
+            Assert.Empty(columns.Payees);
+        }
+
+        [Fact]
+        public void PostColumns_Constructor_CollectsColumns()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString("1970/01/02 * Payee1\n    A:B    $10.25\n    C\n\n1970/01/03 Payee2\n    A:B    5 EUR\n    D\n");
+                var columns = ListAdapter.GetPostColumns(session.Journal);
+
+                Assert.Equal(4, columns.Count);
+                Assert.Equal(new long[] { 1, 1, 2, 2 }, columns.Dates);
+                Assert.Equal(new double[] { 10.25, -10.25, 5, -5 }, columns.Quantities);
+                Assert.Equal(new long[] { 1025, -1025, 5, -5 }, columns.ScaledQuantities);
+
+                Assert.Equal(new string[] { "$", "EUR" }, columns.Commodities);
+                Assert.Equal(new int[] { 2, 0 }, columns.CommodityPrecisions);
+                Assert.Equal(new int[] { 0, 0, 1, 1 }, columns.CommodityIds);
+
+                Assert.Equal(new string[] { "A:B", "C", "D" }, columns.Accounts);
+                Assert.Equal(new int[] { 0, 1, 0, 2 }, columns.AccountIds);
+
+                Assert.Equal(new string[] { "Payee1", "Payee2" }, columns.Payees);
+                Assert.Equal(new int[] { 0, 0, 1, 1 }, columns.PayeeIds);
+
+                Assert.Equal(new int[] { (int)ItemStateEnum.Cleared, (int)ItemStateEnum.Cleared, (int)ItemStateEnum.Uncleared, (int)ItemStateEnum.Uncleared }, columns.States);
+                Assert.Equal(columns.XactSeqs[0], columns.XactSeqs[1]);
+                Assert.NotEqual(columns.XactSeqs[1], columns.XactSeqs[2]);
+            }
+        }
+
+        [Fact]
+        public void PostColumns_Constructor_KeepsQuantitiesThatDoNotFitScaledColumn()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString("2020/01/01 Payee\n    A    123456789012345678901234567890123 XYZ\n    B\n\n" +
+                    "2020/01/02 Payee\n    A    0.1234567890123456789012 ABC\n    B\n");
+                var columns = ListAdapter.GetPostColumns(session.Journal);
+
+                Assert.Equal(4, columns.Count);
+                Assert.Null(columns.ScaledQuantities);
+                Assert.True(Math.Abs(columns.Quantities[0] / 1.23456789012345678e32 - 1) < 1e-12);
+                Assert.True(Math.Abs(columns.Quantities[1] / -1.23456789012345678e32 - 1) < 1e-12);
+                Assert.True(Math.Abs(columns.Quantities[2] - 0.1234567890123456789012) < 1e-15);
+                Assert.Equal(new int[] { 0, 22 }, columns.CommodityPrecisions);
+            }
+        }
+
+        [Fact]
+        public void PostColumns_TryScale_ChecksLongRange()
+        {
+            long scaled;
+            Assert.True(PostColumns.TryScale(Quantity.Parse("10.256"), 2, out scaled));
+            Assert.Equal(1026, scaled);
+            Assert.True(PostColumns.TryScale(Quantity.Parse("0.1"), 18, out scaled));
+            Assert.Equal(100000000000000000, scaled);
+            Assert.False(PostColumns.TryScale(Quantity.Parse("10"), 18, out scaled));
+            Assert.False(PostColumns.TryScale(Quantity.Parse("123456789012345678901234567890"), 0, out scaled));
+        }
+
+        [Fact]
+        public void PostColumns_ToEpochDays_ReturnsDaysSince1970()
+        {
+            Assert.Equal(0, PostColumns.ToEpochDays(new NLedger.Utility.Date(1970, 1, 1)));
+            Assert.Equal(-1, PostColumns.ToEpochDays(new NLedger.Utility.Date(1969, 12, 31)));
+            Assert.Equal(14975, PostColumns.ToEpochDays(new NLedger.Utility.Date(2011, 1, 1)));
+        }
+
+        [Fact]
+        public void PostColumns_GetEpochDays_ReturnsItemDates()
+        {
+            Assert.Throws<ArgumentNullException>(() => PostColumns.GetEpochDays(null));
+
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString("1970/01/02 * Payee1\n    A:B    $10.25\n    C\n\n1970/01/03 Payee2\n    A:B    5 EUR  ; [1970/01/05]\n    D\n");
+
+                Assert.Equal(new long[] { 1, 2 }, PostColumns.GetEpochDays(session.Journal.Xacts));
+                Assert.Equal(new long[] { 1, 1, 4, 2 }, PostColumns.GetEpochDays(session.Journal.Xacts.SelectMany(xact => xact.Posts)));
+            }
+        }
+    }
+}
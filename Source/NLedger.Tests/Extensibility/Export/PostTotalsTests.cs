@@ -0,0 +1,88 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Extensibility.Export;
+using NLedger.Extensibility.Net;
+using NLedger.Journals;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Extensibility.Export
+{
+    public class PostTotalsTests
+    {
+        private const string TestJournal = "2021/01/02 Payee1\n    A:B    $10.25\n    C\n\n2021/01/03 Payee2\n    A:B    5 EUR\n    D\n\n2021/02/01 Payee1\n    A:B    $4.75\n    C\n";
+
+        [Fact]
+        public void PostTotals_Constructor_RequiresPosts()
+        {
+            Assert.Throws<ArgumentNullException>(() => new PostTotals(null));
+        }
+
+        [Fact]
+        public void PostTotals_Constructor_HandlesEmptySequence()
+        {
+            var totals = new PostTotals(Enumerable.Empty<Post>(), PostGrouping.Account);
+            Assert.True(totals.Total.IsEmpty);
+            Assert.Empty(totals.Keys);
+            Assert.Empty(totals.Totals);
+        }
+
+        [Fact]
+        public void PostTotals_Constructor_SumsAllPosts()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(TestJournal);
+                var totals = new PostTotals(session.Journal.Query("^c"));
+
+                Assert.Equal(PostGrouping.None, totals.Grouping);
+                Assert.Equal("$-15.00", totals.Total.ToString().Trim());
+                Assert.Empty(totals.Keys);
+            }
+        }
+
+        [Fact]
+        public void PostTotals_Constructor_GroupsPosts()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(TestJournal);
+                var posts = session.Journal.Query("^a:").ToList();
+
+                var byAccount = new PostTotals(posts, PostGrouping.Account);
+                Assert.Equal(new object[] { "A:B" }, byAccount.Keys);
+
+                var byCommodity = new PostTotals(posts, PostGrouping.Commodity);
+                Assert.Equal(new object[] { "$", "EUR" }, byCommodity.Keys);
+                Assert.Equal("$15.00", byCommodity.Totals[0].ToString().Trim());
+                Assert.Equal("5 EUR", byCommodity.Totals[1].ToString().Trim());
+
+                var byPayee = new PostTotals(posts, PostGrouping.Payee);
+                Assert.Equal(new object[] { "Payee1", "Payee2" }, byPayee.Keys);
+
+                var byMonth = new PostTotals(posts, PostGrouping.Month);
+                Assert.Equal(new object[] { new NLedger.Utility.Date(2021, 1, 1), new NLedger.Utility.Date(2021, 2, 1) }, byMonth.Keys);
+                Assert.Equal("$4.75", byMonth.Totals[1].ToString().Trim());
+            }
+        }
+
+        [Fact]
+        public void PostTotals_ParseGrouping_ReturnsGrouping()
+        {
+            Assert.Equal(PostGrouping.None, PostTotals.ParseGrouping(null));
+            Assert.Equal(PostGrouping.Account, PostTotals.ParseGrouping("account"));
+            Assert.Equal(PostGrouping.Month, PostTotals.ParseGrouping("Month"));
+            Assert.Throws<ArgumentException>(() => PostTotals.ParseGrouping("unknown"));
+        }
+    }
+}
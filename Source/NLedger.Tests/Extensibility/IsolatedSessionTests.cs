@@ -0,0 +1,67 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Commodities;
+using NLedger.Extensibility;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Extensibility
+{
+    public class IsolatedSessionTests
+    {
+        [Fact]
+        public void IsolatedSession_Create_CreatesSessionWithOwnContext()
+        {
+            var session1 = IsolatedSession.Create();
+            var session2 = IsolatedSession.Create();
+
+            Assert.NotNull(session1.Context);
+            Assert.NotEqual(session1.Context, session2.Context);
+            Assert.Null(MainApplicationContext.Current);
+
+            using (session1.Enter())
+            {
+                Assert.Equal(session1.Context, MainApplicationContext.Current);
+                session1.ReadJournalFromString("2021/01/01 Payee\n    A    10 EUR\n    B\n");
+                Assert.NotNull(CommodityPool.Current.Find("EUR"));
+            }
+
+            using (session2.Enter())
+            {
+                Assert.Equal(session2.Context, MainApplicationContext.Current);
+                Assert.Null(CommodityPool.Current.Find("EUR"));
+                Assert.Empty(session2.Journal.Xacts);
+
+                using (session1.Enter())
+                    Assert.Contains("10 EUR", session1.ExecuteCommand("bal A").Output);
+
+                Assert.Equal(session2.Context, MainApplicationContext.Current);
+            }
+
+            Assert.Null(MainApplicationContext.Current);
+            Assert.Single(session1.Journal.Xacts);
+        }
+
+        [Fact]
+        public void IsolatedSession_Create_TakesParentContextSettings()
+        {
+            var parent = new MainApplicationContext() { IsAtty = false };
+            parent.SetEnvironmentVariables(new Dictionary<string, string>() { { "LEDGER_TEST", "1" } });
+
+            var session = IsolatedSession.Create(parent);
+            Assert.False(session.Context.IsAtty);
+            Assert.Equal("1", session.Context.EnvironmentVariables["LEDGER_TEST"]);
+            Assert.Equal(parent.ApplicationServiceProvider, session.Context.ApplicationServiceProvider);
+        }
+    }
+}
@@ -7,8 +7,12 @@
 // See LICENSE.LEDGER file included with the distribution for details and disclaimer.
 // **********************************************************************************
 using NLedger.Extensibility;
+using NLedger.Extensibility.Export;
+using NLedger.Scopus;
+using NLedger.Utility;
 using System;
 using System.Collections.Generic;
+using System.IO;
 using System.Linq;
 using System.Text;
 using System.Threading.Tasks;
@@ -74,5 +78,131 @@ namespace NLedger.Tests.Extensibility
             }
         }
 
+        [Fact]
+        public void SessionExtensions_ExecuteCommand_WritesToOutput()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                MainApplicationContext.Current.IsAtty = false;
+                session.ReadJournalFromString(Input);
+                var output = new StringWriter();
+                var result = session.ExecuteCommand("bal ^Expenses", output);
+                Assert.Equal("$4.50  Expenses:Food", output.ToString().Trim());
+                Assert.Equal(String.Empty, result.Output);
+                Assert.Equal(String.Empty, result.Error);
+
+                output.Write("still open");
+                Assert.Contains("still open", output.ToString());
+            }
+        }
+
+        [Fact]
+        public void SessionExtensions_GetOptionsReport_DescribesHandledOptions()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                var initialReport = session.GetOptionsReport();
+                session.DayBreakHandler.On("test-source");
+                var report = session.GetOptionsReport();
+                Assert.NotEqual(initialReport, report);
+                Assert.Contains("test-source", report);
+            }
+        }
+
+        [Fact]
+        public void SessionExtensions_GetReportRows_ReturnsRegisterRows()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(Input + Input);
+                var rows = session.GetReportRows("reg ^Expenses");
+                Assert.Equal(2, rows.Count);
+                Assert.Equal(new Date(2009, 11, 1), rows[0].Date);
+                Assert.Equal("Panera Bread", rows[0].Payee);
+                Assert.Equal("Expenses:Food", rows[0].Account);
+                Assert.Equal("$4.50", rows[1].Amount.ToString());
+                Assert.Equal("$9.00", rows[1].Total.ToString());
+            }
+        }
+
+        [Fact]
+        public void SessionExtensions_GetReportRows_ReturnsBalanceRows()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(Input);
+                var rows = session.GetReportRows(new string[] { "bal", "--flat" });
+                Assert.Equal(new string[] { "Assets:Checking", "Expenses:Food" }, rows.Select(r => r.Account));
+                Assert.Null(rows[0].Date);
+                Assert.Equal("$-4.50", rows[0].Total.ToString());
+            }
+        }
+
+        [Fact]
+        public void SessionExtensions_GetReportRows_RejectsOtherCommands()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(Input);
+                Assert.Throws<LogicError>(() => session.GetReportRows("print"));
+            }
+        }
+
+        [Fact]
+        public void SessionExtensions_GetReportRows_RestoresGlobalScope()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(Input);
+                var globalScope = Scope.DefaultScope;
+                Assert.Equal(2, session.GetReportRows("reg").Count);
+                Assert.Equal(globalScope, Scope.DefaultScope);
+            }
+        }
+
+        [Fact]
+        public void SessionExtensions_GetReportRows_PassesRowsInChunks()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(Input + Input + Input);
+                var globalScope = Scope.DefaultScope;
+                var chunks = new List<IList<ReportRow>>();
+                var inReportScope = new List<bool>();
+
+                session.GetReportRows(new string[] { "reg", "^Expenses" }, chunk => { chunks.Add(chunk); inReportScope.Add(Scope.DefaultScope != globalScope); }, 2);
+
+                Assert.Equal(new int[] { 2, 1 }, chunks.Select(c => c.Count));
+                Assert.True(inReportScope[0]);
+                Assert.Equal("$13.50", chunks[1][0].Total.ToString());
+                Assert.Equal(globalScope, Scope.DefaultScope);
+                Assert.Throws<ArgumentOutOfRangeException>(() => session.GetReportRows(new string[] { "reg" }, chunk => { }, 0));
+            }
+        }
+
+        [Fact]
+        public void SessionExtensions_GetReportRows_RejectsDataFileOptionsUnlessReadJournalFiles()
+        {
+            using (var session = NLedger.Extensibility.Net.NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(Input);
+                var fileName = Path.GetTempFileName();
+                try
+                {
+                    File.WriteAllText(fileName, Input);
+                    Assert.Throws<LogicError>(() => session.GetReportRows(new string[] { "bal", "-f", fileName }));
+                    Assert.Empty(session.FileHandler.DataFiles);
+
+                    session.CloseJournalFiles();
+                    var rows = session.GetReportRows(new string[] { "bal", "--flat", "-f", fileName }, readJournalFiles: true);
+                    Assert.Equal(new string[] { "Assets:Checking", "Expenses:Food" }, rows.Select(r => r.Account));
+                }
+                finally
+                {
+                    File.Delete(fileName);
+                }
+            }
+        }
+
     }
 }
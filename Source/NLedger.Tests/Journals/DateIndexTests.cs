@@ -0,0 +1,111 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Extensibility.Net;
+using NLedger.Items;
+using NLedger.Journals;
+using NLedger.Utility;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Journals
+{
+    public class DateIndexTests
+    {
+        private const string UnsortedJournal =
+            "2021/02/01 February\n    Expenses:Food    $10\n    Assets:Cash\n\n" +
+            "2021/01/15 January\n    Expenses:Food    $20  ; [2021/03/01]\n    Assets:Cash\n\n" +
+            "2021/02/01 February2\n    Expenses:Rent    $30\n    Assets:Cash\n";
+
+        [Fact]
+        public void DateIndex_Constructor_RequiresJournal()
+        {
+            Assert.Throws<ArgumentNullException>(() => new DateIndex(null));
+        }
+
+        [Fact]
+        public void DateIndex_GetXacts_ReturnsSortedRange()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                var index = session.ReadJournalFromString(UnsortedJournal).GetDateIndex();
+
+                Assert.Equal(new[] { "January", "February", "February2" }, index.GetXacts().Select(x => x.Payee));
+                Assert.Equal(new[] { "February", "February2" }, index.GetXacts(new Date(2021, 2, 1)).Select(x => x.Payee));
+                Assert.Equal(new[] { "January" }, index.GetXacts(null, new Date(2021, 2, 1)).Select(x => x.Payee));
+                Assert.Equal(new[] { "January" }, index.GetXacts(new Date(2021, 1, 15), new Date(2021, 1, 16)).Select(x => x.Payee));
+                Assert.Empty(index.GetXacts(new Date(2021, 1, 16), new Date(2021, 2, 1)));
+                Assert.Empty(index.GetXacts(new Date(2021, 3, 1), new Date(2021, 1, 1)));
+                Assert.True(index.GetXacts().IsReadOnly);
+            }
+        }
+
+        [Fact]
+        public void DateIndex_GetPosts_UsesPostingDates()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                var index = session.ReadJournalFromString(UnsortedJournal).GetDateIndex();
+
+                Assert.Equal(6, index.GetPosts().Count);
+                Assert.Equal(new[] { "Assets:Cash" }, index.GetPosts(null, new Date(2021, 2, 1)).Select(p => p.Account.FullName));
+                Assert.Equal(new[] { "Expenses:Food" }, index.GetPosts(new Date(2021, 2, 2)).Select(p => p.Account.FullName));
+                Assert.Equal(4, index.GetPosts(new Date(2021, 2, 1), new Date(2021, 3, 1)).Count);
+            }
+        }
+
+        [Fact]
+        public void DateIndex_GetDateIndex_RebuildsIndexAfterChanges()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                var journal = session.ReadJournalFromString(UnsortedJournal);
+                var index = journal.GetDateIndex();
+                var xacts = index.GetXacts();
+                var january = journal.Xacts[1];
+
+                Assert.True(journal.RemoveXact(january));
+                Assert.Same(index, journal.GetDateIndex());
+                Assert.Equal(journal.Generation, index.Generation);
+                Assert.Equal(new[] { "February", "February2" }, index.GetXacts().Select(x => x.Payee));
+                Assert.Equal(3, xacts.Count);
+
+                Assert.True(journal.AddFinalizedXact(january));
+                Assert.Equal(new[] { "January", "February", "February2" }, journal.GetDateIndex().GetXacts().Select(x => x.Payee));
+            }
+        }
+
+        [Fact]
+        public void DateIndex_GetDateIndex_RebuildsIndexAfterDateModeChanges()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                var journal = session.ReadJournalFromString(
+                    "2021/01/10=2021/03/01 Effective\n    Expenses:Food    $10\n    Assets:Cash\n\n" +
+                    "2021/02/01 Primary\n    Expenses:Food    $20\n    Assets:Cash\n");
+                var index = journal.GetDateIndex();
+                Assert.False(index.UseAuxDate);
+                Assert.Equal(new[] { "Effective", "Primary" }, index.GetXacts().Select(x => x.Payee));
+
+                Item.UseAuxDate = true;
+                Assert.False(index.IsActual);
+                Assert.Same(index, journal.GetDateIndex());
+                Assert.True(index.UseAuxDate);
+                Assert.Equal(new[] { "Primary", "Effective" }, index.GetXacts().Select(x => x.Payee));
+                Assert.Equal(new[] { "Effective" }, index.GetXacts(new Date(2021, 3, 1)).Select(x => x.Payee));
+
+                Item.UseAuxDate = false;
+                Assert.Equal(new[] { "Effective", "Primary" }, journal.GetDateIndex().GetXacts().Select(x => x.Payee));
+            }
+        }
+    }
+}
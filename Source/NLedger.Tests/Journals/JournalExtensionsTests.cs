@@ -0,0 +1,122 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Commodities;
+using NLedger.Extensibility.Net;
+using NLedger.Journals;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Journals
+{
+    public class JournalExtensionsTests
+    {
+        [Fact]
+        public void JournalExtensions_Refresh_ReadsOnlyChangedIncludedFile()
+        {
+            var folder = Path.Combine(Path.GetTempPath(), Path.GetRandomFileName());
+            Directory.CreateDirectory(folder);
+            try
+            {
+                var mainFile = Path.Combine(folder, "main.dat");
+                var firstFile = Path.Combine(folder, "first.dat");
+                var secondFile = Path.Combine(folder, "second.dat");
+                File.WriteAllText(firstFile, "2021/01/01 First\n    Expenses:Food    $10\n    Assets:Cash\n");
+                File.WriteAllText(secondFile, "2021/02/01 Second\n    Expenses:Food    $20\n    Assets:Cash\n");
+                File.WriteAllText(mainFile, "include first.dat\n\napply account Personal\ninclude second.dat\nend apply account\n\n" +
+                    "2021/03/01 Main\n    Expenses:Rent    $30\n    Assets:Cash\n");
+
+                using (var session = NetSession.CreateStandaloneSession())
+                {
+                    var journal = session.ReadJournal(mainFile);
+                    var first = journal.Xacts[0];
+                    Assert.Equal(0, journal.Refresh());
+
+                    var generation = journal.Generation;
+                    File.AppendAllText(secondFile, "\n2021/02/02 Appended\n    Expenses:Food    $5\n    Assets:Cash\n");
+
+                    Assert.Equal(1, journal.Refresh());
+                    Assert.True(journal.Generation > generation);
+                    Assert.Same(first, journal.Xacts[0]);
+                    Assert.Equal(new[] { "First", "Second", "Appended", "Main" }, journal.Xacts.Select(x => x.Payee));
+                    Assert.Equal(2, journal.FindAccount("Personal:Expenses:Food", false).Posts.Count);
+                    Assert.Single(journal.FindAccount("Expenses:Food", false).Posts);
+                    Assert.Equal(3, journal.IncludedSources.Count + journal.Sources.Count);
+                    Assert.Equal(0, journal.Refresh());
+                }
+            }
+            finally
+            {
+                Directory.Delete(folder, true);
+            }
+        }
+
+        [Fact]
+        public void JournalExtensions_Refresh_ReadsWholeJournalIfTopLevelFileIsChanged()
+        {
+            var fileName = Path.GetTempFileName();
+            try
+            {
+                File.WriteAllText(fileName, "2021/01/01 First\n    Expenses:Food    $10\n    Assets:Cash\n");
+                using (var session = NetSession.CreateStandaloneSession())
+                {
+                    var journal = session.ReadJournal(fileName);
+                    File.WriteAllText(fileName, "2021/01/02 Replaced\n    Expenses:Rent    $10\n    Assets:Cash\n");
+
+                    Assert.Equal(1, journal.Refresh());
+                    Assert.Equal("Replaced", journal.Xacts.Single().Payee);
+                    Assert.Null(journal.FindAccount("Expenses:Food", false));
+                    Assert.Single(journal.Sources);
+                }
+            }
+            finally
+            {
+                File.Delete(fileName);
+            }
+        }
+
+        [Fact]
+        public void JournalExtensions_Refresh_KeepsMasterAccountAndReplacesPricesOfReadFiles()
+        {
+            var fileName = Path.GetTempFileName();
+            try
+            {
+                File.WriteAllText(fileName, "commodity $\naccount Expenses:Food\naccount Assets:Cash\npayee Shop\nP 2021/01/01 AAPL $100\n\n2021/01/02 Shop\n    Expenses:Food    $10\n    Assets:Cash\n");
+                using (var session = NetSession.CreateStandaloneSession())
+                {
+                    session.Journal.CheckPayees = true;
+                    session.Journal.CheckingStyle = JournalCheckingStyleEnum.CHECK_WARNING;
+                    var journal = session.ReadJournal(fileName);
+                    var master = journal.Master;
+                    Assert.True(journal.KnownPayees.Contains("Shop"));
+                    Assert.Single(CommodityPool.Current.CommodityPriceHistory.GetAllPrices());
+                    journal.CheckingStyle = JournalCheckingStyleEnum.CHECK_NORMAL;
+
+                    File.WriteAllText(fileName, "P 2021/01/05 AAPL $110\n\n2021/01/06 Market\n    Expenses:Food    $10\n    Assets:Cash\n");
+                    Assert.Equal(1, journal.Refresh());
+
+                    Assert.Same(master, journal.Master);
+                    Assert.Equal(new[] { "Assets", "Expenses" }, master.Accounts.Keys);
+                    Assert.False(journal.KnownPayees.Contains("Shop"));
+                    var price = CommodityPool.Current.CommodityPriceHistory.GetAllPrices().Single();
+                    Assert.Equal(new DateTime(2021, 1, 5), price.Item2);
+                    Assert.Equal("$110", price.Item3.ToString());
+                }
+            }
+            finally
+            {
+                File.Delete(fileName);
+            }
+        }
+    }
+}
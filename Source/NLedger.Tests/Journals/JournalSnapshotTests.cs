@@ -0,0 +1,197 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Amounts;
+using NLedger.Commodities;
+using NLedger.Extensibility;
+using NLedger.Extensibility.Net;
+using NLedger.Journals;
+using NLedger.Utility;
+using NLedger.Xacts;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Journals
+{
+    public class JournalSnapshotTests
+    {
+        private const string TestJournal =
+            "P 2021/01/01 AAPL $100\n\n" +
+            "2021/01/02 * (12) Broker\n    ; :trip:\n    Assets:Brokerage    3 AAPL @@ $100\n    Assets:Cash\n\n" +
+            "2021/01/03 ! Shop\n    Expenses:Food    $10.25  ; Rate: high\n    Assets:Cash\n\n" +
+            "2021/02/01 Sale\n    Assets:Brokerage    -1 AAPL {$33.33} [2021/01/02] @ $120\n    Assets:Cash    $120\n    Income:Gains\n";
+
+        [Fact]
+        public void JournalSnapshot_Load_RestoresSavedJournal()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(TestJournal);
+                var expectedPosts = DescribePosts(session.Journal);
+                var expectedPrices = CommodityPool.Current.CommodityPriceHistory.GetAllPrices().Count();
+
+                var stream = new MemoryStream();
+                JournalSnapshot.Save(session.Journal, stream);
+
+                session.CloseJournalFiles();
+                Assert.Empty(session.Journal.Xacts);
+
+                stream.Position = 0;
+                Assert.True(JournalSnapshot.Load(session.Journal, stream));
+
+                var journal = session.Journal;
+                Assert.Equal(3, journal.Xacts.Count);
+                Assert.Equal("12", journal.Xacts[0].Code);
+                Assert.Equal(Items.ItemStateEnum.Cleared, journal.Xacts[0].State);
+                Assert.True(journal.Xacts[0].HasTag("trip"));
+                Assert.Equal("high", journal.Xacts[1].Posts[0].GetTag("Rate").ToString());
+                Assert.Equal(expectedPosts, DescribePosts(journal));
+                Assert.Equal(expectedPrices, CommodityPool.Current.CommodityPriceHistory.GetAllPrices().Count());
+                Assert.Equal(2, journal.FindAccount("Assets:Brokerage", false).Posts.Count);
+                Assert.Single(journal.Sources);
+                Assert.True(journal.Sources[0].FromStream);
+            }
+        }
+
+        [Fact]
+        public void JournalSnapshot_Load_ReturnsFalseIfSourceIsChanged()
+        {
+            var fileName = Path.GetTempFileName();
+            try
+            {
+                File.WriteAllText(fileName, TestJournal);
+                using (var session = NetSession.CreateStandaloneSession())
+                {
+                    session.ReadJournal(fileName);
+                    var stream = new MemoryStream();
+                    JournalSnapshot.Save(session.Journal, stream);
+                    session.CloseJournalFiles();
+
+                    File.AppendAllText(fileName, "\n2021/03/01 Late\n    Expenses:Food    $1\n    Assets:Cash\n");
+
+                    stream.Position = 0;
+                    Assert.False(JournalSnapshot.Load(session.Journal, stream));
+                    Assert.Empty(session.Journal.Xacts);
+
+                    stream.Position = 0;
+                    Assert.True(JournalSnapshot.Load(session.Journal, stream, checkSources: false));
+                    Assert.Equal(3, session.Journal.Xacts.Count);
+                }
+            }
+            finally
+            {
+                File.Delete(fileName);
+            }
+        }
+
+        [Fact]
+        public void JournalSnapshot_LoadJournalSnapshot_ReadsChangedSources()
+        {
+            var fileName = Path.GetTempFileName();
+            var snapshotName = Path.GetTempFileName();
+            try
+            {
+                File.WriteAllText(fileName, TestJournal);
+                using (var session = NetSession.CreateStandaloneSession())
+                {
+                    session.ReadJournal(fileName);
+                    JournalSnapshot.Save(session.Journal, snapshotName);
+                    session.CloseJournalFiles();
+
+                    Assert.Equal(3, session.LoadJournalSnapshot(snapshotName).Xacts.Count);
+                    Assert.Equal(new List<string>() { fileName }, session.FileHandler.DataFiles);
+                    session.CloseJournalFiles();
+
+                    File.AppendAllText(fileName, "\n2021/03/01 Late\n    Expenses:Food    $1\n    Assets:Cash\n");
+                    Assert.Equal(4, session.LoadJournalSnapshot(snapshotName).Xacts.Count);
+                }
+            }
+            finally
+            {
+                File.Delete(fileName);
+                File.Delete(snapshotName);
+            }
+        }
+
+        [Fact]
+        public void JournalSnapshot_Load_RequiresEmptyJournal()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(TestJournal);
+                var stream = new MemoryStream();
+                JournalSnapshot.Save(session.Journal, stream);
+
+                stream.Position = 0;
+                Assert.Throws<InvalidOperationException>(() => JournalSnapshot.Load(session.Journal, stream));
+                Assert.Equal(3, session.Journal.Xacts.Count);
+            }
+        }
+
+        [Fact]
+        public void JournalSnapshot_Load_RejectsUnknownContent()
+        {
+            var stream = new MemoryStream(Encoding.UTF8.GetBytes("2021/01/01 Not a snapshot"));
+            Assert.Throws<InvalidOperationException>(() => JournalSnapshot.Load(new Journal(), stream));
+        }
+
+        [Fact]
+        public void JournalSnapshot_Load_RestoresAutomatedTransactionsAndAliases()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournalFromString(
+                    "alias cash=Assets:Cash\n\n" +
+                    "= ^Expenses\n    (Budget:Food)    -1\n    ; :budgeted:\n    assert amount < 1000\n\n" +
+                    "2021/01/03 Grocery\n    Expenses:Food    $10\n    cash\n");
+                session.Journal.KnownPayees.Add("Grocery");
+                session.Journal.KnownTags.Add("Project");
+                var expectedPosts = DescribePosts(session.Journal);
+
+                var stream = new MemoryStream();
+                JournalSnapshot.Save(session.Journal, stream);
+
+                session.CloseJournalFiles();
+                Assert.Empty(session.Journal.AutoXacts);
+
+                stream.Position = 0;
+                Assert.True(JournalSnapshot.Load(session.Journal, stream));
+
+                var journal = session.Journal;
+                Assert.Equal(expectedPosts, DescribePosts(journal));
+                Assert.Single(journal.AutoXacts);
+                Assert.Single(journal.AutoXacts[0].CheckExprs);
+                Assert.Equal(journal.FindAccount("Assets:Cash", false), journal.AccountAliases["cash"]);
+                Assert.True(journal.KnownPayees.Contains("Grocery"));
+                Assert.True(journal.KnownTags.Contains("Project"));
+
+                // Transactions added after loading are extended by the restored automated transaction
+                var xact = new Xact() { Date = new Date(2021, 1, 4), Payee = "Market" };
+                xact.AddPost(new Post(journal.FindAccount("Expenses:Food", true), new Amount("$20")));
+                xact.AddPost(new Post(journal.AccountAliases["cash"], new Amount("$-20")));
+                Assert.True(journal.AddXact(xact));
+
+                var budgetPost = xact.Posts.Single(p => p.Account.FullName == "Budget:Food");
+                Assert.Equal("$-20", budgetPost.Amount.ToString());
+                Assert.True(budgetPost.HasTag("budgeted"));
+            }
+        }
+
+        private static IList<string> DescribePosts(Journal journal)
+        {
+            return journal.Xacts.SelectMany(x => x.Posts).
+                Select(p => String.Format("{0} {1} {2} {3} {4}", p.GetDate(), p.Payee, p.Account.FullName, p.Amount, p.Cost)).
+                ToList();
+        }
+    }
+}
@@ -262,5 +262,29 @@ namespace NLedger.Tests.Journals
             Assert.False(journal.Valid());
         }
 
+        [Fact]
+        public void Journal_Generation_IsChangedByAddAndRemoveXact()
+        {
+            Account account = new Account();
+            Journal journal = new Journal();
+            Assert.Equal(0, journal.Generation);
+
+            Xact xact = new Xact();
+            xact.AddPost(new Post() { Account = account, Amount = new Amount(10) });
+            xact.AddPost(new Post() { Account = account, Amount = new Amount(-10) });
+
+            Assert.True(journal.AddXact(xact));
+            Assert.Equal(1, journal.Generation);
+
+            Assert.True(journal.RemoveXact(xact));
+            Assert.Equal(2, journal.Generation);
+
+            Assert.False(journal.RemoveXact(xact));
+            Assert.Equal(2, journal.Generation);
+
+            journal.IncrementGeneration();
+            Assert.Equal(3, journal.Generation);
+        }
+
     }
 }
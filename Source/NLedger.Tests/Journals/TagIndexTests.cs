@@ -0,0 +1,101 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Extensibility.Net;
+using NLedger.Journals;
+using NLedger.Utility;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Journals
+{
+    public class TagIndexTests
+    {
+        private const string TaggedJournal =
+            "2021/01/01 First\n    ; :Receipt:\n    ; Project: Alpha\n    Expenses:Food    $10\n    Assets:Cash\n\n" +
+            "2021/01/02 Second\n    Expenses:Food    $20  ; Project: Beta\n    Assets:Cash\n\n" +
+            "2021/01/03 Third\n    ; project: Alpha2\n    Expenses:Rent    $30\n    Assets:Cash  ; :Receipt:\n";
+
+        [Fact]
+        public void TagIndex_Constructor_RequiresJournal()
+        {
+            Assert.Throws<ArgumentNullException>(() => new TagIndex(null));
+        }
+
+        [Fact]
+        public void TagIndex_Find_ReturnsTaggedItems()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                var journal = session.ReadJournalFromString(TaggedJournal);
+                var index = journal.GetTagIndex();
+
+                Assert.Equal(new[] { "Project", "Receipt" }, index.Tags);
+                Assert.True(index.HasTag("receipt"));
+                Assert.False(index.HasTag("Unknown"));
+                Assert.Equal(new[] { "Alpha", "Beta", "Alpha2" }, index.GetValues("PROJECT"));
+                Assert.Empty(index.GetValues("Unknown"));
+
+                Assert.Equal(new[] { "First", "Third" }, index.GetXacts("Project").Select(x => x.Payee));
+                Assert.Equal(new[] { "First", "Third" }, index.GetXacts("Project", new Mask("^alpha")).Select(x => x.Payee));
+                Assert.Equal(new[] { "Third" }, index.GetXacts("Project", new Mask("2$")).Select(x => x.Payee));
+
+                Assert.Equal(new[] { "Expenses:Food" }, index.GetPosts("Project", new Mask("Beta"), false).Select(p => p.Account.FullName));
+                Assert.Equal(4, index.GetPosts("Project", new Mask("Alpha")).Count());
+                Assert.Equal(5, index.GetPosts("Project").Count());
+                Assert.Equal(3, index.GetPosts("Receipt").Count());
+                Assert.Single(index.GetPosts("Receipt", null, false));
+            }
+        }
+
+        [Fact]
+        public void TagIndex_AddRemoveXact_UpdatesIndex()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                var journal = session.ReadJournalFromString(TaggedJournal);
+                var index = journal.GetTagIndex();
+                var third = journal.Xacts[2];
+
+                Assert.True(journal.RemoveXact(third));
+                Assert.Equal(journal.Generation, index.Generation);
+                Assert.Equal(new[] { "Alpha", "Beta" }, index.GetValues("Project"));
+                Assert.Equal(new[] { "First" }, index.GetXacts("Receipt").Select(x => x.Payee));
+                Assert.Empty(index.GetPosts("Receipt", null, false));
+
+                Assert.True(journal.AddFinalizedXact(third));
+                Assert.Equal(journal.Generation, index.Generation);
+                Assert.Equal(new[] { "Alpha", "Beta", "Alpha2" }, index.GetValues("Project"));
+                Assert.Single(index.GetPosts("Receipt", null, false));
+                Assert.Same(index, journal.GetTagIndex());
+            }
+        }
+
+        [Fact]
+        public void TagIndex_GetTagIndex_RebuildsOutdatedIndex()
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                var journal = session.ReadJournalFromString(TaggedJournal);
+                var index = journal.GetTagIndex();
+
+                journal.Xacts[1].SetTag("Reviewed");
+                Assert.False(index.HasTag("Reviewed"));
+
+                journal.IncrementGeneration();
+                Assert.Same(index, journal.GetTagIndex());
+                Assert.True(index.HasTag("Reviewed"));
+                Assert.Equal(journal.Generation, index.Generation);
+            }
+        }
+    }
+}
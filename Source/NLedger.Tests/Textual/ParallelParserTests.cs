@@ -0,0 +1,147 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Extensibility;
+using NLedger.Extensibility.Net;
+using NLedger.Journals;
+using NLedger.Textual;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+using Xunit;
+
+namespace NLedger.Tests.Textual
+{
+    public class ParallelParserTests
+    {
+        private const string MainFile =
+            "commodity $\n    format $1,000.00\n\n" +
+            "account Expenses:Food\n    alias food\n\n" +
+            "alias cash=Assets:Cash\n\n" +
+            "P 2020/01/01 EUR $1.10\n\n" +
+            "include y2020.dat\n" +
+            "include y2021.dat\n\n" +
+            "apply account Business\n" +
+            "include y2022.dat\n" +
+            "end apply account\n\n" +
+            "include y2023.dat\n" +
+            "include y2024.dat\n\n" +
+            "2025/01/01 Closing\n    Expenses:Other    $1\n    cash\n";
+
+        private static readonly IDictionary<string, string> IncludedFiles = new Dictionary<string, string>()
+        {
+            { "y2020.dat", "2020/01/02 Shop\n    food    $10.5\n    cash\n\n2020/02/01 Trip\n    Expenses:Travel    100 EUR @ $1.2\n    cash\n\n2020/03/01 Work\n    (Time)    1.5h\n" },
+            { "y2021.dat", "; Comment\nP 2021/01/01 EUR $1.15\n\n2021/01/02 * (12) Shop\n    ; :trip:\n    food    $11  ; Rate: high\n    cash\n" },
+            { "y2022.dat", "2022/03/01 Sale\n    Stock    10 AAPL {$100} [2022/01/01]\n    cash\n" },
+            { "y2023.dat", "account Expenses:Rent\n\n2023/01/01 Rent\n    Expenses:Rent    $500 = $500\n    cash\n" },
+            { "y2024.dat", "2024/01/01 Shop\n    food    20 EUR\n    cash\n" },
+        };
+
+        private static readonly string[] Commands = new string[] { "bal", "reg", "prices", "accounts", "commodities", "bal -X $", "stats" };
+
+        [Fact]
+        public void ParallelParser_IsIndependentFile_AcceptsTransactionsPricesAndComments()
+        {
+            Assert.True(ParallelParser.IsIndependentFile(new StringReader(IncludedFiles["y2020.dat"])));
+            Assert.True(ParallelParser.IsIndependentFile(new StringReader(IncludedFiles["y2021.dat"])));
+            Assert.True(ParallelParser.IsIndependentFile(new StringReader("2020/01/01 Test\n    (Virtual)    $10\n    [Assets:Cash]    $-10 @ EUR 2\n")));
+
+            Assert.False(ParallelParser.IsIndependentFile(new StringReader(IncludedFiles["y2023.dat"])));
+            Assert.False(ParallelParser.IsIndependentFile(new StringReader("2020/01/01 Test\n    A    ($10 * 2)\n    B\n")));
+            Assert.False(ParallelParser.IsIndependentFile(new StringReader("2020/01/01 Test\n    A    $10\n    <Deferred>\n")));
+            Assert.False(ParallelParser.IsIndependentFile(new StringReader("2020/01/01 Test\n    ; Value:: 10\n    A    $10\n    B\n")));
+            Assert.False(ParallelParser.IsIndependentFile(new StringReader("2020/01/01 Test\n    A    $10\n    B\n    assert amount > 0\n")));
+            Assert.False(ParallelParser.IsIndependentFile(new StringReader("Y 2020\n01/01 Test\n    A    $10\n    B\n")));
+        }
+
+        [Fact]
+        public void ParallelParser_IsApplicable_RequiresSeveralProcessors()
+        {
+            var journal = new Journal() { ParallelParsing = true };
+            WithProcessorCount(2, () => Assert.True(ParallelParser.IsApplicable(journal)));
+            WithProcessorCount(1, () => Assert.False(ParallelParser.IsApplicable(journal)));
+        }
+
+        [Fact]
+        public void ParallelParser_ReadJournalFiles_ProducesTheSameReportsAsSequentialParsing()
+        {
+            WithJournalFiles(mainFileName =>
+            {
+                var expected = RunCommands(mainFileName, false);
+                var actual = RunCommands(mainFileName, true);
+                Assert.Equal(expected, actual);
+                Assert.Contains("Business:Stock", actual[0]);
+            });
+        }
+
+        [Fact]
+        public void ParallelParser_ReadJournals_ParsesSeveralFilesInDeclarationOrder()
+        {
+            WithJournalFiles(mainFileName =>
+            {
+                var folder = Path.GetDirectoryName(mainFileName);
+                var fileNames = IncludedFiles.Keys.Where(name => name != "y2022.dat").Select(name => Path.Combine(folder, name)).ToArray();
+
+                using (var session = NetSession.CreateStandaloneSession())
+                {
+                    var journal = session.ReadJournals(fileNames, true);
+                    Assert.Equal(new string[] { "Shop", "Trip", "Work", "Shop", "Rent", "Shop" }, journal.Xacts.Select(x => x.Payee).ToArray());
+                    Assert.Equal(fileNames, journal.Sources.Select(s => s.FileName).ToArray());
+                    Assert.False(journal.ParallelParsing);
+                }
+            });
+        }
+
+        private static IList<string> RunCommands(string mainFileName, bool parallel)
+        {
+            using (var session = NetSession.CreateStandaloneSession())
+            {
+                session.ReadJournals(new string[] { mainFileName }, parallel);
+                return Commands.Select(command => session.ExecuteCommand(command + " --no-color").Output).ToList();
+            }
+        }
+
+        private static void WithJournalFiles(Action<string> action)
+        {
+            var folder = Path.Combine(Path.GetTempPath(), Path.GetRandomFileName());
+            Directory.CreateDirectory(folder);
+            try
+            {
+                foreach (var file in IncludedFiles)
+                    File.WriteAllText(Path.Combine(folder, file.Key), file.Value);
+
+                var mainFileName = Path.Combine(folder, "main.dat");
+                File.WriteAllText(mainFileName, MainFile);
+
+                // Files are parsed on worker threads even if the test host has a single processor
+                WithProcessorCount(2, () => action(mainFileName));
+            }
+            finally
+            {
+                Directory.Delete(folder, true);
+            }
+        }
+
+        private static void WithProcessorCount(int processorCount, Action action)
+        {
+            var savedProcessorCount = ParallelParser.ProcessorCount;
+            ParallelParser.ProcessorCount = processorCount;
+            try
+            {
+                action();
+            }
+            finally
+            {
+                ParallelParser.ProcessorCount = savedProcessorCount;
+            }
+        }
+    }
+}
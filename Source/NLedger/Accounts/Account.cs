@@ -63,6 +63,13 @@ namespace NLedger.Accounts
             get { return _FullName ?? (_FullName = GetFullName()); }
         }
 
+        /// <summary>
+        /// Counter of changes in the account subtree. It is incremented for the account and all its parents
+        /// every time a child account is added or removed, so integration code can detect that cached account trees become outdated.
+        /// </summary>
+        /// <remarks>NLedger extension</remarks>
+        public long TreeGeneration { get; private set; }
+
         /// <summary>
         // This variable holds optional "extended data" which is usually produced
         // only during reporting, and only for the posting set being reported.
@@ -111,6 +118,7 @@ namespace NLedger.Accounts
                     account.IsGeneratedAccount = IsGeneratedAccount;
 
                 Accounts.Add(first, account);
+                IncrementTreeGeneration();
             }
 
             if (!String.IsNullOrEmpty(rest))
@@ -169,6 +177,12 @@ namespace NLedger.Accounts
             }
         }
 
+        private void IncrementTreeGeneration()
+        {
+            for (var acct = this; acct != null; acct = acct.Parent)
+                acct.TreeGeneration++;
+        }
+
         private string GetFullName()
         {
             Account first = this;
@@ -187,6 +201,7 @@ namespace NLedger.Accounts
         public void AddAccount(Account acct)
         {
             Accounts[acct.Name] = acct;
+            IncrementTreeGeneration();
         }
 
         public bool RemoveAccount(Account acct)
@@ -194,6 +209,7 @@ namespace NLedger.Accounts
             if (Accounts.ContainsKey(acct.Name))
             {
                 Accounts.Remove(acct.Name);
+                IncrementTreeGeneration();
                 return true;
             }
             else
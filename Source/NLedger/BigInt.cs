@@ -71,6 +71,25 @@ namespace NLedger
             return new BigInt<T>(value, precision, keepPrecision);
         }
 
+        /// <summary>
+        /// Restores a value from the text produced by ToExactString
+        /// </summary>
+        public static BigInt<T> ParseExact(string s, int precision = 0, bool keepPrecision = false)
+        {
+            if (s == null)
+                throw new ArgumentNullException(nameof(s));
+
+            int pos = s.IndexOf('/');
+            if (pos < 0)
+                return Parse(s, precision, keepPrecision);
+
+            T numerator, denominator, value;
+            Empty.Parse(out numerator, s.Substring(0, pos), CultureInfo.InvariantCulture);
+            Empty.Parse(out denominator, s.Substring(pos + 1), CultureInfo.InvariantCulture);
+            numerator.Divide(out value, ref denominator);
+            return new BigInt<T>(value, precision, keepPrecision);
+        }
+
         public static BigInt<T> FromInt(int value, int precision = 0)
         {
             T val;
@@ -283,6 +302,15 @@ namespace NLedger
             return Value.ToString();
         }
 
+        /// <summary>
+        /// Returns a lossless textual representation of the value (rational values are written as "numerator/denominator").
+        /// Precision and KeepPrecision are not included.
+        /// </summary>
+        public string ToExactString()
+        {
+            return Value.ToString(ExactFormat, CultureInfo.InvariantCulture);
+        }
+
         public long ToLong()
         {
             // GMP_RNDN (see mpfr_get_si)
@@ -319,6 +347,7 @@ namespace NLedger
 
         private T Value;
         private readonly static T Empty = new T();
+        private const string ExactFormat = "B";
 
         private string BuildNumericFormatString(string digitSeparator, string decimalMark, int precision, int zerosSpec)
         {
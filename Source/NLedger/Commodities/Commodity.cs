@@ -18,6 +18,7 @@ using System;
 using System.Collections.Generic;
 using System.Linq;
 using System.Text;
+using System.Threading;
 using System.Threading.Tasks;
 
 namespace NLedger.Commodities
@@ -42,7 +43,7 @@ namespace NLedger.Commodities
          * This comparer mimics the same behavior (at least, in order to pass all tests in the same way).
         */
         private static long GlobalCommodityAllocationCounter = 0;
-        private long CommodityAllocationNumber = ++GlobalCommodityAllocationCounter;
+        private long CommodityAllocationNumber = Interlocked.Increment(ref GlobalCommodityAllocationCounter);  // Commodities can be created by parallel parsers
         public static readonly IComparer<Commodity> DefaultComparer = new DefaultCommodityComparer();
         public class DefaultCommodityComparer : IComparer<Commodity>
         {
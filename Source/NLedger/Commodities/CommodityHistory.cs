@@ -44,6 +44,35 @@ namespace NLedger.Commodities
             }
 
             edge.Prices[when] = price;
+            OnPriceAdded?.Invoke(source, price.Commodity, when);
+        }
+
+        /// <summary>
+        /// Optional callback that is called for every added price with source commodity, price commodity and moment
+        /// </summary>
+        /// <remarks>NLedger extension; journals use it to track prices read from every file (see Journal.SourcePrices)</remarks>
+        public Action<Commodity, Commodity, DateTime> OnPriceAdded { get; set; }
+
+        /// <summary>
+        /// Enumerates all recorded prices as (source commodity, moment, price) items
+        /// </summary>
+        public IEnumerable<Tuple<Commodity, DateTime, Amount>> GetAllPrices()
+        {
+            var edges = new HashSet<PriceGraphEdge>();
+            foreach (var vertex in PriceGraph.Vertices)
+            {
+                foreach (var edgeDescriptor in PriceGraph.AdjacentVertices(vertex.Vertex))
+                {
+                    if (!edges.Add(edgeDescriptor.Edge))
+                        continue;
+
+                    foreach (var pricePair in edgeDescriptor.Edge.Prices)
+                    {
+                        var source = pricePair.Value.Commodity == edgeDescriptor.Vertex1 ? edgeDescriptor.Vertex2 : edgeDescriptor.Vertex1;
+                        yield return new Tuple<Commodity, DateTime, Amount>(source, pricePair.Key, pricePair.Value);
+                    }
+                }
+            }
         }
 
         public void RemovePrice(Commodity source, Commodity target, DateTime date)
@@ -0,0 +1,72 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Accounts;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Extensibility.Export
+{
+    /// <summary>
+    /// Flat representation of an account tree. Accounts are listed in depth-first order (children are sorted by name) with their
+    /// full names, names, depths and indexes of parent accounts, so connectors can build a cached tree view in a single call.
+    /// </summary>
+    public class AccountTreeColumns
+    {
+        public AccountTreeColumns(Account root)
+        {
+            Root = root ?? throw new ArgumentNullException(nameof(root));
+            TreeGeneration = root.TreeGeneration;
+
+            var accounts = new List<Account>();
+            var parents = new List<int>();
+            var stack = new Stack<Tuple<Account, int>>();
+            stack.Push(Tuple.Create(root, -1));
+            while (stack.Count > 0)
+            {
+                var item = stack.Pop();
+                var index = accounts.Count;
+                accounts.Add(item.Item1);
+                parents.Add(item.Item2);
+                foreach (var child in item.Item1.Accounts.Values.Reverse())
+                    stack.Push(Tuple.Create(child, index));
+            }
+
+            Count = accounts.Count;
+            Accounts = accounts.ToArray();
+            Parents = parents.ToArray();
+            FullNames = Accounts.Select(acct => acct.FullName).ToArray();
+            Names = Accounts.Select(acct => acct.Name ?? String.Empty).ToArray();
+            Depths = Accounts.Select(acct => acct.Depth).ToArray();
+        }
+
+        public Account Root { get; }
+
+        /// <summary>
+        /// Tree generation of the root account when the columns were collected (see Account.TreeGeneration)
+        /// </summary>
+        public long TreeGeneration { get; }
+        public int Count { get; }
+
+        /// <summary>
+        /// Accounts in depth-first order; the first item is the root account
+        /// </summary>
+        public Account[] Accounts { get; }
+        public string[] FullNames { get; }
+        public string[] Names { get; }
+        public int[] Depths { get; }
+
+        /// <summary>
+        /// Indexes of parent accounts (-1 for the root account)
+        /// </summary>
+        public int[] Parents { get; }
+    }
+}
@@ -0,0 +1,85 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Extensibility.Export
+{
+    /// <summary>
+    /// Text writer that collects output into chunks of the specified size and passes every complete chunk to a callback.
+    /// Connectors use it to stream command output: the callback is invoked synchronously, so a slow consumer
+    /// holds the command back and no more than one chunk is kept in memory.
+    /// </summary>
+    public class ChunkTextWriter : TextWriter
+    {
+        public const int DefaultChunkSize = 65536;
+
+        public ChunkTextWriter(Action<string> onChunk, int chunkSize = DefaultChunkSize)
+        {
+            if (chunkSize <= 0)
+                throw new ArgumentOutOfRangeException(nameof(chunkSize));
+
+            OnChunk = onChunk ?? throw new ArgumentNullException(nameof(onChunk));
+            ChunkSize = chunkSize;
+            Buffer = new StringBuilder(chunkSize);
+        }
+
+        public int ChunkSize { get; }
+        public override Encoding Encoding => Encoding.Unicode;
+
+        public override void Write(char value)
+        {
+            Buffer.Append(value);
+            if (Buffer.Length >= ChunkSize)
+                SendChunk();
+        }
+
+        public override void Write(char[] buffer, int index, int count)
+        {
+            Buffer.Append(buffer, index, count);
+            if (Buffer.Length >= ChunkSize)
+                SendChunk();
+        }
+
+        public override void Write(string value)
+        {
+            Buffer.Append(value);
+            if (Buffer.Length >= ChunkSize)
+                SendChunk();
+        }
+
+        public override void Flush()
+        {
+            if (Buffer.Length > 0)
+                SendChunk();
+        }
+
+        protected override void Dispose(bool disposing)
+        {
+            if (disposing)
+                Flush();
+
+            base.Dispose(disposing);
+        }
+
+        private void SendChunk()
+        {
+            var chunk = Buffer.ToString();
+            Buffer.Clear();
+            OnChunk(chunk);
+        }
+
+        private readonly Action<string> OnChunk;
+        private readonly StringBuilder Buffer;
+    }
+}
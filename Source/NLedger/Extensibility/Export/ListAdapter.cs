@@ -35,7 +35,30 @@ namespace NLedger.Extensibility.Export
         public void RemoveAt(int index) => Origin.RemoveAt(index);
         public void Insert(int index, T value) => Origin.Insert(index, value);
         public void Add(T value) => Origin.Add(value);
+
+        /// <summary>
+        /// Returns a range of items as an array, so that connectors can fetch a chunk of the list in a single call.
+        /// The range is truncated if it exceeds the end of the list.
+        /// </summary>
+        public T[] GetRange(int index, int count)
+        {
+            if (index < 0)
+                throw new ArgumentOutOfRangeException(nameof(index));
+            if (count < 0)
+                throw new ArgumentOutOfRangeException(nameof(count));
+
+            count = Math.Max(Math.Min(count, Origin.Count - index), 0);
+            var range = new T[count];
+            for (int i = 0; i < count; i++)
+                range[i] = Origin[index + i];
+            return range;
+        }
         public override string ToString() => Origin.ToString();
+
+        /// <summary>
+        /// Creates an adapter for a shallow copy of the origin list
+        /// </summary>
+        public ListAdapter<T> Copy() => new ListAdapter<T>(Origin.ToList());
     }
 
     public static class ListAdapter
@@ -54,6 +77,18 @@ namespace NLedger.Extensibility.Export
         public static ListAdapter<Xacts.AutoXact> GetAutoXacts(Journals.Journal journal) => new ListAdapter<Xacts.AutoXact>(journal?.AutoXacts?.ToList());
         public static ListAdapter<Xacts.PeriodXact> GetPeriodXacts(Journals.Journal journal) => new ListAdapter<Xacts.PeriodXact>(journal?.PeriodXacts?.ToList());
         public static ListAdapter<Journals.JournalFileInfo> GetFileInfos(Journals.Journal journal) => new ListAdapter<Journals.JournalFileInfo>(journal?.Sources?.ToList());
+        public static ListAdapter<Journals.JournalFileInfo> GetIncludedFileInfos(Journals.Journal journal) => new ListAdapter<Journals.JournalFileInfo>(journal?.IncludedSources?.ToList());
         public static ListAdapter<Post> GetQuery(Journals.Journal journal, string query) => new ListAdapter<Post>(Journals.JournalExtensions.Query(journal, query).ToList());
+        public static ListAdapter<Post> GetQuery(Journals.JournalQuery query) => new ListAdapter<Post>(query.Execute().ToList());
+        public static Journals.JournalQuery PrepareQuery(Journals.Journal journal, string query) => Journals.JournalExtensions.PrepareQuery(journal, query);
+        public static PostColumns GetPostColumns(Journals.Journal journal) => new PostColumns(journal?.Xacts?.SelectMany(xact => xact.Posts) ?? Enumerable.Empty<Post>());
+        public static PostColumns GetPostColumns(ListAdapter<Post> posts) => new PostColumns(posts?.Origin ?? Enumerable.Empty<Post>());
+        public static PostTotals GetPostTotals(ListAdapter<Post> posts, string grouping) => new PostTotals(posts?.Origin ?? Enumerable.Empty<Post>(), PostTotals.ParseGrouping(grouping));
+        public static long[] GetItemDates(ListAdapter<Post> posts) => PostColumns.GetEpochDays(posts?.Origin ?? Enumerable.Empty<Post>());
+        public static long[] GetItemDates(ListAdapter<Xacts.Xact> xacts) => PostColumns.GetEpochDays(xacts?.Origin ?? Enumerable.Empty<Xacts.Xact>());
+        public static ListAdapter<Post> GetTaggedPosts(Journals.TagIndex index, string tag, Mask valueMask, bool inherit) => new ListAdapter<Post>(index.GetPosts(tag, valueMask, inherit).ToList());
+        public static ListAdapter<Xacts.Xact> GetTaggedXacts(Journals.TagIndex index, string tag, Mask valueMask) => new ListAdapter<Xacts.Xact>(index.GetXacts(tag, valueMask).ToList());
+        public static ListAdapter<Post> GetPostsBetween(Journals.Journal journal, Utility.Date? start, Utility.Date? end) => new ListAdapter<Post>(journal.GetDateIndex().GetPosts(start, end));
+        public static ListAdapter<Xacts.Xact> GetXactsBetween(Journals.Journal journal, Utility.Date? start, Utility.Date? end) => new ListAdapter<Xacts.Xact>(journal.GetDateIndex().GetXacts(start, end));
     }
 }
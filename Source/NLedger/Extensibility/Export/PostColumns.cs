@@ -0,0 +1,225 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Amounts;
+using NLedger.Items;
+using NLedger.Utility;
+using NLedger.Utility.BigValues;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Extensibility.Export
+{
+    /// <summary>
+    /// Columnar representation of a sequence of posts. Every post attribute is collected into a primitive array,
+    /// so connectors can transfer the whole column in a single call instead of reading attributes post by post.
+    /// Commodities, accounts and payees are represented by indexes in corresponding name tables.
+    /// </summary>
+    public class PostColumns
+    {
+        public static readonly long EpochTicks = new DateTime(1970, 1, 1).Ticks;
+
+        public PostColumns(IEnumerable<Post> posts)
+        {
+            if (posts == null)
+                throw new ArgumentNullException(nameof(posts));
+
+            var postList = posts as IList<Post> ?? posts.ToList();
+            Count = postList.Count;
+
+            Dates = new long[Count];
+            Quantities = new double[Count];
+            ScaledQuantities = new long[Count];
+            CommodityIds = new int[Count];
+            AccountIds = new int[Count];
+            PayeeIds = new int[Count];
+            States = new int[Count];
+            XactSeqs = new long[Count];
+
+            var commodities = new NameTable();
+            var accounts = new NameTable();
+            var payees = new NameTable();
+            var commodityPrecisions = new List<int>();
+
+            for (int i = 0; i < Count; i++)
+            {
+                var post = postList[i];
+
+                Dates[i] = ToEpochDays(post.GetDate());
+
+                var amount = post.Amount;
+                var commodity = amount != null && amount.HasCommodity ? amount.Commodity.Symbol : String.Empty;
+                CommodityIds[i] = commodities.GetId(commodity);
+                if (CommodityIds[i] == commodityPrecisions.Count)
+                    commodityPrecisions.Add(amount != null && amount.HasCommodity ? amount.Commodity.Precision : 0);
+
+                if (!Amount.IsNullOrEmpty(amount))
+                {
+                    var quantity = amount.Quantity;
+                    var precision = commodityPrecisions[CommodityIds[i]];
+                    long scaledQuantity;
+                    bool isScaled;
+
+                    if (IsDecimal(quantity))
+                    {
+                        var value = quantity.ToDecimal();
+                        Quantities[i] = (double)value;
+                        isScaled = TryScale(value, precision, out scaledQuantity) || TryScale(quantity, precision, out scaledQuantity);
+                    }
+                    else
+                    {
+                        Quantities[i] = ToDouble(quantity);
+                        isScaled = TryScale(quantity, precision, out scaledQuantity);
+                    }
+
+                    // Quantities that do not fit into long after scaling are available in Quantities only
+                    if (ScaledQuantities != null && isScaled)
+                        ScaledQuantities[i] = scaledQuantity;
+                    else
+                        ScaledQuantities = null;
+                }
+
+                AccountIds[i] = accounts.GetId(post.Account?.FullName ?? String.Empty);
+                PayeeIds[i] = payees.GetId(post.Payee ?? String.Empty);
+                States[i] = (int)post.State;
+                XactSeqs[i] = post.Xact?.Seq ?? 0;
+            }
+
+            Commodities = commodities.Names.ToArray();
+            CommodityPrecisions = commodityPrecisions.ToArray();
+            Accounts = accounts.Names.ToArray();
+            Payees = payees.Names.ToArray();
+        }
+
+        public int Count { get; }
+
+        /// <summary>
+        /// Post dates as the number of days since 1970-01-01
+        /// </summary>
+        public long[] Dates { get; }
+        public double[] Quantities { get; }
+
+        /// <summary>
+        /// Quantities multiplied by 10^precision of the commodity (see CommodityPrecisions).
+        /// It is null if any scaled quantity does not fit into long (large quantities or high commodity precisions); Quantities are available then.
+        /// </summary>
+        public long[] ScaledQuantities { get; private set; }
+        public int[] CommodityIds { get; }
+        public int[] AccountIds { get; }
+        public int[] PayeeIds { get; }
+        public int[] States { get; }
+        public long[] XactSeqs { get; }
+
+        public string[] Commodities { get; }
+        public int[] CommodityPrecisions { get; }
+        public string[] Accounts { get; }
+        public string[] Payees { get; }
+
+        /// <summary>
+        /// Returns the number of days since 1970-01-01
+        /// </summary>
+        public static long ToEpochDays(Date date)
+        {
+            return (date.Ticks - EpochTicks) / TimeSpan.TicksPerDay;
+        }
+
+        /// <summary>
+        /// Returns dates of items (postings or transactions) as the number of days since 1970-01-01, so connectors can convert all dates in a single call
+        /// </summary>
+        public static long[] GetEpochDays(IEnumerable<Item> items)
+        {
+            if (items == null)
+                throw new ArgumentNullException(nameof(items));
+
+            return items.Select(item => ToEpochDays(item.GetDate())).ToArray();
+        }
+
+        /// <summary>
+        /// Converts a quantity to double; quantities that exceed the range of decimal are scaled down to 28 integer digits before the conversion
+        /// </summary>
+        public static double ToDouble<T>(BigInt<T> quantity) where T : IBigValue<T>, new()
+        {
+            if (IsDecimal(quantity))
+                return (double)quantity.ToDecimal();
+
+            int exponent = 0;
+            while (!IsDecimal(quantity))
+            {
+                quantity = quantity / BigConsts<T>.Ten;
+                exponent++;
+            }
+            return (double)quantity.Floor().ToDecimal() * Math.Pow(10, exponent);
+        }
+
+        /// <summary>
+        /// Multiplies a quantity by 10^precision and rounds it to an integer; returns false if the result does not fit into long
+        /// </summary>
+        public static bool TryScale<T>(BigInt<T> quantity, int precision, out long scaled) where T : IBigValue<T>, new()
+        {
+            if (IsDecimal(quantity) && TryScale(quantity.ToDecimal(), precision, out scaled))
+                return true;
+
+            for (int i = 0; i < precision; i++)
+                quantity = quantity * BigConsts<T>.Ten;
+
+            quantity = quantity.RoundTo(0);
+            scaled = quantity.FitsInLong ? quantity.ToLong() : 0;
+            return quantity.FitsInLong;
+        }
+
+        // Decimal arithmetic is exact for quantities that fit into long after scaling by up to 10^18
+        private static bool TryScale(decimal value, int precision, out long scaled)
+        {
+            if (precision < DecimalScales.Length && Math.Abs(value) < LongLimit / DecimalScales[precision])
+            {
+                scaled = (long)Math.Round(value * DecimalScales[precision]);
+                return true;
+            }
+
+            scaled = 0;
+            return false;
+        }
+
+        private static bool IsDecimal<T>(BigInt<T> quantity) where T : IBigValue<T>, new()
+        {
+            return quantity.Sign >= 0 ? quantity.Compare(BigConsts<T>.DecimalLimit) < 0 : quantity.Compare(BigConsts<T>.NegativeDecimalLimit) > 0;
+        }
+
+        private static readonly decimal LongLimit = long.MaxValue;
+        private static readonly decimal[] DecimalScales = Enumerable.Range(0, 19).Select(precision => (decimal)Math.Pow(10, precision)).ToArray();
+
+        private static class BigConsts<T> where T : IBigValue<T>, new()
+        {
+            public static readonly BigInt<T> Ten = BigInt<T>.FromInt(10);
+            public static readonly BigInt<T> DecimalLimit = BigInt<T>.Parse("10000000000000000000000000000");   // 1e28
+            public static readonly BigInt<T> NegativeDecimalLimit = DecimalLimit.Negative();
+        }
+
+        private class NameTable
+        {
+            public List<string> Names { get; } = new List<string>();
+
+            public int GetId(string name)
+            {
+                int id;
+                if (!Ids.TryGetValue(name, out id))
+                {
+                    id = Names.Count;
+                    Ids.Add(name, id);
+                    Names.Add(name);
+                }
+                return id;
+            }
+
+            private readonly IDictionary<string, int> Ids = new Dictionary<string, int>();
+        }
+    }
+}
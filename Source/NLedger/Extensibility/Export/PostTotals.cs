@@ -0,0 +1,106 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Amounts;
+using NLedger.Utility;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Extensibility.Export
+{
+    public enum PostGrouping
+    {
+        None,
+        Account,
+        Commodity,
+        Payee,
+        Month
+    }
+
+    /// <summary>
+    /// Sums amounts of a sequence of posts in a single call, optionally grouping them by account, commodity, payee or month.
+    /// Keys are account full names, commodity symbols and payees (strings) or the first days of months (Date).
+    /// Posts without amounts are skipped.
+    /// </summary>
+    public class PostTotals
+    {
+        public PostTotals(IEnumerable<Post> posts, PostGrouping grouping = PostGrouping.None)
+        {
+            if (posts == null)
+                throw new ArgumentNullException(nameof(posts));
+
+            Grouping = grouping;
+            Total = new Balance();
+
+            var groups = new Dictionary<object, Balance>();
+            var keys = new List<object>();
+
+            foreach (var post in posts)
+            {
+                var amount = post.Amount;
+                if (Amount.IsNullOrEmpty(amount))
+                    continue;
+
+                Total.Add(amount);
+
+                if (grouping == PostGrouping.None)
+                    continue;
+
+                var key = GetKey(post, grouping);
+                Balance balance;
+                if (!groups.TryGetValue(key, out balance))
+                {
+                    groups.Add(key, balance = new Balance());
+                    keys.Add(key);
+                }
+                balance.Add(amount);
+            }
+
+            Keys = keys.ToArray();
+            Totals = keys.Select(key => groups[key]).ToArray();
+        }
+
+        public PostGrouping Grouping { get; }
+        public Balance Total { get; }
+
+        /// <summary>
+        /// Group keys in order of the first appearance; Totals contains a balance for every key
+        /// </summary>
+        public object[] Keys { get; }
+        public Balance[] Totals { get; }
+
+        public static PostGrouping ParseGrouping(string grouping)
+        {
+            if (String.IsNullOrEmpty(grouping))
+                return PostGrouping.None;
+
+            PostGrouping result;
+            if (!Enum.TryParse(grouping, true, out result))
+                throw new ArgumentException($"Unknown grouping: {grouping}");
+
+            return result;
+        }
+
+        private static object GetKey(Post post, PostGrouping grouping)
+        {
+            switch (grouping)
+            {
+                case PostGrouping.Account: return post.Account?.FullName ?? String.Empty;
+                case PostGrouping.Commodity: return post.Amount.HasCommodity ? post.Amount.Commodity.Symbol : String.Empty;
+                case PostGrouping.Payee: return post.Payee ?? String.Empty;
+                case PostGrouping.Month:
+                    var date = post.GetDate();
+                    return new Date(date.Year, date.Month, 1);
+                default: throw new InvalidOperationException($"Unexpected grouping: {grouping}");
+            }
+        }
+    }
+}
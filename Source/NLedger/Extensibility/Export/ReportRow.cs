@@ -0,0 +1,117 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Accounts;
+using NLedger.Chain;
+using NLedger.Output;
+using NLedger.Scopus;
+using NLedger.Utility;
+using NLedger.Values;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Extensibility.Export
+{
+    /// <summary>
+    /// Typed row of a structured report: a register line (a post) or a balance line (an account).
+    /// Amount and Total are display_amount and display_total values that text reports would format.
+    /// Balance rows have no date and payee.
+    /// </summary>
+    public class ReportRow
+    {
+        public ReportRow(Date? date, string payee, string account, Value amount, Value total)
+        {
+            Date = date;
+            Payee = payee;
+            Account = account;
+            Amount = amount;
+            Total = total;
+        }
+
+        public Date? Date { get; }
+        public string Payee { get; }
+        public string Account { get; }
+        public Value Amount { get; }
+        public Value Total { get; }
+    }
+
+    /// <summary>
+    /// The last handler in a register report chain that produces rows instead of formatted text (see FormatPosts)
+    /// </summary>
+    public class ReportRowPosts : PostHandler
+    {
+        public ReportRowPosts(Report report, Action<ReportRow> onRow)
+            : base(null)
+        {
+            Report = report ?? throw new ArgumentNullException(nameof(report));
+            OnRow = onRow ?? throw new ArgumentNullException(nameof(onRow));
+        }
+
+        public override void Handle(Post post)
+        {
+            if (post.HasXData && post.XData.Displayed)
+                return;
+
+            CallScope callScope = new CallScope(new BindScope(Report, post));
+            OnRow(new ReportRow(post.GetDate(), post.Payee, post.ReportedAccount?.FullName,
+                Report.DisplayValue(Report.FnDisplayAmount(callScope)), Report.DisplayValue(Report.FnDisplayTotal(callScope))));
+
+            post.XData.Displayed = true;
+        }
+
+        private Report Report { get; }
+        private Action<ReportRow> OnRow { get; }
+    }
+
+    /// <summary>
+    /// Accounts handler for a balance report that produces rows instead of formatted text.
+    /// It selects accounts to display by the same rules as FormatAccounts; the final total line is not produced.
+    /// </summary>
+    public class ReportRowAccounts : FormatAccounts
+    {
+        public ReportRowAccounts(Report report, Action<ReportRow> onRow)
+            : base(report, String.Empty)
+        {
+            OnRow = onRow ?? throw new ArgumentNullException(nameof(onRow));
+        }
+
+        public override int PostAccount(Account account, bool flat)
+        {
+            if (!flat && account.Parent != null)
+                PostAccount(account.Parent, flat);
+
+            if (account.XData.ToDisplay && !account.XData.Displayed)
+            {
+                account.XData.Displayed = true;
+
+                CallScope callScope = new CallScope(new BindScope(Report, account));
+                OnRow(new ReportRow(null, null, account.FullName,
+                    Report.DisplayValue(Report.FnDisplayAmount(callScope)), Report.DisplayValue(Report.FnDisplayTotal(callScope))));
+
+                return 1;
+            }
+            return 0;
+        }
+
+        public override void Flush()
+        {
+            if (Report.DisplayHandler.Handled)
+                DispPred.Parse(Report.DisplayHandler.Str());
+
+            MarkAccounts(Report.Session.Journal.Master, Report.FlatHandler.Handled);
+
+            foreach (var account in PostedAccounts)
+                PostAccount(account, Report.FlatHandler.Handled);
+        }
+
+        private Action<ReportRow> OnRow { get; }
+    }
+}
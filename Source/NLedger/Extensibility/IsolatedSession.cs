@@ -0,0 +1,63 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Scopus;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Extensibility
+{
+    /// <summary>
+    /// Session with its own application context (commodity pool, default report, options, time settings etc),
+    /// so several sessions with independent journals can be used in one process.
+    /// The session context should be current (see Enter) while the session or its objects are in use.
+    /// </summary>
+    public class IsolatedSession : Session
+    {
+        /// <summary>
+        /// Creates a new session in a new application context. Application services and environment settings are taken
+        /// from the parent context (if it is specified).
+        /// </summary>
+        public static IsolatedSession Create(MainApplicationContext parentContext = null)
+        {
+            var context = new MainApplicationContext(parentContext?.ApplicationServiceProvider);
+            if (parentContext != null)
+            {
+                context.SetEnvironmentVariables(parentContext.EnvironmentVariables);
+                context.IsAtty = parentContext.IsAtty;
+                context.TimeZone = parentContext.TimeZone;
+            }
+
+            using (context.EnterCurrentThread())
+            {
+                var session = new IsolatedSession(context);
+                Session.SetSessionContext(session);
+                Scope.DefaultScope = new Report(session);
+                return session;
+            }
+        }
+
+        public MainApplicationContext Context { get; }
+
+        /// <summary>
+        /// Makes the session context current for the calling thread until the returned object is disposed
+        /// </summary>
+        public IDisposable Enter()
+        {
+            return Context.EnterCurrentThread();
+        }
+
+        private IsolatedSession(MainApplicationContext context)
+        {
+            Context = context;
+        }
+    }
+}
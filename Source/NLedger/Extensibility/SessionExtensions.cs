@@ -7,6 +7,8 @@
 // See LICENSE.LEDGER file included with the distribution for details and disclaimer.
 // **********************************************************************************
 using NLedger.Expressions;
+using NLedger.Extensibility.Export;
+using NLedger.Journals;
 using NLedger.Scopus;
 using NLedger.Utility;
 using System;
@@ -70,6 +72,39 @@ namespace NLedger.Extensibility
         /// It supports all Ledger capabilities excepting Output, Pager and Options flags that are managed on GlobalScope layer.</remarks>
         public static CommandExecutionResult ExecuteCommand(this Session session, IEnumerable<string> args, bool readJournalFiles = false)
         {
+            using (var output = new StringWriter())
+            {
+                var result = ExecuteCommand(session, args, output, readJournalFiles);
+                return String.IsNullOrEmpty(result.Error) ? CommandExecutionResult.Success(output.ToString()) : result;
+            }
+        }
+
+        /// <summary>
+        /// Executes a Ledger command with arguments and writes the output to the specified text writer while the command produces it.
+        /// </summary>
+        /// <param name="session">Current session instance</param>
+        /// <param name="args">String that contains a command with arguments</param>
+        /// <param name="output">Text writer that receives the command output; it is flushed but not closed</param>
+        /// <param name="readJournalFiles">Optional flag indicating whether it should read journal files before executing the command</param>
+        /// <returns>Command execution result (error messages only; the output is written to the text writer)</returns>
+        public static CommandExecutionResult ExecuteCommand(this Session session, string args, TextWriter output, bool readJournalFiles = false)
+        {
+            return ExecuteCommand(session, CommandLine.PreprocessSingleQuotes(args), output, readJournalFiles);
+        }
+
+        /// <summary>
+        /// Executes a Ledger command with arguments and writes the output to the specified text writer while the command produces it.
+        /// </summary>
+        /// <param name="session">Current session instance</param>
+        /// <param name="args">Enumerable of strings that contains a command with arguments</param>
+        /// <param name="output">Text writer that receives the command output; it is flushed but not closed</param>
+        /// <param name="readJournalFiles">Optional flag indicating whether it should read journal files before executing the command</param>
+        /// <returns>Command execution result (error messages only; the output is written to the text writer)</returns>
+        public static CommandExecutionResult ExecuteCommand(this Session session, IEnumerable<string> args, TextWriter output, bool readJournalFiles = false)
+        {
+            if (output == null)
+                throw new ArgumentNullException(nameof(output));
+
             if (session == null)
                 throw new ArgumentNullException(nameof(session));
 
@@ -110,19 +145,19 @@ namespace NLedger.Extensibility
                 }
 
                 // Specify isolated output stream
-                using (scopeReport.OutputStream = new StringWriter())
-                {
-                    // Compose command args
-                    CallScope commandArgs = new CallScope(boundScope);
-                    foreach (string arg in args)
-                        commandArgs.PushBack(Values.Value.Get(arg));
+                scopeReport.OutputStream = output;
 
-                    // Execute command
-                    command(commandArgs);
+                // Compose command args
+                CallScope commandArgs = new CallScope(boundScope);
+                foreach (string arg in args)
+                    commandArgs.PushBack(Values.Value.Get(arg));
 
-                    // Command execution results
-                    return CommandExecutionResult.Success(scopeReport.OutputStream.ToString());
-                }
+                // Execute command
+                command(commandArgs);
+                output.Flush();
+
+                // Command execution results
+                return CommandExecutionResult.Empty;
             }
             catch (Exception ex)
             {
@@ -137,12 +172,211 @@ namespace NLedger.Extensibility
 
                 return CommandExecutionResult.Failure(sb.ToString());
             }
+            finally
+            {
+                // The output writer belongs to the caller
+                if (scopeReport.OutputStream == output)
+                    scopeReport.OutputStream = null;
+
+                scopeReport.QuickClose();
+                Scope.DefaultScope = currentReport;
+            }
+        }
+
+        /// <summary>
+        /// Runs a register or balance report and returns its rows as typed values instead of formatted text.
+        /// </summary>
+        /// <param name="session">Current session instance</param>
+        /// <param name="args">String that contains a command (register or balance) with arguments</param>
+        /// <param name="readJournalFiles">Optional flag indicating whether it should read journal files before running the report</param>
+        /// <returns>Report rows</returns>
+        public static IList<ReportRow> GetReportRows(this Session session, string args, bool readJournalFiles = false)
+        {
+            return GetReportRows(session, CommandLine.PreprocessSingleQuotes(args), readJournalFiles);
+        }
+
+        /// <summary>
+        /// Runs a register or balance report and returns its rows as typed values instead of formatted text.
+        /// </summary>
+        /// <param name="session">Current session instance</param>
+        /// <param name="args">Enumerable of strings that contains a command (register or balance) with arguments</param>
+        /// <param name="readJournalFiles">Optional flag indicating whether it should read journal files before running the report</param>
+        /// <returns>Report rows</returns>
+        /// <remarks>All rows are collected while the report scope is active, so the global scope and journal xdata are restored
+        /// before the method returns. Data file options (-f) are only allowed if readJournalFiles is set, like in ExecuteCommand.</remarks>
+        public static IList<ReportRow> GetReportRows(this Session session, IEnumerable<string> args, bool readJournalFiles = false)
+        {
+            var rows = new List<ReportRow>();
+            RunReportRows(session, args, rows.Add, readJournalFiles);
+            return rows;
+        }
+
+        /// <summary>
+        /// Runs a register or balance report and passes its rows to the callback in chunks as the report produces them.
+        /// </summary>
+        /// <param name="session">Current session instance</param>
+        /// <param name="args">Enumerable of strings that contains a command (register or balance) with arguments</param>
+        /// <param name="onChunk">Callback that gets chunks of rows; it is invoked synchronously, so a slow consumer holds the report back</param>
+        /// <param name="chunkSize">Number of rows in a chunk (the last chunk can be smaller)</param>
+        /// <param name="readJournalFiles">Optional flag indicating whether it should read journal files before running the report</param>
+        /// <remarks>Register rows are produced while the report walks journal posts (unless the report has to collect all posts first,
+        /// e.g. for sorting); balance rows are produced at the end. The global scope and journal xdata are restored before the method returns.</remarks>
+        public static void GetReportRows(this Session session, IEnumerable<string> args, Action<IList<ReportRow>> onChunk, int chunkSize = DefaultReportRowChunkSize, bool readJournalFiles = false)
+        {
+            if (onChunk == null)
+                throw new ArgumentNullException(nameof(onChunk));
+            if (chunkSize <= 0)
+                throw new ArgumentOutOfRangeException(nameof(chunkSize));
+
+            var chunk = new List<ReportRow>(chunkSize);
+            RunReportRows(session, args, row =>
+            {
+                chunk.Add(row);
+                if (chunk.Count >= chunkSize)
+                {
+                    onChunk(chunk);
+                    chunk = new List<ReportRow>(chunkSize);
+                }
+            }, readJournalFiles);
+
+            if (chunk.Count > 0)
+                onChunk(chunk);
+        }
+
+        private static void RunReportRows(Session session, IEnumerable<string> args, Action<ReportRow> onRow, bool readJournalFiles)
+        {
+            if (session == null)
+                throw new ArgumentNullException(nameof(session));
+
+            var currentReport = Scope.DefaultScope as Report ?? throw new InvalidOperationException("Global scope has not been initialized with a report object");
+
+            var scopeReport = new Report(currentReport);
+            Scope.DefaultScope = scopeReport;
+
+            var dataFiles = session.FileHandler.DataFiles.ToList();
+            try
+            {
+                args = Option.ProcessArguments(args, scopeReport);
+                if (!args.Any())
+                    return;
+
+                string verb = args.First();
+                string whence = RegisterRowVerbs.Contains(verb) ? "#register" : BalanceRowVerbs.Contains(verb) ? "#balance" :
+                    throw new LogicError(String.Format("Command '{0}' does not support structured output; use register or balance", verb));
+
+                if (readJournalFiles)
+                {
+                    session.ReadJournalFiles();
+                }
+                else if (!dataFiles.SequenceEqual(session.FileHandler.DataFiles))
+                {
+                    session.FileHandler.DataFiles.Clear();
+                    foreach (var dataFile in dataFiles)
+                        session.FileHandler.DataFiles.Add(dataFile);
+                    throw new LogicError("Data file options are not allowed in structured reports unless journal files are read (see readJournalFiles)");
+                }
+
+                scopeReport.NormalizeOptions(verb);
+
+                CallScope queryArgs = new CallScope(new BindScope(session, scopeReport));
+                foreach (string arg in args.Skip(1))
+                    queryArgs.PushBack(Values.Value.Get(arg));
+                if (queryArgs.Size > 0)
+                    scopeReport.ParseQueryArgs(queryArgs.Value(), whence);
 
+                if (whence == "#balance")
+                    scopeReport.AccountsReport(new ReportRowAccounts(scopeReport, onRow));
+                else
+                    scopeReport.PostsReport(new ReportRowPosts(scopeReport, onRow));
+            }
             finally
             {
                 scopeReport.QuickClose();
                 Scope.DefaultScope = currentReport;
             }
         }
+
+        /// <summary>
+        /// Populates the session journal from a snapshot file (see JournalSnapshot). The session journal should be empty (see CloseJournalFiles).
+        /// If any of the source files has been changed since the snapshot was saved, the source files are read again instead.
+        /// In both cases, source files of the snapshot become the session data files.
+        /// </summary>
+        /// <param name="session">Current session instance</param>
+        /// <param name="fileName">Snapshot file name</param>
+        /// <returns>Session journal</returns>
+        public static Journal LoadJournalSnapshot(this Session session, string fileName)
+        {
+            if (session == null)
+                throw new ArgumentNullException(nameof(session));
+
+            if (JournalSnapshot.Load(session.Journal, fileName))
+            {
+                SetDataFiles(session, session.Journal.Sources.Where(s => !s.FromStream));
+                return session.Journal;
+            }
+
+            var sources = JournalSnapshot.GetSources(fileName);
+            if (!sources.Any() || sources.Any(s => s.FromStream))
+                throw new InvalidOperationException(String.Format("Journal snapshot '{0}' is outdated and its sources cannot be read again", fileName));
+
+            SetDataFiles(session, sources);
+            return session.ReadJournalFiles();
+        }
+
+        private static void SetDataFiles(Session session, IEnumerable<JournalFileInfo> sources)
+        {
+            session.FileHandler.DataFiles.Clear();
+            foreach (var source in sources)
+                session.FileHandler.DataFiles.Add(source.FileName);
+        }
+
+        /// <summary>
+        /// Reads journal files into the session journal. Files are read in the specified order, like data files given by several --file options.
+        /// If parallel is set, independent files (and independent included files) are parsed on worker threads and merged in the order
+        /// they are declared (see ParallelParser).
+        /// </summary>
+        /// <param name="session">Current session instance</param>
+        /// <param name="fileNames">Journal file names</param>
+        /// <param name="parallel">Enables parallel parsing</param>
+        /// <returns>Session journal</returns>
+        public static Journal ReadJournals(this Session session, IEnumerable<string> fileNames, bool parallel)
+        {
+            if (session == null)
+                throw new ArgumentNullException(nameof(session));
+            if (fileNames == null)
+                throw new ArgumentNullException(nameof(fileNames));
+
+            session.FileHandler.DataFiles.Clear();
+            foreach (var fileName in fileNames)
+                session.FileHandler.DataFiles.Add(fileName);
+
+            var parallelParsing = session.Journal.ParallelParsing;
+            session.Journal.ParallelParsing = parallel;
+            try
+            {
+                return session.ReadJournalFiles();
+            }
+            finally
+            {
+                session.Journal.ParallelParsing = parallelParsing;
+            }
+        }
+
+        /// <summary>
+        /// Returns a text that describes handled options of the session and the current report (see Session.ReportOptions).
+        /// Connectors can use it to detect option changes, e.g. as a part of cached result keys.
+        /// </summary>
+        public static string GetOptionsReport(this Session session)
+        {
+            if (session == null)
+                throw new ArgumentNullException(nameof(session));
+
+            return session.ReportOptions() + ((Scope.DefaultScope as Report)?.ReportOptions() ?? String.Empty);
+        }
+
+        public const int DefaultReportRowChunkSize = 100;
+
+        private static readonly ISet<string> RegisterRowVerbs = new HashSet<string>() { "r", "reg", "register" };
+        private static readonly ISet<string> BalanceRowVerbs = new HashSet<string>() { "b", "bal", "balance" };
     }
 }
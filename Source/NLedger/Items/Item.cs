@@ -606,7 +606,7 @@ namespace NLedger.Items
 
         #endregion
 
-        private void SetTag(string tag, Value value, bool overwriteExisting, bool isParsed)
+        public void SetTag(string tag, Value value, bool overwriteExisting, bool isParsed)
         {
             if (String.IsNullOrWhiteSpace(tag))
                 throw new ArgumentNullException("tag");
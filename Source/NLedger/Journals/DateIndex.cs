@@ -0,0 +1,107 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Items;
+using NLedger.Utility;
+using NLedger.Xacts;
+using System;
+using System.Collections.Generic;
+using System.Collections.ObjectModel;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Journals
+{
+    /// <summary>
+    /// Journal transactions and postings sorted by date. Items in a date range are found by binary search
+    /// and returned as read-only views of the sorted arrays, so selecting a period costs O(log n) plus the size of the result.
+    /// Ranges include the start date and exclude the end date (like --begin and --end options); a missing date means an open range.
+    /// </summary>
+    /// <remarks>
+    /// NLedger extension. The journal builds the index on first request and rebuilds it on the next request after the journal content is changed
+    /// (see Journal.Generation) or the date mode is switched (see Item.UseAuxDate). Items that have the same date keep journal order. Returned views keep referring to the arrays
+    /// they were taken from, so they are not affected by rebuilding the index.
+    /// </remarks>
+    public class DateIndex
+    {
+        public DateIndex(Journal journal)
+        {
+            Journal = journal ?? throw new ArgumentNullException(nameof(journal));
+            Rebuild();
+        }
+
+        public Journal Journal { get; }
+
+        /// <summary>
+        /// Journal generation that the index corresponds to
+        /// </summary>
+        public long Generation { get; private set; }
+
+        /// <summary>
+        /// Whether items were sorted by auxiliary (effective) dates
+        /// </summary>
+        public bool UseAuxDate { get; private set; }
+
+        /// <summary>
+        /// Whether the index corresponds to the current journal content and date mode
+        /// </summary>
+        public bool IsActual => Generation == Journal.Generation && UseAuxDate == Item.UseAuxDate;
+
+        public void Rebuild()
+        {
+            Xacts = Journal.Xacts.OrderBy(xact => xact.GetDate()).ToArray();
+            XactDates = Xacts.Select(xact => xact.GetDate()).ToArray();
+
+            Posts = Journal.Xacts.SelectMany(xact => xact.Posts).OrderBy(post => post.GetDate()).ToArray();
+            PostDates = Posts.Select(post => post.GetDate()).ToArray();
+
+            Generation = Journal.Generation;
+            UseAuxDate = Item.UseAuxDate;
+        }
+
+        public IList<Xact> GetXacts(Date? start = null, Date? end = null)
+        {
+            return GetRange(Xacts, XactDates, start, end);
+        }
+
+        public IList<Post> GetPosts(Date? start = null, Date? end = null)
+        {
+            return GetRange(Posts, PostDates, start, end);
+        }
+
+        private static IList<T> GetRange<T>(T[] items, Date[] dates, Date? start, Date? end)
+        {
+            var from = start.HasValue ? LowerBound(dates, start.Value) : 0;
+            var to = end.HasValue ? LowerBound(dates, end.Value) : dates.Length;
+            return new ReadOnlyCollection<T>(new ArraySegment<T>(items, from, Math.Max(to - from, 0)));
+        }
+
+        /// <summary>
+        /// Returns the index of the first date that is not less than the specified one
+        /// </summary>
+        private static int LowerBound(Date[] dates, Date date)
+        {
+            int low = 0, high = dates.Length;
+            while (low < high)
+            {
+                int middle = low + (high - low) / 2;
+                if (dates[middle] < date)
+                    low = middle + 1;
+                else
+                    high = middle;
+            }
+            return low;
+        }
+
+        private Xact[] Xacts { get; set; }
+        private Date[] XactDates { get; set; }
+        private Post[] Posts { get; set; }
+        private Date[] PostDates { get; set; }
+    }
+}
@@ -45,9 +45,11 @@ namespace NLedger.Journals
             CheckingStyle = JournalCheckingStyleEnum.CHECK_NORMAL;
 
             Sources = new List<JournalFileInfo>();
+            IncludedSources = new List<JournalFileInfo>();
             KnownTags = new HashSet<string>();
             KnownPayees = new HashSet<string>();
             TagCheckExprsMap = new MultiMap<string, CheckExprPair>();
+            SourcePrices = new Dictionary<string, ISet<Tuple<Commodity, Commodity, DateTime>>>();
         }
 
 
@@ -72,10 +74,65 @@ namespace NLedger.Journals
 
         public ParseContext CurrentContext { get; private set; }
         public IList<JournalFileInfo> Sources { get; private set; }
+        public IList<JournalFileInfo> IncludedSources { get; private set; }  // Files read by 'include' directives
         public ISet<string> KnownTags { get; private set; }
         public ISet<string> KnownPayees { get; private set; }
         public IMultiMap<string, CheckExprPair> TagCheckExprsMap { get; private set; }
 
+        /// <summary>
+        /// Prices (source commodity, price commodity, moment) that were added while journal files were read, by file names.
+        /// Refresh removes prices of the files that it reads again, so prices deleted from the files do not stay in the price history.
+        /// </summary>
+        /// <remarks>NLedger extension</remarks>
+        public IDictionary<string, ISet<Tuple<Commodity, Commodity, DateTime>>> SourcePrices { get; private set; }
+
+        /// <summary>
+        /// Journal content generation counter. It is incremented every time transactions are added, removed or read,
+        /// so integration code can detect that cached results of the journal become outdated.
+        /// </summary>
+        /// <remarks>NLedger extension; it is not a part of the original journal_t</remarks>
+        public long Generation { get; private set; }
+
+        public void IncrementGeneration()
+        {
+            Generation++;
+        }
+
+        /// <summary>
+        /// Returns the index of transaction and posting tags. It is built on first request and then updated by AddXact and RemoveXact;
+        /// if the journal content was changed in another way (e.g. read or refreshed), the index is rebuilt.
+        /// </summary>
+        /// <remarks>NLedger extension</remarks>
+        public TagIndex GetTagIndex()
+        {
+            if (tagIndex == null)
+                tagIndex = new TagIndex(this);
+            else if (tagIndex.Generation != Generation)
+                tagIndex.Rebuild();
+
+            return tagIndex;
+        }
+
+        /// <summary>
+        /// Returns the index of transactions and postings sorted by date. It is built on first request and rebuilt after the journal content or the date mode is changed.
+        /// </summary>
+        /// <remarks>NLedger extension</remarks>
+        public DateIndex GetDateIndex()
+        {
+            if (dateIndex == null)
+                dateIndex = new DateIndex(this);
+            else if (!dateIndex.IsActual)
+                dateIndex.Rebuild();
+
+            return dateIndex;
+        }
+
+        /// <summary>
+        /// Enables parsing of independent files (included files or several journal files) on worker threads (see ParallelParser).
+        /// </summary>
+        /// <remarks>NLedger extension; it is not a part of the original journal_t</remarks>
+        public bool ParallelParsing { get; set; }
+
         /// <summary>
         /// Ported from string register_payee(const string& name, xact_t * xact);
         /// </summary>
@@ -312,6 +369,7 @@ namespace NLedger.Journals
             // of balance assertions or other calculations performed in valexpr-based
             // posting amounts.
             ClearXData();
+            IncrementGeneration();
 
             return count;
         }
@@ -325,7 +383,19 @@ namespace NLedger.Journals
 
             TextualParser instance = new TextualParser(contextStack, contextStack.GetCurrent(), null, CheckingStyle == JournalCheckingStyleEnum.CHECK_PERMISSIVE);
             instance.ApplyStack.PushFront("account", contextStack.GetCurrent().Master);
-            instance.Parse();
+
+            // [DM] Prices are recorded by files they are read from (see SourcePrices)
+            var priceHistory = CommodityPool.Current.CommodityPriceHistory;
+            var onPriceAdded = priceHistory.OnPriceAdded;
+            priceHistory.OnPriceAdded = (source, target, moment) => AddSourcePrice(contextStack.GetCurrent().PathName, source, target, moment);
+            try
+            {
+                instance.Parse();
+            }
+            finally
+            {
+                priceHistory.OnPriceAdded = onPriceAdded;
+            }
 
             trace?.Stop(); // TRACE_STOP
 
@@ -359,6 +429,21 @@ namespace NLedger.Journals
                 return false;
             }
 
+            return AddFinalizedXact(xact);
+        }
+
+        /// <summary>
+        /// Adds a transaction that has been already finalized: applies automated transactions and metadata checks
+        /// and registers the transaction in the journal. Returns false if the transaction was rejected.
+        /// </summary>
+        /// <remarks>NLedger extension; it is the second half of journal_t::add_xact that is used to merge transactions parsed by another journal</remarks>
+        public bool AddFinalizedXact(Xact xact)
+        {
+            if (xact == null)
+                throw new ArgumentNullException("xact");
+
+            xact.Journal = this;
+
             ExtendXact(xact);
             CheckAllMetadata(xact);
             
@@ -419,7 +504,12 @@ namespace NLedger.Journals
                 }
             }
 
+            var isTagIndexActual = tagIndex?.Generation == Generation;
             Xacts.Add(xact);
+            IncrementGeneration();
+            if (isTagIndexActual)
+                tagIndex.AddXact(xact);
+
             return true;
         }
 
@@ -428,9 +518,15 @@ namespace NLedger.Journals
         /// </summary>
         public bool RemoveXact(Xact xact)
         {
+            var isTagIndexActual = tagIndex?.Generation == Generation;
             var found = Xacts.Remove(xact);
             if (found)
+            {
                 xact.Journal = null;
+                IncrementGeneration();
+                if (isTagIndexActual)
+                    tagIndex.RemoveXact(xact);
+            }
 
             return found;
         }
@@ -541,6 +637,14 @@ namespace NLedger.Journals
             return true;
         }
 
+        private void AddSourcePrice(string pathName, Commodity source, Commodity target, DateTime moment)
+        {
+            ISet<Tuple<Commodity, Commodity, DateTime>> prices;
+            if (!SourcePrices.TryGetValue(pathName ?? String.Empty, out prices))
+                SourcePrices.Add(pathName ?? String.Empty, prices = new HashSet<Tuple<Commodity, Commodity, DateTime>>());
+            prices.Add(Tuple.Create(source, target, moment));
+        }
+
         /// <summary>
         /// Only for test purposes
         /// </summary>
@@ -549,6 +653,9 @@ namespace NLedger.Journals
             CurrentContext = currentContext;
         }
 
+        private TagIndex tagIndex;
+        private DateIndex dateIndex;
+
         /// <summary>
         /// Ported from is_equivalent_posting(post_t * left, post_t * right)
         /// </summary>
@@ -6,10 +6,15 @@
 // Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
 // See LICENSE.LEDGER file included with the distribution for details and disclaimer.
 // **********************************************************************************
+using NLedger.Accounts;
+using NLedger.Commodities;
 using NLedger.Filters;
+using NLedger.Items;
 using NLedger.Scopus;
+using NLedger.Textual;
 using NLedger.Utility;
 using NLedger.Values;
+using NLedger.Xacts;
 using System;
 using System.Collections.Generic;
 using System.Linq;
@@ -27,48 +32,187 @@ namespace NLedger.Journals
         /// <param name="query"></param>
         /// <returns></returns>
         public static IEnumerable<Post> Query(this Journal journal, string query)
+        {
+            return PrepareQuery(journal, query).Execute();
+        }
+
+        /// <summary>
+        /// Parses query arguments once and returns a prepared query object that can be executed many times.
+        /// </summary>
+        public static JournalQuery PrepareQuery(this Journal journal, string query)
         {
             if (journal == null)
                 throw new ArgumentNullException(nameof(journal));
 
-            if (journal.HasXData())
-                throw new RuntimeError("Cannot have more than one active journal query");
+            return new JournalQuery(journal, query, (Report)Scope.DefaultScope);
+        }
+
+        /// <summary>
+        /// Reads again journal files that were changed after they had been parsed and returns the number of read files.
+        /// If only files read by 'include' directives were changed, only these files are parsed again and their transactions
+        /// are replaced in place. Otherwise (a top-level file was changed, a changed file includes other files or defines
+        /// automated or periodic transactions) the journal is cleared and all its top-level files are read again.
+        /// The master account object is kept; prices that were read from the files are removed before the files are read again.
+        /// </summary>
+        public static int Refresh(this Journal journal)
+        {
+            if (journal == null)
+                throw new ArgumentNullException(nameof(journal));
 
-            var currentReport = (Report)Scope.DefaultScope;
-            using (var coll = new CollectorWraper(journal, currentReport))
+            var changedIncludes = journal.IncludedSources.Where(s => s.IsChanged()).ToList();
+            var sourcesChanged = journal.Sources.Any(s => s.IsChanged());
+            if (!sourcesChanged && !changedIncludes.Any())
+                return 0;
+
+            if (sourcesChanged || !changedIncludes.All(s => CanRefreshIncludedSource(journal, s)))
+                return Reload(journal);
+
+            foreach (var source in changedIncludes)
+                RefreshIncludedSource(journal, source);
+
+            journal.ClearXData();
+            journal.IncrementGeneration();
+
+            return changedIncludes.Count;
+        }
+
+        private static bool CanRefreshIncludedSource(Journal journal, JournalFileInfo source)
+        {
+            var fileName = source.FileName;
+            return source.ParentFileName != null && source.MasterAccount != null && FileSystem.FileExists(fileName) &&
+                journal.IncludedSources.Count(s => s.FileName == fileName) == 1 &&
+                !journal.IncludedSources.Any(s => s.ParentFileName == fileName) &&
+                !journal.AutoXacts.Any(x => x.HasPos && x.Pos.PathName == fileName) &&
+                !journal.PeriodXacts.Any(x => x.HasPos && x.Pos.PathName == fileName);
+        }
+
+        private static void RefreshIncludedSource(Journal journal, JournalFileInfo source)
+        {
+            var context = new ParseContextStack();
+            context.Push(source.FileName);
+            try
             {
-                var remaining = Option.ProcessArguments(StringExtensions.SplitArguments(query), coll.Report);
-                coll.Report.NormalizeOptions("register");
+                var current = context.GetCurrent();
+                var pathName = current.PathName;
+
+                // Remove transactions that were read from this file; new ones take the place of the first removed transaction
+                var removed = new HashSet<Xact>(journal.Xacts.Where(x => x.HasPos && x.Pos.PathName == pathName));
+                var kept = journal.Xacts.Where(x => !removed.Contains(x)).ToList();
+                var index = removed.Any() ? journal.Xacts.TakeWhile(x => !removed.Contains(x)).Count() : kept.Count;
 
-                var args = new Value();
-                foreach (var arg in remaining)
-                    args.PushBack(Value.StringValue(arg));
-                coll.Report.ParseQueryArgs(args, "@Journal.query");
+                DetachXacts(removed);
+                foreach (var uuid in journal.ChecksumMapping.Where(m => removed.Contains(m.Value)).Select(m => m.Key).ToList())
+                    journal.ChecksumMapping.Remove(uuid);
 
-                coll.Report.PostsReport(coll.CollectPosts);
-                return coll.CollectPosts.Posts;
+                journal.Xacts.Clear();
+                foreach (var xact in kept)
+                    journal.Xacts.Add(xact);
+
+                RemoveSourcePrices(journal, new[] { pathName });
+
+                current.Journal = journal;
+                current.Master = String.IsNullOrEmpty(source.MasterAccount) ? journal.Master : journal.Master.FindAccount(source.MasterAccount);
+                current.Scope = Scope.DefaultScope;
+                if (removed.Any())
+                    current.Sequence = removed.Min(x => x.Pos.Sequence);
+
+                if (current.Scope == null)
+                    throw new RuntimeError(String.Format(RuntimeError.ErrorMessageNoDefaultScopeInWhichToReadJournalFile, pathName));
+
+                journal.SetCurrentContext(current);
+                journal.ReadTextual(context);
+
+                var added = journal.Xacts.Skip(kept.Count).ToList();
+                journal.Xacts.Clear();
+                foreach (var xact in kept.Take(index).Concat(added).Concat(kept.Skip(index)))
+                    journal.Xacts.Add(xact);
+            }
+            finally
+            {
+                context.Pop();
             }
+
+            journal.IncludedSources[journal.IncludedSources.IndexOf(source)] =
+                new JournalFileInfo(source.FileName) { ParentFileName = source.ParentFileName, MasterAccount = source.MasterAccount };
         }
 
-        /// <summary>
-        /// Ported from py_journal.cc - collector_wrapper
-        /// </summary>
-        private class CollectorWraper : IDisposable
+        private static int Reload(Journal journal)
         {
-            public CollectorWraper(Journal journal, Report report)
+            var sources = journal.Sources.ToList();
+            if (sources.Any(s => s.FromStream))
+                throw new InvalidOperationException("Cannot read the journal again because it was read from a stream");
+
+            RemoveSourcePrices(journal, sources.Concat(journal.IncludedSources).Select(s => s.FileName));
+
+            // The master account is kept, so references to it (e.g. in connectors) stay valid
+            foreach (var account in journal.Master.Accounts.Values.ToList())
+                journal.Master.RemoveAccount(account);
+            journal.Master.Posts.Clear();
+            journal.Bucket = null;
+            journal.Xacts.Clear();
+            journal.AutoXacts.Clear();
+            journal.PeriodXacts.Clear();
+            journal.ChecksumMapping.Clear();
+            journal.AccountAliases.Clear();
+            journal.PayeeUUIDMapping.Clear();
+            journal.PayeesForUnknownAccounts.Clear();
+            journal.PayeeAliasMappings.Clear();
+            journal.KnownPayees.Clear();
+            journal.KnownTags.Clear();
+            journal.Sources.Clear();
+            journal.IncludedSources.Clear();
+
+            foreach (var source in sources)
             {
-                Journal = journal ?? throw new ArgumentNullException(nameof(journal));
-                Report = new Report(report ?? throw new ArgumentNullException(nameof(report)));
-                CollectPosts = new CollectPosts();
+                var context = new ParseContextStack();
+                context.Push(source.FileName);
+                try
+                {
+                    context.GetCurrent().Journal = journal;
+                    context.GetCurrent().Master = journal.Master;
+                    journal.Read(context);
+                }
+                finally
+                {
+                    context.Pop();
+                }
             }
 
-            public Journal Journal { get; }
-            public Report Report { get; }
-            public CollectPosts CollectPosts { get; }
+            return sources.Count;
+        }
+
+        // Removes prices that were read from the files unless they were also read from other files
+        private static void RemoveSourcePrices(Journal journal, IEnumerable<string> fileNames)
+        {
+            var removedFiles = new HashSet<string>(fileNames);
+            var keptPrices = new HashSet<Tuple<Commodity, Commodity, DateTime>>(journal.SourcePrices.Where(kv => !removedFiles.Contains(kv.Key)).SelectMany(kv => kv.Value));
 
-            public void Dispose()
+            foreach (var fileName in removedFiles)
             {
-                Journal.ClearXData();
+                ISet<Tuple<Commodity, Commodity, DateTime>> prices;
+                if (!journal.SourcePrices.TryGetValue(fileName, out prices))
+                    continue;
+
+                foreach (var price in prices.Where(p => !keptPrices.Contains(p)))
+                    price.Item1.RemovePrice(price.Item3, price.Item2);
+                journal.SourcePrices.Remove(fileName);
+            }
+        }
+
+        // Batched equivalent of XactBase.Detach: every affected account drops its removed postings in a single pass
+        private static void DetachXacts(IEnumerable<Xact> xacts)
+        {
+            var posts = xacts.Where(x => !x.Flags.HasFlag(SupportsFlagsEnum.ITEM_TEMP)).SelectMany(x => x.Posts).Where(p => p.Account != null);
+            foreach (var group in posts.GroupBy(p => p.Account).ToList())
+            {
+                var removed = new HashSet<Post>(group);
+                var kept = group.Key.Posts.Where(p => !removed.Contains(p)).ToList();
+                group.Key.Posts.Clear();
+                foreach (var post in kept)
+                    group.Key.Posts.Add(post);
+
+                foreach (var post in removed)
+                    post.Account = null;
             }
         }
     }
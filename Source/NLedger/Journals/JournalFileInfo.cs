@@ -32,9 +32,32 @@ namespace NLedger.Journals
             ModTime = FileSystem.LastWriteTime(fileName);
         }
 
+        public JournalFileInfo(string fileName, long size, DateTime modTime)
+        {
+            FileName = fileName;
+            Size = size;
+            ModTime = modTime;
+        }
+
         public string FileName { get; private set; }
         public long Size { get; private set; }
         public DateTime ModTime { get; private set; }
         public bool FromStream { get; private set; }
+
+        // Context of 'include' directive that read this file (the including file and the full name of the master account)
+        public string ParentFileName { get; set; }
+        public string MasterAccount { get; set; }
+
+        /// <summary>
+        /// Checks whether the file was changed or removed after this information had been collected.
+        /// Stream sources cannot be checked, so they are never considered as changed.
+        /// </summary>
+        public bool IsChanged()
+        {
+            if (FromStream)
+                return false;
+
+            return !FileSystem.FileExists(FileName) || FileSystem.FileSize(FileName) != Size || FileSystem.LastWriteTime(FileName) != ModTime;
+        }
     }
 }
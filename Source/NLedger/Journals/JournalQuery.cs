@@ -0,0 +1,79 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Filters;
+using NLedger.Scopus;
+using NLedger.Utility;
+using NLedger.Values;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Journals
+{
+    /// <summary>
+    /// Prepared journal query. Keeps a report object with parsed query arguments and options
+    /// so that repeated executions do not parse the query text again.
+    /// Report options are copied when the query is prepared, so later option changes do not affect its results
+    /// (see ReportOptions and CurrentReportOptions).
+    /// </summary>
+    public class JournalQuery
+    {
+        public JournalQuery(Journal journal, string query, Report report)
+        {
+            Journal = journal ?? throw new ArgumentNullException(nameof(journal));
+            QueryText = query;
+            Report = new Report(report ?? throw new ArgumentNullException(nameof(report)));
+            ReportOptions = report.ReportOptions();
+
+            var remaining = Option.ProcessArguments(StringExtensions.SplitArguments(query), Report);
+            Report.NormalizeOptions("register");
+
+            var args = new Value();
+            foreach (var arg in remaining)
+                args.PushBack(Value.StringValue(arg));
+            Report.ParseQueryArgs(args, "@Journal.query");
+        }
+
+        public Journal Journal { get; }
+        public string QueryText { get; }
+        public Report Report { get; }
+
+        /// <summary>
+        /// Handled options of the source report when the query was prepared
+        /// </summary>
+        public string ReportOptions { get; }
+
+        /// <summary>
+        /// Handled options of the current report; connectors can compare it with ReportOptions or use it as a part of cached query keys
+        /// </summary>
+        public static string CurrentReportOptions()
+        {
+            return (Scope.DefaultScope as Report)?.ReportOptions() ?? String.Empty;
+        }
+
+        public IEnumerable<Post> Execute()
+        {
+            if (Journal.HasXData())
+                throw new RuntimeError("Cannot have more than one active journal query");
+
+            var collectPosts = new CollectPosts();
+            try
+            {
+                Report.PostsReport(collectPosts);
+                return collectPosts.Posts;
+            }
+            finally
+            {
+                Journal.ClearXData();
+            }
+        }
+    }
+}
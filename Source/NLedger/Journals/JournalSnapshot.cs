@@ -0,0 +1,867 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Accounts;
+using NLedger.Amounts;
+using NLedger.Annotate;
+using NLedger.Commodities;
+using NLedger.Expressions;
+using NLedger.Items;
+using NLedger.Utility;
+using NLedger.Utility.BigValues;
+using NLedger.Values;
+using NLedger.Xacts;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Journals
+{
+    using BigInt = BigInt<BigRational>;
+
+    /// <summary>
+    /// Binary snapshot of a parsed journal. It keeps transactions, postings, accounts, commodities and price history
+    /// together with sizes and modification times of source files, so the journal can be restored without parsing
+    /// as long as the source files have not been changed.
+    /// </summary>
+    /// <remarks>
+    /// Automated and periodic transactions, account aliases and known payees and tags are stored as well,
+    /// so transactions added to the restored journal are processed the same way as in the original one.
+    /// Other parsing directives (payee and account mappings, tag checks, etc.) are not stored;
+    /// their effects are already applied to the stored items.
+    /// </remarks>
+    public static class JournalSnapshot
+    {
+        public const string Signature = "NLEDGER-JOURNAL-SNAPSHOT";
+        public const int Version = 3;
+
+        public static void Save(Journal journal, string fileName)
+        {
+            using (var stream = File.Create(fileName))
+                Save(journal, stream);
+        }
+
+        public static void Save(Journal journal, Stream stream)
+        {
+            if (journal == null)
+                throw new ArgumentNullException(nameof(journal));
+            if (stream == null)
+                throw new ArgumentNullException(nameof(stream));
+
+            using (var writer = new BinaryWriter(stream, Encoding.UTF8, true))
+                new SnapshotWriter(writer).WriteJournal(journal);
+        }
+
+        /// <summary>
+        /// Populates the journal with the content of the snapshot. The journal should be empty (e.g. after Session.CloseJournalFiles),
+        /// otherwise loaded transactions would be appended to existing ones.
+        /// Returns false (and leaves the journal untouched) if any of source files has been changed after the snapshot was saved.
+        /// </summary>
+        public static bool Load(Journal journal, string fileName, bool checkSources = true)
+        {
+            using (var stream = File.OpenRead(fileName))
+                return Load(journal, stream, checkSources);
+        }
+
+        public static bool Load(Journal journal, Stream stream, bool checkSources = true)
+        {
+            if (journal == null)
+                throw new ArgumentNullException(nameof(journal));
+            if (stream == null)
+                throw new ArgumentNullException(nameof(stream));
+            if (!IsEmpty(journal))
+                throw new InvalidOperationException("Journal snapshot can be loaded only into an empty journal");
+
+            using (var reader = new BinaryReader(stream, Encoding.UTF8, true))
+            {
+                var snapshotReader = new SnapshotReader(reader);
+                var sources = snapshotReader.ReadHeader();
+                if (checkSources && sources.Any(s => s.IsChanged()))
+                    return false;
+
+                snapshotReader.ReadJournal(journal, sources);
+                return true;
+            }
+        }
+
+        public static bool IsEmpty(Journal journal)
+        {
+            if (journal == null)
+                throw new ArgumentNullException(nameof(journal));
+
+            return !journal.Xacts.Any() && !journal.AutoXacts.Any() && !journal.PeriodXacts.Any() && !journal.Sources.Any();
+        }
+
+        /// <summary>
+        /// Returns the list of top-level source files the snapshot was created from
+        /// </summary>
+        public static IList<JournalFileInfo> GetSources(string fileName)
+        {
+            using (var stream = File.OpenRead(fileName))
+            using (var reader = new BinaryReader(stream, Encoding.UTF8, true))
+                return new SnapshotReader(reader).ReadHeader().Where(s => !s.IsIncluded).Select(s => s.FileInfo).ToList();
+        }
+
+        private class SnapshotSource
+        {
+            public SnapshotSource(JournalFileInfo fileInfo, bool isIncluded)
+            {
+                FileInfo = fileInfo;
+                IsIncluded = isIncluded;
+            }
+
+            public JournalFileInfo FileInfo { get; }
+            public bool IsIncluded { get; }
+
+            public bool IsChanged() => FileInfo.IsChanged();
+        }
+
+        private class SnapshotWriter
+        {
+            public SnapshotWriter(BinaryWriter writer)
+            {
+                Writer = writer;
+            }
+
+            public void WriteJournal(Journal journal)
+            {
+                Writer.Write(Signature);
+                Writer.Write(Version);
+
+                WriteSources(journal.Sources);
+                WriteSources(journal.IncludedSources);
+                WriteCommodities(CommodityPool.Current);
+                WritePrices(CommodityPool.Current.CommodityPriceHistory);
+                WriteAccounts(journal);
+
+                Writer.Write(journal.Xacts.Count);
+                foreach (var xact in journal.Xacts)
+                {
+                    WriteItem(xact);
+                    WriteString(xact.Code);
+                    WriteString(xact.Payee);
+                    WritePosts(xact.Posts);
+                }
+
+                Writer.Write(journal.PeriodXacts.Count);
+                foreach (var periodXact in journal.PeriodXacts)
+                {
+                    Writer.Write(periodXact.PeriodSting);
+                    WriteItem(periodXact);
+                    WritePosts(periodXact.Posts);
+                }
+
+                Writer.Write(journal.AutoXacts.Count);
+                foreach (var autoXact in journal.AutoXacts)
+                    WriteAutoXact(autoXact);
+
+                WriteStrings(journal.KnownPayees);
+                WriteStrings(journal.KnownTags);
+
+                Writer.Write(journal.AccountAliases.Count);
+                foreach (var alias in journal.AccountAliases)
+                {
+                    Writer.Write(alias.Key);
+                    Writer.Write(AccountIds[alias.Value]);
+                }
+            }
+
+            private void WriteAutoXact(AutoXact autoXact)
+            {
+                var predicate = autoXact.Predicate ?? Predicate.EmptyPredicate;
+                Writer.Write(predicate.IsEmpty ? String.Empty : predicate.Print());
+                Writer.Write(predicate.WhatToKeep.KeepPrice);
+                Writer.Write(predicate.WhatToKeep.KeepDate);
+                Writer.Write(predicate.WhatToKeep.KeepTag);
+                Writer.Write(predicate.WhatToKeep.OnlyActuals);
+                Writer.Write(autoXact.TryQuickMatch);
+
+                WriteItem(autoXact);
+                WritePosts(autoXact.Posts);
+
+                Writer.Write(autoXact.CheckExprs?.Count ?? 0);
+                if (autoXact.CheckExprs != null)
+                {
+                    foreach (var checkExpr in autoXact.CheckExprs)
+                    {
+                        Writer.Write(checkExpr.Expr.Text);
+                        Writer.Write((int)checkExpr.CheckExprKind);
+                    }
+                }
+
+                Writer.Write(autoXact.DeferredNotes?.Count ?? 0);
+                if (autoXact.DeferredNotes != null)
+                {
+                    foreach (var deferredNote in autoXact.DeferredNotes)
+                    {
+                        Writer.Write(deferredNote.TagData);
+                        Writer.Write(deferredNote.OverwriteExisting);
+                        Writer.Write(deferredNote.ApplyToPost != null ? autoXact.Posts.IndexOf(deferredNote.ApplyToPost) : -1);
+                    }
+                }
+            }
+
+            private void WriteStrings(ICollection<string> strings)
+            {
+                Writer.Write(strings.Count);
+                foreach (var str in strings)
+                    Writer.Write(str);
+            }
+
+            private void WriteSources(IList<JournalFileInfo> sources)
+            {
+                Writer.Write(sources.Count);
+                foreach (var source in sources)
+                {
+                    Writer.Write(source.FromStream);
+                    WriteString(source.FileName);
+                    Writer.Write(source.Size);
+                    Writer.Write(source.ModTime.ToBinary());
+                    WriteString(source.ParentFileName);
+                    WriteString(source.MasterAccount);
+                }
+            }
+
+            private void WriteCommodities(CommodityPool pool)
+            {
+                WriteString(pool.DefaultCommodity?.BaseSymbol);
+
+                var commodities = pool.Commodities.Where(kv => kv.Key == kv.Value.BaseSymbol).Select(kv => kv.Value).ToList();
+                Writer.Write(commodities.Count);
+                foreach (var commodity in commodities)
+                {
+                    Writer.Write(commodity.BaseSymbol);
+                    Writer.Write(commodity.Precision);
+                    Writer.Write((int)commodity.Flags);
+                    WriteString(commodity.Name);
+                    WriteString(commodity.Note);
+                    WriteExpr(commodity.ValueExpr);
+                    WriteAmount(commodity.Smaller);
+                    WriteAmount(commodity.Larger);
+                }
+
+                var aliases = pool.Commodities.Where(kv => kv.Key != kv.Value.BaseSymbol).ToList();
+                Writer.Write(aliases.Count);
+                foreach (var alias in aliases)
+                {
+                    Writer.Write(alias.Key);
+                    Writer.Write(alias.Value.BaseSymbol);
+                }
+            }
+
+            private void WritePrices(CommodityHistory history)
+            {
+                var prices = history.GetAllPrices().ToList();
+                Writer.Write(prices.Count);
+                foreach (var price in prices)
+                {
+                    Writer.Write(price.Item1.BaseSymbol);
+                    Writer.Write(price.Item2.ToBinary());
+                    WriteAmount(price.Item3);
+                }
+            }
+
+            private void WriteAccounts(Journal journal)
+            {
+                PostedAccounts = new HashSet<Post>();
+                WriteAccount(journal.Master);
+                Writer.Write(journal.Bucket != null ? AccountIds[journal.Bucket] : -1);
+            }
+
+            private void WriteAccount(Account account)
+            {
+                AccountIds.Add(account, AccountIds.Count);
+                foreach (var post in account.Posts)
+                    PostedAccounts.Add(post);
+
+                WriteString(account.Note);
+                Writer.Write(account.IsKnownAccount);
+                Writer.Write(account.IsTempAccount);
+                Writer.Write(account.IsGeneratedAccount);
+                WriteExpr(account.ValueExpr);
+
+                Writer.Write(account.Accounts.Count);
+                foreach (var child in account.Accounts.Values)
+                {
+                    Writer.Write(child.Name);
+                    WriteAccount(child);
+                }
+            }
+
+            private void WritePosts(IList<Post> posts)
+            {
+                Writer.Write(posts.Count);
+                foreach (var post in posts)
+                {
+                    WriteItem(post);
+                    Writer.Write(post.Account != null ? AccountIds[post.Account] : -1);
+                    Writer.Write(PostedAccounts.Contains(post));
+                    WriteAmount(post.Amount);
+                    WriteExpr(post.AmountExpr);
+                    WriteAmount(post.AssignedAmount);
+                    WriteAmount(post.Cost);
+                    WriteAmount(post.GivenCost);
+                    WriteDateTime(post.Checkin);
+                    WriteDateTime(post.Checkout);
+                }
+            }
+
+            private void WriteItem(Item item)
+            {
+                Writer.Write((int)item.Flags);
+                Writer.Write((int)item.State);
+                WriteDate(item.Date);
+                WriteDate(item.DateAux);
+                WriteString(item.Note);
+
+                Writer.Write(item.HasPos);
+                if (item.HasPos)
+                {
+                    WriteName(item.Pos.PathName);
+                    Writer.Write(item.Pos.BegPos);
+                    Writer.Write(item.Pos.BegLine);
+                    Writer.Write(item.Pos.EndPos);
+                    Writer.Write(item.Pos.EndLine);
+                    Writer.Write(item.Pos.Sequence);
+                }
+
+                var metadata = item.GetMetadata()?.ToList();
+                Writer.Write(metadata?.Count ?? 0);
+                if (metadata != null)
+                {
+                    foreach (var tag in metadata)
+                    {
+                        Writer.Write(tag.Key);
+                        Writer.Write(tag.Value.IsParsed);
+                        WriteValue(tag.Value.Value);
+                    }
+                }
+            }
+
+            private void WriteValue(Value value)
+            {
+                var type = Value.IsNullOrEmpty(value) ? ValueTypeEnum.Void : value.Type;
+                switch (type)
+                {
+                    case ValueTypeEnum.Void:
+                    case ValueTypeEnum.Boolean:
+                    case ValueTypeEnum.Integer:
+                    case ValueTypeEnum.Date:
+                    case ValueTypeEnum.DateTime:
+                    case ValueTypeEnum.Amount:
+                        break;
+                    default:
+                        type = ValueTypeEnum.String;    // Other types are stored as strings
+                        break;
+                }
+
+                Writer.Write((int)type);
+                switch (type)
+                {
+                    case ValueTypeEnum.Boolean: Writer.Write(value.AsBoolean); break;
+                    case ValueTypeEnum.Integer: Writer.Write(value.AsLong); break;
+                    case ValueTypeEnum.Date: Writer.Write(value.AsDate.Ticks); break;
+                    case ValueTypeEnum.DateTime: Writer.Write(value.AsDateTime.ToBinary()); break;
+                    case ValueTypeEnum.Amount: WriteAmount(value.AsAmount); break;
+                    case ValueTypeEnum.String: Writer.Write(value.AsString); break;
+                }
+            }
+
+            private void WriteAmount(Amount amount)
+            {
+                if (amount == null)
+                {
+                    Writer.Write((byte)AmountKind.Null);
+                    return;
+                }
+
+                if (!amount.Quantity.HasValue)
+                {
+                    Writer.Write((byte)AmountKind.Uninitialized);
+                    return;
+                }
+
+                Writer.Write((byte)AmountKind.Quantity);
+                Writer.Write(amount.Quantity.ToExactString());
+                Writer.Write(amount.Quantity.Precision);
+                Writer.Write(amount.Quantity.KeepPrecision);
+                WriteName(amount.HasCommodity ? amount.Commodity.BaseSymbol : null);
+
+                var annotation = amount.HasAnnotation ? amount.Annotation : null;
+                Writer.Write(annotation != null);
+                if (annotation != null)
+                {
+                    WriteAmount(annotation.Price);
+                    WriteDate(annotation.Date);
+                    WriteString(annotation.Tag);
+                    WriteExpr(annotation.ValueExpr);
+                    Writer.Write((int)GetAnnotationFlags(annotation));
+                }
+            }
+
+            private void WriteExpr(Expr expr)
+            {
+                WriteString(expr?.Text);
+            }
+
+            private void WriteDate(Date? date)
+            {
+                Writer.Write(date.HasValue);
+                if (date.HasValue)
+                    Writer.Write(date.Value.Ticks);
+            }
+
+            private void WriteDateTime(DateTime? dateTime)
+            {
+                Writer.Write(dateTime.HasValue);
+                if (dateTime.HasValue)
+                    Writer.Write(dateTime.Value.ToBinary());
+            }
+
+            private void WriteString(string str)
+            {
+                Writer.Write(str != null);
+                if (str != null)
+                    Writer.Write(str);
+            }
+
+            // Frequently repeated strings (file names, commodity symbols) are written once and then referenced by index
+            private void WriteName(string name)
+            {
+                if (name == null)
+                {
+                    Writer.Write(-1);
+                    return;
+                }
+
+                int id;
+                if (NameIds.TryGetValue(name, out id))
+                {
+                    Writer.Write(id);
+                }
+                else
+                {
+                    Writer.Write(NameIds.Count);
+                    Writer.Write(name);
+                    NameIds.Add(name, NameIds.Count);
+                }
+            }
+
+            private readonly BinaryWriter Writer;
+            private readonly IDictionary<string, int> NameIds = new Dictionary<string, int>();
+            private readonly IDictionary<Account, int> AccountIds = new Dictionary<Account, int>();
+            private ISet<Post> PostedAccounts;
+        }
+
+        private class SnapshotReader
+        {
+            public SnapshotReader(BinaryReader reader)
+            {
+                Reader = reader;
+            }
+
+            public IList<SnapshotSource> ReadHeader()
+            {
+                string signature;
+                try
+                {
+                    signature = Reader.ReadString();
+                }
+                catch (EndOfStreamException)
+                {
+                    signature = null;
+                }
+
+                if (signature != Signature)
+                    throw new InvalidOperationException("Not a journal snapshot");
+
+                var version = Reader.ReadInt32();
+                if (version != Version)
+                    throw new InvalidOperationException(String.Format("Unsupported journal snapshot version: {0}", version));
+
+                return ReadSources(false).Concat(ReadSources(true)).ToList();
+            }
+
+            public void ReadJournal(Journal journal, IList<SnapshotSource> sources)
+            {
+                var pool = CommodityPool.Current;
+
+                ReadCommodities(pool);
+                ReadPrices(pool);
+                ReadAccounts(journal);
+
+                var xactCount = Reader.ReadInt32();
+                for (int i = 0; i < xactCount; i++)
+                {
+                    var xact = new Xact();
+                    ReadItem(xact);
+                    xact.Code = ReadString();
+                    xact.Payee = ReadString();
+                    ReadPosts(xact);
+
+                    xact.Journal = journal;
+                    journal.Xacts.Add(xact);
+
+                    var uuid = xact.GetTag("UUID");
+                    if (!Value.IsNullOrEmpty(uuid) && !journal.ChecksumMapping.ContainsKey(uuid.AsString))
+                        journal.ChecksumMapping.Add(uuid.AsString, xact);
+                }
+
+                var periodXactCount = Reader.ReadInt32();
+                for (int i = 0; i < periodXactCount; i++)
+                {
+                    var periodXact = new PeriodXact(Reader.ReadString());
+                    ReadItem(periodXact);
+                    ReadPosts(periodXact);
+
+                    periodXact.Journal = journal;
+                    journal.PeriodXacts.Add(periodXact);
+                }
+
+                var autoXactCount = Reader.ReadInt32();
+                for (int i = 0; i < autoXactCount; i++)
+                {
+                    var autoXact = ReadAutoXact();
+                    autoXact.Journal = journal;
+                    journal.AutoXacts.Add(autoXact);
+                }
+
+                ReadStrings(journal.KnownPayees);
+                ReadStrings(journal.KnownTags);
+
+                var aliasCount = Reader.ReadInt32();
+                for (int i = 0; i < aliasCount; i++)
+                {
+                    var alias = Reader.ReadString();
+                    journal.AccountAliases[alias] = Accounts[Reader.ReadInt32()];
+                }
+
+                foreach (var source in sources)
+                    (source.IsIncluded ? journal.IncludedSources : journal.Sources).Add(source.FileInfo);
+
+                journal.IncrementGeneration();
+            }
+
+            private AutoXact ReadAutoXact()
+            {
+                var predicateText = Reader.ReadString();
+                var keeper = new AnnotationKeepDetails(Reader.ReadBoolean(), Reader.ReadBoolean(), Reader.ReadBoolean(), Reader.ReadBoolean());
+                var autoXact = new AutoXact(new Predicate(predicateText, keeper));
+                autoXact.TryQuickMatch = Reader.ReadBoolean();
+
+                ReadItem(autoXact);
+                ReadPosts(autoXact);
+
+                var checkExprCount = Reader.ReadInt32();
+                if (checkExprCount > 0)
+                {
+                    autoXact.CheckExprs = new List<CheckExprPair>();
+                    for (int i = 0; i < checkExprCount; i++)
+                    {
+                        var expr = new Expr(Reader.ReadString());
+                        autoXact.CheckExprs.Add(new CheckExprPair(expr, (CheckExprKindEnum)Reader.ReadInt32()));
+                    }
+                }
+
+                // Deferred notes are restored the same way the parser collects them: through the active posting
+                var deferredNoteCount = Reader.ReadInt32();
+                for (int i = 0; i < deferredNoteCount; i++)
+                {
+                    var tagData = Reader.ReadString();
+                    var overwriteExisting = Reader.ReadBoolean();
+                    var postIndex = Reader.ReadInt32();
+                    autoXact.ActivePost = postIndex >= 0 ? autoXact.Posts[postIndex] : null;
+                    autoXact.ParseTags(tagData, null, overwriteExisting);
+                }
+                autoXact.ActivePost = null;
+
+                return autoXact;
+            }
+
+            private void ReadStrings(ICollection<string> strings)
+            {
+                var count = Reader.ReadInt32();
+                for (int i = 0; i < count; i++)
+                    strings.Add(Reader.ReadString());
+            }
+
+            private IEnumerable<SnapshotSource> ReadSources(bool isIncluded)
+            {
+                var sources = new List<SnapshotSource>();
+                var count = Reader.ReadInt32();
+                for (int i = 0; i < count; i++)
+                {
+                    var fromStream = Reader.ReadBoolean();
+                    var fileName = ReadString();
+                    var size = Reader.ReadInt64();
+                    var modTime = DateTime.FromBinary(Reader.ReadInt64());
+                    var fileInfo = fromStream ? new JournalFileInfo() : new JournalFileInfo(fileName, size, modTime);
+                    fileInfo.ParentFileName = ReadString();
+                    fileInfo.MasterAccount = ReadString();
+                    sources.Add(new SnapshotSource(fileInfo, isIncluded));
+                }
+                return sources;
+            }
+
+            private void ReadCommodities(CommodityPool pool)
+            {
+                var defaultCommodity = ReadString();
+                if (defaultCommodity != null)
+                    pool.DefaultCommodity = pool.FindOrCreate(defaultCommodity);
+
+                var count = Reader.ReadInt32();
+                for (int i = 0; i < count; i++)
+                {
+                    var commodity = pool.FindOrCreate(Reader.ReadString());
+                    commodity.Precision = Reader.ReadInt32();
+                    commodity.Flags = (CommodityFlagsEnum)Reader.ReadInt32();
+                    commodity.Base.Name = ReadString();
+                    commodity.Base.Note = ReadString();
+                    commodity.ValueExpr = ReadExpr() ?? commodity.ValueExpr;
+                    commodity.Smaller = ReadAmount();
+                    commodity.Larger = ReadAmount();
+                }
+
+                var aliasCount = Reader.ReadInt32();
+                for (int i = 0; i < aliasCount; i++)
+                {
+                    var alias = Reader.ReadString();
+                    var referent = pool.FindOrCreate(Reader.ReadString());
+                    if (pool.Find(alias) == null)
+                        pool.Alias(alias, referent);
+                }
+            }
+
+            private void ReadPrices(CommodityPool pool)
+            {
+                var count = Reader.ReadInt32();
+                for (int i = 0; i < count; i++)
+                {
+                    var source = pool.FindOrCreate(Reader.ReadString());
+                    var moment = DateTime.FromBinary(Reader.ReadInt64());
+                    var price = ReadAmount();
+                    pool.CommodityPriceHistory.AddPrice(source, moment, price);
+                    source.Base.PriceMap.Clear();
+                }
+            }
+
+            private void ReadAccounts(Journal journal)
+            {
+                ReadAccount(journal.Master);
+                var bucketId = Reader.ReadInt32();
+                if (bucketId >= 0)
+                    journal.Bucket = Accounts[bucketId];
+            }
+
+            private void ReadAccount(Account account)
+            {
+                Accounts.Add(account);
+
+                account.Note = ReadString() ?? account.Note;
+                account.IsKnownAccount |= Reader.ReadBoolean();
+                account.IsTempAccount = Reader.ReadBoolean();
+                account.IsGeneratedAccount = Reader.ReadBoolean();
+                account.ValueExpr = ReadExpr() ?? account.ValueExpr;
+
+                var count = Reader.ReadInt32();
+                for (int i = 0; i < count; i++)
+                {
+                    var name = Reader.ReadString();
+                    Account child;
+                    if (!account.Accounts.TryGetValue(name, out child))
+                    {
+                        child = new Account(account, name);
+                        account.AddAccount(child);
+                    }
+                    ReadAccount(child);
+                }
+            }
+
+            private void ReadPosts(XactBase xact)
+            {
+                var count = Reader.ReadInt32();
+                for (int i = 0; i < count; i++)
+                {
+                    var post = new Post();
+                    ReadItem(post);
+
+                    var accountId = Reader.ReadInt32();
+                    post.Account = accountId >= 0 ? Accounts[accountId] : null;
+                    var isPosted = Reader.ReadBoolean();
+
+                    post.Amount = ReadAmount();
+                    post.AmountExpr = ReadExpr();
+                    post.AssignedAmount = ReadAmount();
+                    post.Cost = ReadAmount();
+                    post.GivenCost = ReadAmount();
+                    post.Checkin = ReadDateTime();
+                    post.Checkout = ReadDateTime();
+
+                    xact.AddPost(post);
+                    if (isPosted)
+                        post.Account.AddPost(post);
+                }
+            }
+
+            private void ReadItem(Item item)
+            {
+                item.Flags = (SupportsFlagsEnum)Reader.ReadInt32();
+                item.State = (ItemStateEnum)Reader.ReadInt32();
+                item.Date = ReadDate();
+                item.DateAux = ReadDate();
+                item.Note = ReadString();
+
+                if (Reader.ReadBoolean())
+                {
+                    item.Pos.PathName = ReadName();
+                    item.Pos.BegPos = Reader.ReadInt64();
+                    item.Pos.BegLine = Reader.ReadInt32();
+                    item.Pos.EndPos = Reader.ReadInt32();
+                    item.Pos.EndLine = Reader.ReadInt32();
+                    item.Pos.Sequence = Reader.ReadInt32();
+                }
+
+                var tagCount = Reader.ReadInt32();
+                for (int i = 0; i < tagCount; i++)
+                {
+                    var tag = Reader.ReadString();
+                    var isParsed = Reader.ReadBoolean();
+                    item.SetTag(tag, ReadValue(), true, isParsed);
+                }
+            }
+
+            private Value ReadValue()
+            {
+                switch ((ValueTypeEnum)Reader.ReadInt32())
+                {
+                    case ValueTypeEnum.Boolean: return Value.Get(Reader.ReadBoolean());
+                    case ValueTypeEnum.Integer: return Value.Get(Reader.ReadInt64());
+                    case ValueTypeEnum.Date: return Value.Get((Date)new DateTime(Reader.ReadInt64()));
+                    case ValueTypeEnum.DateTime: return Value.Get(DateTime.FromBinary(Reader.ReadInt64()));
+                    case ValueTypeEnum.Amount: return Value.Get(ReadAmount());
+                    case ValueTypeEnum.String: return Value.StringValue(Reader.ReadString());
+                    default: return new Value();
+                }
+            }
+
+            private Amount ReadAmount()
+            {
+                switch ((AmountKind)Reader.ReadByte())
+                {
+                    case AmountKind.Null:
+                        return null;
+                    case AmountKind.Uninitialized:
+                        return new Amount();
+                }
+
+                var quantityText = Reader.ReadString();
+                var precision = Reader.ReadInt32();
+                var keepPrecision = Reader.ReadBoolean();
+                var quantity = BigInt.ParseExact(quantityText, precision, keepPrecision);
+
+                var symbol = ReadName();
+                Annotation annotation = null;
+                if (Reader.ReadBoolean())
+                {
+                    annotation = new Annotation(ReadAmount(), ReadDate(), ReadString());
+                    annotation.ValueExpr = ReadExpr();
+                    SetAnnotationFlags(annotation, (AnnotationFlags)Reader.ReadInt32());
+                }
+
+                if (symbol == null)
+                    return new Amount(quantity, null);
+
+                var commodity = annotation != null
+                    ? CommodityPool.Current.FindOrCreate(symbol, annotation)
+                    : CommodityPool.Current.FindOrCreate(symbol);
+                return new Amount(quantity, commodity);
+            }
+
+            private Expr ReadExpr()
+            {
+                var text = ReadString();
+                return text != null ? new Expr(text) : null;
+            }
+
+            private Date? ReadDate()
+            {
+                return Reader.ReadBoolean() ? (Date)new DateTime(Reader.ReadInt64()) : (Date?)null;
+            }
+
+            private DateTime? ReadDateTime()
+            {
+                return Reader.ReadBoolean() ? DateTime.FromBinary(Reader.ReadInt64()) : (DateTime?)null;
+            }
+
+            private string ReadString()
+            {
+                return Reader.ReadBoolean() ? Reader.ReadString() : null;
+            }
+
+            private string ReadName()
+            {
+                var id = Reader.ReadInt32();
+                if (id < 0)
+                    return null;
+
+                if (id == Names.Count)
+                    Names.Add(Reader.ReadString());
+
+                return Names[id];
+            }
+
+            private readonly BinaryReader Reader;
+            private readonly IList<string> Names = new List<string>();
+            private readonly IList<Account> Accounts = new List<Account>();
+        }
+
+        private enum AmountKind : byte
+        {
+            Null,
+            Uninitialized,
+            Quantity
+        }
+
+        [Flags]
+        private enum AnnotationFlags
+        {
+            None = 0x00,
+            PriceNotPerUnit = 0x01,
+            PriceFixated = 0x02,
+            PriceCalculated = 0x04,
+            DateCalculated = 0x08,
+            TagCalculated = 0x10,
+            ValueExprCalculated = 0x20
+        }
+
+        private static AnnotationFlags GetAnnotationFlags(Annotation annotation)
+        {
+            var flags = AnnotationFlags.None;
+            if (annotation.IsPriceNotPerUnit) flags |= AnnotationFlags.PriceNotPerUnit;
+            if (annotation.IsPriceFixated) flags |= AnnotationFlags.PriceFixated;
+            if (annotation.IsPriceCalculated) flags |= AnnotationFlags.PriceCalculated;
+            if (annotation.IsDateCalculated) flags |= AnnotationFlags.DateCalculated;
+            if (annotation.IsTagCalculated) flags |= AnnotationFlags.TagCalculated;
+            if (annotation.IsValueExprCalculated) flags |= AnnotationFlags.ValueExprCalculated;
+            return flags;
+        }
+
+        private static void SetAnnotationFlags(Annotation annotation, AnnotationFlags flags)
+        {
+            annotation.IsPriceNotPerUnit = flags.HasFlag(AnnotationFlags.PriceNotPerUnit);
+            annotation.IsPriceFixated = flags.HasFlag(AnnotationFlags.PriceFixated);
+            annotation.IsPriceCalculated = flags.HasFlag(AnnotationFlags.PriceCalculated);
+            annotation.IsDateCalculated = flags.HasFlag(AnnotationFlags.DateCalculated);
+            annotation.IsTagCalculated = flags.HasFlag(AnnotationFlags.TagCalculated);
+            annotation.IsValueExprCalculated = flags.HasFlag(AnnotationFlags.ValueExprCalculated);
+        }
+    }
+}
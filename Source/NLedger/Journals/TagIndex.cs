@@ -0,0 +1,189 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Items;
+using NLedger.Xacts;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Journals
+{
+    /// <summary>
+    /// Index of journal metadata: tag name => tag value => transactions and postings that have this tag.
+    /// It answers questions like "all postings with tag Receipt" or "all values of tag Project" without checking every journal item.
+    /// Tag names are case-insensitive (like item metadata); values are compared by their text representation.
+    /// </summary>
+    /// <remarks>
+    /// NLedger extension. The journal builds the index on first request and updates it when transactions are added or removed;
+    /// other changes of the journal content cause rebuilding the index on the next request. Changes of metadata of items
+    /// that are already in the journal are not tracked, so Rebuild should be called after them.
+    /// </remarks>
+    public class TagIndex
+    {
+        public TagIndex(Journal journal)
+        {
+            Journal = journal ?? throw new ArgumentNullException(nameof(journal));
+            Rebuild();
+        }
+
+        public Journal Journal { get; }
+
+        /// <summary>
+        /// Journal generation that the index corresponds to
+        /// </summary>
+        public long Generation { get; private set; }
+
+        public IEnumerable<string> Tags => Index.Keys.OrderBy(tag => tag, StringComparer.InvariantCultureIgnoreCase).ToList();
+
+        public void Rebuild()
+        {
+            Index.Clear();
+            foreach (var xact in Journal.Xacts)
+                AddItems(xact);
+            Generation = Journal.Generation;
+        }
+
+        public bool HasTag(string tag)
+        {
+            return Index.ContainsKey(tag ?? throw new ArgumentNullException(nameof(tag)));
+        }
+
+        /// <summary>
+        /// Returns distinct values of the tag (an empty string stands for tags without values)
+        /// </summary>
+        public IEnumerable<string> GetValues(string tag)
+        {
+            return GetTagValues(tag).Keys.ToList();
+        }
+
+        /// <summary>
+        /// Returns transactions that have the tag (with a value that matches the mask if it is specified)
+        /// </summary>
+        public IEnumerable<Xact> GetXacts(string tag, Mask valueMask = null)
+        {
+            return GetEntries(tag, valueMask).SelectMany(entry => entry.Xacts).Distinct().ToList();
+        }
+
+        /// <summary>
+        /// Returns postings that have the tag (with a value that matches the mask if it is specified).
+        /// If inherit is true, postings of tagged transactions are included (the same as Post.HasTag does).
+        /// </summary>
+        public IEnumerable<Post> GetPosts(string tag, Mask valueMask = null, bool inherit = true)
+        {
+            var entries = GetEntries(tag, valueMask).ToList();
+            var posts = entries.SelectMany(entry => entry.Posts);
+            if (inherit)
+                posts = posts.Concat(entries.SelectMany(entry => entry.Xacts).SelectMany(xact => xact.Posts));
+            return posts.Distinct().ToList();
+        }
+
+        internal void AddXact(Xact xact)
+        {
+            AddItems(xact);
+            Generation = Journal.Generation;
+        }
+
+        internal void RemoveXact(Xact xact)
+        {
+            RemoveItem(xact);
+            foreach (var post in xact.Posts)
+                RemoveItem(post);
+            Generation = Journal.Generation;
+        }
+
+        private void AddItems(Xact xact)
+        {
+            AddItem(xact);
+            foreach (var post in xact.Posts)
+                AddItem(post);
+        }
+
+        private void AddItem(Item item)
+        {
+            var metadata = item.GetMetadata();
+            if (metadata == null)
+                return;
+
+            foreach (var tag in metadata)
+            {
+                Dictionary<string, TagEntries> values;
+                if (!Index.TryGetValue(tag.Key, out values))
+                    Index.Add(tag.Key, values = new Dictionary<string, TagEntries>());
+
+                var value = GetValueKey(tag.Value);
+                TagEntries entries;
+                if (!values.TryGetValue(value, out entries))
+                    values.Add(value, entries = new TagEntries());
+
+                if (item is Post post)
+                    entries.Posts.Add(post);
+                else if (item is Xact xact)
+                    entries.Xacts.Add(xact);
+            }
+        }
+
+        private void RemoveItem(Item item)
+        {
+            var metadata = item.GetMetadata();
+            if (metadata == null)
+                return;
+
+            foreach (var tag in metadata)
+            {
+                Dictionary<string, TagEntries> values;
+                TagEntries entries;
+                var value = GetValueKey(tag.Value);
+                if (!Index.TryGetValue(tag.Key, out values) || !values.TryGetValue(value, out entries))
+                    continue;
+
+                if (item is Post post)
+                    entries.Posts.Remove(post);
+                else if (item is Xact xact)
+                    entries.Xacts.Remove(xact);
+
+                if (entries.IsEmpty)
+                {
+                    values.Remove(value);
+                    if (values.Count == 0)
+                        Index.Remove(tag.Key);
+                }
+            }
+        }
+
+        private IDictionary<string, TagEntries> GetTagValues(string tag)
+        {
+            Dictionary<string, TagEntries> values;
+            return Index.TryGetValue(tag ?? throw new ArgumentNullException(nameof(tag)), out values) ? values : EmptyValues;
+        }
+
+        private IEnumerable<TagEntries> GetEntries(string tag, Mask valueMask)
+        {
+            var values = GetTagValues(tag);
+            return valueMask == null ? values.Values : values.Where(kv => valueMask.Match(kv.Key)).Select(kv => kv.Value);
+        }
+
+        // Values are matched by their text representation (see Item.HasTag)
+        private static string GetValueKey(ItemTag itemTag)
+        {
+            return itemTag.Value?.ToString() ?? String.Empty;
+        }
+
+        private class TagEntries
+        {
+            public List<Xact> Xacts { get; } = new List<Xact>();
+            public List<Post> Posts { get; } = new List<Post>();
+            public bool IsEmpty => Xacts.Count == 0 && Posts.Count == 0;
+        }
+
+        private static readonly IDictionary<string, TagEntries> EmptyValues = new Dictionary<string, TagEntries>();
+        private readonly IDictionary<string, Dictionary<string, TagEntries>> Index = new Dictionary<string, Dictionary<string, TagEntries>>(StringComparer.InvariantCultureIgnoreCase);
+    }
+}
@@ -168,6 +168,12 @@ namespace NLedger
             return new ThreadAcquirer(this);
         }
 
+        // Makes this context current for the calling thread until the returned object is disposed (then the previous context is restored)
+        public ThreadSwitcher EnterCurrentThread()
+        {
+            return new ThreadSwitcher(this);
+        }
+
         public MainApplicationContext Clone(IApplicationServiceProvider applicationServiceProvider = null)
         {
             var context = new MainApplicationContext(applicationServiceProvider ?? _ApplicationServiceProvider);
@@ -210,6 +216,25 @@ namespace NLedger
             }
         }
 
+        public class ThreadSwitcher : IDisposable
+        {
+            public ThreadSwitcher(MainApplicationContext context)
+            {
+                if (context == null)
+                    throw new ArgumentNullException(nameof(context));
+
+                PreviousInstance = CurrentInstance;
+                CurrentInstance = context;
+            }
+
+            public void Dispose()
+            {
+                CurrentInstance = PreviousInstance;
+            }
+
+            private readonly MainApplicationContext PreviousInstance;
+        }
+
         [ThreadStatic]
         private static MainApplicationContext CurrentInstance;
         private static readonly IDictionary<string, string> Empty = new Dictionary<string, string>();
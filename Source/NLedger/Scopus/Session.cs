@@ -190,34 +190,29 @@ namespace NLedger.Scopus
                 ParsingContext.Pop();
             }
 
+            // [DM] Several journal files can be parsed in parallel (NLedger extension; see Journal.ParallelParsing)
+            ParallelParser parallelParser = Journal.ParallelParsing && FileHandler.DataFiles.Count > 1 ? new ParallelParser(Journal) : null;
+            Action<string, Account> readFile = (pathName, master) => xactCount += ReadDataFile(pathName, master);
+            Action<string, Account, int, int> mergedFile = (pathName, master, count, sequence) =>
+            {
+                if (count > 0)
+                    Journal.Sources.Add(new JournalFileInfo(pathName));
+                xactCount += count;
+            };
+
             foreach(string pathName in FileHandler.DataFiles)
             {
-                if (pathName == "-" || FileSystem.IsStdIn(pathName)) // (pathname == "-" || pathname == "/dev/stdin")
+                if (pathName == "-" || FileSystem.IsStdIn(pathName) || parallelParser == null)
                 {
-                    // To avoid problems with stdin and pipes, etc., we read the entire
-                    // file in beforehand into a memory buffer, and then parcel it out
-                    // from there.
-                    ParsingContext.Push(new TextualReader(FileSystem.GetStdInAsStreamReader()));
+                    parallelParser?.Complete(readFile, mergedFile);
+                    readFile(pathName, acct);
                 }
                 else
                 {
-                    ParsingContext.Push(pathName);
-                }
-
-                ParsingContext.GetCurrent().Journal = Journal;
-                ParsingContext.GetCurrent().Master = acct;
-
-                try
-                {
-                    xactCount += Journal.Read(ParsingContext);
-                }
-                catch
-                {
-                    ParsingContext.Pop();
-                    throw;
+                    parallelParser.Add(pathName, acct);
                 }
-                ParsingContext.Pop();
             }
+            parallelParser?.Complete(readFile, mergedFile);
 
             Logger.Current.Debug("ledger.read", () => String.Format("xact_count [{0}] == journal->xacts.size() [{1}]", xactCount, Journal.Xacts.Count));
             if (xactCount != Journal.Xacts.Count)
@@ -231,6 +226,38 @@ namespace NLedger.Scopus
             return Journal.Xacts.Count();
         }
 
+        private int ReadDataFile(string pathName, Account acct)
+        {
+            if (pathName == "-" || FileSystem.IsStdIn(pathName)) // (pathname == "-" || pathname == "/dev/stdin")
+            {
+                // To avoid problems with stdin and pipes, etc., we read the entire
+                // file in beforehand into a memory buffer, and then parcel it out
+                // from there.
+                ParsingContext.Push(new TextualReader(FileSystem.GetStdInAsStreamReader()));
+            }
+            else
+            {
+                ParsingContext.Push(pathName);
+            }
+
+            ParsingContext.GetCurrent().Journal = Journal;
+            ParsingContext.GetCurrent().Master = acct;
+
+            int xactCount;
+            try
+            {
+                xactCount = Journal.Read(ParsingContext);
+            }
+            catch
+            {
+                ParsingContext.Pop();
+                throw;
+            }
+            ParsingContext.Pop();
+
+            return xactCount;
+        }
+
         /// <summary>
         /// Ported from journal_t * session_t::read_journal_files
         /// </summary>
@@ -54,6 +54,14 @@ namespace NLedger.Textual
                 return Parent != null ? Parent.GetApplication<T>() : default(T);
         }
 
+        /// <summary>
+        /// Checks whether all applications in this stack and its parents have the given type
+        /// </summary>
+        public bool ContainsOnly<T>()
+        {
+            return Items.All(item => item.Item2 is T) && (Parent == null || Parent.ContainsOnly<T>());
+        }
+
         public void PushFront<T>(string key, T value)
         {
             Items.Push(new Tuple<string, object>(key, value));
@@ -0,0 +1,482 @@
+﻿// **********************************************************************************
+// Copyright (c) 2015-2023, Dmitry Merzlyakov.  All rights reserved.
+// Licensed under the FreeBSD Public License. See LICENSE file included with the distribution for details and disclaimer.
+// 
+// This file is part of NLedger that is a .Net port of C++ Ledger tool (ledger-cli.org). Original code is licensed under:
+// Copyright (c) 2003-2023, John Wiegley.  All rights reserved.
+// See LICENSE.LEDGER file included with the distribution for details and disclaimer.
+// **********************************************************************************
+using NLedger.Abstracts.Impl;
+using NLedger.Accounts;
+using NLedger.Amounts;
+using NLedger.Annotate;
+using NLedger.Commodities;
+using NLedger.Journals;
+using NLedger.Scopus;
+using NLedger.Utility;
+using NLedger.Utils;
+using NLedger.Xacts;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace NLedger.Textual
+{
+    /// <summary>
+    /// Parses independent journal files on thread pool threads and merges parsed transactions into the journal in the order the files were added.
+    /// </summary>
+    /// <remarks>
+    /// NLedger extension (see Journal.ParallelParsing). A file is independent if it contains only transactions, price directives and comments
+    /// (see IsIndependentFile), so the result of parsing does not depend on the files parsed before it - excepting the state of the journal
+    /// that is created by preceding directives (commodities, account aliases, the default account etc). Every file is parsed in its own
+    /// application context with a copy of that state; parsed transactions, commodities and prices are moved to the journal on the calling thread.
+    /// Files that are not independent or cannot be parsed without errors are returned to the caller, so it parses them in the usual way
+    /// (and reports errors in the usual way); files that follow such a file are parsed again because the file could change the state of the journal.
+    /// </remarks>
+    public sealed class ParallelParser
+    {
+        /// <summary>
+        /// Number of processors that parallel parsing can use. Copying the journal state and merging parsed files costs about 10-15%
+        /// of the sequential parsing time, so files are parsed in parallel only if there is more than one processor.
+        /// </summary>
+        public static int ProcessorCount { get; set; } = Environment.ProcessorCount;
+
+        /// <summary>
+        /// Checks whether the current state of the journal allows parsing files in parallel.
+        /// Strict checks, automated transactions and tag checks make the result of parsing depend on the rest of the journal.
+        /// </summary>
+        public static bool IsApplicable(Journal journal)
+        {
+            if (journal == null)
+                throw new ArgumentNullException(nameof(journal));
+
+            return journal.ParallelParsing && ProcessorCount > 1 &&
+                journal.CheckingStyle != JournalCheckingStyleEnum.CHECK_WARNING && journal.CheckingStyle != JournalCheckingStyleEnum.CHECK_ERROR &&
+                !journal.AutoXacts.Any() && !journal.TagCheckExprsMap.Any();
+        }
+
+        /// <summary>
+        /// Checks whether a file contains only transactions, price directives and comments. Postings should not have balance assignments,
+        /// value expressions, deferred accounts or inline checks; metadata should not have typed (evaluated) values or UUID tags.
+        /// </summary>
+        public static bool IsIndependentFile(TextReader reader)
+        {
+            if (reader == null)
+                throw new ArgumentNullException(nameof(reader));
+
+            string line;
+            while ((line = reader.ReadLine()) != null)
+            {
+                if (line.Length == 0)
+                    continue;
+
+                if (line.Contains("::") || line.Contains(TextualParser.UUIDTag))
+                    return false;
+
+                char firstChar = line[0];
+                if (firstChar.IsCommentChar() || Char.IsDigit(firstChar) || firstChar == 'P')
+                    continue;
+
+                if (!Char.IsWhiteSpace(firstChar))
+                    return false;
+
+                line = line.Trim();
+                if (line.Length == 0 || line[0] == ';')
+                    continue;
+
+                if (line.StartsWith(TextualParser.AssertToken) || line.StartsWith(TextualParser.CheckToken) || line.StartsWith(TextualParser.ExprToken))
+                    return false;
+
+                int pos = line.IndexOf(';');
+                if (pos >= 0)
+                    line = line.Substring(0, pos);
+
+                string amount = StringExtensions.NextElement(ref line, true);
+                line = line.TrimStart('*', '!', ' ', '\t');
+                if (line.StartsWith("<") || (amount != null && (amount.IndexOf('(') >= 0 || amount.IndexOf('=') >= 0)))
+                    return false;
+            }
+
+            return true;
+        }
+
+        public ParallelParser(Journal journal)
+        {
+            if (journal == null)
+                throw new ArgumentNullException(nameof(journal));
+
+            Journal = journal;
+        }
+
+        public Journal Journal { get; private set; }
+
+        public bool HasPendingFiles
+        {
+            get { return PendingFiles.Any(); }
+        }
+
+        /// <summary>
+        /// Starts parsing a file on a thread pool thread. The master account is the account that 'include' applies to the file.
+        /// </summary>
+        public void Add(string pathName, Account master)
+        {
+            if (String.IsNullOrEmpty(pathName))
+                throw new ArgumentNullException(nameof(pathName));
+            if (master == null)
+                throw new ArgumentNullException(nameof(master));
+
+            var file = new PendingFile() { PathName = pathName, Master = master };
+            if (IsApplicable(Journal))
+            {
+                file.Context = CreateContext(file);
+                file.Task = Task.Run(() => ParseFile(file));
+            }
+            PendingFiles.Add(file);
+        }
+
+        /// <summary>
+        /// Completes pending files in the order they were added. Parsed files are merged into the journal and passed to mergedFile
+        /// (with the path name of the parsed file, the master account, the number of added transactions and the number of parsed items);
+        /// other files are passed to parseFile, so the caller parses them in the usual way.
+        /// </summary>
+        public void Complete(Action<string, Account> parseFile, Action<string, Account, int, int> mergedFile)
+        {
+            if (parseFile == null)
+                throw new ArgumentNullException(nameof(parseFile));
+            if (mergedFile == null)
+                throw new ArgumentNullException(nameof(mergedFile));
+
+            while (PendingFiles.Any())
+            {
+                var file = PendingFiles.First();
+                PendingFiles.RemoveAt(0);
+
+                var result = WaitFor(file);
+                if (result != null)
+                {
+                    Merge(result);
+                    mergedFile(result.PathName, file.Master, result.Count, result.Sequence);
+                }
+                else
+                {
+                    parseFile(file.PathName, file.Master);
+
+                    // The file could change the journal (e.g. declare aliases), so files that were started before are parsed again
+                    var restarted = PendingFiles.ToList();
+                    PendingFiles.Clear();
+                    foreach (var pendingFile in restarted)
+                    {
+                        Interrupt(pendingFile);
+                        Add(pendingFile.PathName, pendingFile.Master);
+                    }
+                }
+            }
+        }
+
+        private ParseResult WaitFor(PendingFile file)
+        {
+            if (file.Task == null)
+                return null;
+
+            while (!file.Task.Wait(CancellationCheckInterval))
+            {
+                if (CancellationManager.IsCancellationRequested)
+                {
+                    Interrupt(file);
+                    foreach (var pendingFile in PendingFiles)
+                        Interrupt(pendingFile);
+                    PendingFiles.Clear();
+
+                    CancellationManager.CheckForSignal();
+                }
+            }
+
+            return file.Task.Result;
+        }
+
+        private static void Interrupt(PendingFile file)
+        {
+            if (file.Context != null)
+                file.Context.CancellationSignal = CaughtSignalEnum.INTERRUPTED;
+        }
+
+        // Creates an application context for a worker thread with a copy of the journal state. It is called on the thread that owns the journal.
+        private MainApplicationContext CreateContext(PendingFile file)
+        {
+            var currentContext = MainApplicationContext.Current;
+            var services = currentContext.ApplicationServiceProvider;
+            file.Errors = new StringWriter();
+
+            var context = currentContext.Clone(new ApplicationServiceProvider(
+                quoteProviderFactory: () => services.QuoteProvider,
+                processManagerFactory: () => services.ProcessManager,
+                manPageProviderFactory: () => services.ManPageProvider,
+                virtualConsoleProviderFactory: () => new VirtualConsoleProvider(TextReader.Null, file.Errors, file.Errors),
+                fileSystemProviderFactory: () => services.FileSystemProvider,
+                pagerProviderFactory: () => services.PagerProvider,
+                extensionProviderFactory: () => services.ExtensionProvider));
+
+            context.TimesCommon = currentContext.TimesCommon.Clone();
+            context.Logger = new Logger();
+            context.ErrorContext = new ErrorContext();
+            context.CancellationSignal = CaughtSignalEnum.NONE_CAUGHT;
+            context.DefaultScope = null;    // Scopes of the session cannot be used concurrently; independent files do not evaluate expressions
+
+            using (context.EnterCurrentThread())
+            {
+                context.CommodityPool = CopyCommodityPool(currentContext.CommodityPool);
+                file.Journal = CopyJournal(Journal);
+                file.WorkerMaster = FindAccount(file.Journal.Master, file.Master);
+            }
+
+            return context;
+        }
+
+        private static CommodityPool CopyCommodityPool(CommodityPool source)
+        {
+            var pool = new CommodityPool() { KeepBase = source.KeepBase };
+            var commodities = new Dictionary<Commodity, Commodity>();
+
+            foreach (var pair in source.Commodities.Where(kv => kv.Key == kv.Value.BaseSymbol))
+            {
+                var commodity = pool.Find(pair.Key) ?? pool.Create(pair.Key);
+                commodity.Flags = pair.Value.Flags;
+                commodity.Precision = pair.Value.Precision;
+                commodities[pair.Value] = commodity;
+            }
+
+            // Commodity conversions (e.g. time units) are applied to parsed amounts
+            foreach (var pair in commodities)
+            {
+                pair.Value.Smaller = CopyAmount(pair.Key.Smaller, commodities);
+                pair.Value.Larger = CopyAmount(pair.Key.Larger, commodities);
+            }
+
+            foreach (var pair in source.Commodities.Where(kv => kv.Key != kv.Value.BaseSymbol))
+                pool.Alias(pair.Key, commodities[pair.Value]);
+
+            if (source.DefaultCommodity != null)
+                pool.DefaultCommodity = commodities[source.DefaultCommodity.Referent];
+
+            return pool;
+        }
+
+        private static Amount CopyAmount(Amount amount, IDictionary<Commodity, Commodity> commodities)
+        {
+            Commodity commodity;
+            if (amount == null || amount.Commodity == null || !commodities.TryGetValue(amount.Commodity, out commodity))
+                return amount;
+
+            return new Amount(amount.Quantity, commodity);
+        }
+
+        private static Journal CopyJournal(Journal source)
+        {
+            var journal = new Journal()
+            {
+                CheckingStyle = source.CheckingStyle,
+                NoAliases = source.NoAliases,
+                RecursiveAliases = source.RecursiveAliases,
+                DayBreak = source.DayBreak,
+                CheckPayees = source.CheckPayees
+            };
+
+            foreach (var alias in source.AccountAliases)
+                journal.AccountAliases[alias.Key] = FindAccount(journal.Master, alias.Value);
+
+            foreach (var mapping in source.PayeesForUnknownAccounts)
+                journal.PayeesForUnknownAccounts.Add(new Tuple<Mask, Account>(mapping.Item1, FindAccount(journal.Master, mapping.Item2)));
+
+            foreach (var mapping in source.PayeeAliasMappings)
+                journal.PayeeAliasMappings.Add(mapping);
+
+            if (source.Bucket != null)
+                journal.Bucket = FindAccount(journal.Master, source.Bucket);
+
+            return journal;
+        }
+
+        private static Account FindAccount(Account master, Account account)
+        {
+            return account.Parent == null ? master : master.FindAccount(account.FullName);
+        }
+
+        // Parses a file on a worker thread. Returns null if the file is not independent or has errors.
+        private static ParseResult ParseFile(PendingFile file)
+        {
+            using (file.Context.EnterCurrentThread())
+            {
+                try
+                {
+                    var contextStack = new ParseContextStack();
+                    contextStack.Push(file.PathName);
+                    try
+                    {
+                        var parseContext = contextStack.GetCurrent();
+                        using (var reader = FileSystem.GetStreamReader(parseContext.PathName))
+                        {
+                            if (!IsIndependentFile(reader))
+                                return null;
+                        }
+
+                        parseContext.Journal = file.Journal;
+                        parseContext.Master = file.WorkerMaster;
+                        parseContext.Scope = new EmptyScope();
+
+                        var count = file.Journal.Read(contextStack);
+                        if (file.Errors.GetStringBuilder().Length > 0)
+                            return null;
+
+                        return new ParseResult()
+                        {
+                            PathName = parseContext.PathName,
+                            Journal = file.Journal,
+                            CommodityPool = file.Context.CommodityPool,
+                            Count = count,
+                            Sequence = parseContext.Sequence
+                        };
+                    }
+                    finally
+                    {
+                        contextStack.Pop();
+                    }
+                }
+                catch
+                {
+                    return null;
+                }
+            }
+        }
+
+        // Moves commodities, prices and transactions of a parsed file to the journal. It is called on the thread that owns the journal.
+        private void Merge(ParseResult result)
+        {
+            var merger = new Merger(Journal, result.CommodityPool, CommodityPool.Current);
+
+            // Commodities are mapped in the order they were created, so they get the same allocation order as with sequential parsing
+            foreach (var commodity in result.CommodityPool.Commodities.Where(kv => kv.Key == kv.Value.BaseSymbol).Select(kv => kv.Value).ToList())
+                merger.MapCommodity(commodity);
+            foreach (var commodity in result.CommodityPool.AnnotatedCommodities.Values.ToList())
+                merger.MapCommodity(commodity);
+
+            foreach (var price in result.CommodityPool.CommodityPriceHistory.GetAllPrices().ToList())
+            {
+                var commodity = merger.MapCommodity(price.Item1);
+                CommodityPool.Current.CommodityPriceHistory.AddPrice(commodity, price.Item2, merger.MapAmount(price.Item3));
+                commodity.Base.PriceMap.Clear();
+            }
+
+            merger.MapAccounts(result.Journal.Master, Journal.Master);
+
+            foreach (var xact in result.Journal.Xacts)
+            {
+                foreach (var post in xact.Posts)
+                {
+                    post.Account = merger.Accounts[post.Account];
+                    post.Account.AddPost(post);
+
+                    post.Amount = merger.MapAmount(post.Amount);
+                    post.Cost = merger.MapAmount(post.Cost);
+                    post.GivenCost = merger.MapAmount(post.GivenCost);
+                    post.AssignedAmount = merger.MapAmount(post.AssignedAmount);
+                }
+
+                if (!Journal.AddFinalizedXact(xact))
+                    xact.Detach();
+            }
+        }
+
+        private class Merger
+        {
+            public Merger(Journal journal, CommodityPool sourcePool, CommodityPool targetPool)
+            {
+                Journal = journal;
+                SourcePool = sourcePool;
+                TargetPool = targetPool;
+            }
+
+            public Journal Journal { get; }
+            public CommodityPool SourcePool { get; }
+            public CommodityPool TargetPool { get; }
+            public IDictionary<Account, Account> Accounts { get; } = new Dictionary<Account, Account>();
+
+            public Commodity MapCommodity(Commodity commodity)
+            {
+                if (commodity == null || commodity.Pool != SourcePool)
+                    return commodity;
+
+                Commodity target;
+                if (!Commodities.TryGetValue(commodity, out target))
+                {
+                    if (commodity.IsAnnotated)
+                    {
+                        var details = ((AnnotatedCommodity)commodity).Details;
+                        var targetDetails = new Annotation(MapAmount(details.Price), details.Date, details.Tag)
+                        {
+                            ValueExpr = details.ValueExpr,
+                            IsPriceNotPerUnit = details.IsPriceNotPerUnit,
+                            IsPriceFixated = details.IsPriceFixated,
+                            IsPriceCalculated = details.IsPriceCalculated,
+                            IsDateCalculated = details.IsDateCalculated,
+                            IsTagCalculated = details.IsTagCalculated,
+                            IsValueExprCalculated = details.IsValueExprCalculated
+                        };
+                        target = TargetPool.FindOrCreate(MapCommodity(commodity.Referent), targetDetails);
+                    }
+                    else
+                    {
+                        // Parsing only adds style flags and increases precision, so merging them gives the same result as sequential parsing
+                        target = TargetPool.Find(commodity.BaseSymbol) ?? TargetPool.Create(commodity.BaseSymbol);
+                        target.Flags |= commodity.Flags;
+                        target.Precision = Math.Max(target.Precision, commodity.Precision);
+                    }
+                    Commodities.Add(commodity, target);
+                }
+                return target;
+            }
+
+            public Amount MapAmount(Amount amount)
+            {
+                if (amount == null || amount.Commodity == null || amount.Commodity.Pool != SourcePool)
+                    return amount;
+
+                return new Amount(amount.Quantity, MapCommodity(amount.Commodity));
+            }
+
+            public void MapAccounts(Account source, Account target)
+            {
+                Accounts[source] = target;
+                foreach (var child in source.Accounts.Values)
+                    MapAccounts(child, target.FindAccount(child.Name));
+            }
+
+            private readonly IDictionary<Commodity, Commodity> Commodities = new Dictionary<Commodity, Commodity>();
+        }
+
+        private class PendingFile
+        {
+            public string PathName { get; set; }
+            public Account Master { get; set; }
+            public MainApplicationContext Context { get; set; }
+            public Journal Journal { get; set; }
+            public Account WorkerMaster { get; set; }
+            public StringWriter Errors { get; set; }
+            public Task<ParseResult> Task { get; set; }
+        }
+
+        private class ParseResult
+        {
+            public string PathName { get; set; }
+            public Journal Journal { get; set; }
+            public CommodityPool CommodityPool { get; set; }
+            public int Count { get; set; }
+            public int Sequence { get; set; }
+        }
+
+        private const int CancellationCheckInterval = 100;
+        private readonly IList<PendingFile> PendingFiles = new List<PendingFile>();
+    }
+}
@@ -82,6 +82,7 @@ namespace NLedger.Textual
         private TextualParser Parent { get; set; }
         private ITextualReader In { get; set; }
         public TimeLog TimeLog { get; private set; }
+        private ParallelParser ParallelParser { get; set; }
 
         public override string Description
         {
@@ -146,6 +147,8 @@ namespace NLedger.Textual
                 }
             }
 
+            CompletePendingIncludes();
+
             if (ApplyStack.IsFrontType<DateTime?>())
                 TimesCommon.Current.Epoch = ApplyStack.Front<DateTime?>().Value;
 
@@ -191,6 +194,10 @@ namespace NLedger.Textual
             if (!Char.IsWhiteSpace(firstChar))
                 ErrorFlag = false;
 
+            // Files included in parallel are merged before any other directive changes the journal
+            if (ParallelParser != null && ParallelParser.HasPendingFiles && !firstChar.IsCommentChar() && !IsIncludeDirective(line))
+                CompletePendingIncludes();
+
             // Main switch
             if (Char.IsWhiteSpace(firstChar))
             {
@@ -1014,35 +1021,15 @@ namespace NLedger.Textual
                     string fileBase = FileSystem.GetFileName(iter);
                     if (glob.Match(fileBase))
                     {
-                        Journal journal = Context.Journal;
-                        Account master = TopAccount;
-                        Scope scope = Context.Scope;
-                        //int errors = Context.Errors;
-                        //int count = Context.Count;
-                        //int sequence = Context.Sequence;
-
-                        Logger.Current.Debug(DebugTextualInclude, () => "Including: " + iter);
-                        Logger.Current.Debug(DebugTextualInclude, () => "Master account: " + master.FullName);
-
-                        ContextStack.Push(iter);
-
-                        ContextStack.GetCurrent().Journal = journal;
-                        ContextStack.GetCurrent().Master = master;
-                        ContextStack.GetCurrent().Scope = scope;
-
-                        try
+                        if (Context.Journal.ParallelParsing && ApplyStack.ContainsOnly<Account>())
                         {
-                            var instance = new TextualParser(ContextStack, ContextStack.GetCurrent(), this, NoAssertions);
-                            instance.ApplyStack.PushFront("account", master);
-                            instance.Parse();
+                            if (ParallelParser == null)
+                                ParallelParser = new ParallelParser(Context.Journal);
+                            ParallelParser.Add(iter, TopAccount);
                         }
-                        finally
+                        else
                         {
-                            Context.Errors += ContextStack.GetCurrent().Errors;
-                            Context.Count += ContextStack.GetCurrent().Count;
-                            Context.Sequence += ContextStack.GetCurrent().Sequence;
-
-                            ContextStack.Pop();
+                            ParseIncludedFile(iter, TopAccount);
                         }
 
                         filesFound = true;
@@ -1054,6 +1041,65 @@ namespace NLedger.Textual
                 throw new RuntimeError(String.Format(RuntimeError.ErrorMessageFileToIncludeWasNotFound, fileName));
         }
 
+        private void ParseIncludedFile(string iter, Account master)
+        {
+            Journal journal = Context.Journal;
+            Scope scope = Context.Scope;
+            //int errors = Context.Errors;
+            //int count = Context.Count;
+            //int sequence = Context.Sequence;
+
+            Logger.Current.Debug(DebugTextualInclude, () => "Including: " + iter);
+            Logger.Current.Debug(DebugTextualInclude, () => "Master account: " + master.FullName);
+
+            ContextStack.Push(iter);
+            journal.IncludedSources.Add(new JournalFileInfo(iter) { ParentFileName = Context.PathName, MasterAccount = master.FullName });
+
+            ContextStack.GetCurrent().Journal = journal;
+            ContextStack.GetCurrent().Master = master;
+            ContextStack.GetCurrent().Scope = scope;
+
+            try
+            {
+                var instance = new TextualParser(ContextStack, ContextStack.GetCurrent(), this, NoAssertions);
+                instance.ApplyStack.PushFront("account", master);
+                instance.Parse();
+            }
+            finally
+            {
+                Context.Errors += ContextStack.GetCurrent().Errors;
+                Context.Count += ContextStack.GetCurrent().Count;
+                Context.Sequence += ContextStack.GetCurrent().Sequence;
+
+                ContextStack.Pop();
+            }
+        }
+
+        /// <summary>
+        /// Merges files that are included in parallel (see Journal.ParallelParsing); files that cannot be parsed in parallel are parsed here.
+        /// </summary>
+        /// <remarks>NLedger extension</remarks>
+        private void CompletePendingIncludes()
+        {
+            if (ParallelParser == null)
+                return;
+
+            ParallelParser.Complete(ParseIncludedFile, (pathName, master, count, sequence) =>
+            {
+                Context.Journal.IncludedSources.Add(new JournalFileInfo(pathName) { ParentFileName = Context.PathName, MasterAccount = master.FullName });
+                Context.Count += count;
+                Context.Sequence += sequence;
+            });
+        }
+
+        private static bool IsIncludeDirective(string line)
+        {
+            if (line.StartsWith("!") || line.StartsWith("@"))
+                line = line.Remove(0, 1);
+
+            return line.StartsWith(IncludeToken) && line.Length > IncludeToken.Length && Char.IsWhiteSpace(line[IncludeToken.Length]);
+        }
+
         /// <summary>
         /// Ported from end_apply_directive
         /// </summary>
@@ -42,6 +42,6 @@ namespace NLedger.Times
         protected string ParseDotNetFmtStr { get; set; }
         protected string PrintDotNetFmtStr { get; set; }
 
-        protected string FmtStr { get; private set; }
+        public string FmtStr { get; private set; }
     }
 }
@@ -122,6 +122,39 @@ namespace NLedger.Times
             }
         }
 
+        /// <summary>
+        /// Creates a copy of date/time settings (formats, epoch and the first day of week).
+        /// </summary>
+        /// <remarks>
+        /// NLedger extension. Date readers keep parsing state, so threads that parse dates concurrently should use their own copies.
+        /// </remarks>
+        public TimesCommon Clone()
+        {
+            var timesCommon = new TimesCommon()
+            {
+                ConvertSeparatorsToSlashes = ConvertSeparatorsToSlashes,
+                Epoch = Epoch,
+                StartToWeek = StartToWeek
+            };
+
+            if (IsInitialized)
+            {
+                timesCommon.InputDateTimeIO = new DateTimeIO(InputDateTimeIO.FmtStr, true);
+                timesCommon.TimelogDateTimeIO = new DateTimeIO(TimelogDateTimeIO.FmtStr, true);
+                timesCommon.WrittenDateTimeIO = new DateTimeIO(WrittenDateTimeIO.FmtStr, false);
+                timesCommon.WrittenDateIO = new DateIO(WrittenDateIO.FmtStr, false);
+                timesCommon.PrintedDateTimeIO = new DateTimeIO(PrintedDateTimeIO.FmtStr, false);
+                timesCommon.PrintedDateIO = new DateIO(PrintedDateIO.FmtStr, false);
+
+                foreach (DateIO reader in Readers)
+                    timesCommon.Readers.Add(new DateIO(reader.FmtStr, true));
+
+                timesCommon.IsInitialized = true;
+            }
+
+            return timesCommon;
+        }
+
         /// <summary>
         /// Ported from parse_date_mask_routine
         /// </summary>
@@ -142,6 +142,10 @@ namespace NLedger.Utility.BigValues
 
         public string ToString(string format, IFormatProvider formatProvider)
         {
+            // Decimal values are exact in the general format, so it is used as the "B" (exact) representation
+            if (format == "B")
+                format = "G";
+
             return Value.ToString(format, formatProvider);
         }
 